@@ -2,9 +2,9 @@
 
 
 module Biatob.Proto.Mvp exposing
-    ( TradeState(..), Void(..), Resolution(..), PredictionViewPrivacy(..), PredictionFollowingStatus(..), AuthToken, HashedPassword, LoginType(..), GenericUserInfo, GenericUserInfoInvitation, Relationship, ResolutionEventPriorRevision(..), ResolutionEvent, Trade, Empty, ErrorResponse, WhoamiRequest, WhoamiResponse, SignOutRequest, SignOutResponse, AuthSuccess, SendVerificationEmailRequest, RegisterUsernameRequest, LogInUsernameRequest, CertaintyRange, CreatePredictionRequest, CreatePredictionResponse, GetPredictionRequest, UserPredictionView, ListMyStakesRequest, PredictionsById, ListPredictionsRequest, FollowRequest, StakeRequest, ResolveRequest, SetTrustedRequest, GetUserRequest, ChangePasswordRequest, GetSettingsRequest, SendInvitationRequest, CheckInvitationRequest, CheckInvitationResponse, AcceptInvitationRequest, SavedCreatedPredictionFormState
-    , authTokenDecoder, hashedPasswordDecoder, genericUserInfoDecoder, relationshipDecoder, resolutionEventDecoder, tradeDecoder, emptyDecoder, errorResponseDecoder, whoamiRequestDecoder, whoamiResponseDecoder, signOutRequestDecoder, signOutResponseDecoder, authSuccessDecoder, sendVerificationEmailRequestDecoder, registerUsernameRequestDecoder, logInUsernameRequestDecoder, certaintyRangeDecoder, createPredictionRequestDecoder, createPredictionResponseDecoder, getPredictionRequestDecoder, userPredictionViewDecoder, listMyStakesRequestDecoder, predictionsByIdDecoder, listPredictionsRequestDecoder, followRequestDecoder, stakeRequestDecoder, resolveRequestDecoder, setTrustedRequestDecoder, getUserRequestDecoder, changePasswordRequestDecoder, getSettingsRequestDecoder, sendInvitationRequestDecoder, checkInvitationRequestDecoder, checkInvitationResponseDecoder, acceptInvitationRequestDecoder, savedCreatedPredictionFormStateDecoder
-    , toAuthTokenEncoder, toHashedPasswordEncoder, toGenericUserInfoEncoder, toRelationshipEncoder, toResolutionEventEncoder, toTradeEncoder, toEmptyEncoder, toErrorResponseEncoder, toWhoamiRequestEncoder, toWhoamiResponseEncoder, toSignOutRequestEncoder, toSignOutResponseEncoder, toAuthSuccessEncoder, toSendVerificationEmailRequestEncoder, toRegisterUsernameRequestEncoder, toLogInUsernameRequestEncoder, toCertaintyRangeEncoder, toCreatePredictionRequestEncoder, toCreatePredictionResponseEncoder, toGetPredictionRequestEncoder, toUserPredictionViewEncoder, toListMyStakesRequestEncoder, toPredictionsByIdEncoder, toListPredictionsRequestEncoder, toFollowRequestEncoder, toStakeRequestEncoder, toResolveRequestEncoder, toSetTrustedRequestEncoder, toGetUserRequestEncoder, toChangePasswordRequestEncoder, toGetSettingsRequestEncoder, toSendInvitationRequestEncoder, toCheckInvitationRequestEncoder, toCheckInvitationResponseEncoder, toAcceptInvitationRequestEncoder, toSavedCreatedPredictionFormStateEncoder
+    ( TradeState(..), Void(..), Resolution(..), PredictionViewPrivacy(..), PredictionFollowingStatus(..), PredictionOrder(..), PredictionProjection(..), AuthToken, HashedPassword, LoginType(..), GenericUserInfo, GenericUserInfoInvitation, Relationship, ResolutionEventPriorRevision(..), ResolutionEvent, Trade, Empty, ErrorResponse, WhoamiRequest, WhoamiResponse, SignOutRequest, SignOutResponse, AuthSuccess, SendVerificationEmailRequest, RegisterUsernameRequest, LogInUsernameRequest, CertaintyRange, CreatePredictionRequest, CreatePredictionResponse, GetPredictionRequest, UserPredictionView, PredictionSummary, PredictionUpdate, ListMyStakesRequest, PredictionsById, ListPredictionsRequest, FollowRequest, StakeRequest, ResolveRequest, SetTrustedRequest, GetUserRequest, ChangePasswordRequest, GetSettingsRequest, SendInvitationRequest, CheckInvitationRequest, CheckInvitationResponse, AcceptInvitationRequest, BatchRequest, BatchRequestCall, BatchResponse, Outcome(..), BatchResponseResult, SavedCreatedPredictionFormState
+    , authTokenDecoder, hashedPasswordDecoder, genericUserInfoDecoder, relationshipDecoder, resolutionEventDecoder, tradeDecoder, emptyDecoder, errorResponseDecoder, whoamiRequestDecoder, whoamiResponseDecoder, signOutRequestDecoder, signOutResponseDecoder, authSuccessDecoder, sendVerificationEmailRequestDecoder, registerUsernameRequestDecoder, logInUsernameRequestDecoder, certaintyRangeDecoder, createPredictionRequestDecoder, createPredictionResponseDecoder, getPredictionRequestDecoder, userPredictionViewDecoder, predictionSummaryDecoder, predictionUpdateDecoder, listMyStakesRequestDecoder, predictionsByIdDecoder, listPredictionsRequestDecoder, followRequestDecoder, stakeRequestDecoder, resolveRequestDecoder, setTrustedRequestDecoder, getUserRequestDecoder, changePasswordRequestDecoder, getSettingsRequestDecoder, sendInvitationRequestDecoder, checkInvitationRequestDecoder, checkInvitationResponseDecoder, acceptInvitationRequestDecoder, batchRequestDecoder, batchResponseDecoder, savedCreatedPredictionFormStateDecoder
+    , toAuthTokenEncoder, toHashedPasswordEncoder, toGenericUserInfoEncoder, toRelationshipEncoder, toResolutionEventEncoder, toTradeEncoder, toEmptyEncoder, toErrorResponseEncoder, toWhoamiRequestEncoder, toWhoamiResponseEncoder, toSignOutRequestEncoder, toSignOutResponseEncoder, toAuthSuccessEncoder, toSendVerificationEmailRequestEncoder, toRegisterUsernameRequestEncoder, toLogInUsernameRequestEncoder, toCertaintyRangeEncoder, toCreatePredictionRequestEncoder, toCreatePredictionResponseEncoder, toGetPredictionRequestEncoder, toUserPredictionViewEncoder, toPredictionSummaryEncoder, toPredictionUpdateEncoder, toListMyStakesRequestEncoder, toPredictionsByIdEncoder, toListPredictionsRequestEncoder, toFollowRequestEncoder, toStakeRequestEncoder, toResolveRequestEncoder, toSetTrustedRequestEncoder, toGetUserRequestEncoder, toChangePasswordRequestEncoder, toGetSettingsRequestEncoder, toSendInvitationRequestEncoder, toCheckInvitationRequestEncoder, toCheckInvitationResponseEncoder, toAcceptInvitationRequestEncoder, toBatchRequestEncoder, toBatchResponseEncoder, toSavedCreatedPredictionFormStateEncoder
     )
 
 {-| ProtoBuf module: `Biatob.Proto.Mvp`
@@ -20,17 +20,17 @@ To run it use [`elm-protocol-buffers`](https://package.elm-lang.org/packages/eri
 
 # Model
 
-@docs TradeState, Void, Resolution, PredictionViewPrivacy, PredictionFollowingStatus, AuthToken, HashedPassword, LoginType, GenericUserInfo, GenericUserInfoInvitation, Relationship, ResolutionEventPriorRevision, ResolutionEvent, Trade, Empty, ErrorResponse, WhoamiRequest, WhoamiResponse, SignOutRequest, SignOutResponse, AuthSuccess, SendVerificationEmailRequest, RegisterUsernameRequest, LogInUsernameRequest, CertaintyRange, CreatePredictionRequest, CreatePredictionResponse, GetPredictionRequest, UserPredictionView, ListMyStakesRequest, PredictionsById, ListPredictionsRequest, FollowRequest, StakeRequest, ResolveRequest, SetTrustedRequest, GetUserRequest, ChangePasswordRequest, GetSettingsRequest, SendInvitationRequest, CheckInvitationRequest, CheckInvitationResponse, AcceptInvitationRequest, SavedCreatedPredictionFormState
+@docs TradeState, Void, Resolution, PredictionViewPrivacy, PredictionFollowingStatus, PredictionOrder, PredictionProjection, AuthToken, HashedPassword, LoginType, GenericUserInfo, GenericUserInfoInvitation, Relationship, ResolutionEventPriorRevision, ResolutionEvent, Trade, Empty, ErrorResponse, WhoamiRequest, WhoamiResponse, SignOutRequest, SignOutResponse, AuthSuccess, SendVerificationEmailRequest, RegisterUsernameRequest, LogInUsernameRequest, CertaintyRange, CreatePredictionRequest, CreatePredictionResponse, GetPredictionRequest, UserPredictionView, PredictionSummary, PredictionUpdate, ListMyStakesRequest, PredictionsById, ListPredictionsRequest, FollowRequest, StakeRequest, ResolveRequest, SetTrustedRequest, GetUserRequest, ChangePasswordRequest, GetSettingsRequest, SendInvitationRequest, CheckInvitationRequest, CheckInvitationResponse, AcceptInvitationRequest, BatchRequest, BatchRequestCall, BatchResponse, Outcome, BatchResponseResult, SavedCreatedPredictionFormState
 
 
 # Decoder
 
-@docs authTokenDecoder, hashedPasswordDecoder, genericUserInfoDecoder, relationshipDecoder, resolutionEventDecoder, tradeDecoder, emptyDecoder, errorResponseDecoder, whoamiRequestDecoder, whoamiResponseDecoder, signOutRequestDecoder, signOutResponseDecoder, authSuccessDecoder, sendVerificationEmailRequestDecoder, registerUsernameRequestDecoder, logInUsernameRequestDecoder, certaintyRangeDecoder, createPredictionRequestDecoder, createPredictionResponseDecoder, getPredictionRequestDecoder, userPredictionViewDecoder, listMyStakesRequestDecoder, predictionsByIdDecoder, listPredictionsRequestDecoder, followRequestDecoder, stakeRequestDecoder, resolveRequestDecoder, setTrustedRequestDecoder, getUserRequestDecoder, changePasswordRequestDecoder, getSettingsRequestDecoder, sendInvitationRequestDecoder, checkInvitationRequestDecoder, checkInvitationResponseDecoder, acceptInvitationRequestDecoder, savedCreatedPredictionFormStateDecoder
+@docs authTokenDecoder, hashedPasswordDecoder, genericUserInfoDecoder, relationshipDecoder, resolutionEventDecoder, tradeDecoder, emptyDecoder, errorResponseDecoder, whoamiRequestDecoder, whoamiResponseDecoder, signOutRequestDecoder, signOutResponseDecoder, authSuccessDecoder, sendVerificationEmailRequestDecoder, registerUsernameRequestDecoder, logInUsernameRequestDecoder, certaintyRangeDecoder, createPredictionRequestDecoder, createPredictionResponseDecoder, getPredictionRequestDecoder, userPredictionViewDecoder, predictionSummaryDecoder, predictionUpdateDecoder, listMyStakesRequestDecoder, predictionsByIdDecoder, listPredictionsRequestDecoder, followRequestDecoder, stakeRequestDecoder, resolveRequestDecoder, setTrustedRequestDecoder, getUserRequestDecoder, changePasswordRequestDecoder, getSettingsRequestDecoder, sendInvitationRequestDecoder, checkInvitationRequestDecoder, checkInvitationResponseDecoder, acceptInvitationRequestDecoder, batchRequestDecoder, batchResponseDecoder, savedCreatedPredictionFormStateDecoder
 
 
 # Encoder
 
-@docs toAuthTokenEncoder, toHashedPasswordEncoder, toGenericUserInfoEncoder, toRelationshipEncoder, toResolutionEventEncoder, toTradeEncoder, toEmptyEncoder, toErrorResponseEncoder, toWhoamiRequestEncoder, toWhoamiResponseEncoder, toSignOutRequestEncoder, toSignOutResponseEncoder, toAuthSuccessEncoder, toSendVerificationEmailRequestEncoder, toRegisterUsernameRequestEncoder, toLogInUsernameRequestEncoder, toCertaintyRangeEncoder, toCreatePredictionRequestEncoder, toCreatePredictionResponseEncoder, toGetPredictionRequestEncoder, toUserPredictionViewEncoder, toListMyStakesRequestEncoder, toPredictionsByIdEncoder, toListPredictionsRequestEncoder, toFollowRequestEncoder, toStakeRequestEncoder, toResolveRequestEncoder, toSetTrustedRequestEncoder, toGetUserRequestEncoder, toChangePasswordRequestEncoder, toGetSettingsRequestEncoder, toSendInvitationRequestEncoder, toCheckInvitationRequestEncoder, toCheckInvitationResponseEncoder, toAcceptInvitationRequestEncoder, toSavedCreatedPredictionFormStateEncoder
+@docs toAuthTokenEncoder, toHashedPasswordEncoder, toGenericUserInfoEncoder, toRelationshipEncoder, toResolutionEventEncoder, toTradeEncoder, toEmptyEncoder, toErrorResponseEncoder, toWhoamiRequestEncoder, toWhoamiResponseEncoder, toSignOutRequestEncoder, toSignOutResponseEncoder, toAuthSuccessEncoder, toSendVerificationEmailRequestEncoder, toRegisterUsernameRequestEncoder, toLogInUsernameRequestEncoder, toCertaintyRangeEncoder, toCreatePredictionRequestEncoder, toCreatePredictionResponseEncoder, toGetPredictionRequestEncoder, toUserPredictionViewEncoder, toPredictionSummaryEncoder, toPredictionUpdateEncoder, toListMyStakesRequestEncoder, toPredictionsByIdEncoder, toListPredictionsRequestEncoder, toFollowRequestEncoder, toStakeRequestEncoder, toResolveRequestEncoder, toSetTrustedRequestEncoder, toGetUserRequestEncoder, toChangePasswordRequestEncoder, toGetSettingsRequestEncoder, toSendInvitationRequestEncoder, toCheckInvitationRequestEncoder, toCheckInvitationResponseEncoder, toAcceptInvitationRequestEncoder, toBatchRequestEncoder, toBatchResponseEncoder, toSavedCreatedPredictionFormStateEncoder
 
 -}
 
@@ -88,6 +88,25 @@ type PredictionFollowingStatus
     | PredictionFollowingStatusUnrecognized_ Int
 
 
+{-| `PredictionOrder` enumeration
+-}
+type PredictionOrder
+    = PredictionOrderCreated
+    | PredictionOrderCloses
+    | PredictionOrderResolves
+    | PredictionOrderClosesSoonest
+    | PredictionOrderResolvesSoonest
+    | PredictionOrderUnrecognized_ Int
+
+
+{-| `PredictionProjection` enumeration
+-}
+type PredictionProjection
+    = PredictionProjectionFull
+    | PredictionProjectionSummary
+    | PredictionProjectionUnrecognized_ Int
+
+
 {-| `AuthToken` message
 -}
 type alias AuthToken =
@@ -290,16 +309,48 @@ type alias UserPredictionView =
     }
 
 
+{-| `PredictionSummary` message
+-}
+type alias PredictionSummary =
+    { prediction : String
+    , certainty : Maybe CertaintyRange
+    , maximumStakeCents : Int
+    , remainingStakeCentsVsBelievers : Int
+    , remainingStakeCentsVsSkeptics : Int
+    , createdUnixtime : Float
+    , closesUnixtime : Float
+    , resolvesAtUnixtime : Float
+    , creator : String
+    , resolution : Resolution
+    }
+
+
+{-| `PredictionUpdate` message
+-}
+type alias PredictionUpdate =
+    { remainingStakeCentsVsBelievers : Int
+    , remainingStakeCentsVsSkeptics : Int
+    , resolution : Resolution
+    , numActiveTrades : Int
+    }
+
+
 {-| `ListMyStakesRequest` message
 -}
 type alias ListMyStakesRequest =
-    {}
+    { limit : Int
+    , cursor : String
+    , order : PredictionOrder
+    , projection : PredictionProjection
+    }
 
 
 {-| `PredictionsById` message
 -}
 type alias PredictionsById =
     { predictions : Dict.Dict String (Maybe UserPredictionView)
+    , summaries : Dict.Dict String (Maybe PredictionSummary)
+    , nextCursor : String
     }
 
 
@@ -307,6 +358,10 @@ type alias PredictionsById =
 -}
 type alias ListPredictionsRequest =
     { creator : String
+    , limit : Int
+    , cursor : String
+    , order : PredictionOrder
+    , projection : PredictionProjection
     }
 
 
@@ -395,6 +450,43 @@ type alias AcceptInvitationRequest =
     }
 
 
+{-| `BatchRequest` message
+-}
+type alias BatchRequest =
+    { calls : List BatchRequestCall
+    }
+
+
+{-| `BatchRequestCall` message
+-}
+type alias BatchRequestCall =
+    { method : String
+    , request : Bytes.Bytes
+    }
+
+
+{-| `BatchResponse` message
+-}
+type alias BatchResponse =
+    { results : List BatchResponseResult
+    }
+
+
+{-| Outcome
+-}
+type Outcome
+    = OutcomeOk Bytes.Bytes
+    | OutcomeError ErrorResponse
+
+
+{-| `BatchResponseResult` message
+-}
+type alias BatchResponseResult =
+    { httpStatus : Int
+    , outcome : Maybe Outcome
+    }
+
+
 {-| `SavedCreatedPredictionFormState` message
 -}
 type alias SavedCreatedPredictionFormState =
@@ -511,6 +603,49 @@ predictionFollowingStatusDecoder =
             )
 
 
+predictionOrderDecoder : Decode.Decoder PredictionOrder
+predictionOrderDecoder =
+    Decode.int32
+        |> Decode.map
+            (\value ->
+                case value of
+                    0 ->
+                        PredictionOrderCreated
+
+                    1 ->
+                        PredictionOrderCloses
+
+                    2 ->
+                        PredictionOrderResolves
+
+                    3 ->
+                        PredictionOrderClosesSoonest
+
+                    4 ->
+                        PredictionOrderResolvesSoonest
+
+                    v ->
+                        PredictionOrderUnrecognized_ v
+            )
+
+
+predictionProjectionDecoder : Decode.Decoder PredictionProjection
+predictionProjectionDecoder =
+    Decode.int32
+        |> Decode.map
+            (\value ->
+                case value of
+                    0 ->
+                        PredictionProjectionFull
+
+                    1 ->
+                        PredictionProjectionSummary
+
+                    v ->
+                        PredictionProjectionUnrecognized_ v
+            )
+
+
 {-| `AuthToken` decoder
 -}
 authTokenDecoder : Decode.Decoder AuthToken
@@ -751,20 +886,56 @@ userPredictionViewDecoder =
         ]
 
 
+{-| `PredictionSummary` decoder
+-}
+predictionSummaryDecoder : Decode.Decoder PredictionSummary
+predictionSummaryDecoder =
+    Decode.message (PredictionSummary "" Nothing 0 0 0 0 0 0 "" ResolutionNoneYet)
+        [ Decode.optional 1 Decode.string setPrediction
+        , Decode.optional 2 (Decode.map Just certaintyRangeDecoder) setCertainty
+        , Decode.optional 3 Decode.uint32 setMaximumStakeCents
+        , Decode.optional 4 Decode.uint32 setRemainingStakeCentsVsBelievers
+        , Decode.optional 5 Decode.uint32 setRemainingStakeCentsVsSkeptics
+        , Decode.optional 6 Decode.double setCreatedUnixtime
+        , Decode.optional 7 Decode.double setClosesUnixtime
+        , Decode.optional 8 Decode.double setResolvesAtUnixtime
+        , Decode.optional 9 Decode.string setCreator
+        , Decode.optional 10 resolutionDecoder setResolution
+        ]
+
+
+{-| `PredictionUpdate` decoder
+-}
+predictionUpdateDecoder : Decode.Decoder PredictionUpdate
+predictionUpdateDecoder =
+    Decode.message (PredictionUpdate 0 0 ResolutionNoneYet 0)
+        [ Decode.optional 1 Decode.uint32 setRemainingStakeCentsVsBelievers
+        , Decode.optional 2 Decode.uint32 setRemainingStakeCentsVsSkeptics
+        , Decode.optional 3 resolutionDecoder setResolution
+        , Decode.optional 4 Decode.uint32 setNumActiveTrades
+        ]
+
+
 {-| `ListMyStakesRequest` decoder
 -}
 listMyStakesRequestDecoder : Decode.Decoder ListMyStakesRequest
 listMyStakesRequestDecoder =
-    Decode.message ListMyStakesRequest
-        []
+    Decode.message (ListMyStakesRequest 0 "" PredictionOrderCreated PredictionProjectionFull)
+        [ Decode.optional 1 Decode.uint32 setLimit
+        , Decode.optional 2 Decode.string setCursor
+        , Decode.optional 3 predictionOrderDecoder setOrder
+        , Decode.optional 4 predictionProjectionDecoder setProjection
+        ]
 
 
 {-| `PredictionsById` decoder
 -}
 predictionsByIdDecoder : Decode.Decoder PredictionsById
 predictionsByIdDecoder =
-    Decode.message (PredictionsById Dict.empty)
+    Decode.message (PredictionsById Dict.empty Dict.empty "")
         [ Decode.mapped 1 ( "", Nothing ) Decode.string (Decode.map Just userPredictionViewDecoder) .predictions setPredictions
+        , Decode.mapped 3 ( "", Nothing ) Decode.string (Decode.map Just predictionSummaryDecoder) .summaries setSummaries
+        , Decode.optional 2 Decode.string setNextCursor
         ]
 
 
@@ -772,8 +943,12 @@ predictionsByIdDecoder =
 -}
 listPredictionsRequestDecoder : Decode.Decoder ListPredictionsRequest
 listPredictionsRequestDecoder =
-    Decode.message (ListPredictionsRequest "")
+    Decode.message (ListPredictionsRequest "" 0 "" PredictionOrderCreated PredictionProjectionFull)
         [ Decode.optional 2 Decode.string setCreator
+        , Decode.optional 3 Decode.uint32 setLimit
+        , Decode.optional 4 Decode.string setCursor
+        , Decode.optional 5 predictionOrderDecoder setOrder
+        , Decode.optional 6 predictionProjectionDecoder setProjection
         ]
 
 
@@ -884,6 +1059,44 @@ acceptInvitationRequestDecoder =
         ]
 
 
+{-| `BatchRequest` decoder
+-}
+batchRequestDecoder : Decode.Decoder BatchRequest
+batchRequestDecoder =
+    Decode.message (BatchRequest [])
+        [ Decode.repeated 1 batchRequestCallDecoder .calls setCalls
+        ]
+
+
+batchRequestCallDecoder : Decode.Decoder BatchRequestCall
+batchRequestCallDecoder =
+    Decode.message (BatchRequestCall "" (Encode.encode <| Encode.string ""))
+        [ Decode.optional 1 Decode.string setMethod
+        , Decode.optional 2 Decode.bytes setRequest
+        ]
+
+
+{-| `BatchResponse` decoder
+-}
+batchResponseDecoder : Decode.Decoder BatchResponse
+batchResponseDecoder =
+    Decode.message (BatchResponse [])
+        [ Decode.repeated 1 batchResponseResultDecoder .results setResults
+        ]
+
+
+batchResponseResultDecoder : Decode.Decoder BatchResponseResult
+batchResponseResultDecoder =
+    Decode.message (BatchResponseResult 0 Nothing)
+        [ Decode.optional 3 Decode.uint32 setHttpStatus
+        , Decode.oneOf
+            [ ( 1, Decode.map OutcomeOk Decode.bytes )
+            , ( 2, Decode.map OutcomeError errorResponseDecoder )
+            ]
+            setOutcome
+        ]
+
+
 {-| `SavedCreatedPredictionFormState` decoder
 -}
 savedCreatedPredictionFormStateDecoder : Decode.Decoder SavedCreatedPredictionFormState
@@ -987,6 +1200,43 @@ toPredictionFollowingStatusEncoder value =
                 v
 
 
+toPredictionOrderEncoder : PredictionOrder -> Encode.Encoder
+toPredictionOrderEncoder value =
+    Encode.int32 <|
+        case value of
+            PredictionOrderCreated ->
+                0
+
+            PredictionOrderCloses ->
+                1
+
+            PredictionOrderResolves ->
+                2
+
+            PredictionOrderClosesSoonest ->
+                3
+
+            PredictionOrderResolvesSoonest ->
+                4
+
+            PredictionOrderUnrecognized_ v ->
+                v
+
+
+toPredictionProjectionEncoder : PredictionProjection -> Encode.Encoder
+toPredictionProjectionEncoder value =
+    Encode.int32 <|
+        case value of
+            PredictionProjectionFull ->
+                0
+
+            PredictionProjectionSummary ->
+                1
+
+            PredictionProjectionUnrecognized_ v ->
+                v
+
+
 {-| `AuthToken` encoder
 -}
 toAuthTokenEncoder : AuthToken -> Encode.Encoder
@@ -1226,12 +1476,46 @@ toUserPredictionViewEncoder model =
         ]
 
 
+{-| `PredictionSummary` encoder
+-}
+toPredictionSummaryEncoder : PredictionSummary -> Encode.Encoder
+toPredictionSummaryEncoder model =
+    Encode.message
+        [ ( 1, Encode.string model.prediction )
+        , ( 2, (Maybe.withDefault Encode.none << Maybe.map toCertaintyRangeEncoder) model.certainty )
+        , ( 3, Encode.uint32 model.maximumStakeCents )
+        , ( 4, Encode.uint32 model.remainingStakeCentsVsBelievers )
+        , ( 5, Encode.uint32 model.remainingStakeCentsVsSkeptics )
+        , ( 6, Encode.double model.createdUnixtime )
+        , ( 7, Encode.double model.closesUnixtime )
+        , ( 8, Encode.double model.resolvesAtUnixtime )
+        , ( 9, Encode.string model.creator )
+        , ( 10, toResolutionEncoder model.resolution )
+        ]
+
+
+{-| `PredictionUpdate` encoder
+-}
+toPredictionUpdateEncoder : PredictionUpdate -> Encode.Encoder
+toPredictionUpdateEncoder model =
+    Encode.message
+        [ ( 1, Encode.uint32 model.remainingStakeCentsVsBelievers )
+        , ( 2, Encode.uint32 model.remainingStakeCentsVsSkeptics )
+        , ( 3, toResolutionEncoder model.resolution )
+        , ( 4, Encode.uint32 model.numActiveTrades )
+        ]
+
+
 {-| `ListMyStakesRequest` encoder
 -}
 toListMyStakesRequestEncoder : ListMyStakesRequest -> Encode.Encoder
 toListMyStakesRequestEncoder model =
     Encode.message
-        []
+        [ ( 1, Encode.uint32 model.limit )
+        , ( 2, Encode.string model.cursor )
+        , ( 3, toPredictionOrderEncoder model.order )
+        , ( 4, toPredictionProjectionEncoder model.projection )
+        ]
 
 
 {-| `PredictionsById` encoder
@@ -1240,6 +1524,8 @@ toPredictionsByIdEncoder : PredictionsById -> Encode.Encoder
 toPredictionsByIdEncoder model =
     Encode.message
         [ ( 1, Encode.dict Encode.string (Maybe.withDefault Encode.none << Maybe.map toUserPredictionViewEncoder) model.predictions )
+        , ( 3, Encode.dict Encode.string (Maybe.withDefault Encode.none << Maybe.map toPredictionSummaryEncoder) model.summaries )
+        , ( 2, Encode.string model.nextCursor )
         ]
 
 
@@ -1249,6 +1535,10 @@ toListPredictionsRequestEncoder : ListPredictionsRequest -> Encode.Encoder
 toListPredictionsRequestEncoder model =
     Encode.message
         [ ( 2, Encode.string model.creator )
+        , ( 3, Encode.uint32 model.limit )
+        , ( 4, Encode.string model.cursor )
+        , ( 5, toPredictionOrderEncoder model.order )
+        , ( 6, toPredictionProjectionEncoder model.projection )
         ]
 
 
@@ -1359,6 +1649,50 @@ toAcceptInvitationRequestEncoder model =
         ]
 
 
+{-| `BatchRequest` encoder
+-}
+toBatchRequestEncoder : BatchRequest -> Encode.Encoder
+toBatchRequestEncoder model =
+    Encode.message
+        [ ( 1, Encode.list toBatchRequestCallEncoder model.calls )
+        ]
+
+
+toBatchRequestCallEncoder : BatchRequestCall -> Encode.Encoder
+toBatchRequestCallEncoder model =
+    Encode.message
+        [ ( 1, Encode.string model.method )
+        , ( 2, Encode.bytes model.request )
+        ]
+
+
+{-| `BatchResponse` encoder
+-}
+toBatchResponseEncoder : BatchResponse -> Encode.Encoder
+toBatchResponseEncoder model =
+    Encode.message
+        [ ( 1, Encode.list toBatchResponseResultEncoder model.results )
+        ]
+
+
+toOutcomeEncoder : Outcome -> ( Int, Encode.Encoder )
+toOutcomeEncoder model =
+    case model of
+        OutcomeOk value ->
+            ( 1, Encode.bytes value )
+
+        OutcomeError value ->
+            ( 2, toErrorResponseEncoder value )
+
+
+toBatchResponseResultEncoder : BatchResponseResult -> Encode.Encoder
+toBatchResponseResultEncoder model =
+    Encode.message
+        [ ( 3, Encode.uint32 model.httpStatus )
+        , Maybe.withDefault ( 0, Encode.none ) <| Maybe.map toOutcomeEncoder model.outcome
+        ]
+
+
 {-| `SavedCreatedPredictionFormState` encoder
 -}
 toSavedCreatedPredictionFormStateEncoder : SavedCreatedPredictionFormState -> Encode.Encoder
@@ -1615,11 +1949,46 @@ setYourFollowingStatus value model =
     { model | yourFollowingStatus = value }
 
 
+setLimit : a -> { b | limit : a } -> { b | limit : a }
+setLimit value model =
+    { model | limit = value }
+
+
+setCursor : a -> { b | cursor : a } -> { b | cursor : a }
+setCursor value model =
+    { model | cursor = value }
+
+
+setOrder : a -> { b | order : a } -> { b | order : a }
+setOrder value model =
+    { model | order = value }
+
+
+setNumActiveTrades : a -> { b | numActiveTrades : a } -> { b | numActiveTrades : a }
+setNumActiveTrades value model =
+    { model | numActiveTrades = value }
+
+
+setProjection : a -> { b | projection : a } -> { b | projection : a }
+setProjection value model =
+    { model | projection = value }
+
+
 setPredictions : a -> { b | predictions : a } -> { b | predictions : a }
 setPredictions value model =
     { model | predictions = value }
 
 
+setSummaries : a -> { b | summaries : a } -> { b | summaries : a }
+setSummaries value model =
+    { model | summaries = value }
+
+
+setNextCursor : a -> { b | nextCursor : a } -> { b | nextCursor : a }
+setNextCursor value model =
+    { model | nextCursor = value }
+
+
 setFollow : a -> { b | follow : a } -> { b | follow : a }
 setFollow value model =
     { model | follow = value }
@@ -1665,6 +2034,36 @@ setInviter value model =
     { model | inviter = value }
 
 
+setCalls : a -> { b | calls : a } -> { b | calls : a }
+setCalls value model =
+    { model | calls = value }
+
+
+setMethod : a -> { b | method : a } -> { b | method : a }
+setMethod value model =
+    { model | method = value }
+
+
+setRequest : a -> { b | request : a } -> { b | request : a }
+setRequest value model =
+    { model | request = value }
+
+
+setResults : a -> { b | results : a } -> { b | results : a }
+setResults value model =
+    { model | results = value }
+
+
+setHttpStatus : a -> { b | httpStatus : a } -> { b | httpStatus : a }
+setHttpStatus value model =
+    { model | httpStatus = value }
+
+
+setOutcome : a -> { b | outcome : a } -> { b | outcome : a }
+setOutcome value model =
+    { model | outcome = value }
+
+
 setPredictionField : a -> { b | predictionField : a } -> { b | predictionField : a }
 setPredictionField value model =
     { model | predictionField = value }
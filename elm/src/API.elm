@@ -3,6 +3,8 @@ module API exposing (..)
 import Protobuf.Decode as PD
 import Protobuf.Encode as PE
 import Biatob.Proto.Mvp as Pb
+import Bytes exposing (Bytes)
+import Dict
 import Http
 import Utils exposing (PredictionId)
 
@@ -47,20 +49,63 @@ call endpoint toMsg req =
 
 expectProtoOrError : PD.Decoder resp -> (Result Error resp -> msg) -> Http.Expect msg
 expectProtoOrError decoder toMsg =
-  Http.expectBytesResponse toMsg <| \response ->
-    case response of
-      Http.BadUrl_ url -> Err (TransportError (Http.BadUrl url))
-      Http.Timeout_ -> Err (TransportError Http.Timeout)
-      Http.NetworkError_ -> Err (TransportError Http.NetworkError)
-      Http.BadStatus_ metadata body ->
-        case PD.decode Pb.errorResponseDecoder body of
-          Just err -> Err (ApiError {status = metadata.statusCode, catchall = err.catchall})
-          -- A non-2xx that isn't one of ours (a proxy's 502 page, say).
-          Nothing -> Err (TransportError (Http.BadStatus metadata.statusCode))
-      Http.GoodStatus_ _ body ->
-        case PD.decode decoder body of
-          Just value -> Ok value
-          Nothing -> Err (TransportError (Http.BadBody "unintelligible response"))
+  Http.expectBytesResponse toMsg (decodeProtoResponse decoder)
+
+decodeProtoResponse : PD.Decoder resp -> Http.Response Bytes -> Result Error resp
+decodeProtoResponse decoder response =
+  case response of
+    Http.BadUrl_ url -> Err (TransportError (Http.BadUrl url))
+    Http.Timeout_ -> Err (TransportError Http.Timeout)
+    Http.NetworkError_ -> Err (TransportError Http.NetworkError)
+    Http.BadStatus_ metadata body ->
+      case PD.decode Pb.errorResponseDecoder body of
+        Just err -> Err (ApiError {status = metadata.statusCode, catchall = err.catchall})
+        -- A non-2xx that isn't one of ours (a proxy's 502 page, say).
+        Nothing -> Err (TransportError (Http.BadStatus metadata.statusCode))
+    Http.GoodStatus_ _ body ->
+      case PD.decode decoder body of
+        Just value -> Ok value
+        Nothing -> Err (TransportError (Http.BadBody "unintelligible response"))
+
+{-| A response, and the ETag the server sent it with (if any). -}
+type alias Tagged resp = { etag : Maybe String, value : resp }
+
+{-| Make a call to a read the server answers conditionally (GetPrediction,
+ListMyStakes, ListPredictions).
+
+Pass the tagged response to an earlier identical call, if you kept it: its ETag
+goes out as If-None-Match, and if the server says 304, that response is still
+current and comes back again, without the server sending or us decoding it.
+-}
+callConditionally : Endpoint req resp -> (Result Error (Tagged resp) -> msg) -> Maybe (Tagged resp) -> req -> Cmd msg
+callConditionally endpoint toMsg cached req =
+  Http.request
+    { method = "POST"
+    , headers =
+        case cached |> Maybe.andThen .etag of
+          Just etag -> [Http.header "If-None-Match" etag]
+          Nothing -> []
+    , url = endpoint.url
+    , body = Http.bytesBody "application/octet-stream" <| PE.encode <| endpoint.encoder req
+    , expect = Http.expectBytesResponse toMsg (decodeTaggedProtoResponse endpoint.decoder cached)
+    , timeout = Nothing
+    , tracker = Nothing
+    }
+
+decodeTaggedProtoResponse : PD.Decoder resp -> Maybe (Tagged resp) -> Http.Response Bytes -> Result Error (Tagged resp)
+decodeTaggedProtoResponse decoder cached response =
+  case (response, cached) of
+    -- elm/http counts only 2xx as good, so a 304 arrives as a bad status.
+    (Http.BadStatus_ metadata _, Just tagged) ->
+      if metadata.statusCode == 304 then
+        Ok tagged
+      else
+        decodeProtoResponse decoder response |> Result.map (Tagged Nothing)
+    (Http.GoodStatus_ metadata _, _) ->
+      -- The browser hands over header names lowercased.
+      decodeProtoResponse decoder response |> Result.map (Tagged (Dict.get "etag" metadata.headers))
+    _ ->
+      decodeProtoResponse decoder response |> Result.map (Tagged Nothing)
 
 postWhoami : (Result Error Pb.WhoamiResponse -> msg) -> Pb.WhoamiRequest -> Cmd msg
 postWhoami = call {url="/api/Whoami", encoder=Pb.toWhoamiRequestEncoder, decoder=Pb.whoamiResponseDecoder}
@@ -80,6 +125,12 @@ postListMyStakes : (Result Error Pb.PredictionsById -> msg) -> Pb.ListMyStakesRe
 postListMyStakes = call {url="/api/ListMyStakes", encoder=Pb.toListMyStakesRequestEncoder, decoder=Pb.predictionsByIdDecoder}
 postListPredictions : (Result Error Pb.PredictionsById -> msg) -> Pb.ListPredictionsRequest -> Cmd msg
 postListPredictions = call {url="/api/ListPredictions", encoder=Pb.toListPredictionsRequestEncoder, decoder=Pb.predictionsByIdDecoder}
+postGetPredictionConditionally : (Result Error (Tagged Pb.UserPredictionView) -> msg) -> Maybe (Tagged Pb.UserPredictionView) -> Pb.GetPredictionRequest -> Cmd msg
+postGetPredictionConditionally = callConditionally {url="/api/GetPrediction", encoder=Pb.toGetPredictionRequestEncoder, decoder=Pb.userPredictionViewDecoder}
+postListMyStakesConditionally : (Result Error (Tagged Pb.PredictionsById) -> msg) -> Maybe (Tagged Pb.PredictionsById) -> Pb.ListMyStakesRequest -> Cmd msg
+postListMyStakesConditionally = callConditionally {url="/api/ListMyStakes", encoder=Pb.toListMyStakesRequestEncoder, decoder=Pb.predictionsByIdDecoder}
+postListPredictionsConditionally : (Result Error (Tagged Pb.PredictionsById) -> msg) -> Maybe (Tagged Pb.PredictionsById) -> Pb.ListPredictionsRequest -> Cmd msg
+postListPredictionsConditionally = callConditionally {url="/api/ListPredictions", encoder=Pb.toListPredictionsRequestEncoder, decoder=Pb.predictionsByIdDecoder}
 postStake : (Result Error Pb.UserPredictionView -> msg) -> Pb.StakeRequest -> Cmd msg
 postStake = call {url="/api/Stake", encoder=Pb.toStakeRequestEncoder, decoder=Pb.userPredictionViewDecoder}
 postFollow : (Result Error Pb.UserPredictionView -> msg) -> Pb.FollowRequest -> Cmd msg
@@ -98,6 +149,8 @@ postSendInvitation : (Result Error Pb.GenericUserInfo -> msg) -> Pb.SendInvitati
 postSendInvitation = call {url="/api/SendInvitation", encoder=Pb.toSendInvitationRequestEncoder, decoder=Pb.genericUserInfoDecoder}
 postAcceptInvitation : (Result Error Pb.GenericUserInfo -> msg) -> Pb.AcceptInvitationRequest -> Cmd msg
 postAcceptInvitation = call {url="/api/AcceptInvitation", encoder=Pb.toAcceptInvitationRequestEncoder, decoder=Pb.genericUserInfoDecoder}
+postBatch : (Result Error Pb.BatchResponse -> msg) -> Pb.BatchRequest -> Cmd msg
+postBatch = call {url="/api/Batch", encoder=Pb.toBatchRequestEncoder, decoder=Pb.batchResponseDecoder}
 
 httpErrorToString : Http.Error -> String
 httpErrorToString e =
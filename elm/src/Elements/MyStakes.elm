@@ -20,14 +20,20 @@ import Utils exposing (Username)
 
 port navigate : Maybe String -> Cmd msg
 port authWidgetExternallyChanged : (AuthWidget.DomModification -> msg) -> Sub msg
+port nearBottom : (JD.Value -> msg) -> Sub msg
 
 type alias Model =
   { globals : Globals.Globals
   , navbarAuth : AuthWidget.State
   , filter : Filter
   , order : SortOrder
+  , nextCursor : String
+  , loadingMore : Bool
   }
 
+pageSize : Int
+pageSize = 50
+
 type alias Filter =
   { own : Maybe Bool
   , phase : Maybe LifecyclePhase
@@ -49,6 +55,8 @@ type Msg
   | SetFilterOwn (Maybe Bool)
   | SetFilterPhase (Maybe LifecyclePhase)
   | SetSortOrder SortOrder
+  | LoadMore
+  | LoadMoreFinished Pb.ListMyStakesRequest (Result API.Error Pb.PredictionsById)
   | Ignore
 
 init : JD.Value -> ( Model, Cmd Msg )
@@ -57,6 +65,8 @@ init flags =
     , navbarAuth = AuthWidget.init
     , filter = { own = Nothing , phase = Nothing }
     , order = CreatedDate Desc
+    , nextCursor = Utils.mustDecodeFromFlags JD.string "nextCursor" flags
+    , loadingMore = False
     }
   , Cmd.none
   )
@@ -110,6 +120,15 @@ view model =
                       })
                   |> H.tbody []
                 ]
+            , if model.nextCursor == "" then
+                H.text ""
+              else
+                H.button
+                  [ HA.class "btn btn-outline-primary"
+                  , HA.disabled model.loadingMore
+                  , HE.onClick LoadMore
+                  ]
+                  [ H.text <| if model.loadingMore then "Loading..." else "Load more" ]
             ]
       ]
     ]
@@ -269,11 +288,32 @@ update msg model =
       ( { model | order = order }
       , Cmd.none
       )
+    LoadMore ->
+      if model.nextCursor == "" || model.loadingMore then
+        ( model , Cmd.none )
+      else
+        let req = {limit=pageSize, cursor=model.nextCursor, order=Pb.PredictionOrderCreated, projection=Pb.PredictionProjectionFull} in
+        ( { model | loadingMore = True }
+        , API.postListMyStakes (LoadMoreFinished req) req
+        )
+    LoadMoreFinished req res ->
+      ( { model | globals = model.globals |> Globals.handleListMyStakesResponse req res
+                , loadingMore = False
+                , nextCursor = case res of
+                    Ok predictions -> predictions.nextCursor
+                    Err _ -> model.nextCursor
+        }
+      , Cmd.none
+      )
 
     Ignore ->
       ( model , Cmd.none )
 
 subscriptions : Model -> Sub Msg
-subscriptions _ = authWidgetExternallyChanged AuthWidgetExternallyModified
+subscriptions _ =
+  Sub.batch
+    [ authWidgetExternallyChanged AuthWidgetExternallyModified
+    , nearBottom (\_ -> LoadMore)
+    ]
 
 main = Browser.document {init=init, view=view, update=update, subscriptions=subscriptions}
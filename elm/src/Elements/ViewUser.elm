@@ -21,6 +21,7 @@ import Biatob.Proto.Mvp exposing (Relationship)
 port copy : String -> Cmd msg
 port navigate : Maybe String -> Cmd msg
 port authWidgetExternallyChanged : (AuthWidget.DomModification -> msg) -> Sub msg
+port nearBottom : (JD.Value -> msg) -> Sub msg
 
 type alias Model =
   { globals : Globals.Globals
@@ -30,8 +31,13 @@ type alias Model =
   , setTrustedRequestStatus : RequestStatus
   , predictionFilter : Filter
   , predictionSortOrder : SortOrder
+  , nextCursor : String
+  , loadingMore : Bool
   }
 
+pageSize : Int
+pageSize = 50
+
 
 type alias Filter =
   { phase : Maybe LifecyclePhase
@@ -54,6 +60,8 @@ type Msg
   | SignOutFinished Pb.SignOutRequest (Result API.Error Pb.SignOutResponse)
   | SetPredictionFilterPhase (Maybe LifecyclePhase)
   | SetPredictionSortOrder SortOrder
+  | LoadMore
+  | LoadMoreFinished Pb.ListPredictionsRequest (Result API.Error Pb.PredictionsById)
   | Copy String
   | Tick Time.Posix
   | AuthWidgetExternallyModified AuthWidget.DomModification
@@ -68,6 +76,8 @@ init flags =
     , setTrustedRequestStatus = Unstarted
     , predictionFilter = { phase = Nothing }
     , predictionSortOrder = CreatedDate Desc
+    , nextCursor = Utils.mustDecodeFromFlags JD.string "nextCursor" flags
+    , loadingMore = False
     }
   , Cmd.none
   )
@@ -134,6 +144,23 @@ update msg model =
       ( { model | predictionSortOrder = order }
       , Cmd.none
       )
+    LoadMore ->
+      if model.nextCursor == "" || model.loadingMore then
+        ( model , Cmd.none )
+      else
+        let req = {creator=model.who, limit=pageSize, cursor=model.nextCursor, order=Pb.PredictionOrderCreated, projection=Pb.PredictionProjectionFull} in
+        ( { model | loadingMore = True }
+        , API.postListPredictions (LoadMoreFinished req) req
+        )
+    LoadMoreFinished req res ->
+      ( { model | globals = model.globals |> Globals.handleListPredictionsResponse req res
+                , loadingMore = False
+                , nextCursor = case res of
+                    Ok predictions -> predictions.nextCursor
+                    Err _ -> model.nextCursor
+        }
+      , Cmd.none
+      )
     Copy s ->
       ( model
       , copy s
@@ -360,11 +387,24 @@ view model =
               })
           |> H.tbody []
         ]
+      , if model.nextCursor == "" then
+          H.text ""
+        else
+          H.button
+            [ HA.class "btn btn-outline-primary"
+            , HA.disabled model.loadingMore
+            , HE.onClick LoadMore
+            ]
+            [ H.text <| if model.loadingMore then "Loading..." else "Load more" ]
       ]
     ]
   ]}
 
 subscriptions : Model -> Sub Msg
-subscriptions _ = authWidgetExternallyChanged AuthWidgetExternallyModified
+subscriptions _ =
+  Sub.batch
+    [ authWidgetExternallyChanged AuthWidgetExternallyModified
+    , nearBottom (\_ -> LoadMore)
+    ]
 
 main = Browser.document {init=init, view=view, update=update, subscriptions=subscriptions}
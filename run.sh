@@ -20,5 +20,7 @@ python -m server.main \
   --host=0.0.0.0 \
   --port=8080 \
   --credentials-path='/home/protected/credentials.json' \
+  --production-templates \
+  --template-bytecode-cache-dir='/home/protected/cache/templates' \
   "$@"
 # e.g. --email-daily-backups-to=somebody@example.com
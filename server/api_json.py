@@ -0,0 +1,168 @@
+"""The API's JSON wire format: converting between api_types models and the protobuf messages the servicer speaks.
+
+A JSON request body is validated against its api_types model and then
+converted to the request message, field by field; a response message is
+converted to its model and dumped. The conversion is driven by the message
+descriptors and the models' fields, not by protobuf's own JSON mapping, which
+differs from api_types in two ways:
+  - an unset message field is absent in protobuf's JSON, but is a default
+    object in api_types (unless the model makes it Optional, like
+    ResolutionEvent.prior_revision, in which case it's null);
+  - AuthSuccess carries only the token's owner, not the token.
+Fields that the model lacks (e.g. GenericUserInfo.login_password) are never
+sent.
+"""
+
+import functools
+import struct
+import typing
+from typing import Any, Callable, Dict, Mapping, Optional, Sequence, Tuple, Type, TypeVar
+
+from google.protobuf.descriptor import Descriptor, FieldDescriptor
+from google.protobuf.message import Message
+from pydantic import BaseModel
+
+from . import api_types
+from .protobuf import mvp_pb2
+from .static_assets import accepted_encodings
+
+PROTOBUF_CONTENT_TYPE = 'application/octet-stream'
+JSON_CONTENT_TYPE = 'application/json'
+
+_M = TypeVar('_M', bound=BaseModel)
+_P = TypeVar('_P', bound=Message)
+
+
+def response_content_type(accept: str, request_content_type: str) -> str:
+    """Whichever of JSON and protobuf `accept` prefers; or the request's format, if it has no preference."""
+    accepted = accepted_encodings(accept)  # same q-value syntax as Accept-Encoding
+    default = JSON_CONTENT_TYPE if request_content_type == JSON_CONTENT_TYPE else PROTOBUF_CONTENT_TYPE
+    q = {
+        content_type: accepted.get(content_type, accepted.get('application/*', accepted.get('*/*')))
+        for content_type in (JSON_CONTENT_TYPE, PROTOBUF_CONTENT_TYPE)
+    }
+    q_json, q_protobuf = q[JSON_CONTENT_TYPE], q[PROTOBUF_CONTENT_TYPE]
+    if q_json == q_protobuf:
+        return default
+    return JSON_CONTENT_TYPE if (q_json or 0) > (q_protobuf or 0) else PROTOBUF_CONTENT_TYPE
+
+
+# --- message -> model ------------------------------------------------------------
+
+def _model_in(annotation: Any) -> Optional[Type[BaseModel]]:
+    """The model a field's value is, or holds (as a List, Dict or Optional), if any."""
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+    for arg in reversed(typing.get_args(annotation)):
+        model = _model_in(arg)
+        if model is not None:
+            return model
+    return None
+
+# (field name, its descriptor, the model its values are, whether it may be None)
+_Plan = Sequence[Tuple[str, FieldDescriptor, Optional[Type[BaseModel]], bool]]
+
+@functools.lru_cache(maxsize=None)
+def _plan(model_cls: Type[BaseModel], descriptor: Descriptor) -> _Plan:
+    """Which of the model's fields the message has, and how to convert them; worked out once per pair."""
+    return [
+        (name, descriptor.fields_by_name[name], _model_in(field.annotation), not field.is_required())
+        for name, field in model_cls.model_fields.items()
+        if name in descriptor.fields_by_name
+    ]
+
+def _is_map(fd: FieldDescriptor) -> bool:
+    return fd.message_type is not None and fd.message_type.GetOptions().map_entry
+
+def _is_repeated(fd: FieldDescriptor) -> bool:
+    return fd.label == FieldDescriptor.LABEL_REPEATED  # type: ignore  # the stubs only know newer protobufs' `is_repeated`
+
+def _map_value_field(fd: FieldDescriptor) -> FieldDescriptor:
+    assert fd.message_type is not None
+    return fd.message_type.fields_by_name['value']
+
+def _shortest_float32(value: float) -> float:
+    """The shortest decimal that's the same float32 as `value`: 0.6, not 0.6000000238418579."""
+    for precision in range(6, 10):
+        rounded = float(f'{value:.{precision}g}')
+        if struct.unpack('f', struct.pack('f', rounded))[0] == value:
+            return rounded
+    return value
+
+def _scalar_to_model(fd: FieldDescriptor, value: Any) -> Any:
+    if fd.type == FieldDescriptor.TYPE_ENUM:
+        assert fd.enum_type is not None
+        enum_value = fd.enum_type.values_by_number.get(value)
+        return value if (enum_value is None) else enum_value.name
+    if fd.type == FieldDescriptor.TYPE_FLOAT:
+        return _shortest_float32(value)
+    return value
+
+def to_model(message: Message, model_cls: Type[_M]) -> _M:
+    """The api_types model for `message`, as the JSON wire carries it."""
+    custom = _CUSTOM_TO_MODEL.get(message.DESCRIPTOR.full_name)
+    if custom is not None:
+        return custom(message)  # type: ignore
+    fields: Dict[str, Any] = {}
+    for name, fd, inner_model, optional in _plan(model_cls, message.DESCRIPTOR):
+        value = getattr(message, name)
+        if _is_map(fd):
+            value_fd = _map_value_field(fd)
+            fields[name] = {k: (to_model(v, inner_model) if inner_model else _scalar_to_model(value_fd, v)) for k, v in value.items()}
+        elif _is_repeated(fd):
+            fields[name] = [(to_model(v, inner_model) if inner_model else _scalar_to_model(fd, v)) for v in value]
+        elif inner_model is not None:
+            fields[name] = None if (optional and not message.HasField(name)) else to_model(value, inner_model)
+        else:
+            fields[name] = _scalar_to_model(fd, value)
+    return model_cls(**fields)
+
+_CUSTOM_TO_MODEL: Mapping[str, Callable[[Any], BaseModel]] = {
+    mvp_pb2.AuthSuccess.DESCRIPTOR.full_name: lambda m: api_types.AuthSuccess(
+        owner=m.token.owner,
+        user_info=to_model(m.user_info, api_types.GenericUserInfo),
+    ),
+}
+
+
+# --- model -> message ------------------------------------------------------------
+
+def _scalar_from_model(fd: FieldDescriptor, value: Any) -> Any:
+    if fd.type == FieldDescriptor.TYPE_ENUM:
+        assert fd.enum_type is not None
+        return fd.enum_type.values_by_name[value.value].number
+    return value
+
+def _fill(message: Message, model: BaseModel) -> None:
+    message.SetInParent()
+    for name, fd, inner_model, _ in _plan(type(model), message.DESCRIPTOR):
+        value = getattr(model, name)
+        if value is None:
+            continue
+        if _is_map(fd):
+            target = getattr(message, name)
+            for k, v in value.items():
+                if inner_model is not None:
+                    _fill(target[k], v)
+                else:
+                    target[k] = _scalar_from_model(_map_value_field(fd), v)
+        elif _is_repeated(fd):
+            target = getattr(message, name)
+            for v in value:
+                if inner_model is not None:
+                    _fill(target.add(), v)
+                else:
+                    target.append(_scalar_from_model(fd, v))
+        elif inner_model is not None:
+            _fill(getattr(message, name), value)
+        else:
+            setattr(message, name, _scalar_from_model(fd, value))
+
+def from_model(model: BaseModel, message_cls: Type[_P]) -> _P:
+    """The message for an api_types model, e.g. a JSON request body. Raises ValueError if a value doesn't fit its field (e.g. a negative uint32)."""
+    message = message_cls()
+    try:
+        _fill(message, model)
+    except TypeError as e:
+        raise ValueError(str(e)) from e
+    return message
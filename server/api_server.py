@@ -1,19 +1,28 @@
+import concurrent.futures
 import functools
+import hashlib
+import secrets
 import time
-from typing import AbstractSet, Awaitable, Callable, TypeVar, Type
+from typing import AbstractSet, Any, Awaitable, Callable, Dict, List, Mapping, Optional, Sequence, Tuple, TypeVar, Type, Union
 
 from aiohttp import web
 from google.protobuf.message import Message
+import pydantic
 import structlog
 
-from .core import ApiError, Servicer, TokenMint, Username
+from . import api_json
+from . import api_types
+from .core import ApiError, AuthorizingUsername, InvalidRequestError, PasswordHasher, PrecomputedHashes, PredictionId, PredictionsPage, Servicer, TokenMint, Username, call_in_executor
 from .http_glue import HttpTokenGlue
+from .live_updates import KEEPALIVE_SECONDS, PredictionUpdateHub, format_event
 from .protobuf import mvp_pb2
+from .static_assets import if_none_match_hits
 
 logger = structlog.get_logger()
 
 _Req = TypeVar('_Req', bound=Message)
 _Resp = TypeVar('_Resp', bound=Message)
+_Model = TypeVar('_Model', bound=pydantic.BaseModel)
 
 
 async def parse_proto(http_req: web.Request, pb_req_cls: Type[_Req]) -> _Req:
@@ -23,13 +32,56 @@ async def parse_proto(http_req: web.Request, pb_req_cls: Type[_Req]) -> _Req:
 def proto_response(pb_resp: _Resp) -> web.Response:
     return web.Response(status=200, headers={'Content-Type':'application/octet-stream'}, body=pb_resp.SerializeToString())
 
-def error_response(e: ApiError) -> web.Response:
+def parse_json(model_cls: Type[_Model], body: Union[bytes, Mapping[str, Any]]) -> _Model:
+    """Validates a JSON request body (or, in a batch, one call's) against its api_types model. Raises InvalidRequestError."""
+    try:
+        return model_cls.model_validate_json(body) if isinstance(body, bytes) else model_cls.model_validate(body)
+    except pydantic.ValidationError as e:
+        problems = '; '.join(f"{'.'.join(str(x) for x in err['loc']) or 'body'}: {err['msg']}" for err in e.errors()[:3])
+        raise InvalidRequestError(f'malformed {model_cls.__name__}: {problems}')
+def json_response(model: pydantic.BaseModel, status: int = 200) -> web.Response:
+    return web.Response(status=status, headers={'Content-Type': api_json.JSON_CONTENT_TYPE}, body=model.model_dump_json().encode('utf-8'))
+
+def error_response(e: ApiError, content_type: str = api_json.PROTOBUF_CONTENT_TYPE) -> web.Response:
+    if content_type == api_json.JSON_CONTENT_TYPE:
+        return json_response(api_types.ErrorResponse(catchall=e.catchall), status=e.http_status)
     return web.Response(
         status=e.http_status,
         headers={'Content-Type': 'application/octet-stream'},
         body=mvp_pb2.ErrorResponse(catchall=e.catchall).SerializeToString(),
     )
 
+def response_content_type(http_req: web.Request) -> str:
+    return api_json.response_content_type(http_req.headers.get('Accept', ''), http_req.content_type)
+
+# name -> (request model, response model), for every endpoint in api_types.ENDPOINTS.
+ENDPOINT_MODELS: Mapping[str, Tuple[Type[pydantic.BaseModel], Type[pydantic.BaseModel]]] = {
+    name: (request_model, response_model)
+    for name, request_model, response_model in api_types.ENDPOINTS
+}
+
+# What /api/Batch can run: method name -> request type. That's every endpoint
+# whose handler just calls the servicer method of the same name; the ones that
+# set or clear the auth cookie need a response of their own, and ChangePassword
+# would hash passwords in the middle of the batch's transaction.
+BATCHABLE_METHODS: Mapping[str, Type[Message]] = {
+    'Whoami': mvp_pb2.WhoamiRequest,
+    'SendVerificationEmail': mvp_pb2.SendVerificationEmailRequest,
+    'CreatePrediction': mvp_pb2.CreatePredictionRequest,
+    'GetPrediction': mvp_pb2.GetPredictionRequest,
+    'ListMyStakes': mvp_pb2.ListMyStakesRequest,
+    'ListPredictions': mvp_pb2.ListPredictionsRequest,
+    'Stake': mvp_pb2.StakeRequest,
+    'Follow': mvp_pb2.FollowRequest,
+    'Resolve': mvp_pb2.ResolveRequest,
+    'SetTrusted': mvp_pb2.SetTrustedRequest,
+    'GetUser': mvp_pb2.GetUserRequest,
+    'GetSettings': mvp_pb2.GetSettingsRequest,
+    'SendInvitation': mvp_pb2.SendInvitationRequest,
+    'AcceptInvitation': mvp_pb2.AcceptInvitationRequest,
+}
+MAX_BATCH_CALLS = 32
+
 _Handler = Callable[['ApiServer', web.Request], Awaitable[web.Response]]
 
 def translates_api_errors(handler: _Handler) -> _Handler:
@@ -46,90 +98,233 @@ def translates_api_errors(handler: _Handler) -> _Handler:
             return await handler(self, http_req)
         except ApiError as e:
             logger.info('api error', path=http_req.path, status=e.http_status, catchall=e.catchall)
-            return error_response(e)
+            return error_response(e, response_content_type(http_req))
     return wrapper
 
 
 class ApiServer:
+    """Serves each endpoint in api_types.ENDPOINTS at /api/<name>.
+
+    Every endpoint speaks both protobuf (as the Elm client does) and JSON (as
+    api_types describes it; see api_json). The request's Content-Type says
+    which it's in; the response is in whichever the Accept header prefers, or
+    else the request's. Most endpoints just run the servicer method of the same
+    name, and the tables in __init__ say which need more than that; Batch,
+    whose calls carry bodies of their own, has a handler of its own.
+    """
 
-    def __init__(self, token_glue: HttpTokenGlue, servicer: Servicer) -> None:
+    def __init__(self, token_glue: HttpTokenGlue, servicer: Servicer, executor: Optional[concurrent.futures.Executor] = None, keepalive_seconds: float = KEEPALIVE_SECONDS, password_hasher: Optional[PasswordHasher] = None) -> None:
         self._token_glue = token_glue
         self._servicer = servicer
+        self._executor = executor
+        self._password_hasher = password_hasher
+        self._keepalive_seconds = keepalive_seconds
+        self.prediction_updates = PredictionUpdateHub()
+        # Prediction versions start over when the server restarts; this keeps
+        # an ETag from before a restart from matching one after it.
+        self._etag_epoch = secrets.token_hex(8)
+        # Reads whose responses are determined by `etag_inputs(actor, request)`; see `_call_conditionally`.
+        self._etag_inputs: Mapping[str, Callable[[Optional[AuthorizingUsername], Any], Sequence[Any]]] = {
+            'GetPrediction': lambda actor, req: [self._servicer.GetPredictionVersion(PredictionId(req.prediction_id))],
+            'ListMyStakes': lambda actor, req: self._page_versions(self._servicer.ListMyStakesPage(actor, req)),
+            'ListPredictions': lambda actor, req: self._page_versions(self._servicer.ListPredictionsPage(actor, req)),
+        }
+        # Endpoints that set or clear the auth cookie: name -> f(http_req, pb_resp, http_resp).
+        self._cookie_effects: Mapping[str, Callable[[web.Request, Any, web.Response], object]] = {
+            'SignOut': lambda http_req, pb_resp, http_resp: self._token_glue.del_cookie(http_req, http_resp),
+            'RegisterUsername': lambda http_req, pb_resp, http_resp: self._token_glue.set_cookie_for_owner(Username(pb_resp.token.owner), http_resp),
+            'LogInUsername': lambda http_req, pb_resp, http_resp: self._token_glue.set_cookie_for_owner(Username(pb_resp.token.owner), http_resp),
+        }
+        # Endpoints that scrypt passwords, and which: name -> f(actor, request) ->
+        # ([(password, user whose stored salt it's checked with)], [new passwords]).
+        # See `_precompute_hashes`.
+        self._password_inputs: Mapping[str, Callable[[Optional[AuthorizingUsername], Any], Tuple[Sequence[Tuple[str, Username]], Sequence[str]]]] = {
+            'RegisterUsername': lambda actor, req: ([], [req.password] if (actor is None) else []),
+            'LogInUsername': lambda actor, req: ([(req.password, Username(req.username))] if (actor is None) else [], []),
+            'ChangePassword': lambda actor, req: ([(req.old_password, actor)], [req.new_password]) if (actor is not None) else ([], []),
+        }
 
-    @translates_api_errors
-    async def Whoami(self, http_req: web.Request) -> web.Response:
-        return proto_response(self._servicer.Whoami(actor=self._token_glue.get_authorizing_user(http_req), request=await parse_proto(http_req, mvp_pb2.WhoamiRequest)))
-    @translates_api_errors
-    async def SignOut(self, http_req: web.Request) -> web.Response:
-        http_resp = proto_response(self._servicer.SignOut(actor=self._token_glue.get_authorizing_user(http_req), request=await parse_proto(http_req, mvp_pb2.SignOutRequest)))
-        self._token_glue.del_cookie(http_req, http_resp)
-        return http_resp
-    @translates_api_errors
-    async def SendVerificationEmail(self, http_req: web.Request) -> web.Response:
-        return proto_response(self._servicer.SendVerificationEmail(actor=self._token_glue.get_authorizing_user(http_req), request=await parse_proto(http_req, mvp_pb2.SendVerificationEmailRequest)))
-    @translates_api_errors
-    async def RegisterUsername(self, http_req: web.Request) -> web.Response:
-        auth_success = self._servicer.RegisterUsername(actor=self._token_glue.get_authorizing_user(http_req), request=await parse_proto(http_req, mvp_pb2.RegisterUsernameRequest))
-        http_resp = proto_response(auth_success)
-        self._token_glue.set_cookie_for_owner(Username(auth_success.token.owner), http_resp)
-        return http_resp
-    @translates_api_errors
-    async def LogInUsername(self, http_req: web.Request) -> web.Response:
-        auth_success = self._servicer.LogInUsername(actor=self._token_glue.get_authorizing_user(http_req), request=await parse_proto(http_req, mvp_pb2.LogInUsernameRequest))
-        http_resp = proto_response(auth_success)
-        self._token_glue.set_cookie_for_owner(Username(auth_success.token.owner), http_resp)
+    async def _parse(self, http_req: web.Request, pb_req_cls: Type[_Req], request_model: Type[pydantic.BaseModel]) -> _Req:
+        """Reads the request body, in whichever format its Content-Type says."""
+        if http_req.content_type != api_json.JSON_CONTENT_TYPE:
+            return await parse_proto(http_req, pb_req_cls)
+        return self._from_json(parse_json(request_model, await http_req.read()), pb_req_cls)
+
+    @staticmethod
+    def _from_json(model: pydantic.BaseModel, pb_req_cls: Type[_Req]) -> _Req:
+        try:
+            return api_json.from_model(model, pb_req_cls)
+        except ValueError as e:
+            raise InvalidRequestError(f'malformed {type(model).__name__}: {e}')
+
+    @staticmethod
+    def _encode(pb_resp: Message, response_model: Type[pydantic.BaseModel], content_type: str) -> web.Response:
+        if content_type == api_json.JSON_CONTENT_TYPE:
+            return json_response(api_json.to_model(pb_resp, response_model))
+        return proto_response(pb_resp)
+
+    async def _call_conditionally(self, http_req: web.Request, method: Callable[[Optional[AuthorizingUsername], _Req], _Resp], actor: Optional[AuthorizingUsername], request: _Req, etag_inputs: Callable[[Optional[AuthorizingUsername], _Req], Sequence[Any]], response_model: Type[pydantic.BaseModel], content_type: str) -> web.Response:
+        """Runs a read whose response is determined by `etag_inputs(actor, request)`.
+
+        The response carries an ETag derived from those inputs; if the client
+        already has that ETag, it gets a bodiless 304 and `method` isn't run.
+        The inputs are computed before `method` runs, so the body is never
+        older than the ETag it's sent with.
+        """
+        inputs = await call_in_executor(self._executor, etag_inputs, actor, request)
+        etag = hashlib.sha256(repr((self._etag_epoch, http_req.path, content_type, actor, request.SerializeToString(), inputs)).encode('utf-8')).hexdigest()[:32]
+        headers = {'ETag': f'"{etag}"'}
+        if_none_match = http_req.headers.get('If-None-Match')
+        if if_none_match is not None and if_none_match_hits(if_none_match, etag):
+            return web.Response(status=304, headers=headers)
+        http_resp = self._encode(await call_in_executor(self._executor, method, actor, request), response_model, content_type)
+        http_resp.headers.update(headers)
         return http_resp
+
+    def _page_versions(self, page: PredictionsPage) -> Sequence[Any]:
+        return [*((pid, self._servicer.GetPredictionVersion(pid)) for pid in page.prediction_ids), page.next_cursor]
+
+    async def _precompute_hashes(self, name: str, actor: Optional[AuthorizingUsername], request: Any) -> PrecomputedHashes:
+        """The password hashes the servicer method `name` will need for `request`, worked out while no servicer thread waits.
+
+        Otherwise, a burst of logins would tie up every servicer thread waiting
+        on scrypt. The servicer still checks everything itself: a hash worked
+        out here that it doesn't need (e.g. for a request it rejects) is just
+        wasted.
+        """
+        password_inputs = self._password_inputs.get(name)
+        if self._password_hasher is None or password_inputs is None:
+            return PrecomputedHashes({}, {})
+        checks, new_passwords = password_inputs(actor, request)
+        salts = await call_in_executor(self._executor, lambda: [self._servicer.GetPasswordSalt(username) for _, username in checks])
+        return await self._password_hasher.precompute(
+            checks=[(password, salt) for (password, _), salt in zip(checks, salts) if salt is not None],
+            new_passwords=new_passwords,
+        )
+
+    def _endpoint(self, name: str) -> Callable[[web.Request], Awaitable[web.Response]]:
+        """The handler for /api/<name>: parses the request, runs the servicer method `name` on it, and encodes the response."""
+        request_model, response_model = ENDPOINT_MODELS[name]
+        pb_req_cls: Type[Message] = getattr(mvp_pb2, f'{name}Request')
+        etag_inputs = self._etag_inputs.get(name)
+        cookie_effect = self._cookie_effects.get(name)
+
+        @translates_api_errors
+        async def handler(self: 'ApiServer', http_req: web.Request) -> web.Response:
+            actor = self._token_glue.get_authorizing_user(http_req)
+            request = await self._parse(http_req, pb_req_cls, request_model)
+            content_type = response_content_type(http_req)
+            method = getattr(self._servicer, name)
+            if etag_inputs is not None:
+                return await self._call_conditionally(http_req, method, actor, request, etag_inputs, response_model, content_type)
+            with PasswordHasher.using(await self._precompute_hashes(name, actor, request)):
+                pb_resp = await call_in_executor(self._executor, method, actor, request)
+            http_resp = self._encode(pb_resp, response_model, content_type)
+            if cookie_effect is not None:
+                cookie_effect(http_req, pb_resp, http_resp)
+            return http_resp
+        return functools.partial(handler, self)
+
+    def _publish_prediction_update(self, prediction_id: PredictionId) -> None:
+        """Sends the prediction's watchers its new state, if it has any watchers.
+
+        Runs on the thread that committed the change (see
+        Servicer.WatchPredictions), so that's one query per change, however
+        many are watching. The version is read first, so the update is at least
+        as new as it says; the hub drops it if a newer one got there first.
+        """
+        if not self.prediction_updates.watched(prediction_id):
+            return
+        version = self._servicer.GetPredictionVersion(prediction_id)
+        try:
+            update = self._servicer.GetPredictionUpdate(prediction_id)
+        except Exception:
+            logger.exception('failed to get update for watched prediction', prediction_id=prediction_id)
+            return
+        self.prediction_updates.publish(prediction_id, version, update)
+
     @translates_api_errors
-    async def CreatePrediction(self, http_req: web.Request) -> web.Response:
-        return proto_response(self._servicer.CreatePrediction(actor=self._token_glue.get_authorizing_user(http_req), request=await parse_proto(http_req, mvp_pb2.CreatePredictionRequest)))
-    @translates_api_errors
-    async def GetPrediction(self, http_req: web.Request) -> web.Response:
-        return proto_response(self._servicer.GetPrediction(actor=self._token_glue.get_authorizing_user(http_req), request=await parse_proto(http_req, mvp_pb2.GetPredictionRequest)))
-    @translates_api_errors
-    async def Stake(self, http_req: web.Request) -> web.Response:
-        return proto_response(self._servicer.Stake(actor=self._token_glue.get_authorizing_user(http_req), request=await parse_proto(http_req, mvp_pb2.StakeRequest)))
-    @translates_api_errors
-    async def Follow(self, http_req: web.Request) -> web.Response:
-        return proto_response(self._servicer.Follow(actor=self._token_glue.get_authorizing_user(http_req), request=await parse_proto(http_req, mvp_pb2.FollowRequest)))
-    @translates_api_errors
-    async def Resolve(self, http_req: web.Request) -> web.Response:
-        return proto_response(self._servicer.Resolve(actor=self._token_glue.get_authorizing_user(http_req), request=await parse_proto(http_req, mvp_pb2.ResolveRequest)))
-    @translates_api_errors
-    async def SetTrusted(self, http_req: web.Request) -> web.Response:
-        return proto_response(self._servicer.SetTrusted(actor=self._token_glue.get_authorizing_user(http_req), request=await parse_proto(http_req, mvp_pb2.SetTrustedRequest)))
-    @translates_api_errors
-    async def GetUser(self, http_req: web.Request) -> web.Response:
-        return proto_response(self._servicer.GetUser(actor=self._token_glue.get_authorizing_user(http_req), request=await parse_proto(http_req, mvp_pb2.GetUserRequest)))
-    @translates_api_errors
-    async def ChangePassword(self, http_req: web.Request) -> web.Response:
-        return proto_response(self._servicer.ChangePassword(actor=self._token_glue.get_authorizing_user(http_req), request=await parse_proto(http_req, mvp_pb2.ChangePasswordRequest)))
-    @translates_api_errors
-    async def GetSettings(self, http_req: web.Request) -> web.Response:
-        return proto_response(self._servicer.GetSettings(actor=self._token_glue.get_authorizing_user(http_req), request=await parse_proto(http_req, mvp_pb2.GetSettingsRequest)))
-    @translates_api_errors
-    async def SendInvitation(self, http_req: web.Request) -> web.Response:
-        return proto_response(self._servicer.SendInvitation(actor=self._token_glue.get_authorizing_user(http_req), request=await parse_proto(http_req, mvp_pb2.SendInvitationRequest)))
-    @translates_api_errors
-    async def AcceptInvitation(self, http_req: web.Request) -> web.Response:
-        return proto_response(self._servicer.AcceptInvitation(actor=self._token_glue.get_authorizing_user(http_req), request=await parse_proto(http_req, mvp_pb2.AcceptInvitationRequest)))
+    async def Batch(self, http_req: web.Request) -> web.Response:
+        actor = self._token_glue.get_authorizing_user(http_req)
+        as_json = (http_req.content_type == api_json.JSON_CONTENT_TYPE)
+        content_type = response_content_type(http_req)
+        call_bodies: List[Tuple[str, Union[bytes, Mapping[str, Any]]]]
+        if as_json:
+            call_bodies = [(call.method, call.request) for call in parse_json(api_types.BatchRequest, await http_req.read()).calls]
+        else:
+            call_bodies = [(call.method, call.request) for call in (await parse_proto(http_req, mvp_pb2.BatchRequest)).calls]
+        if len(call_bodies) > MAX_BATCH_CALLS:
+            raise InvalidRequestError(f'a batch can hold at most {MAX_BATCH_CALLS} calls')
+        calls = []
+        for method, body in call_bodies:
+            pb_req_cls = BATCHABLE_METHODS.get(method)
+            if pb_req_cls is None:
+                raise InvalidRequestError(f'cannot batch {method!r}')
+            if isinstance(body, bytes):
+                pb_req = pb_req_cls()
+                pb_req.ParseFromString(body)
+            else:
+                pb_req = self._from_json(parse_json(ENDPOINT_MODELS[method][0], body), pb_req_cls)
+            calls.append(functools.partial(getattr(self._servicer, method), actor, pb_req))
+        results = await call_in_executor(self._executor, self._servicer.RunBatch, actor, calls)
+        if content_type == api_json.JSON_CONTENT_TYPE:
+            return json_response(api_types.BatchResponse(results=[
+                api_types.BatchResult(http_status=result.http_status, error=api_types.ErrorResponse(catchall=result.catchall))
+                if isinstance(result, ApiError) else
+                api_types.BatchResult(http_status=200, ok=api_json.to_model(result, ENDPOINT_MODELS[method][1]).model_dump(mode='json'))
+                for (method, _), result in zip(call_bodies, results)
+            ]))
+        return proto_response(mvp_pb2.BatchResponse(results=[
+            mvp_pb2.BatchResponse.Result(http_status=result.http_status, error=mvp_pb2.ErrorResponse(catchall=result.catchall))
+            if isinstance(result, ApiError) else
+            mvp_pb2.BatchResponse.Result(http_status=200, ok=result.SerializeToString())
+            for result in results
+        ]))
+
+    async def StreamPrediction(self, http_req: web.Request) -> web.StreamResponse:
+        """Server-sent events: the prediction's PredictionUpdate now, and again each time it changes.
+
+        Anyone who could GetPrediction it can watch it. Not wrapped in
+        translates_api_errors, since the response is a stream; an error can
+        only happen before the stream starts, and is handled the same way.
+        """
+        prediction_id = PredictionId(http_req.match_info['prediction_id'])
+        # Subscribe before reading the current state, so that a change committing
+        # in between lands in the subscription rather than being missed.
+        with self.prediction_updates.subscribe(prediction_id) as subscription:
+            try:
+                update: Optional[mvp_pb2.PredictionUpdate] = await call_in_executor(self._executor, self._servicer.GetPredictionUpdate, prediction_id)
+            except ApiError as e:
+                logger.info('api error', path=http_req.path, status=e.http_status, catchall=e.catchall)
+                return error_response(e, response_content_type(http_req))
+            http_resp = web.StreamResponse(headers={
+                'Content-Type': 'text/event-stream',
+                'Cache-Control': 'no-cache',
+                'X-Accel-Buffering': 'no',  # so nginx passes events on as they come
+            })
+            await http_resp.prepare(http_req)
+            last_sent = None
+            while not subscription.closed:
+                if update is None:
+                    await http_resp.write(b': keepalive\n\n')
+                elif update != last_sent:
+                    await http_resp.write(format_event(update))
+                    last_sent = update
+                update = await subscription.next(timeout=self._keepalive_seconds)
+            return http_resp
+
+    async def _start_watching_predictions(self, app: web.Application) -> None:
+        self._servicer.WatchPredictions(self._publish_prediction_update)
+
+    async def _end_prediction_streams(self, app: web.Application) -> None:
+        self.prediction_updates.close()
 
     def add_to_app(self, app: web.Application) -> None:
-        app.router.add_post('/api/Whoami', self.Whoami)
-        app.router.add_post('/api/SignOut', self.SignOut)
-        app.router.add_post('/api/SendVerificationEmail', self.SendVerificationEmail)
-        app.router.add_post('/api/RegisterUsername', self.RegisterUsername)
-        app.router.add_post('/api/LogInUsername', self.LogInUsername)
-        app.router.add_post('/api/CreatePrediction', self.CreatePrediction)
-        app.router.add_post('/api/GetPrediction', self.GetPrediction)
-        app.router.add_post('/api/Stake', self.Stake)
-        app.router.add_post('/api/Follow', self.Follow)
-        app.router.add_post('/api/Resolve', self.Resolve)
-        app.router.add_post('/api/SetTrusted', self.SetTrusted)
-        app.router.add_post('/api/GetUser', self.GetUser)
-        app.router.add_post('/api/ChangePassword', self.ChangePassword)
-        app.router.add_post('/api/GetSettings', self.GetSettings)
-        app.router.add_post('/api/SendInvitation', self.SendInvitation)
-        app.router.add_post('/api/AcceptInvitation', self.AcceptInvitation)
+        for name in ENDPOINT_MODELS:
+            app.router.add_post(f'/api/{name}', self.Batch if (name == 'Batch') else self._endpoint(name))
+        app.router.add_get('/api/stream/prediction/{prediction_id}', self.StreamPrediction)
+        app.on_startup.append(self._start_watching_predictions)
+        app.on_shutdown.append(self._end_prediction_streams)
         self._token_glue.add_to_app(app)
 
 
@@ -13,7 +13,7 @@ Design notes (from the spike, biatob PR #34):
 """
 
 import enum
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple, Type
 
 from pydantic import BaseModel, ConfigDict
 from pydantic.alias_generators import to_camel
@@ -54,6 +54,19 @@ class PredictionFollowingStatus(str, enum.Enum):
     MANDATORY_BECAUSE_STAKED = "PREDICTION_FOLLOWING_MANDATORY_BECAUSE_STAKED"
 
 
+class PredictionOrder(str, enum.Enum):
+    CREATED = "PREDICTION_ORDER_CREATED"
+    CLOSES = "PREDICTION_ORDER_CLOSES"
+    RESOLVES = "PREDICTION_ORDER_RESOLVES"
+    CLOSES_SOONEST = "PREDICTION_ORDER_CLOSES_SOONEST"
+    RESOLVES_SOONEST = "PREDICTION_ORDER_RESOLVES_SOONEST"
+
+
+class PredictionProjection(str, enum.Enum):
+    FULL = "PREDICTION_PROJECTION_FULL"
+    SUMMARY = "PREDICTION_PROJECTION_SUMMARY"
+
+
 # --- domain types ------------------------------------------------------------
 
 class CertaintyRange(_Base):
@@ -112,8 +125,31 @@ class UserPredictionView(_Base):
     your_following_status: PredictionFollowingStatus
 
 
+class PredictionSummary(_Base):
+    prediction: str
+    certainty: CertaintyRange
+    maximum_stake_cents: int
+    remaining_stake_cents_vs_believers: int
+    remaining_stake_cents_vs_skeptics: int
+    created_unixtime: float
+    closes_unixtime: float
+    resolves_at_unixtime: float
+    creator: str
+    resolution: Resolution
+
+
+class PredictionUpdate(_Base):
+    # Not an endpoint's body: the data of each event /api/stream/prediction/{id} sends.
+    remaining_stake_cents_vs_believers: int
+    remaining_stake_cents_vs_skeptics: int
+    resolution: Resolution
+    num_active_trades: int
+
+
 class PredictionsById(_Base):
     predictions: Dict[str, UserPredictionView]
+    summaries: Dict[str, PredictionSummary]
+    next_cursor: str
 
 
 class AuthSuccess(_Base):
@@ -146,6 +182,18 @@ class ErrorResponse(_Base):
     catchall: str
 
 
+class BatchResult(_Base):
+    # The protobuf carries each response as serialized bytes; here it's the
+    # endpoint's own JSON body. Exactly one of `ok` and `error` is set.
+    http_status: int
+    ok: Optional[Dict[str, Any]] = None
+    error: Optional[ErrorResponse] = None
+
+
+class BatchResponse(_Base):
+    results: List[BatchResult]
+
+
 # --- request bodies ----------------------------------------------------------
 
 class WhoamiRequest(_Base):
@@ -186,11 +234,18 @@ class GetPredictionRequest(_Base):
 
 
 class ListMyStakesRequest(_Base):
-    pass
+    limit: int
+    cursor: str
+    order: PredictionOrder
+    projection: PredictionProjection
 
 
 class ListPredictionsRequest(_Base):
     creator: str
+    limit: int
+    cursor: str
+    order: PredictionOrder
+    projection: PredictionProjection
 
 
 class FollowRequest(_Base):
@@ -240,6 +295,16 @@ class AcceptInvitationRequest(_Base):
     nonce: str
 
 
+class BatchCall(_Base):
+    # `method` is an endpoint name (see ENDPOINTS); `request` is its JSON body.
+    method: str
+    request: Dict[str, Any]
+
+
+class BatchRequest(_Base):
+    calls: List[BatchCall]
+
+
 # --- the endpoint contract ---------------------------------------------------
 #
 # (operation name, request body, response body). The canonical list of API
@@ -248,7 +313,7 @@ class AcceptInvitationRequest(_Base):
 # the OpenAPI schema. Every response body is the success payload -- failures are
 # an HTTP status + ErrorResponse (docs/error-handling.md).
 
-ENDPOINTS = [
+ENDPOINTS: List[Tuple[str, Type[BaseModel], Type[BaseModel]]] = [
     ("Whoami", WhoamiRequest, WhoamiResponse),
     ("SignOut", SignOutRequest, Empty),
     ("SendVerificationEmail", SendVerificationEmailRequest, Empty),
@@ -268,6 +333,7 @@ ENDPOINTS = [
     ("SendInvitation", SendInvitationRequest, GenericUserInfo),
     ("CheckInvitation", CheckInvitationRequest, CheckInvitationResponse),
     ("AcceptInvitation", AcceptInvitationRequest, GenericUserInfo),
+    ("Batch", BatchRequest, BatchResponse),
 ]
 
 
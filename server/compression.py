@@ -0,0 +1,98 @@
+import asyncio
+import concurrent.futures
+import gzip
+import threading
+from typing import Any, Dict, Mapping, Optional
+
+from aiohttp import web
+import structlog
+
+from .static_assets import accepted_encodings
+
+logger = structlog.get_logger()
+
+# application/octet-stream is here for the API's protobuf bodies, which are mostly strings.
+COMPRESSIBLE_CONTENT_TYPES = {'text/html', 'text/css', 'text/javascript', 'text/plain', 'application/json', 'image/svg+xml', 'application/octet-stream'}
+
+
+class _RouteStats:
+    def __init__(self) -> None:
+        self.responses = 0
+        self.compressed = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+
+class CompressionMiddleware:
+    """Gzips responses that are big enough to be worth it, for clients that accept gzip.
+
+    Leaves alone anything that's already encoded (e.g. static assets, which
+    are precompressed), streamed, or not of a compressible type. Bodies of at
+    least `executor_min_bytes` are compressed in `executor` (the loop's
+    default executor, if None) so as not to stall the event loop.
+    """
+    def __init__(self, min_bytes: int = 1024, level: int = 6, executor_min_bytes: int = 64 * 1024, executor: Optional[concurrent.futures.Executor] = None) -> None:
+        self.min_bytes = min_bytes
+        self.level = level
+        self.executor_min_bytes = executor_min_bytes
+        self._executor = executor
+        self._stats: Dict[str, _RouteStats] = {}
+        self._stats_lock = threading.Lock()
+
+    def add_to_app(self, app: web.Application) -> None:
+        # Goes first, i.e. outermost, so it sees the responses other middlewares make too.
+        if self.middleware not in app.middlewares:
+            app.middlewares.insert(0, self.middleware)
+
+    @web.middleware
+    async def middleware(self, request: web.Request, handler):
+        response = await handler(request)
+        if not isinstance(response, web.Response) or not isinstance(response.body, bytes):
+            return response
+        body = response.body
+        if response.content_type not in COMPRESSIBLE_CONTENT_TYPES or 'Content-Encoding' in response.headers:
+            return response
+        response.headers.add('Vary', 'Accept-Encoding')
+
+        accepted = accepted_encodings(request.headers.get('Accept-Encoding', ''))
+        if len(body) < self.min_bytes or accepted.get('gzip', accepted.get('*', 0)) <= 0:
+            self._record(request, len(body), len(body), compressed=False)
+            return response
+
+        if len(body) >= self.executor_min_bytes:
+            compressed = await asyncio.get_running_loop().run_in_executor(self._executor, gzip.compress, body, self.level)
+        else:
+            compressed = gzip.compress(body, self.level)
+        self._record(request, len(body), len(compressed), compressed=True)
+        response.body = compressed
+        response.headers['Content-Encoding'] = 'gzip'
+        etag = response.headers.get('ETag')
+        if etag is not None and not etag.startswith('W/'):
+            # Strong ETags must differ between representations; if_none_match_hits accepts either.
+            response.headers['ETag'] = etag[:-1] + '-gzip"'
+        return response
+
+    def _record(self, request: web.Request, bytes_in: int, bytes_out: int, compressed: bool) -> None:
+        route = request.match_info.route.resource
+        key = route.canonical if route is not None else request.path
+        with self._stats_lock:
+            stats = self._stats.setdefault(key, _RouteStats())
+            stats.responses += 1
+            stats.compressed += compressed
+            stats.bytes_in += bytes_in
+            stats.bytes_out += bytes_out
+
+    def stats(self) -> Mapping[str, Mapping[str, Any]]:
+        """Per-route counts of responses, how many were compressed, and bytes saved, biggest savings first."""
+        with self._stats_lock:
+            rows = {
+                route: {
+                    'responses': s.responses,
+                    'compressed': s.compressed,
+                    'bytes_in': s.bytes_in,
+                    'bytes_out': s.bytes_out,
+                    'bytes_saved': s.bytes_in - s.bytes_out,
+                }
+                for route, s in self._stats.items()
+            }
+        return dict(sorted(rows.items(), key=lambda kv: -kv[1]['bytes_saved']))
@@ -21,6 +21,11 @@ class SmtpCredentials(BaseModel):
 class SqliteDatabase(BaseModel):
     kind: Literal["sqlite"] = "sqlite"
     path: str
+    # "default": one connection per transaction, rollback journal.
+    # "performance": WAL, tuned pragmas, a pool of read-only connections for
+    # read-only transactions and a single dedicated writer; see
+    # sql_schema.create_engine.
+    profile: Literal["default", "performance"] = "default"
 
 
 class MysqlDatabase(BaseModel):
@@ -1,10 +1,16 @@
 import abc
+import asyncio
+import concurrent.futures
+import contextlib
+import contextvars
+import dataclasses
 import datetime
+import functools
 import hashlib
 import random
 import re
 import secrets
-from typing import overload, Optional, Container, NewType, Callable
+from typing import overload, Any, Awaitable, Optional, Container, Generic, Iterable, Iterator, Mapping, NamedTuple, NewType, Callable, Sequence, Tuple, TypeVar, Union
 
 from aiohttp import web
 
@@ -135,11 +141,75 @@ def secret_eq(a: bytes, b: bytes) -> bool:
     return len(a) == len(b) and all(a[i]==b[i] for i in range(len(a)))
 def scrypt(password: str, salt: bytes) -> bytes:
     return hashlib.scrypt(password.encode('utf8'), salt=salt, n=16384, r=8, p=1)
-def new_hashed_password(password: str) -> mvp_pb2.HashedPassword:
-    salt = secrets.token_bytes(4)
-    return mvp_pb2.HashedPassword(salt=salt, scrypt=scrypt(password, salt))
-def check_password(password: str, hashed: mvp_pb2.HashedPassword) -> bool:
-    return secret_eq(hashed.scrypt, scrypt(password, hashed.salt))
+
+
+class PrecomputedHashes(NamedTuple):
+    """Hashes worked out ahead of a servicer call; see PasswordHasher.precompute."""
+    scrypts: Mapping[Tuple[str, bytes], bytes]  # (password, salt) -> scrypt
+    fresh_salts: Mapping[str, bytes]  # password -> the salt new_hashed_password should use for it
+
+_PRECOMPUTED_HASHES: contextvars.ContextVar[PrecomputedHashes] = contextvars.ContextVar('_PRECOMPUTED_HASHES', default=PrecomputedHashes({}, {}))
+
+
+class PasswordHasher:
+    """Computes scrypt hashes, in `executor` if given, else inline.
+
+    scrypt is deliberately slow (tens of ms of CPU). Handing it to a process
+    pool keeps a burst of logins from starving every other request of the GIL.
+    A servicer thread that calls new_hashed_password or check_password still
+    waits for the result, though; so transports work the hashes out first, on
+    the event loop (`precompute`), and make the servicer call `using` them.
+    """
+
+    def __init__(self, executor: Optional[concurrent.futures.Executor] = None) -> None:
+        self._executor = executor
+
+    @staticmethod
+    def process_pool(max_workers: Optional[int] = None) -> 'PasswordHasher':
+        """A hasher backed by a process pool with one worker per core (by default)."""
+        return PasswordHasher(concurrent.futures.ProcessPoolExecutor(max_workers=max_workers))
+
+    def _scrypt(self, password: str, salt: bytes) -> bytes:
+        precomputed = _PRECOMPUTED_HASHES.get().scrypts.get((password, salt))
+        if precomputed is not None:
+            return precomputed
+        if self._executor is None:
+            return scrypt(password, salt)
+        return self._executor.submit(scrypt, password, salt).result()
+
+    def new_hashed_password(self, password: str) -> mvp_pb2.HashedPassword:
+        salt = _PRECOMPUTED_HASHES.get().fresh_salts.get(password)
+        if salt is None:
+            salt = secrets.token_bytes(4)
+        return mvp_pb2.HashedPassword(salt=salt, scrypt=self._scrypt(password, salt))
+
+    def check_password(self, password: str, hashed: mvp_pb2.HashedPassword) -> bool:
+        return secret_eq(hashed.scrypt, self._scrypt(password, hashed.salt))
+
+    async def precompute(self, checks: Iterable[Tuple[str, bytes]] = (), new_passwords: Iterable[str] = ()) -> PrecomputedHashes:
+        """Hashes each (password, salt) of `checks`, and each of `new_passwords` with a fresh salt, without blocking the event loop.
+
+        (Inline hashers use the loop's default executor for this.)
+        """
+        loop = asyncio.get_running_loop()
+        fresh_salts = {password: secrets.token_bytes(4) for password in new_passwords}
+        pairs = list(checks) + list(fresh_salts.items())
+        scrypts = await asyncio.gather(*[loop.run_in_executor(self._executor, scrypt, password, salt) for password, salt in pairs])
+        return PrecomputedHashes(scrypts=dict(zip(pairs, scrypts)), fresh_salts=fresh_salts)
+
+    @staticmethod
+    @contextlib.contextmanager
+    def using(hashes: PrecomputedHashes) -> Iterator[None]:
+        """Within this block (and in contexts copied from it, e.g. by call_in_executor), hashers look up `hashes` before computing anything."""
+        token = _PRECOMPUTED_HASHES.set(hashes)
+        try:
+            yield
+        finally:
+            _PRECOMPUTED_HASHES.reset(token)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
 
 def weak_rand_not_in(rng: random.Random, limit: int, xs: Container[int]) -> int:
     result = rng.randrange(0, limit)
@@ -235,6 +305,20 @@ def describe_AcceptInvitationRequest_problems(request: mvp_pb2.AcceptInvitationR
     return '; '.join(problems) if problems else None
 
 
+_T = TypeVar('_T')
+
+@dataclasses.dataclass(frozen=True)
+class PageContext(Generic[_T]):
+    """Everything a server-rendered page needs: the viewer's settings (None if logged out) and the page's own data."""
+    user_info: Optional[mvp_pb2.GenericUserInfo]
+    payload: _T
+
+@dataclasses.dataclass(frozen=True)
+class PredictionsPage:
+    """Which predictions a page of a listing holds (but not their views), and the cursor for the next page."""
+    prediction_ids: Sequence[PredictionId]
+    next_cursor: str
+
 class Servicer(abc.ABC):
     def Whoami(self, actor: Optional[AuthorizingUsername], request: mvp_pb2.WhoamiRequest) -> mvp_pb2.WhoamiResponse: pass
     def SignOut(self, actor: Optional[AuthorizingUsername], request: mvp_pb2.SignOutRequest) -> mvp_pb2.SignOutResponse: pass
@@ -273,6 +357,89 @@ class Servicer(abc.ABC):
     def AcceptInvitation(self, actor: Optional[AuthorizingUsername], request: mvp_pb2.AcceptInvitationRequest) -> mvp_pb2.GenericUserInfo:
         """Raises NoSuchInvitationError."""
 
+    def GetPageContext(self, actor: Optional[AuthorizingUsername], load_payload: Callable[[], _T], relationships_with: Callable[[_T], Iterable[str]] = lambda _: ()) -> PageContext[_T]:
+        """Runs `load_payload` (typically another servicer call) and then GetSettings, in one transaction.
+
+        Not an RPC: it's for WebServer, which would otherwise pay for two
+        transactions per page. The transaction is read-only, so `load_payload`
+        mustn't write. `relationships_with(payload)` names the users
+        whose relationship with the actor the settings should include. Raises
+        whatever `load_payload` raises; a failure to get the settings is
+        logged, and yields `user_info=None`.
+        """
+    def RunBatch(self, actor: Optional[AuthorizingUsername], calls: Sequence[Callable[[], _T]]) -> Sequence[Union[_T, ApiError]]:
+        """Runs each of `calls` (typically other servicer calls, as `actor`), in order, in one transaction.
+
+        Not an RPC: it's for transports' batch endpoints. A call that raises an
+        ApiError gets that error as its result, and the calls after it still
+        run; each call runs in a savepoint, so the failed call leaves nothing
+        behind. Any other exception aborts the whole batch. Emails go out only
+        once the batch commits.
+        """
+    def ListMyStakesPage(self, actor: Optional[AuthorizingUsername], request: mvp_pb2.ListMyStakesRequest) -> PredictionsPage:
+        """Which predictions ListMyStakes would return, without building their views.
+
+        Not an RPC: together with GetPredictionVersion, it tells transports
+        whether a client's copy of a listing is still current.
+        """
+    def ListPredictionsPage(self, actor: Optional[AuthorizingUsername], request: mvp_pb2.ListPredictionsRequest) -> PredictionsPage:
+        """Which predictions ListPredictions would return, without building their views; see ListMyStakesPage."""
+    def GetPredictionVersion(self, prediction_id: PredictionId) -> int:
+        """A number that changes whenever a Stake, Resolve or Follow (etc.) changes the prediction.
+
+        Not an RPC, and needs no database access: it's for caching things derived
+        from a prediction. Not meaningful across server restarts.
+        """
+    def GetPredictionUpdate(self, prediction_id: PredictionId) -> mvp_pb2.PredictionUpdate:
+        """The prediction's remaining stakes, resolution and number of active trades. Raises NoSuchPredictionError.
+
+        Not an RPC: it's what transports push to a prediction's watchers. It
+        doesn't depend on who's asking, so one call serves them all.
+        """
+    def WatchPredictions(self, callback: Callable[[PredictionId], None]) -> None:
+        """Arranges for `callback(prediction_id)` to be called whenever a change to a prediction commits.
+
+        Called on whichever thread committed the change, after the change
+        bumps GetPredictionVersion, and before the servicer method that made
+        it returns: so whatever `callback` does delays that method's
+        response, and it mustn't raise.
+        """
+    def GetPasswordSalt(self, username: Username) -> Optional[bytes]:
+        """The salt the user's login password is hashed with; None if there's no such user, or they have no password.
+
+        Not an RPC: it lets transports hash the password a LogInUsername or
+        ChangePassword will check (see PasswordHasher.precompute) before the
+        call, rather than have a servicer thread wait for it.
+        """
+
+
+# --- running servicers off the event loop ------------------------------------
+#
+# Servicer methods are synchronous and block on the database. The transports
+# hand them to a thread pool via call_in_executor, so one slow query doesn't
+# stall every other in-flight request. A servicer that wants to kick off async
+# work (sending an email) uses fire_and_forget, which finds its way back to the
+# event loop from whichever thread it's called on.
+
+_EVENT_LOOP: contextvars.ContextVar[asyncio.AbstractEventLoop] = contextvars.ContextVar('_EVENT_LOOP')
+
+async def call_in_executor(executor: Optional[concurrent.futures.Executor], f: Callable[..., _T], *args: Any, **kwargs: Any) -> _T:
+    """Runs `f(*args, **kwargs)` in `executor`, or inline if `executor` is None."""
+    if executor is None:
+        return f(*args, **kwargs)
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+    ctx.run(_EVENT_LOOP.set, loop)
+    return await loop.run_in_executor(executor, functools.partial(ctx.run, f, *args, **kwargs))
+
+def fire_and_forget(coro: Awaitable[Any]) -> None:
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        asyncio.run_coroutine_threadsafe(coro, _EVENT_LOOP.get())  # type: ignore
+    else:
+        loop.create_task(coro)  # type: ignore
+
 
 AUTH_TOKEN_TTL_SECONDS = 60 * 60 * 24 * 365
 
@@ -7,11 +7,11 @@ from pathlib import Path
 from typing import Any, Iterable, Mapping, Optional, Sequence
 
 import aiosmtplib
-import jinja2
 import structlog
 
 from .core import PredictionId, Username
 from .protobuf import mvp_pb2
+from .templating import make_environment
 
 logger = structlog.get_logger()
 
@@ -26,6 +26,8 @@ class Emailer:
         password: str,
         from_addr: str,
         *,
+        production_templates: bool = False,
+        template_bytecode_cache_dir: Optional[Path] = None,
         aiosmtplib_for_testing=aiosmtplib,
     ) -> None:
         self._hostname = hostname
@@ -35,11 +37,7 @@ class Emailer:
         self._from_addr = from_addr
         self._aiosmtplib = aiosmtplib_for_testing
 
-        jenv = jinja2.Environment( # adapted from https://jinja.palletsprojects.com/en/2.11.x/api/#basics
-            loader=jinja2.FileSystemLoader(searchpath=[_HERE/'templates'/'emails'], encoding='utf-8'),
-            autoescape=jinja2.select_autoescape(['html', 'xml']),
-        )
-        jenv.undefined = jinja2.StrictUndefined  # raise exception if a template uses an undefined variable; adapted from https://stackoverflow.com/a/39127941/8877656
+        jenv = make_environment(_HERE/'templates'/'emails', production=production_templates, bytecode_cache_dir=template_bytecode_cache_dir)
         self._ResolutionNotification_template = jenv.get_template('ResolutionNotification.html')
         self._ResolutionReminder_template = jenv.get_template('ResolutionReminder.html')
         self._EmailVerification_template = jenv.get_template('EmailVerification.html')
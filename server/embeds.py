@@ -0,0 +1,249 @@
+"""The little "[bet: $50 at 60-70%]" images people embed next to links to their predictions."""
+
+import asyncio
+import collections
+import concurrent.futures
+import datetime
+import hashlib
+import io
+import os
+from pathlib import Path
+import re
+import tempfile
+import threading
+from typing import Any, Dict, Mapping, Optional, Tuple
+from xml.sax.saxutils import escape, quoteattr
+
+from attr import dataclass
+from PIL import Image, ImageDraw, ImageFont  # type: ignore
+import structlog
+
+from .protobuf import mvp_pb2
+
+logger = structlog.get_logger()
+
+_HERE = Path(__file__).parent
+
+ARIAL_PATH = _HERE / 'arial.ttf'
+WARNOCK_PRO_PATH = _HERE / 'warnock-pro.otf'
+
+# Part of every cache key; bump it when a change to rendering makes old images wrong.
+RENDER_VERSION = 1
+
+# Embeds show remaining stakes, which change; but not so fast that every page
+# view needs to ask. Past this, the ETag makes asking cheap.
+EMBED_CACHE_CONTROL = 'public, max-age=60'
+
+
+@dataclass(frozen=True)
+class Style:
+    color: Tuple[int, int, int]
+    fontpath: Path
+    fontsize: int
+    underline: bool
+
+    @staticmethod
+    def parse(s: str) -> 'Style':
+        s = s.lstrip('-')
+        m = re.search(r'(?:-|^)([0-9]{1,2})pt\b', s)
+        if m:
+            fontsize = min(30, int(m.group(1)))
+            s = s.replace(m.group(), '', 1)
+        else:
+            fontsize = 12
+
+        if s == 'lesswrong':
+            return Style(color=(0x5f, 0x9b, 0x65), fontpath=WARNOCK_PRO_PATH, fontsize=fontsize, underline=False)
+
+        m = re.search('(?:-|^)(' + '|'.join(COLOR_NAME_TO_COLOR.keys()) + r')\b', s)
+        if m:
+            color = COLOR_NAME_TO_COLOR[m.group(1)]
+            s = s.replace(m.group(), '', 1)
+        else:
+            color = COLOR_NAME_TO_COLOR['darkgreen']
+
+        return Style(color=color, fontpath=ARIAL_PATH, fontsize=fontsize, underline=True)
+
+    def canonical(self) -> str:
+        """Equal for any two Styles that render identically (however they were spelled in the URL)."""
+        return f'{self.color[0]:02x}{self.color[1]:02x}{self.color[2]:02x}-{self.fontpath.name}-{self.fontsize}-{"u" if self.underline else "n"}'
+
+COLOR_NAME_TO_COLOR = {
+    'red'      : (255, 0  , 0  ),
+    'darkgreen': (0  , 128, 0  ),
+    'darkblue' : (0  , 0  , 128),
+    'black'    : (0  , 0  , 0  ),
+    'white'    : (255, 255, 255),
+    'plainlink' : (0x0a, 0x58, 0xca),
+    'lwlinkgreen': (0x5f, 0x9b, 0x65),
+}
+
+
+def embed_text(prediction: mvp_pb2.UserPredictionView, now: datetime.datetime) -> str:
+    def format_stake_concisely(n_cents: int) -> str:
+        return f'${n_cents//100}'
+    stake_text = format_stake_concisely(prediction.maximum_stake_cents)
+
+    if prediction.certainty.high == 1:
+        confidence_text = f'{round(prediction.certainty.low*100)}%+'
+    else:
+        confidence_text = f'{round(prediction.certainty.low*100)}-{round(prediction.certainty.high*100)}%'
+
+    if prediction.resolution and prediction.resolution.resolution != mvp_pb2.RESOLUTION_NONE_YET:
+        res = prediction.resolution.resolution
+        res_text = "correct" if res == mvp_pb2.RESOLUTION_YES else "incorrect" if res == mvp_pb2.RESOLUTION_NO  else "n/a" if res == mvp_pb2.RESOLUTION_INVALID else "???"
+        remaining_text = f" (resolved: {res_text})"
+    elif prediction.closes_unixtime < now.timestamp():
+        remaining_text = " (closed)"
+    elif not (prediction.remaining_stake_cents_vs_skeptics == prediction.remaining_stake_cents_vs_believers == prediction.maximum_stake_cents):
+        remaining_text = (
+            " ("
+            + format_stake_concisely(prediction.remaining_stake_cents_vs_skeptics)
+            + ("/" + format_stake_concisely(prediction.remaining_stake_cents_vs_believers) if prediction.remaining_stake_cents_vs_believers < prediction.maximum_stake_cents else "")
+            + " remain)"
+        )
+    else:
+        remaining_text = ""
+
+    return f'[bet: {stake_text} at {confidence_text}{remaining_text}]'
+
+
+# Each rendering thread gets its own font objects: loading a TrueType font is
+# the bulk of the cost of a small render, but FreeType faces aren't safe to
+# share between threads.
+_thread_fonts = threading.local()
+
+def _font(path: Path, size: int) -> Any:
+    fonts = getattr(_thread_fonts, 'fonts', None)
+    if fonts is None:
+        fonts = _thread_fonts.fonts = {}
+    font = fonts.get((path, size))
+    if font is None:
+        font = fonts[(path, size)] = ImageFont.truetype(str(path.resolve()), size)
+    return font
+
+def render_text(text: str, style: Style, file_format: str = 'png') -> bytes:
+    font = _font(style.fontpath, style.fontsize)
+    _,_,w, h = font.getbbox(text)
+    if style.underline:
+        h += 2
+    img = Image.new('RGBA', (w, h), color=(255,255,255,0))
+    draw = ImageDraw.Draw(img)
+    draw.text((0,0), text, fill=style.color, font=font)
+    if style.underline:
+        draw.line([(0, h-1), (w, h-1)], fill=style.color)
+    buf = io.BytesIO()
+    img.save(buf, format=file_format)
+    return buf.getvalue()
+
+
+# What the viewer's browser should draw an SVG embed in, given the font we'd rasterize with.
+FONT_FAMILIES = {
+    ARIAL_PATH: 'Arial, Helvetica, sans-serif',
+    WARNOCK_PRO_PATH: "'Warnock Pro', Georgia, serif",
+}
+
+# (font path, size, character) -> how far the character advances the pen.
+# Measuring a whole string costs about as much as rasterizing it; summing
+# per-character advances gives the same width (our fonts don't kern these
+# texts) for a dict lookup per character.
+_advances: Dict[Tuple[Path, int, str], float] = {}
+
+def _advance(path: Path, size: int, c: str) -> float:
+    advance = _advances.get((path, size, c))
+    if advance is None:
+        advance = _advances[(path, size, c)] = _font(path, size).getlength(c)
+    return advance
+
+def render_svg(text: str, style: Style) -> bytes:
+    """Like `render_text`, but the browser draws the text, so there's no rasterizing to do.
+
+    The image is sized from the font's metrics; no glyphs are drawn here.
+    """
+    font = _font(style.fontpath, style.fontsize)
+    w = round(sum(_advance(style.fontpath, style.fontsize, c) for c in text))
+    ascent, descent = font.getmetrics()
+    h = ascent + descent + (2 if style.underline else 0)
+    color = '#{:02x}{:02x}{:02x}'.format(*style.color)
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{w}" height="{h}" viewBox="0 0 {w} {h}">'
+        f'<text x="0" y="{ascent}" fill="{color}" font-family={quoteattr(FONT_FAMILIES[style.fontpath])} font-size="{style.fontsize}px"'
+        + (' text-decoration="underline"' if style.underline else '')
+        + f'>{escape(text)}</text>'
+        + '</svg>'
+    ).encode('utf-8')
+
+
+class EmbedRenderer:
+    """Renders embed images off the event loop, remembering what it's rendered.
+
+    Images are cached in a bounded in-memory LRU, in front of (if `cache_dir`
+    is given) a directory of files that survives restarts. Both are keyed by
+    `cache_key`, which is also a fine ETag, since rendering is deterministic.
+    """
+    def __init__(self, cache_dir: Optional[Path] = None, memory_cache_size: int = 4096, executor: Optional[concurrent.futures.Executor] = None) -> None:
+        self._cache_dir = cache_dir
+        if cache_dir is not None:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+        self.memory_cache_size = memory_cache_size
+        self._memory: 'collections.OrderedDict[str, bytes]' = collections.OrderedDict()
+        self._executor = executor if (executor is not None) else concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix='embed')
+        self._counts_lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.renders = 0
+
+    @staticmethod
+    def cache_key(text: str, style: Style, file_format: str) -> str:
+        return hashlib.sha256(f'{RENDER_VERSION}\0{file_format}\0{style.canonical()}\0{text}'.encode('utf-8')).hexdigest()[:32]
+
+    async def render(self, text: str, style: Style, file_format: str = 'png') -> bytes:
+        key = self.cache_key(text, style, file_format)
+        body = self._memory.get(key)
+        if body is not None:
+            self._memory.move_to_end(key)
+            self.memory_hits += 1
+            return body
+        body = await asyncio.get_running_loop().run_in_executor(self._executor, self._load_or_render, key, text, style, file_format)
+        self._memory[key] = body
+        while len(self._memory) > self.memory_cache_size:
+            self._memory.popitem(last=False)
+        return body
+
+    def _load_or_render(self, key: str, text: str, style: Style, file_format: str) -> bytes:
+        path = None if (self._cache_dir is None) else self._cache_dir / f'{key}.{file_format}'
+        if path is not None:
+            try:
+                body = path.read_bytes()
+                with self._counts_lock:
+                    self.disk_hits += 1
+                return body
+            except FileNotFoundError:
+                pass
+
+        body = render_text(text=text, style=style, file_format=file_format)
+        with self._counts_lock:
+            self.renders += 1
+        if path is not None:
+            # Write-then-rename, so a concurrent reader never sees half a file.
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(body)
+                os.replace(tmp, path)
+            except OSError:
+                logger.exception('failed to write embed to disk cache', path=str(path))
+                Path(tmp).unlink(missing_ok=True)
+        return body
+
+    def stats(self) -> Mapping[str, Any]:
+        with self._counts_lock:
+            return {
+                'memory_size': len(self._memory),
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'renders': self.renders,
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown()
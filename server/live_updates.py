@@ -0,0 +1,128 @@
+"""Pushing changes to predictions out to the browsers watching them, as server-sent events."""
+
+import asyncio
+import contextlib
+import json
+import threading
+from typing import Dict, Iterator, Optional, Set
+
+from google.protobuf import json_format
+
+from .core import PredictionId
+from .protobuf import mvp_pb2
+
+# How often an idle stream sends a comment, so that proxies (and browsers) don't give up on it.
+KEEPALIVE_SECONDS = 30.0
+
+
+class Subscription:
+    """One watcher of one prediction: the newest update it hasn't read yet."""
+    def __init__(self) -> None:
+        self._latest: Optional[mvp_pb2.PredictionUpdate] = None
+        self._wakeup = asyncio.Event()
+        self.closed = False
+
+    def _offer(self, update: mvp_pb2.PredictionUpdate) -> None:
+        self._latest = update
+        self._wakeup.set()
+
+    def _close(self) -> None:
+        self.closed = True
+        self._wakeup.set()
+
+    async def next(self, timeout: float) -> Optional[mvp_pb2.PredictionUpdate]:
+        """The newest update since the last call; None if `timeout` seconds pass first, or the hub closes."""
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        self._wakeup.clear()
+        update, self._latest = self._latest, None
+        return update
+
+
+class PredictionUpdateHub:
+    """Fans each prediction's updates out to everyone watching it.
+
+    `subscribe` is for the event loop; `watched` and `publish` may be called
+    from any thread (typically a servicer thread, just after a commit), and
+    `publish` hands the update over to the loop. Nothing here touches the
+    database: the publisher fetches an update once, however many are watching.
+
+    A subscription holds only the newest update it hasn't read, since an update
+    is the whole of a prediction's changeable state: a slow reader skips
+    straight to the latest, and needs no more memory than a fast one.
+
+    Each update comes with the prediction's version (see PredictionVersions),
+    read before the update was: publishers on different threads can race, so
+    an update no newer than the last one delivered is dropped, rather than
+    overwriting it with older state.
+    """
+    def __init__(self) -> None:
+        self._subscriptions: Dict[str, Set[Subscription]] = {}
+        self._delivered_versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def watched(self, prediction_id: PredictionId) -> bool:
+        with self._lock:
+            return prediction_id in self._subscriptions
+
+    @contextlib.contextmanager
+    def subscribe(self, prediction_id: PredictionId) -> Iterator[Subscription]:
+        self._loop = asyncio.get_running_loop()
+        subscription = Subscription()
+        with self._lock:
+            self._subscriptions.setdefault(prediction_id, set()).add(subscription)
+        try:
+            yield subscription
+        finally:
+            with self._lock:
+                subscriptions = self._subscriptions[prediction_id]
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[prediction_id]
+                    self._delivered_versions.pop(prediction_id, None)
+
+    def publish(self, prediction_id: PredictionId, version: int, update: mvp_pb2.PredictionUpdate) -> None:
+        loop = self._loop
+        if loop is None:
+            return  # nobody has ever subscribed
+        try:
+            running_loop: Optional[asyncio.AbstractEventLoop] = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if running_loop is loop:
+            self._deliver(prediction_id, version, update)
+        else:
+            loop.call_soon_threadsafe(self._deliver, prediction_id, version, update)
+
+    def _deliver(self, prediction_id: PredictionId, version: int, update: mvp_pb2.PredictionUpdate) -> None:
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(prediction_id, ()))
+            if not subscriptions or version <= self._delivered_versions.get(prediction_id, -1):
+                return
+            self._delivered_versions[prediction_id] = version
+        for subscription in subscriptions:
+            subscription._offer(update)
+
+    def close(self) -> None:
+        """Ends every subscription, so that the streams reading them finish (e.g. at shutdown)."""
+        with self._lock:
+            subscriptions = [s for ss in self._subscriptions.values() for s in ss]
+        for subscription in subscriptions:
+            subscription._close()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'predictions_watched': len(self._subscriptions),
+                'subscriptions': sum(len(ss) for ss in self._subscriptions.values()),
+            }
+
+
+def format_event(update: mvp_pb2.PredictionUpdate) -> bytes:
+    """An SSE `update` event carrying `update` as JSON (camelCase, enums by name, as in api_types)."""
+    fields = json_format.MessageToDict(update, including_default_value_fields=True)  # type: ignore
+    data = json.dumps(fields, separators=(',', ':'))
+    return f'event: update\ndata: {data}\n\n'.encode('utf-8')
@@ -2,6 +2,7 @@
 
 import argparse
 import asyncio
+import concurrent.futures
 from pathlib import Path
 import sys
 import argparse
@@ -11,13 +12,14 @@ from email.message import EmailMessage
 from aiohttp import web
 
 from .api_server import *
+from .compression import CompressionMiddleware
 from .core import *
 from .emailer import *
 from .http_glue import *
 from .web_server import *
 from .protobuf import mvp_pb2
 from .sql_servicer import *
-from .sql_schema import create_engine
+from .sql_schema import create_engine, create_read_engine, prediction_exposure, stakes
 from .config import CredentialsConfig
 
 # adapted from https://www.structlog.org/en/stable/examples.html?highlight=json#processors
@@ -45,6 +47,14 @@ parser.add_argument("--email-daily-backups-to", help='send daily backups to this
 parser.add_argument("--email-invariant-violations-to", help='send notifications of invariant violations to this email address')
 parser.add_argument("-v", "--verbose", action="count", default=0)
 parser.add_argument("--mock-out-emails", action="store_true")
+parser.add_argument("--password-hashing-processes", type=int, default=None, help='size of the scrypt process pool (default: one per core)')
+parser.add_argument("--rebuild-denormalized-data", action="store_true", help='before serving, recompute the prediction_exposure and stakes tables (creating them if needed) and the current-resolution columns on predictions')
+parser.add_argument("--servicer-threads", type=int, default=8, help='number of threads (and pooled DB connections) serving requests')
+parser.add_argument("--embed-cache-dir", type=Path, default=None, help='keep rendered embed images here, across restarts (default: only in memory)')
+parser.add_argument("--production-templates", action="store_true", help="compile every page and email template at startup, and never check their files for changes again")
+parser.add_argument("--template-bytecode-cache-dir", type=Path, default=None, help="keep compiled templates here, so restarts needn't recompile them")
+parser.add_argument("--compression-level", type=int, default=6, help='gzip level (1-9) for compressing pages and API responses')
+parser.add_argument("--compression-min-bytes", type=int, default=1024, help="don't bother compressing responses smaller than this")
 
 async def main(args: argparse.Namespace):
     logging.basicConfig(level=logging.INFO if args.verbose==0 else logging.DEBUG)
@@ -52,6 +62,8 @@ async def main(args: argparse.Namespace):
         logging.getLogger('filelock').setLevel(logging.WARN)
         logging.getLogger('aiohttp.access').setLevel(logging.WARN)
     app = web.Application()
+    compression = CompressionMiddleware(min_bytes=args.compression_min_bytes, level=args.compression_level)
+    compression.add_to_app(app)
 
     credentials = CredentialsConfig.from_json(args.credentials_path.read_text())
 
@@ -70,41 +82,69 @@ async def main(args: argparse.Namespace):
         username=credentials.smtp.username,
         password=credentials.smtp.password,
         from_addr=credentials.smtp.from_addr,
+        production_templates=args.production_templates,
+        template_bytecode_cache_dir=args.template_bytecode_cache_dir,
         **testing_overrides,
     )
     token_mint = TokenMint(secret_key=credentials.token_signing_secret_bytes)
     token_glue = HttpTokenGlue(token_mint=token_mint)
-    raw_conn = create_engine(credentials.database).connect()
-    conn = SqlConn(raw_conn)
-    servicer = SqlServicer(conn=conn, token_mint=token_mint, emailer=emailer)
+    engine = create_engine(credentials.database, pool_size=args.servicer_threads)
+    password_hasher = PasswordHasher.process_pool(max_workers=args.password_hashing_processes)
+    if args.rebuild_denormalized_data:
+        prediction_exposure.create(engine, checkfirst=True)
+        stakes.create(engine, checkfirst=True)
+        with engine.connect() as raw_conn:
+            rebuild_prediction_exposure(raw_conn)
+            rebuild_stakes(raw_conn)
+            rebuild_current_resolutions(raw_conn)
+    read_engine = create_read_engine(credentials.database, pool_size=args.servicer_threads)
+    conn = SqlConn(engine, password_hasher=password_hasher, read_engine=read_engine)
+    conn.rebuild_trust_graph()
+    servicer = SqlServicer(conn=conn, token_mint=token_mint, emailer=emailer, password_hasher=password_hasher)
+    servicer_executor = concurrent.futures.ThreadPoolExecutor(max_workers=args.servicer_threads, thread_name_prefix='servicer')
 
     token_glue.add_to_app(app)
-    WebServer(
+    web_server = WebServer(
         token_glue=token_glue,
         token_mint=token_mint,
         elm_dist=args.elm_dist,
         servicer=servicer,
-    ).add_to_app(app)
-    ApiServer(
+        executor=servicer_executor,
+        embed_cache_dir=args.embed_cache_dir,
+        production_templates=args.production_templates,
+        template_bytecode_cache_dir=args.template_bytecode_cache_dir,
+    )
+    web_server.preload_assets()
+    web_server.add_to_app(app)
+    api_server = ApiServer(
         token_glue=token_glue,
         servicer=servicer,
-    ).add_to_app(app)
+        executor=servicer_executor,
+        password_hasher=password_hasher,
+    )
+    api_server.add_to_app(app)
     # print('\n'.join(sorted(set(p for p in (r.get_info().get('path') for r in app.router.routes()) if p and '/' not in p[1:])))); exit(1)
 
     asyncio.get_running_loop().create_task(forever(
         datetime.timedelta(hours=1),
         lambda now: email_resolution_reminders(conn, emailer, now),
     ))
+    async def _log_cache_stats(now: datetime.datetime) -> None:
+        logger.info('cache stats', known_users=conn.known_users.stats(), trust_graph_memory_bytes=conn.trust_graph.memory_bytes(), anonymous_prediction_pages=web_server.anonymous_prediction_pages.stats(), embed_predictions=web_server.embed_predictions.stats(), embeds=web_server.embeds.stats(), prediction_streams=api_server.prediction_updates.stats())
+    asyncio.get_running_loop().create_task(forever(datetime.timedelta(hours=1), _log_cache_stats))
+    async def _log_compression_stats(now: datetime.datetime) -> None:
+        logger.info('compression stats', bytes_saved_by_route=compression.stats())
+    asyncio.get_running_loop().create_task(forever(datetime.timedelta(hours=1), _log_compression_stats))
     if args.email_daily_backups_to is not None:
-        asyncio.get_running_loop().create_task(forever(
-            datetime.timedelta(hours=24),
-            lambda now: email_daily_backups(conn=raw_conn, emailer=emailer, recipient_email=args.email_daily_backups_to, now=now)
-        ))
+        async def _email_daily_backups(now: datetime.datetime) -> None:
+            with engine.connect() as raw_conn:
+                await email_daily_backups(conn=raw_conn, emailer=emailer, recipient_email=args.email_daily_backups_to, now=now)
+        asyncio.get_running_loop().create_task(forever(datetime.timedelta(hours=24), _email_daily_backups))
     if args.email_invariant_violations_to is not None:
-        asyncio.get_running_loop().create_task(forever(
-            datetime.timedelta(hours=1),
-            lambda now: email_invariant_violations(raw_conn, emailer, recipient_email=args.email_invariant_violations_to, now=now),
-        ))
+        async def _email_invariant_violations(now: datetime.datetime) -> None:
+            with engine.connect() as raw_conn:
+                await email_invariant_violations(raw_conn, emailer, recipient_email=args.email_invariant_violations_to, now=now)
+        asyncio.get_running_loop().create_task(forever(datetime.timedelta(hours=1), _email_invariant_violations))
 
     # adapted from https://docs.aiohttp.org/en/stable/web_advanced.html#application-runners
     runner = web.AppRunner(app)
@@ -118,6 +158,8 @@ async def main(args: argparse.Namespace):
     except KeyboardInterrupt:
         print('Shutting down server...', file=sys.stderr)
         await runner.cleanup()
+        servicer_executor.shutdown()
+        password_hasher.shutdown()
         print('...server shut down.', file=sys.stderr)
 
 if __name__ == '__main__':
@@ -20,7 +20,7 @@ DESCRIPTOR = _descriptor.FileDescriptor(
   syntax='proto3',
   serialized_options=None,
   create_key=_descriptor._internal_create_key,
-  serialized_pb=b'\n\x12protobuf/mvp.proto\x12\x10\x62iatob.proto.mvp\"c\n\tAuthToken\x12\x14\n\x0chmac_of_rest\x18\x01 \x01(\x0c\x12\r\n\x05owner\x18\x07 \x01(\t\x12\x17\n\x0fminted_unixtime\x18\x05 \x01(\x01\x12\x18\n\x10\x65xpires_unixtime\x18\x06 \x01(\x01\".\n\x0eHashedPassword\x12\x0c\n\x04salt\x18\x01 \x01(\x0c\x12\x0e\n\x06scrypt\x18\x02 \x01(\x0c\"\xce\x03\n\x0fGenericUserInfo\x12\x15\n\remail_address\x18\n \x01(\t\x12G\n\x0binvitations\x18\x05 \x03(\x0b\x32\x32.biatob.proto.mvp.GenericUserInfo.InvitationsEntry\x12K\n\rrelationships\x18\x06 \x03(\x0b\x32\x34.biatob.proto.mvp.GenericUserInfo.RelationshipsEntry\x12:\n\x0elogin_password\x18\x07 \x01(\x0b\x32 .biatob.proto.mvp.HashedPasswordH\x00\x1a`\n\x10InvitationsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12;\n\x05value\x18\x02 \x01(\x0b\x32,.biatob.proto.mvp.GenericUserInfo.Invitation:\x02\x38\x01\x1aT\n\x12RelationshipsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12-\n\x05value\x18\x02 \x01(\x0b\x32\x1e.biatob.proto.mvp.Relationship:\x02\x38\x01\x1a\x0c\n\nInvitationB\x0c\n\nlogin_type\":\n\x0cRelationship\x12\x12\n\ntrusts_you\x18\x01 \x01(\x08\x12\x16\n\x0etrusted_by_you\x18\x02 \x01(\x08\"\x9f\x01\n\x0fResolutionEvent\x12\x10\n\x08unixtime\x18\x04 \x01(\x01\x12\x30\n\nresolution\x18\x02 \x01(\x0e\x32\x1c.biatob.proto.mvp.Resolution\x12\r\n\x05notes\x18\x03 \x01(\t\x12\x39\n\x0eprior_revision\x18\x05 \x01(\x0b\x32!.biatob.proto.mvp.ResolutionEvent\"\xe0\x01\n\x05Trade\x12\x0e\n\x06\x62\x65ttor\x18\x07 \x01(\t\x12\x1b\n\x13\x62\x65ttor_is_a_skeptic\x18\x02 \x01(\x08\x12\x1a\n\x12\x62\x65ttor_stake_cents\x18\x03 \x01(\r\x12\x1b\n\x13\x63reator_stake_cents\x18\x04 \x01(\r\x12\x1b\n\x13transacted_unixtime\x18\x06 \x01(\x01\x12\x18\n\x10updated_unixtime\x18\x08 \x01(\x01\x12\r\n\x05notes\x18\t \x01(\t\x12+\n\x05state\x18\n \x01(\x0e\x32\x1c.biatob.proto.mvp.TradeState\"\x07\n\x05\x45mpty\"!\n\rErrorResponse\x12\x10\n\x08\x63\x61tchall\x18\x01 \x01(\t\"\x0f\n\rWhoamiRequest\"\"\n\x0eWhoamiResponse\x12\x10\n\x08username\x18\x01 \x01(\t\"\x10\n\x0eSignOutRequest\"\x11\n\x0fSignOutResponse\"o\n\x0b\x41uthSuccess\x12*\n\x05token\x18\x01 \x01(\x0b\x32\x1b.biatob.proto.mvp.AuthToken\x12\x34\n\tuser_info\x18\x02 \x01(\x0b\x32!.biatob.proto.mvp.GenericUserInfo\"5\n\x1cSendVerificationEmailRequest\x12\x15\n\remail_address\x18\x01 \x01(\t\"[\n\x17RegisterUsernameRequest\x12\x10\n\x08username\x18\x01 \x01(\t\x12\x10\n\x08password\x18\x02 \x01(\t\x12\x1c\n\x14proof_of_email_token\x18\x03 \x01(\t\":\n\x14LogInUsernameRequest\x12\x10\n\x08username\x18\x01 \x01(\t\x12\x10\n\x08password\x18\x02 \x01(\t\"+\n\x0e\x43\x65rtaintyRange\x12\x0b\n\x03low\x18\x01 \x01(\x02\x12\x0c\n\x04high\x18\x02 \x01(\x02\"\x89\x02\n\x17\x43reatePredictionRequest\x12\x12\n\nprediction\x18\x02 \x01(\t\x12=\n\x0cview_privacy\x18\x03 \x01(\x0e\x32\'.biatob.proto.mvp.PredictionViewPrivacy\x12\x33\n\tcertainty\x18\x04 \x01(\x0b\x32 .biatob.proto.mvp.CertaintyRange\x12\x1b\n\x13maximum_stake_cents\x18\x05 \x01(\r\x12\x14\n\x0copen_seconds\x18\x06 \x01(\r\x12\x15\n\rspecial_rules\x18\x07 \x01(\t\x12\x1c\n\x14resolves_at_unixtime\x18\t \x01(\x01\"5\n\x18\x43reatePredictionResponse\x12\x19\n\x11new_prediction_id\x18\x01 \x01(\t\"-\n\x14GetPredictionRequest\x12\x15\n\rprediction_id\x18\x02 \x01(\t\"\xfb\x03\n\x12UserPredictionView\x12\x12\n\nprediction\x18\x01 \x01(\t\x12\x33\n\tcertainty\x18\x02 \x01(\x0b\x32 .biatob.proto.mvp.CertaintyRange\x12\x1b\n\x13maximum_stake_cents\x18\x03 \x01(\r\x12*\n\"remaining_stake_cents_vs_believers\x18\x04 \x01(\r\x12)\n!remaining_stake_cents_vs_skeptics\x18\x05 \x01(\r\x12\x18\n\x10\x63reated_unixtime\x18\r \x01(\x01\x12\x17\n\x0f\x63loses_unixtime\x18\x0e \x01(\x01\x12\x15\n\rspecial_rules\x18\x08 \x01(\t\x12\x0f\n\x07\x63reator\x18\t \x01(\t\x12\x35\n\nresolution\x18\x11 \x01(\x0b\x32!.biatob.proto.mvp.ResolutionEvent\x12,\n\x0byour_trades\x18\x0b \x03(\x0b\x32\x17.biatob.proto.mvp.Trade\x12\x1c\n\x14resolves_at_unixtime\x18\x0f \x01(\x01\x12J\n\x15your_following_status\x18\x12 \x01(\x0e\x32+.biatob.proto.mvp.PredictionFollowingStatus\"\x15\n\x13ListMyStakesRequest\"\xb4\x01\n\x0fPredictionsById\x12G\n\x0bpredictions\x18\x01 \x03(\x0b\x32\x32.biatob.proto.mvp.PredictionsById.PredictionsEntry\x1aX\n\x10PredictionsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\x33\n\x05value\x18\x02 \x01(\x0b\x32$.biatob.proto.mvp.UserPredictionView:\x02\x38\x01\")\n\x16ListPredictionsRequest\x12\x0f\n\x07\x63reator\x18\x02 \x01(\t\"6\n\rFollowRequest\x12\x15\n\rprediction_id\x18\x01 \x01(\t\x12\x0e\n\x06\x66ollow\x18\x02 \x01(\x08\"^\n\x0cStakeRequest\x12\x15\n\rprediction_id\x18\x02 \x01(\t\x12\x1b\n\x13\x62\x65ttor_is_a_skeptic\x18\x03 \x01(\x08\x12\x1a\n\x12\x62\x65ttor_stake_cents\x18\x04 \x01(\r\"h\n\x0eResolveRequest\x12\x15\n\rprediction_id\x18\x01 \x01(\t\x12\x30\n\nresolution\x18\x02 \x01(\x0e\x32\x1c.biatob.proto.mvp.Resolution\x12\r\n\x05notes\x18\x03 \x01(\t\"1\n\x11SetTrustedRequest\x12\x0b\n\x03who\x18\x03 \x01(\t\x12\x0f\n\x07trusted\x18\x02 \x01(\x08\"\x1d\n\x0eGetUserRequest\x12\x0b\n\x03who\x18\x02 \x01(\t\"C\n\x15\x43hangePasswordRequest\x12\x14\n\x0cold_password\x18\x01 \x01(\t\x12\x14\n\x0cnew_password\x18\x02 \x01(\t\">\n\x12GetSettingsRequest\x12(\n include_relationships_with_users\x18\x01 \x03(\t\"*\n\x15SendInvitationRequest\x12\x11\n\trecipient\x18\x01 \x01(\t\"\'\n\x16\x43heckInvitationRequest\x12\r\n\x05nonce\x18\x01 \x01(\t\"=\n\x17\x43heckInvitationResponse\x12\x0f\n\x07inviter\x18\x01 \x01(\t\x12\x11\n\trecipient\x18\x02 \x01(\t\"(\n\x17\x41\x63\x63\x65ptInvitationRequest\x12\r\n\x05nonce\x18\x01 \x01(\t\"\x8c\x02\n\x1fSavedCreatedPredictionFormState\x12\x18\n\x10prediction_field\x18\x01 \x01(\t\x12\x19\n\x11resolves_at_field\x18\x02 \x01(\t\x12\x13\n\x0bstake_field\x18\x03 \x01(\t\x12\x13\n\x0blow_p_field\x18\x04 \x01(\t\x12\x14\n\x0chigh_p_field\x18\x05 \x01(\t\x12\x1b\n\x13open_for_unit_field\x18\x06 \x01(\t\x12\x1e\n\x16open_for_seconds_field\x18\x07 \x01(\t\x12\x1a\n\x12view_privacy_field\x18\t \x01(\t\x12\x1b\n\x13special_rules_field\x18\x08 \x01(\t*w\n\nTradeState\x12\x16\n\x12TRADE_STATE_ACTIVE\x10\x00\x12\x16\n\x12TRADE_STATE_QUEUED\x10\x01\x12\x19\n\x15TRADE_STATE_DISAVOWED\x10\x02\x12\x1e\n\x1aTRADE_STATE_DEQUEUE_FAILED\x10\x03*\x10\n\x04Void\x12\x08\n\x04VOID\x10\x00*d\n\nResolution\x12\x17\n\x13RESOLUTION_NONE_YET\x10\x00\x12\x12\n\x0eRESOLUTION_YES\x10\x01\x12\x11\n\rRESOLUTION_NO\x10\x02\x12\x16\n\x12RESOLUTION_INVALID\x10\x03*o\n\x15PredictionViewPrivacy\x12#\n\x1fPREDICTION_VIEW_PRIVACY_ANYBODY\x10\x00\x12\x31\n-PREDICTION_VIEW_PRIVACY_ANYBODY_WITH_THE_LINK\x10\x01*\x9a\x01\n\x19PredictionFollowingStatus\x12&\n\"PREDICTION_FOLLOWING_NOT_FOLLOWING\x10\x00\x12\"\n\x1ePREDICTION_FOLLOWING_FOLLOWING\x10\x01\x12\x31\n-PREDICTION_FOLLOWING_MANDATORY_BECAUSE_STAKED\x10\x02\x62\x06proto3'
+  serialized_pb=b'\n\x12protobuf/mvp.proto\x12\x10\x62iatob.proto.mvp\"c\n\tAuthToken\x12\x14\n\x0chmac_of_rest\x18\x01 \x01(\x0c\x12\r\n\x05owner\x18\x07 \x01(\t\x12\x17\n\x0fminted_unixtime\x18\x05 \x01(\x01\x12\x18\n\x10\x65xpires_unixtime\x18\x06 \x01(\x01\".\n\x0eHashedPassword\x12\x0c\n\x04salt\x18\x01 \x01(\x0c\x12\x0e\n\x06scrypt\x18\x02 \x01(\x0c\"\xce\x03\n\x0fGenericUserInfo\x12\x15\n\remail_address\x18\n \x01(\t\x12G\n\x0binvitations\x18\x05 \x03(\x0b\x32\x32.biatob.proto.mvp.GenericUserInfo.InvitationsEntry\x12K\n\rrelationships\x18\x06 \x03(\x0b\x32\x34.biatob.proto.mvp.GenericUserInfo.RelationshipsEntry\x12:\n\x0elogin_password\x18\x07 \x01(\x0b\x32 .biatob.proto.mvp.HashedPasswordH\x00\x1a`\n\x10InvitationsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12;\n\x05value\x18\x02 \x01(\x0b\x32,.biatob.proto.mvp.GenericUserInfo.Invitation:\x02\x38\x01\x1aT\n\x12RelationshipsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12-\n\x05value\x18\x02 \x01(\x0b\x32\x1e.biatob.proto.mvp.Relationship:\x02\x38\x01\x1a\x0c\n\nInvitationB\x0c\n\nlogin_type\":\n\x0cRelationship\x12\x12\n\ntrusts_you\x18\x01 \x01(\x08\x12\x16\n\x0etrusted_by_you\x18\x02 \x01(\x08\"\x9f\x01\n\x0fResolutionEvent\x12\x10\n\x08unixtime\x18\x04 \x01(\x01\x12\x30\n\nresolution\x18\x02 \x01(\x0e\x32\x1c.biatob.proto.mvp.Resolution\x12\r\n\x05notes\x18\x03 \x01(\t\x12\x39\n\x0eprior_revision\x18\x05 \x01(\x0b\x32!.biatob.proto.mvp.ResolutionEvent\"\xe0\x01\n\x05Trade\x12\x0e\n\x06\x62\x65ttor\x18\x07 \x01(\t\x12\x1b\n\x13\x62\x65ttor_is_a_skeptic\x18\x02 \x01(\x08\x12\x1a\n\x12\x62\x65ttor_stake_cents\x18\x03 \x01(\r\x12\x1b\n\x13\x63reator_stake_cents\x18\x04 \x01(\r\x12\x1b\n\x13transacted_unixtime\x18\x06 \x01(\x01\x12\x18\n\x10updated_unixtime\x18\x08 \x01(\x01\x12\r\n\x05notes\x18\t \x01(\t\x12+\n\x05state\x18\n \x01(\x0e\x32\x1c.biatob.proto.mvp.TradeState\"\x07\n\x05\x45mpty\"!\n\rErrorResponse\x12\x10\n\x08\x63\x61tchall\x18\x01 \x01(\t\"\x0f\n\rWhoamiRequest\"\"\n\x0eWhoamiResponse\x12\x10\n\x08username\x18\x01 \x01(\t\"\x10\n\x0eSignOutRequest\"\x11\n\x0fSignOutResponse\"o\n\x0b\x41uthSuccess\x12*\n\x05token\x18\x01 \x01(\x0b\x32\x1b.biatob.proto.mvp.AuthToken\x12\x34\n\tuser_info\x18\x02 \x01(\x0b\x32!.biatob.proto.mvp.GenericUserInfo\"5\n\x1cSendVerificationEmailRequest\x12\x15\n\remail_address\x18\x01 \x01(\t\"[\n\x17RegisterUsernameRequest\x12\x10\n\x08username\x18\x01 \x01(\t\x12\x10\n\x08password\x18\x02 \x01(\t\x12\x1c\n\x14proof_of_email_token\x18\x03 \x01(\t\":\n\x14LogInUsernameRequest\x12\x10\n\x08username\x18\x01 \x01(\t\x12\x10\n\x08password\x18\x02 \x01(\t\"+\n\x0e\x43\x65rtaintyRange\x12\x0b\n\x03low\x18\x01 \x01(\x02\x12\x0c\n\x04high\x18\x02 \x01(\x02\"\x89\x02\n\x17\x43reatePredictionRequest\x12\x12\n\nprediction\x18\x02 \x01(\t\x12=\n\x0cview_privacy\x18\x03 \x01(\x0e\x32\'.biatob.proto.mvp.PredictionViewPrivacy\x12\x33\n\tcertainty\x18\x04 \x01(\x0b\x32 .biatob.proto.mvp.CertaintyRange\x12\x1b\n\x13maximum_stake_cents\x18\x05 \x01(\r\x12\x14\n\x0copen_seconds\x18\x06 \x01(\r\x12\x15\n\rspecial_rules\x18\x07 \x01(\t\x12\x1c\n\x14resolves_at_unixtime\x18\t \x01(\x01\"5\n\x18\x43reatePredictionResponse\x12\x19\n\x11new_prediction_id\x18\x01 \x01(\t\"-\n\x14GetPredictionRequest\x12\x15\n\rprediction_id\x18\x02 \x01(\t\"\xfb\x03\n\x12UserPredictionView\x12\x12\n\nprediction\x18\x01 \x01(\t\x12\x33\n\tcertainty\x18\x02 \x01(\x0b\x32 .biatob.proto.mvp.CertaintyRange\x12\x1b\n\x13maximum_stake_cents\x18\x03 \x01(\r\x12*\n\"remaining_stake_cents_vs_believers\x18\x04 \x01(\r\x12)\n!remaining_stake_cents_vs_skeptics\x18\x05 \x01(\r\x12\x18\n\x10\x63reated_unixtime\x18\r \x01(\x01\x12\x17\n\x0f\x63loses_unixtime\x18\x0e \x01(\x01\x12\x15\n\rspecial_rules\x18\x08 \x01(\t\x12\x0f\n\x07\x63reator\x18\t \x01(\t\x12\x35\n\nresolution\x18\x11 \x01(\x0b\x32!.biatob.proto.mvp.ResolutionEvent\x12,\n\x0byour_trades\x18\x0b \x03(\x0b\x32\x17.biatob.proto.mvp.Trade\x12\x1c\n\x14resolves_at_unixtime\x18\x0f \x01(\x01\x12J\n\x15your_following_status\x18\x12 \x01(\x0e\x32+.biatob.proto.mvp.PredictionFollowingStatus\"\xe4\x02\n\x11PredictionSummary\x12\x12\n\nprediction\x18\x01 \x01(\t\x12\x33\n\tcertainty\x18\x02 \x01(\x0b\x32 .biatob.proto.mvp.CertaintyRange\x12\x1b\n\x13maximum_stake_cents\x18\x03 \x01(\r\x12*\n\"remaining_stake_cents_vs_believers\x18\x04 \x01(\r\x12)\n!remaining_stake_cents_vs_skeptics\x18\x05 \x01(\r\x12\x18\n\x10\x63reated_unixtime\x18\x06 \x01(\x01\x12\x17\n\x0f\x63loses_unixtime\x18\x07 \x01(\x01\x12\x1c\n\x14resolves_at_unixtime\x18\x08 \x01(\x01\x12\x0f\n\x07\x63reator\x18\t \x01(\t\x12\x30\n\nresolution\x18\n \x01(\x0e\x32\x1c.biatob.proto.mvp.Resolution\"\xb6\x01\n\x10PredictionUpdate\x12*\n\"remaining_stake_cents_vs_believers\x18\x01 \x01(\r\x12)\n!remaining_stake_cents_vs_skeptics\x18\x02 \x01(\r\x12\x30\n\nresolution\x18\x03 \x01(\x0e\x32\x1c.biatob.proto.mvp.Resolution\x12\x19\n\x11num_active_trades\x18\x04 \x01(\r\"\xa2\x01\n\x13ListMyStakesRequest\x12\r\n\x05limit\x18\x01 \x01(\r\x12\x0e\n\x06\x63ursor\x18\x02 \x01(\t\x12\x30\n\x05order\x18\x03 \x01(\x0e\x32!.biatob.proto.mvp.PredictionOrder\x12:\n\nprojection\x18\x04 \x01(\x0e\x32&.biatob.proto.mvp.PredictionProjection\"\xe5\x02\n\x0fPredictionsById\x12G\n\x0bpredictions\x18\x01 \x03(\x0b\x32\x32.biatob.proto.mvp.PredictionsById.PredictionsEntry\x12\x43\n\tsummaries\x18\x03 \x03(\x0b\x32\x30.biatob.proto.mvp.PredictionsById.SummariesEntry\x12\x13\n\x0bnext_cursor\x18\x02 \x01(\t\x1aX\n\x10PredictionsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\x33\n\x05value\x18\x02 \x01(\x0b\x32$.biatob.proto.mvp.UserPredictionView:\x02\x38\x01\x1aU\n\x0eSummariesEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\x32\n\x05value\x18\x02 \x01(\x0b\x32#.biatob.proto.mvp.PredictionSummary:\x02\x38\x01\"\xb6\x01\n\x16ListPredictionsRequest\x12\x0f\n\x07\x63reator\x18\x02 \x01(\t\x12\r\n\x05limit\x18\x03 \x01(\r\x12\x0e\n\x06\x63ursor\x18\x04 \x01(\t\x12\x30\n\x05order\x18\x05 \x01(\x0e\x32!.biatob.proto.mvp.PredictionOrder\x12:\n\nprojection\x18\x06 \x01(\x0e\x32&.biatob.proto.mvp.PredictionProjection\"6\n\rFollowRequest\x12\x15\n\rprediction_id\x18\x01 \x01(\t\x12\x0e\n\x06\x66ollow\x18\x02 \x01(\x08\"^\n\x0cStakeRequest\x12\x15\n\rprediction_id\x18\x02 \x01(\t\x12\x1b\n\x13\x62\x65ttor_is_a_skeptic\x18\x03 \x01(\x08\x12\x1a\n\x12\x62\x65ttor_stake_cents\x18\x04 \x01(\r\"h\n\x0eResolveRequest\x12\x15\n\rprediction_id\x18\x01 \x01(\t\x12\x30\n\nresolution\x18\x02 \x01(\x0e\x32\x1c.biatob.proto.mvp.Resolution\x12\r\n\x05notes\x18\x03 \x01(\t\"1\n\x11SetTrustedRequest\x12\x0b\n\x03who\x18\x03 \x01(\t\x12\x0f\n\x07trusted\x18\x02 \x01(\x08\"\x1d\n\x0eGetUserRequest\x12\x0b\n\x03who\x18\x02 \x01(\t\"C\n\x15\x43hangePasswordRequest\x12\x14\n\x0cold_password\x18\x01 \x01(\t\x12\x14\n\x0cnew_password\x18\x02 \x01(\t\">\n\x12GetSettingsRequest\x12(\n include_relationships_with_users\x18\x01 \x03(\t\"*\n\x15SendInvitationRequest\x12\x11\n\trecipient\x18\x01 \x01(\t\"\'\n\x16\x43heckInvitationRequest\x12\r\n\x05nonce\x18\x01 \x01(\t\"=\n\x17\x43heckInvitationResponse\x12\x0f\n\x07inviter\x18\x01 \x01(\t\x12\x11\n\trecipient\x18\x02 \x01(\t\"(\n\x17\x41\x63\x63\x65ptInvitationRequest\x12\r\n\x05nonce\x18\x01 \x01(\t\"k\n\x0c\x42\x61tchRequest\x12\x32\n\x05\x63\x61lls\x18\x01 \x03(\x0b\x32#.biatob.proto.mvp.BatchRequest.Call\x1a\'\n\x04\x43\x61ll\x12\x0e\n\x06method\x18\x01 \x01(\t\x12\x0f\n\x07request\x18\x02 \x01(\x0c\"\xb2\x01\n\rBatchResponse\x12\x37\n\x07results\x18\x01 \x03(\x0b\x32&.biatob.proto.mvp.BatchResponse.Result\x1ah\n\x06Result\x12\x13\n\x0bhttp_status\x18\x03 \x01(\r\x12\x0c\n\x02ok\x18\x01 \x01(\x0cH\x00\x12\x30\n\x05\x65rror\x18\x02 \x01(\x0b\x32\x1f.biatob.proto.mvp.ErrorResponseH\x00\x42\t\n\x07outcome\"\x8c\x02\n\x1fSavedCreatedPredictionFormState\x12\x18\n\x10prediction_field\x18\x01 \x01(\t\x12\x19\n\x11resolves_at_field\x18\x02 \x01(\t\x12\x13\n\x0bstake_field\x18\x03 \x01(\t\x12\x13\n\x0blow_p_field\x18\x04 \x01(\t\x12\x14\n\x0chigh_p_field\x18\x05 \x01(\t\x12\x1b\n\x13open_for_unit_field\x18\x06 \x01(\t\x12\x1e\n\x16open_for_seconds_field\x18\x07 \x01(\t\x12\x1a\n\x12view_privacy_field\x18\t \x01(\t\x12\x1b\n\x13special_rules_field\x18\x08 \x01(\t*w\n\nTradeState\x12\x16\n\x12TRADE_STATE_ACTIVE\x10\x00\x12\x16\n\x12TRADE_STATE_QUEUED\x10\x01\x12\x19\n\x15TRADE_STATE_DISAVOWED\x10\x02\x12\x1e\n\x1aTRADE_STATE_DEQUEUE_FAILED\x10\x03*\x10\n\x04Void\x12\x08\n\x04VOID\x10\x00*d\n\nResolution\x12\x17\n\x13RESOLUTION_NONE_YET\x10\x00\x12\x12\n\x0eRESOLUTION_YES\x10\x01\x12\x11\n\rRESOLUTION_NO\x10\x02\x12\x16\n\x12RESOLUTION_INVALID\x10\x03*o\n\x15PredictionViewPrivacy\x12#\n\x1fPREDICTION_VIEW_PRIVACY_ANYBODY\x10\x00\x12\x31\n-PREDICTION_VIEW_PRIVACY_ANYBODY_WITH_THE_LINK\x10\x01*\x9a\x01\n\x19PredictionFollowingStatus\x12&\n\"PREDICTION_FOLLOWING_NOT_FOLLOWING\x10\x00\x12\"\n\x1ePREDICTION_FOLLOWING_FOLLOWING\x10\x01\x12\x31\n-PREDICTION_FOLLOWING_MANDATORY_BECAUSE_STAKED\x10\x02*\xb7\x01\n\x0fPredictionOrder\x12\x1c\n\x18PREDICTION_ORDER_CREATED\x10\x00\x12\x1b\n\x17PREDICTION_ORDER_CLOSES\x10\x01\x12\x1d\n\x19PREDICTION_ORDER_RESOLVES\x10\x02\x12#\n\x1fPREDICTION_ORDER_CLOSES_SOONEST\x10\x03\x12%\n!PREDICTION_ORDER_RESOLVES_SOONEST\x10\x04*Y\n\x14PredictionProjection\x12\x1e\n\x1aPREDICTION_PROJECTION_FULL\x10\x00\x12!\n\x1dPREDICTION_PROJECTION_SUMMARY\x10\x01\x62\x06proto3'
 )
 
 _TRADESTATE = _descriptor.EnumDescriptor(
@@ -53,8 +53,8 @@ _TRADESTATE = _descriptor.EnumDescriptor(
   ],
   containing_type=None,
   serialized_options=None,
-  serialized_start=3666,
-  serialized_end=3785,
+  serialized_start=4961,
+  serialized_end=5080,
 )
 _sym_db.RegisterEnumDescriptor(_TRADESTATE)
 
@@ -74,8 +74,8 @@ _VOID = _descriptor.EnumDescriptor(
   ],
   containing_type=None,
   serialized_options=None,
-  serialized_start=3787,
-  serialized_end=3803,
+  serialized_start=5082,
+  serialized_end=5098,
 )
 _sym_db.RegisterEnumDescriptor(_VOID)
 
@@ -110,8 +110,8 @@ _RESOLUTION = _descriptor.EnumDescriptor(
   ],
   containing_type=None,
   serialized_options=None,
-  serialized_start=3805,
-  serialized_end=3905,
+  serialized_start=5100,
+  serialized_end=5200,
 )
 _sym_db.RegisterEnumDescriptor(_RESOLUTION)
 
@@ -136,8 +136,8 @@ _PREDICTIONVIEWPRIVACY = _descriptor.EnumDescriptor(
   ],
   containing_type=None,
   serialized_options=None,
-  serialized_start=3907,
-  serialized_end=4018,
+  serialized_start=5202,
+  serialized_end=5313,
 )
 _sym_db.RegisterEnumDescriptor(_PREDICTIONVIEWPRIVACY)
 
@@ -167,12 +167,79 @@ _PREDICTIONFOLLOWINGSTATUS = _descriptor.EnumDescriptor(
   ],
   containing_type=None,
   serialized_options=None,
-  serialized_start=4021,
-  serialized_end=4175,
+  serialized_start=5316,
+  serialized_end=5470,
 )
 _sym_db.RegisterEnumDescriptor(_PREDICTIONFOLLOWINGSTATUS)
 
 PredictionFollowingStatus = enum_type_wrapper.EnumTypeWrapper(_PREDICTIONFOLLOWINGSTATUS)
+_PREDICTIONORDER = _descriptor.EnumDescriptor(
+  name='PredictionOrder',
+  full_name='biatob.proto.mvp.PredictionOrder',
+  filename=None,
+  file=DESCRIPTOR,
+  create_key=_descriptor._internal_create_key,
+  values=[
+    _descriptor.EnumValueDescriptor(
+      name='PREDICTION_ORDER_CREATED', index=0, number=0,
+      serialized_options=None,
+      type=None,
+      create_key=_descriptor._internal_create_key),
+    _descriptor.EnumValueDescriptor(
+      name='PREDICTION_ORDER_CLOSES', index=1, number=1,
+      serialized_options=None,
+      type=None,
+      create_key=_descriptor._internal_create_key),
+    _descriptor.EnumValueDescriptor(
+      name='PREDICTION_ORDER_RESOLVES', index=2, number=2,
+      serialized_options=None,
+      type=None,
+      create_key=_descriptor._internal_create_key),
+    _descriptor.EnumValueDescriptor(
+      name='PREDICTION_ORDER_CLOSES_SOONEST', index=3, number=3,
+      serialized_options=None,
+      type=None,
+      create_key=_descriptor._internal_create_key),
+    _descriptor.EnumValueDescriptor(
+      name='PREDICTION_ORDER_RESOLVES_SOONEST', index=4, number=4,
+      serialized_options=None,
+      type=None,
+      create_key=_descriptor._internal_create_key),
+  ],
+  containing_type=None,
+  serialized_options=None,
+  serialized_start=5473,
+  serialized_end=5656,
+)
+_sym_db.RegisterEnumDescriptor(_PREDICTIONORDER)
+
+PredictionOrder = enum_type_wrapper.EnumTypeWrapper(_PREDICTIONORDER)
+_PREDICTIONPROJECTION = _descriptor.EnumDescriptor(
+  name='PredictionProjection',
+  full_name='biatob.proto.mvp.PredictionProjection',
+  filename=None,
+  file=DESCRIPTOR,
+  create_key=_descriptor._internal_create_key,
+  values=[
+    _descriptor.EnumValueDescriptor(
+      name='PREDICTION_PROJECTION_FULL', index=0, number=0,
+      serialized_options=None,
+      type=None,
+      create_key=_descriptor._internal_create_key),
+    _descriptor.EnumValueDescriptor(
+      name='PREDICTION_PROJECTION_SUMMARY', index=1, number=1,
+      serialized_options=None,
+      type=None,
+      create_key=_descriptor._internal_create_key),
+  ],
+  containing_type=None,
+  serialized_options=None,
+  serialized_start=5658,
+  serialized_end=5747,
+)
+_sym_db.RegisterEnumDescriptor(_PREDICTIONPROJECTION)
+
+PredictionProjection = enum_type_wrapper.EnumTypeWrapper(_PREDICTIONPROJECTION)
 TRADE_STATE_ACTIVE = 0
 TRADE_STATE_QUEUED = 1
 TRADE_STATE_DISAVOWED = 2
@@ -187,6 +254,13 @@ PREDICTION_VIEW_PRIVACY_ANYBODY_WITH_THE_LINK = 1
 PREDICTION_FOLLOWING_NOT_FOLLOWING = 0
 PREDICTION_FOLLOWING_FOLLOWING = 1
 PREDICTION_FOLLOWING_MANDATORY_BECAUSE_STAKED = 2
+PREDICTION_ORDER_CREATED = 0
+PREDICTION_ORDER_CLOSES = 1
+PREDICTION_ORDER_RESOLVES = 2
+PREDICTION_ORDER_CLOSES_SOONEST = 3
+PREDICTION_ORDER_RESOLVES_SOONEST = 4
+PREDICTION_PROJECTION_FULL = 0
+PREDICTION_PROJECTION_SUMMARY = 1
 
 
 
@@ -1226,6 +1300,154 @@ _USERPREDICTIONVIEW = _descriptor.Descriptor(
 )
 
 
+_PREDICTIONSUMMARY = _descriptor.Descriptor(
+  name='PredictionSummary',
+  full_name='biatob.proto.mvp.PredictionSummary',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='prediction', full_name='biatob.proto.mvp.PredictionSummary.prediction', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='certainty', full_name='biatob.proto.mvp.PredictionSummary.certainty', index=1,
+      number=2, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='maximum_stake_cents', full_name='biatob.proto.mvp.PredictionSummary.maximum_stake_cents', index=2,
+      number=3, type=13, cpp_type=3, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='remaining_stake_cents_vs_believers', full_name='biatob.proto.mvp.PredictionSummary.remaining_stake_cents_vs_believers', index=3,
+      number=4, type=13, cpp_type=3, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='remaining_stake_cents_vs_skeptics', full_name='biatob.proto.mvp.PredictionSummary.remaining_stake_cents_vs_skeptics', index=4,
+      number=5, type=13, cpp_type=3, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='created_unixtime', full_name='biatob.proto.mvp.PredictionSummary.created_unixtime', index=5,
+      number=6, type=1, cpp_type=5, label=1,
+      has_default_value=False, default_value=float(0),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='closes_unixtime', full_name='biatob.proto.mvp.PredictionSummary.closes_unixtime', index=6,
+      number=7, type=1, cpp_type=5, label=1,
+      has_default_value=False, default_value=float(0),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='resolves_at_unixtime', full_name='biatob.proto.mvp.PredictionSummary.resolves_at_unixtime', index=7,
+      number=8, type=1, cpp_type=5, label=1,
+      has_default_value=False, default_value=float(0),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='creator', full_name='biatob.proto.mvp.PredictionSummary.creator', index=8,
+      number=9, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='resolution', full_name='biatob.proto.mvp.PredictionSummary.resolution', index=9,
+      number=10, type=14, cpp_type=8, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=2484,
+  serialized_end=2840,
+)
+
+
+_PREDICTIONUPDATE = _descriptor.Descriptor(
+  name='PredictionUpdate',
+  full_name='biatob.proto.mvp.PredictionUpdate',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='remaining_stake_cents_vs_believers', full_name='biatob.proto.mvp.PredictionUpdate.remaining_stake_cents_vs_believers', index=0,
+      number=1, type=13, cpp_type=3, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='remaining_stake_cents_vs_skeptics', full_name='biatob.proto.mvp.PredictionUpdate.remaining_stake_cents_vs_skeptics', index=1,
+      number=2, type=13, cpp_type=3, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='resolution', full_name='biatob.proto.mvp.PredictionUpdate.resolution', index=2,
+      number=3, type=14, cpp_type=8, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='num_active_trades', full_name='biatob.proto.mvp.PredictionUpdate.num_active_trades', index=3,
+      number=4, type=13, cpp_type=3, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=2843,
+  serialized_end=3025,
+)
+
+
 _LISTMYSTAKESREQUEST = _descriptor.Descriptor(
   name='ListMyStakesRequest',
   full_name='biatob.proto.mvp.ListMyStakesRequest',
@@ -1234,6 +1456,34 @@ _LISTMYSTAKESREQUEST = _descriptor.Descriptor(
   containing_type=None,
   create_key=_descriptor._internal_create_key,
   fields=[
+    _descriptor.FieldDescriptor(
+      name='limit', full_name='biatob.proto.mvp.ListMyStakesRequest.limit', index=0,
+      number=1, type=13, cpp_type=3, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='cursor', full_name='biatob.proto.mvp.ListMyStakesRequest.cursor', index=1,
+      number=2, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='order', full_name='biatob.proto.mvp.ListMyStakesRequest.order', index=2,
+      number=3, type=14, cpp_type=8, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='projection', full_name='biatob.proto.mvp.ListMyStakesRequest.projection', index=3,
+      number=4, type=14, cpp_type=8, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
   ],
   extensions=[
   ],
@@ -1246,8 +1496,8 @@ _LISTMYSTAKESREQUEST = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=2483,
-  serialized_end=2504,
+  serialized_start=3028,
+  serialized_end=3190,
 )
 
 
@@ -1285,8 +1535,46 @@ _PREDICTIONSBYID_PREDICTIONSENTRY = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=2599,
-  serialized_end=2687,
+  serialized_start=3375,
+  serialized_end=3463,
+)
+
+_PREDICTIONSBYID_SUMMARIESENTRY = _descriptor.Descriptor(
+  name='SummariesEntry',
+  full_name='biatob.proto.mvp.PredictionsById.SummariesEntry',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='key', full_name='biatob.proto.mvp.PredictionsById.SummariesEntry.key', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='value', full_name='biatob.proto.mvp.PredictionsById.SummariesEntry.value', index=1,
+      number=2, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=b'8\001',
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=3465,
+  serialized_end=3550,
 )
 
 _PREDICTIONSBYID = _descriptor.Descriptor(
@@ -1304,10 +1592,24 @@ _PREDICTIONSBYID = _descriptor.Descriptor(
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='summaries', full_name='biatob.proto.mvp.PredictionsById.summaries', index=1,
+      number=3, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='next_cursor', full_name='biatob.proto.mvp.PredictionsById.next_cursor', index=2,
+      number=2, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
   ],
   extensions=[
   ],
-  nested_types=[_PREDICTIONSBYID_PREDICTIONSENTRY, ],
+  nested_types=[_PREDICTIONSBYID_PREDICTIONSENTRY, _PREDICTIONSBYID_SUMMARIESENTRY, ],
   enum_types=[
   ],
   serialized_options=None,
@@ -1316,8 +1618,8 @@ _PREDICTIONSBYID = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=2507,
-  serialized_end=2687,
+  serialized_start=3193,
+  serialized_end=3550,
 )
 
 
@@ -1336,6 +1638,34 @@ _LISTPREDICTIONSREQUEST = _descriptor.Descriptor(
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='limit', full_name='biatob.proto.mvp.ListPredictionsRequest.limit', index=1,
+      number=3, type=13, cpp_type=3, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='cursor', full_name='biatob.proto.mvp.ListPredictionsRequest.cursor', index=2,
+      number=4, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='order', full_name='biatob.proto.mvp.ListPredictionsRequest.order', index=3,
+      number=5, type=14, cpp_type=8, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='projection', full_name='biatob.proto.mvp.ListPredictionsRequest.projection', index=4,
+      number=6, type=14, cpp_type=8, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
   ],
   extensions=[
   ],
@@ -1348,8 +1678,8 @@ _LISTPREDICTIONSREQUEST = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=2689,
-  serialized_end=2730,
+  serialized_start=3553,
+  serialized_end=3735,
 )
 
 
@@ -1387,8 +1717,8 @@ _FOLLOWREQUEST = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=2732,
-  serialized_end=2786,
+  serialized_start=3737,
+  serialized_end=3791,
 )
 
 
@@ -1433,8 +1763,8 @@ _STAKEREQUEST = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=2788,
-  serialized_end=2882,
+  serialized_start=3793,
+  serialized_end=3887,
 )
 
 
@@ -1479,8 +1809,8 @@ _RESOLVEREQUEST = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=2884,
-  serialized_end=2988,
+  serialized_start=3889,
+  serialized_end=3993,
 )
 
 
@@ -1518,8 +1848,8 @@ _SETTRUSTEDREQUEST = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=2990,
-  serialized_end=3039,
+  serialized_start=3995,
+  serialized_end=4044,
 )
 
 
@@ -1550,8 +1880,8 @@ _GETUSERREQUEST = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=3041,
-  serialized_end=3070,
+  serialized_start=4046,
+  serialized_end=4075,
 )
 
 
@@ -1589,8 +1919,8 @@ _CHANGEPASSWORDREQUEST = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=3072,
-  serialized_end=3139,
+  serialized_start=4077,
+  serialized_end=4144,
 )
 
 
@@ -1621,8 +1951,8 @@ _GETSETTINGSREQUEST = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=3141,
-  serialized_end=3203,
+  serialized_start=4146,
+  serialized_end=4208,
 )
 
 
@@ -1653,8 +1983,8 @@ _SENDINVITATIONREQUEST = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=3205,
-  serialized_end=3247,
+  serialized_start=4210,
+  serialized_end=4252,
 )
 
 
@@ -1685,8 +2015,8 @@ _CHECKINVITATIONREQUEST = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=3249,
-  serialized_end=3288,
+  serialized_start=4254,
+  serialized_end=4293,
 )
 
 
@@ -1724,8 +2054,8 @@ _CHECKINVITATIONRESPONSE = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=3290,
-  serialized_end=3351,
+  serialized_start=4295,
+  serialized_end=4356,
 )
 
 
@@ -1756,8 +2086,160 @@ _ACCEPTINVITATIONREQUEST = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=3353,
-  serialized_end=3393,
+  serialized_start=4358,
+  serialized_end=4398,
+)
+
+
+_BATCHREQUEST_CALL = _descriptor.Descriptor(
+  name='Call',
+  full_name='biatob.proto.mvp.BatchRequest.Call',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='method', full_name='biatob.proto.mvp.BatchRequest.Call.method', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='request', full_name='biatob.proto.mvp.BatchRequest.Call.request', index=1,
+      number=2, type=12, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"",
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=4468,
+  serialized_end=4507,
+)
+
+_BATCHREQUEST = _descriptor.Descriptor(
+  name='BatchRequest',
+  full_name='biatob.proto.mvp.BatchRequest',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='calls', full_name='biatob.proto.mvp.BatchRequest.calls', index=0,
+      number=1, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[_BATCHREQUEST_CALL, ],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=4400,
+  serialized_end=4507,
+)
+
+
+_BATCHRESPONSE_RESULT = _descriptor.Descriptor(
+  name='Result',
+  full_name='biatob.proto.mvp.BatchResponse.Result',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='http_status', full_name='biatob.proto.mvp.BatchResponse.Result.http_status', index=0,
+      number=3, type=13, cpp_type=3, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='ok', full_name='biatob.proto.mvp.BatchResponse.Result.ok', index=1,
+      number=1, type=12, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"",
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='error', full_name='biatob.proto.mvp.BatchResponse.Result.error', index=2,
+      number=2, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+    _descriptor.OneofDescriptor(
+      name='outcome', full_name='biatob.proto.mvp.BatchResponse.Result.outcome',
+      index=0, containing_type=None,
+      create_key=_descriptor._internal_create_key,
+    fields=[]),
+  ],
+  serialized_start=4584,
+  serialized_end=4688,
+)
+
+_BATCHRESPONSE = _descriptor.Descriptor(
+  name='BatchResponse',
+  full_name='biatob.proto.mvp.BatchResponse',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='results', full_name='biatob.proto.mvp.BatchResponse.results', index=0,
+      number=1, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[_BATCHRESPONSE_RESULT, ],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=4510,
+  serialized_end=4688,
 )
 
 
@@ -1844,8 +2326,8 @@ _SAVEDCREATEDPREDICTIONFORMSTATE = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=3396,
-  serialized_end=3664,
+  serialized_start=4691,
+  serialized_end=4959,
 )
 
 _GENERICUSERINFO_INVITATIONSENTRY.fields_by_name['value'].message_type = _GENERICUSERINFO_INVITATION
@@ -1870,10 +2352,31 @@ _USERPREDICTIONVIEW.fields_by_name['certainty'].message_type = _CERTAINTYRANGE
 _USERPREDICTIONVIEW.fields_by_name['resolution'].message_type = _RESOLUTIONEVENT
 _USERPREDICTIONVIEW.fields_by_name['your_trades'].message_type = _TRADE
 _USERPREDICTIONVIEW.fields_by_name['your_following_status'].enum_type = _PREDICTIONFOLLOWINGSTATUS
+_PREDICTIONSUMMARY.fields_by_name['certainty'].message_type = _CERTAINTYRANGE
+_PREDICTIONSUMMARY.fields_by_name['resolution'].enum_type = _RESOLUTION
+_PREDICTIONUPDATE.fields_by_name['resolution'].enum_type = _RESOLUTION
+_LISTMYSTAKESREQUEST.fields_by_name['order'].enum_type = _PREDICTIONORDER
+_LISTMYSTAKESREQUEST.fields_by_name['projection'].enum_type = _PREDICTIONPROJECTION
 _PREDICTIONSBYID_PREDICTIONSENTRY.fields_by_name['value'].message_type = _USERPREDICTIONVIEW
 _PREDICTIONSBYID_PREDICTIONSENTRY.containing_type = _PREDICTIONSBYID
+_PREDICTIONSBYID_SUMMARIESENTRY.fields_by_name['value'].message_type = _PREDICTIONSUMMARY
+_PREDICTIONSBYID_SUMMARIESENTRY.containing_type = _PREDICTIONSBYID
 _PREDICTIONSBYID.fields_by_name['predictions'].message_type = _PREDICTIONSBYID_PREDICTIONSENTRY
+_PREDICTIONSBYID.fields_by_name['summaries'].message_type = _PREDICTIONSBYID_SUMMARIESENTRY
+_LISTPREDICTIONSREQUEST.fields_by_name['order'].enum_type = _PREDICTIONORDER
+_LISTPREDICTIONSREQUEST.fields_by_name['projection'].enum_type = _PREDICTIONPROJECTION
 _RESOLVEREQUEST.fields_by_name['resolution'].enum_type = _RESOLUTION
+_BATCHREQUEST_CALL.containing_type = _BATCHREQUEST
+_BATCHREQUEST.fields_by_name['calls'].message_type = _BATCHREQUEST_CALL
+_BATCHRESPONSE_RESULT.fields_by_name['error'].message_type = _ERRORRESPONSE
+_BATCHRESPONSE_RESULT.containing_type = _BATCHRESPONSE
+_BATCHRESPONSE_RESULT.oneofs_by_name['outcome'].fields.append(
+  _BATCHRESPONSE_RESULT.fields_by_name['ok'])
+_BATCHRESPONSE_RESULT.fields_by_name['ok'].containing_oneof = _BATCHRESPONSE_RESULT.oneofs_by_name['outcome']
+_BATCHRESPONSE_RESULT.oneofs_by_name['outcome'].fields.append(
+  _BATCHRESPONSE_RESULT.fields_by_name['error'])
+_BATCHRESPONSE_RESULT.fields_by_name['error'].containing_oneof = _BATCHRESPONSE_RESULT.oneofs_by_name['outcome']
+_BATCHRESPONSE.fields_by_name['results'].message_type = _BATCHRESPONSE_RESULT
 DESCRIPTOR.message_types_by_name['AuthToken'] = _AUTHTOKEN
 DESCRIPTOR.message_types_by_name['HashedPassword'] = _HASHEDPASSWORD
 DESCRIPTOR.message_types_by_name['GenericUserInfo'] = _GENERICUSERINFO
@@ -1895,6 +2398,8 @@ DESCRIPTOR.message_types_by_name['CreatePredictionRequest'] = _CREATEPREDICTIONR
 DESCRIPTOR.message_types_by_name['CreatePredictionResponse'] = _CREATEPREDICTIONRESPONSE
 DESCRIPTOR.message_types_by_name['GetPredictionRequest'] = _GETPREDICTIONREQUEST
 DESCRIPTOR.message_types_by_name['UserPredictionView'] = _USERPREDICTIONVIEW
+DESCRIPTOR.message_types_by_name['PredictionSummary'] = _PREDICTIONSUMMARY
+DESCRIPTOR.message_types_by_name['PredictionUpdate'] = _PREDICTIONUPDATE
 DESCRIPTOR.message_types_by_name['ListMyStakesRequest'] = _LISTMYSTAKESREQUEST
 DESCRIPTOR.message_types_by_name['PredictionsById'] = _PREDICTIONSBYID
 DESCRIPTOR.message_types_by_name['ListPredictionsRequest'] = _LISTPREDICTIONSREQUEST
@@ -1909,12 +2414,16 @@ DESCRIPTOR.message_types_by_name['SendInvitationRequest'] = _SENDINVITATIONREQUE
 DESCRIPTOR.message_types_by_name['CheckInvitationRequest'] = _CHECKINVITATIONREQUEST
 DESCRIPTOR.message_types_by_name['CheckInvitationResponse'] = _CHECKINVITATIONRESPONSE
 DESCRIPTOR.message_types_by_name['AcceptInvitationRequest'] = _ACCEPTINVITATIONREQUEST
+DESCRIPTOR.message_types_by_name['BatchRequest'] = _BATCHREQUEST
+DESCRIPTOR.message_types_by_name['BatchResponse'] = _BATCHRESPONSE
 DESCRIPTOR.message_types_by_name['SavedCreatedPredictionFormState'] = _SAVEDCREATEDPREDICTIONFORMSTATE
 DESCRIPTOR.enum_types_by_name['TradeState'] = _TRADESTATE
 DESCRIPTOR.enum_types_by_name['Void'] = _VOID
 DESCRIPTOR.enum_types_by_name['Resolution'] = _RESOLUTION
 DESCRIPTOR.enum_types_by_name['PredictionViewPrivacy'] = _PREDICTIONVIEWPRIVACY
 DESCRIPTOR.enum_types_by_name['PredictionFollowingStatus'] = _PREDICTIONFOLLOWINGSTATUS
+DESCRIPTOR.enum_types_by_name['PredictionOrder'] = _PREDICTIONORDER
+DESCRIPTOR.enum_types_by_name['PredictionProjection'] = _PREDICTIONPROJECTION
 _sym_db.RegisterFileDescriptor(DESCRIPTOR)
 
 AuthToken = _reflection.GeneratedProtocolMessageType('AuthToken', (_message.Message,), {
@@ -2088,6 +2597,20 @@ UserPredictionView = _reflection.GeneratedProtocolMessageType('UserPredictionVie
   })
 _sym_db.RegisterMessage(UserPredictionView)
 
+PredictionSummary = _reflection.GeneratedProtocolMessageType('PredictionSummary', (_message.Message,), {
+  'DESCRIPTOR' : _PREDICTIONSUMMARY,
+  '__module__' : 'protobuf.mvp_pb2'
+  # @@protoc_insertion_point(class_scope:biatob.proto.mvp.PredictionSummary)
+  })
+_sym_db.RegisterMessage(PredictionSummary)
+
+PredictionUpdate = _reflection.GeneratedProtocolMessageType('PredictionUpdate', (_message.Message,), {
+  'DESCRIPTOR' : _PREDICTIONUPDATE,
+  '__module__' : 'protobuf.mvp_pb2'
+  # @@protoc_insertion_point(class_scope:biatob.proto.mvp.PredictionUpdate)
+  })
+_sym_db.RegisterMessage(PredictionUpdate)
+
 ListMyStakesRequest = _reflection.GeneratedProtocolMessageType('ListMyStakesRequest', (_message.Message,), {
   'DESCRIPTOR' : _LISTMYSTAKESREQUEST,
   '__module__' : 'protobuf.mvp_pb2'
@@ -2103,12 +2626,20 @@ PredictionsById = _reflection.GeneratedProtocolMessageType('PredictionsById', (_
     # @@protoc_insertion_point(class_scope:biatob.proto.mvp.PredictionsById.PredictionsEntry)
     })
   ,
+
+  'SummariesEntry' : _reflection.GeneratedProtocolMessageType('SummariesEntry', (_message.Message,), {
+    'DESCRIPTOR' : _PREDICTIONSBYID_SUMMARIESENTRY,
+    '__module__' : 'protobuf.mvp_pb2'
+    # @@protoc_insertion_point(class_scope:biatob.proto.mvp.PredictionsById.SummariesEntry)
+    })
+  ,
   'DESCRIPTOR' : _PREDICTIONSBYID,
   '__module__' : 'protobuf.mvp_pb2'
   # @@protoc_insertion_point(class_scope:biatob.proto.mvp.PredictionsById)
   })
 _sym_db.RegisterMessage(PredictionsById)
 _sym_db.RegisterMessage(PredictionsById.PredictionsEntry)
+_sym_db.RegisterMessage(PredictionsById.SummariesEntry)
 
 ListPredictionsRequest = _reflection.GeneratedProtocolMessageType('ListPredictionsRequest', (_message.Message,), {
   'DESCRIPTOR' : _LISTPREDICTIONSREQUEST,
@@ -2194,6 +2725,36 @@ AcceptInvitationRequest = _reflection.GeneratedProtocolMessageType('AcceptInvita
   })
 _sym_db.RegisterMessage(AcceptInvitationRequest)
 
+BatchRequest = _reflection.GeneratedProtocolMessageType('BatchRequest', (_message.Message,), {
+
+  'Call' : _reflection.GeneratedProtocolMessageType('Call', (_message.Message,), {
+    'DESCRIPTOR' : _BATCHREQUEST_CALL,
+    '__module__' : 'protobuf.mvp_pb2'
+    # @@protoc_insertion_point(class_scope:biatob.proto.mvp.BatchRequest.Call)
+    })
+  ,
+  'DESCRIPTOR' : _BATCHREQUEST,
+  '__module__' : 'protobuf.mvp_pb2'
+  # @@protoc_insertion_point(class_scope:biatob.proto.mvp.BatchRequest)
+  })
+_sym_db.RegisterMessage(BatchRequest)
+_sym_db.RegisterMessage(BatchRequest.Call)
+
+BatchResponse = _reflection.GeneratedProtocolMessageType('BatchResponse', (_message.Message,), {
+
+  'Result' : _reflection.GeneratedProtocolMessageType('Result', (_message.Message,), {
+    'DESCRIPTOR' : _BATCHRESPONSE_RESULT,
+    '__module__' : 'protobuf.mvp_pb2'
+    # @@protoc_insertion_point(class_scope:biatob.proto.mvp.BatchResponse.Result)
+    })
+  ,
+  'DESCRIPTOR' : _BATCHRESPONSE,
+  '__module__' : 'protobuf.mvp_pb2'
+  # @@protoc_insertion_point(class_scope:biatob.proto.mvp.BatchResponse)
+  })
+_sym_db.RegisterMessage(BatchResponse)
+_sym_db.RegisterMessage(BatchResponse.Result)
+
 SavedCreatedPredictionFormState = _reflection.GeneratedProtocolMessageType('SavedCreatedPredictionFormState', (_message.Message,), {
   'DESCRIPTOR' : _SAVEDCREATEDPREDICTIONFORMSTATE,
   '__module__' : 'protobuf.mvp_pb2'
@@ -2205,4 +2766,5 @@ _sym_db.RegisterMessage(SavedCreatedPredictionFormState)
 _GENERICUSERINFO_INVITATIONSENTRY._options = None
 _GENERICUSERINFO_RELATIONSHIPSENTRY._options = None
 _PREDICTIONSBYID_PREDICTIONSENTRY._options = None
+_PREDICTIONSBYID_SUMMARIESENTRY._options = None
 # @@protoc_insertion_point(module_scope)
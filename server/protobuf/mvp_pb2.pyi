@@ -85,6 +85,38 @@ class _PredictionFollowingStatus(google.protobuf.internal.enum_type_wrapper._Enu
     PREDICTION_FOLLOWING_FOLLOWING = PredictionFollowingStatus.V(1)
     PREDICTION_FOLLOWING_MANDATORY_BECAUSE_STAKED = PredictionFollowingStatus.V(2)
 
+class PredictionOrder(metaclass=_PredictionOrder):
+    V = typing.NewType('V', builtins.int)
+
+global___PredictionOrder = PredictionOrder
+
+PREDICTION_ORDER_CREATED = PredictionOrder.V(0)
+PREDICTION_ORDER_CLOSES = PredictionOrder.V(1)
+PREDICTION_ORDER_RESOLVES = PredictionOrder.V(2)
+PREDICTION_ORDER_CLOSES_SOONEST = PredictionOrder.V(3)
+PREDICTION_ORDER_RESOLVES_SOONEST = PredictionOrder.V(4)
+
+class _PredictionOrder(google.protobuf.internal.enum_type_wrapper._EnumTypeWrapper[PredictionOrder.V], builtins.type):
+    DESCRIPTOR: google.protobuf.descriptor.EnumDescriptor = ...
+    PREDICTION_ORDER_CREATED = PredictionOrder.V(0)
+    PREDICTION_ORDER_CLOSES = PredictionOrder.V(1)
+    PREDICTION_ORDER_RESOLVES = PredictionOrder.V(2)
+    PREDICTION_ORDER_CLOSES_SOONEST = PredictionOrder.V(3)
+    PREDICTION_ORDER_RESOLVES_SOONEST = PredictionOrder.V(4)
+
+class PredictionProjection(metaclass=_PredictionProjection):
+    V = typing.NewType('V', builtins.int)
+
+global___PredictionProjection = PredictionProjection
+
+PREDICTION_PROJECTION_FULL = PredictionProjection.V(0)
+PREDICTION_PROJECTION_SUMMARY = PredictionProjection.V(1)
+
+class _PredictionProjection(google.protobuf.internal.enum_type_wrapper._EnumTypeWrapper[PredictionProjection.V], builtins.type):
+    DESCRIPTOR: google.protobuf.descriptor.EnumDescriptor = ...
+    PREDICTION_PROJECTION_FULL = PredictionProjection.V(0)
+    PREDICTION_PROJECTION_SUMMARY = PredictionProjection.V(1)
+
 class AuthToken(google.protobuf.message.Message):
     DESCRIPTOR: google.protobuf.descriptor.Descriptor = ...
     HMAC_OF_REST_FIELD_NUMBER: builtins.int
@@ -506,11 +538,88 @@ class UserPredictionView(google.protobuf.message.Message):
     def ClearField(self, field_name: typing_extensions.Literal[u"certainty",b"certainty",u"closes_unixtime",b"closes_unixtime",u"created_unixtime",b"created_unixtime",u"creator",b"creator",u"maximum_stake_cents",b"maximum_stake_cents",u"prediction",b"prediction",u"remaining_stake_cents_vs_believers",b"remaining_stake_cents_vs_believers",u"remaining_stake_cents_vs_skeptics",b"remaining_stake_cents_vs_skeptics",u"resolution",b"resolution",u"resolves_at_unixtime",b"resolves_at_unixtime",u"special_rules",b"special_rules",u"your_following_status",b"your_following_status",u"your_trades",b"your_trades"]) -> None: ...
 global___UserPredictionView = UserPredictionView
 
+class PredictionSummary(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor = ...
+    PREDICTION_FIELD_NUMBER: builtins.int
+    CERTAINTY_FIELD_NUMBER: builtins.int
+    MAXIMUM_STAKE_CENTS_FIELD_NUMBER: builtins.int
+    REMAINING_STAKE_CENTS_VS_BELIEVERS_FIELD_NUMBER: builtins.int
+    REMAINING_STAKE_CENTS_VS_SKEPTICS_FIELD_NUMBER: builtins.int
+    CREATED_UNIXTIME_FIELD_NUMBER: builtins.int
+    CLOSES_UNIXTIME_FIELD_NUMBER: builtins.int
+    RESOLVES_AT_UNIXTIME_FIELD_NUMBER: builtins.int
+    CREATOR_FIELD_NUMBER: builtins.int
+    RESOLUTION_FIELD_NUMBER: builtins.int
+    prediction: typing.Text = ...
+    maximum_stake_cents: builtins.int = ...
+    remaining_stake_cents_vs_believers: builtins.int = ...
+    remaining_stake_cents_vs_skeptics: builtins.int = ...
+    created_unixtime: builtins.float = ...
+    closes_unixtime: builtins.float = ...
+    resolves_at_unixtime: builtins.float = ...
+    creator: typing.Text = ...
+    resolution: global___Resolution.V = ...
+
+    @property
+    def certainty(self) -> global___CertaintyRange: ...
+
+    def __init__(self,
+        *,
+        prediction : typing.Text = ...,
+        certainty : typing.Optional[global___CertaintyRange] = ...,
+        maximum_stake_cents : builtins.int = ...,
+        remaining_stake_cents_vs_believers : builtins.int = ...,
+        remaining_stake_cents_vs_skeptics : builtins.int = ...,
+        created_unixtime : builtins.float = ...,
+        closes_unixtime : builtins.float = ...,
+        resolves_at_unixtime : builtins.float = ...,
+        creator : typing.Text = ...,
+        resolution : global___Resolution.V = ...,
+        ) -> None: ...
+    def HasField(self, field_name: typing_extensions.Literal[u"certainty",b"certainty"]) -> builtins.bool: ...
+    def ClearField(self, field_name: typing_extensions.Literal[u"certainty",b"certainty",u"closes_unixtime",b"closes_unixtime",u"created_unixtime",b"created_unixtime",u"creator",b"creator",u"maximum_stake_cents",b"maximum_stake_cents",u"prediction",b"prediction",u"remaining_stake_cents_vs_believers",b"remaining_stake_cents_vs_believers",u"remaining_stake_cents_vs_skeptics",b"remaining_stake_cents_vs_skeptics",u"resolution",b"resolution",u"resolves_at_unixtime",b"resolves_at_unixtime"]) -> None: ...
+global___PredictionSummary = PredictionSummary
+
+class PredictionUpdate(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor = ...
+    REMAINING_STAKE_CENTS_VS_BELIEVERS_FIELD_NUMBER: builtins.int
+    REMAINING_STAKE_CENTS_VS_SKEPTICS_FIELD_NUMBER: builtins.int
+    RESOLUTION_FIELD_NUMBER: builtins.int
+    NUM_ACTIVE_TRADES_FIELD_NUMBER: builtins.int
+    remaining_stake_cents_vs_believers: builtins.int = ...
+    remaining_stake_cents_vs_skeptics: builtins.int = ...
+    resolution: global___Resolution.V = ...
+    num_active_trades: builtins.int = ...
+
+    def __init__(self,
+        *,
+        remaining_stake_cents_vs_believers : builtins.int = ...,
+        remaining_stake_cents_vs_skeptics : builtins.int = ...,
+        resolution : global___Resolution.V = ...,
+        num_active_trades : builtins.int = ...,
+        ) -> None: ...
+    def ClearField(self, field_name: typing_extensions.Literal[u"num_active_trades",b"num_active_trades",u"remaining_stake_cents_vs_believers",b"remaining_stake_cents_vs_believers",u"remaining_stake_cents_vs_skeptics",b"remaining_stake_cents_vs_skeptics",u"resolution",b"resolution"]) -> None: ...
+global___PredictionUpdate = PredictionUpdate
+
 class ListMyStakesRequest(google.protobuf.message.Message):
     DESCRIPTOR: google.protobuf.descriptor.Descriptor = ...
+    LIMIT_FIELD_NUMBER: builtins.int
+    CURSOR_FIELD_NUMBER: builtins.int
+    ORDER_FIELD_NUMBER: builtins.int
+    PROJECTION_FIELD_NUMBER: builtins.int
+    limit: builtins.int = ...
+    cursor: typing.Text = ...
+    order: global___PredictionOrder.V = ...
+    projection: global___PredictionProjection.V = ...
 
     def __init__(self,
+        *,
+        limit : builtins.int = ...,
+        cursor : typing.Text = ...,
+        order : global___PredictionOrder.V = ...,
+        projection : global___PredictionProjection.V = ...,
         ) -> None: ...
+    def ClearField(self, field_name: typing_extensions.Literal[u"cursor",b"cursor",u"limit",b"limit",u"order",b"order",u"projection",b"projection"]) -> None: ...
 global___ListMyStakesRequest = ListMyStakesRequest
 
 class PredictionsById(google.protobuf.message.Message):
@@ -532,28 +641,65 @@ class PredictionsById(google.protobuf.message.Message):
         def HasField(self, field_name: typing_extensions.Literal[u"value",b"value"]) -> builtins.bool: ...
         def ClearField(self, field_name: typing_extensions.Literal[u"key",b"key",u"value",b"value"]) -> None: ...
 
+    class SummariesEntry(google.protobuf.message.Message):
+        DESCRIPTOR: google.protobuf.descriptor.Descriptor = ...
+        KEY_FIELD_NUMBER: builtins.int
+        VALUE_FIELD_NUMBER: builtins.int
+        key: typing.Text = ...
+
+        @property
+        def value(self) -> global___PredictionSummary: ...
+
+        def __init__(self,
+            *,
+            key : typing.Text = ...,
+            value : typing.Optional[global___PredictionSummary] = ...,
+            ) -> None: ...
+        def HasField(self, field_name: typing_extensions.Literal[u"value",b"value"]) -> builtins.bool: ...
+        def ClearField(self, field_name: typing_extensions.Literal[u"key",b"key",u"value",b"value"]) -> None: ...
+
     PREDICTIONS_FIELD_NUMBER: builtins.int
+    SUMMARIES_FIELD_NUMBER: builtins.int
+    NEXT_CURSOR_FIELD_NUMBER: builtins.int
+    next_cursor: typing.Text = ...
 
     @property
     def predictions(self) -> google.protobuf.internal.containers.MessageMap[typing.Text, global___UserPredictionView]: ...
 
+    @property
+    def summaries(self) -> google.protobuf.internal.containers.MessageMap[typing.Text, global___PredictionSummary]: ...
+
     def __init__(self,
         *,
         predictions : typing.Optional[typing.Mapping[typing.Text, global___UserPredictionView]] = ...,
+        summaries : typing.Optional[typing.Mapping[typing.Text, global___PredictionSummary]] = ...,
+        next_cursor : typing.Text = ...,
         ) -> None: ...
-    def ClearField(self, field_name: typing_extensions.Literal[u"predictions",b"predictions"]) -> None: ...
+    def ClearField(self, field_name: typing_extensions.Literal[u"next_cursor",b"next_cursor",u"predictions",b"predictions",u"summaries",b"summaries"]) -> None: ...
 global___PredictionsById = PredictionsById
 
 class ListPredictionsRequest(google.protobuf.message.Message):
     DESCRIPTOR: google.protobuf.descriptor.Descriptor = ...
     CREATOR_FIELD_NUMBER: builtins.int
+    LIMIT_FIELD_NUMBER: builtins.int
+    CURSOR_FIELD_NUMBER: builtins.int
+    ORDER_FIELD_NUMBER: builtins.int
+    PROJECTION_FIELD_NUMBER: builtins.int
     creator: typing.Text = ...
+    limit: builtins.int = ...
+    cursor: typing.Text = ...
+    order: global___PredictionOrder.V = ...
+    projection: global___PredictionProjection.V = ...
 
     def __init__(self,
         *,
         creator : typing.Text = ...,
+        limit : builtins.int = ...,
+        cursor : typing.Text = ...,
+        order : global___PredictionOrder.V = ...,
+        projection : global___PredictionProjection.V = ...,
         ) -> None: ...
-    def ClearField(self, field_name: typing_extensions.Literal[u"creator",b"creator"]) -> None: ...
+    def ClearField(self, field_name: typing_extensions.Literal[u"creator",b"creator",u"cursor",b"cursor",u"limit",b"limit",u"order",b"order",u"projection",b"projection"]) -> None: ...
 global___ListPredictionsRequest = ListPredictionsRequest
 
 class FollowRequest(google.protobuf.message.Message):
@@ -714,6 +860,69 @@ class AcceptInvitationRequest(google.protobuf.message.Message):
     def ClearField(self, field_name: typing_extensions.Literal[u"nonce",b"nonce"]) -> None: ...
 global___AcceptInvitationRequest = AcceptInvitationRequest
 
+class BatchRequest(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor = ...
+    class Call(google.protobuf.message.Message):
+        DESCRIPTOR: google.protobuf.descriptor.Descriptor = ...
+        METHOD_FIELD_NUMBER: builtins.int
+        REQUEST_FIELD_NUMBER: builtins.int
+        method: typing.Text = ...
+        request: builtins.bytes = ...
+
+        def __init__(self,
+            *,
+            method : typing.Text = ...,
+            request : builtins.bytes = ...,
+            ) -> None: ...
+        def ClearField(self, field_name: typing_extensions.Literal[u"method",b"method",u"request",b"request"]) -> None: ...
+
+    CALLS_FIELD_NUMBER: builtins.int
+
+    @property
+    def calls(self) -> google.protobuf.internal.containers.RepeatedCompositeFieldContainer[global___BatchRequest.Call]: ...
+
+    def __init__(self,
+        *,
+        calls : typing.Optional[typing.Iterable[global___BatchRequest.Call]] = ...,
+        ) -> None: ...
+    def ClearField(self, field_name: typing_extensions.Literal[u"calls",b"calls"]) -> None: ...
+global___BatchRequest = BatchRequest
+
+class BatchResponse(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor = ...
+    class Result(google.protobuf.message.Message):
+        DESCRIPTOR: google.protobuf.descriptor.Descriptor = ...
+        HTTP_STATUS_FIELD_NUMBER: builtins.int
+        OK_FIELD_NUMBER: builtins.int
+        ERROR_FIELD_NUMBER: builtins.int
+        http_status: builtins.int = ...
+        ok: builtins.bytes = ...
+
+        @property
+        def error(self) -> global___ErrorResponse: ...
+
+        def __init__(self,
+            *,
+            http_status : builtins.int = ...,
+            ok : builtins.bytes = ...,
+            error : typing.Optional[global___ErrorResponse] = ...,
+            ) -> None: ...
+        def HasField(self, field_name: typing_extensions.Literal[u"error",b"error",u"ok",b"ok",u"outcome",b"outcome"]) -> builtins.bool: ...
+        def ClearField(self, field_name: typing_extensions.Literal[u"error",b"error",u"http_status",b"http_status",u"ok",b"ok",u"outcome",b"outcome"]) -> None: ...
+        def WhichOneof(self, oneof_group: typing_extensions.Literal[u"outcome",b"outcome"]) -> typing_extensions.Literal["ok","error"]: ...
+
+    RESULTS_FIELD_NUMBER: builtins.int
+
+    @property
+    def results(self) -> google.protobuf.internal.containers.RepeatedCompositeFieldContainer[global___BatchResponse.Result]: ...
+
+    def __init__(self,
+        *,
+        results : typing.Optional[typing.Iterable[global___BatchResponse.Result]] = ...,
+        ) -> None: ...
+    def ClearField(self, field_name: typing_extensions.Literal[u"results",b"results"]) -> None: ...
+global___BatchResponse = BatchResponse
+
 class SavedCreatedPredictionFormState(google.protobuf.message.Message):
     DESCRIPTOR: google.protobuf.descriptor.Descriptor = ...
     PREDICTION_FIELD_FIELD_NUMBER: builtins.int
@@ -0,0 +1,54 @@
+"""Benchmark: per-request CPU cost of producing an embed, PNG vs SVG.
+
+Times (in process CPU time, not wall time) producing the embed for a handful
+of texts and styles, uncached, both ways:
+
+  png  rasterizing with Pillow and encoding the PNG, as the .png route does on a cache miss
+  svg  filling in the SVG template, as the .svg route does on every request
+
+Fonts are loaded before timing starts, as they are in a warmed-up server.
+
+Usage: python -m server.scripts.bench_embeds [--calls=2000]
+"""
+
+import argparse
+import time
+from typing import Callable, Sequence
+
+from ..embeds import Style, render_svg, render_text
+
+parser = argparse.ArgumentParser()
+parser.add_argument('--calls', type=int, default=2000)
+
+TEXTS: Sequence[str] = [
+    '[bet: $50 at 60-70%]',
+    '[bet: $100 at 80%+ ($20/$35 remain)]',
+    '[bet: $5 at 10-20% (resolved: correct)]',
+]
+STYLES: Sequence[str] = ['', '-red-14pt', '-lesswrong', '-black-24pt']
+
+
+def _cpu_per_call(calls: int, f: Callable[[str, Style], bytes]) -> float:
+    styles = [Style.parse(s) for s in STYLES]
+    for text in TEXTS:
+        for style in styles:
+            f(text, style)  # warm the fonts
+    start = time.process_time()
+    for i in range(calls):
+        f(TEXTS[i % len(TEXTS)], styles[i % len(styles)])
+    return (time.process_time() - start) / calls
+
+
+def main(args: argparse.Namespace) -> None:
+    png = _cpu_per_call(args.calls, lambda text, style: render_text(text, style, 'png'))
+    svg = _cpu_per_call(args.calls, render_svg)
+    png_bytes = sum(len(render_text(t, Style.parse(s), 'png')) for t in TEXTS for s in STYLES) / (len(TEXTS) * len(STYLES))
+    svg_bytes = sum(len(render_svg(t, Style.parse(s))) for t in TEXTS for s in STYLES) / (len(TEXTS) * len(STYLES))
+    print(f'{"format":>6}  {"cpu/request":>11}  {"mean size":>9}')
+    print(f'{"png":>6}  {1e6*png:9.1f}us  {png_bytes:7.0f} B')
+    print(f'{"svg":>6}  {1e6*svg:9.1f}us  {svg_bytes:7.0f} B')
+    print(f'svg is {png/svg:.1f}x cheaper')
+
+
+if __name__ == '__main__':
+    main(parser.parse_args())
@@ -0,0 +1,138 @@
+"""Benchmark: how a burst of logins affects everybody else.
+
+Fires a storm of concurrent LogInUsername calls at an in-process server while a
+second client keeps issuing GetPrediction calls, and reports login throughput
+alongside the latency of those unrelated requests. Run under each setup:
+
+  loop       servicers run on the event loop, scrypt inline (the old setup)
+  threads    servicers run in a thread pool, scrypt inline on those threads
+  processes  servicers run in a thread pool, scrypt in a process pool, awaited
+             on the event loop before the servicer call (the current setup)
+
+Usage: python -m server.scripts.bench_login_storm [--logins=200] [--modes=loop,processes]
+"""
+
+import argparse
+import asyncio
+import concurrent.futures
+import contextlib
+import datetime
+from pathlib import Path
+import statistics
+import tempfile
+import time
+from typing import Iterator, List, Optional, Sequence, Tuple
+from unittest.mock import Mock
+
+from aiohttp import DummyCookieJar, web
+from aiohttp.test_utils import TestClient, TestServer
+from google.protobuf.message import Message
+
+from ..api_server import ApiServer
+from ..config import SqliteDatabase
+from ..core import PasswordHasher, PredictionId, TokenMint, Username
+from ..http_glue import HttpTokenGlue
+from ..protobuf import mvp_pb2
+from ..sql_servicer import SqlConn, SqlServicer
+from .. import sql_schema
+
+MODES = ('loop', 'threads', 'processes')
+
+parser = argparse.ArgumentParser()
+parser.add_argument('--logins', type=int, default=200)
+parser.add_argument('--login-concurrency', type=int, default=32)
+parser.add_argument('--servicer-threads', type=int, default=8)
+parser.add_argument('--modes', default=','.join(MODES))
+
+
+@contextlib.contextmanager
+def _mode_resources(mode: str, servicer_threads: int) -> Iterator[Tuple[Optional[concurrent.futures.Executor], PasswordHasher]]:
+    servicer_executor = None if mode == 'loop' else concurrent.futures.ThreadPoolExecutor(max_workers=servicer_threads)
+    password_hasher = PasswordHasher.process_pool() if mode == 'processes' else PasswordHasher()
+    try:
+        yield servicer_executor, password_hasher
+    finally:
+        if servicer_executor is not None:
+            servicer_executor.shutdown()
+        password_hasher.shutdown()
+
+
+def _percentile(xs: Sequence[float], p: float) -> float:
+    xs = sorted(xs)
+    return xs[min(len(xs) - 1, int(len(xs) * p))]
+
+
+async def _post(client: TestClient, method: str, request: Message) -> None:
+    resp = await client.post(f'/api/{method}', data=request.SerializeToString())
+    assert resp.status == 200, (method, resp.status)
+    await resp.read()
+
+
+async def run_mode(mode: str, args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as tmpdir, _mode_resources(mode, args.servicer_threads) as (servicer_executor, password_hasher):
+        engine = sql_schema.create_engine(SqliteDatabase(path=str(Path(tmpdir) / 'bench.db')))
+        sql_schema.metadata.create_all(engine)
+        token_mint = TokenMint(secret_key=b'bench')
+        conn = SqlConn(engine, password_hasher=password_hasher)
+        servicer = SqlServicer(conn=conn, token_mint=token_mint, emailer=Mock(), password_hasher=password_hasher)
+
+        alice = Username('alice')
+        prediction_id = PredictionId('1')
+        now = datetime.datetime.now()
+        with conn.transaction():
+            conn.register_username(alice, password='secret', password_id='alicepwid', email_address='alice@example.com')
+            conn.create_prediction(now, prediction_id, alice, mvp_pb2.CreatePredictionRequest(
+                prediction='a thing will happen',
+                certainty=mvp_pb2.CertaintyRange(low=0.4, high=0.6),
+                maximum_stake_cents=100_00,
+                open_seconds=86400,
+                resolves_at_unixtime=now.timestamp() + 2*86400,
+            ))
+
+        app = web.Application()
+        ApiServer(
+            token_glue=HttpTokenGlue(token_mint), servicer=servicer, executor=servicer_executor,
+            password_hasher=password_hasher if (mode == 'processes') else None,
+        ).add_to_app(app)
+        # Every login is from a fresh anonymous client, so don't keep the auth cookie.
+        async with TestClient(TestServer(app), cookie_jar=DummyCookieJar()) as login_client, TestClient(TestServer(app)) as reader_client:
+            storm_done = asyncio.Event()
+            latencies: List[float] = []
+
+            async def read_forever() -> None:
+                while not storm_done.is_set():
+                    start = time.perf_counter()
+                    await _post(reader_client, 'GetPrediction', mvp_pb2.GetPredictionRequest(prediction_id=prediction_id))
+                    latencies.append(time.perf_counter() - start)
+
+            sem = asyncio.Semaphore(args.login_concurrency)
+            async def log_in() -> None:
+                async with sem:
+                    await _post(login_client, 'LogInUsername', mvp_pb2.LogInUsernameRequest(username=alice, password='secret'))
+
+            reader = asyncio.ensure_future(read_forever())
+            start = time.perf_counter()
+            await asyncio.gather(*[log_in() for _ in range(args.logins)])
+            storm_secs = time.perf_counter() - start
+            storm_done.set()
+            await reader
+
+    print(
+        f'{mode:>10}:'
+        f'  logins/s={args.logins/storm_secs:7.1f}'
+        f'  other requests={len(latencies):5d}'
+        f'  p50={1000*statistics.median(latencies):7.1f}ms'
+        f'  p99={1000*_percentile(latencies, 0.99):7.1f}ms'
+        f'  max={1000*max(latencies):7.1f}ms'
+    )
+
+
+async def main(args: argparse.Namespace) -> None:
+    for mode in args.modes.split(','):
+        if mode not in MODES:
+            raise ValueError(f'unknown mode {mode!r}; choose from {MODES}')
+        await run_mode(mode, args)
+
+
+if __name__ == '__main__':
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,128 @@
+"""Benchmark: the default SQLite setup vs the "performance" profile.
+
+Runs a fixed mix of traffic straight against the servicer from a thread pool
+(as main.py does): many threads loading prediction pages, while a few others
+keep staking on predictions. Reports read and write throughput and read
+latency under each profile:
+
+  default      one pooled connection per thread, rollback journal
+  performance  WAL, one writer connection, a pool of read-only connections
+
+Usage: python -m server.scripts.bench_sqlite_profile [--seconds=5] [--readers=8] [--writers=2]
+"""
+
+import argparse
+import concurrent.futures
+import datetime
+import logging
+from pathlib import Path
+import statistics
+import tempfile
+import threading
+import time
+from typing import List
+from unittest.mock import Mock
+
+import structlog
+
+from ..config import SqliteDatabase
+from ..core import AuthorizingUsername, PasswordHasher, PredictionId, TokenMint, Username
+from ..protobuf import mvp_pb2
+from ..sql_servicer import SqlConn, SqlServicer
+from .. import sql_schema
+
+PROFILES = ('default', 'performance')
+
+parser = argparse.ArgumentParser()
+parser.add_argument('--seconds', type=float, default=5)
+parser.add_argument('--readers', type=int, default=8)
+parser.add_argument('--writers', type=int, default=2)
+parser.add_argument('--profiles', default=','.join(PROFILES))
+
+
+def _percentile(xs: List[float], p: float) -> float:
+    xs = sorted(xs)
+    return xs[min(len(xs) - 1, int(len(xs) * p))]
+
+
+def run_profile(profile: str, args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = SqliteDatabase(path=str(Path(tmpdir) / 'bench.db'), profile=profile)  # type: ignore
+        engine = sql_schema.create_engine(db)
+        sql_schema.metadata.create_all(engine)
+        conn = SqlConn(engine, read_engine=sql_schema.create_read_engine(db, pool_size=args.readers))
+        servicer = SqlServicer(conn=conn, token_mint=TokenMint(secret_key=b'bench'), emailer=Mock(), password_hasher=PasswordHasher())
+
+        creator = AuthorizingUsername(Username('creator'))
+        bettors = [AuthorizingUsername(Username(f'bettor{i}')) for i in range(args.writers)]
+        prediction_ids: List[PredictionId] = []
+        now = datetime.datetime.now() - datetime.timedelta(minutes=1)
+        with conn.transaction():
+            for user in [creator, *bettors]:
+                conn.register_username(user, password='secret', password_id=f'{user}pwid', email_address=f'{user}@example.com')
+            for bettor in bettors:
+                conn.set_trusted(creator, bettor, True, now=now)
+                conn.set_trusted(bettor, creator, True, now=now)
+            for i in range(20):
+                prediction_id = PredictionId(str(i))
+                conn.create_prediction(now, prediction_id, creator, mvp_pb2.CreatePredictionRequest(
+                    prediction=f'thing {i} will happen',
+                    certainty=mvp_pb2.CertaintyRange(low=0.4, high=0.6),
+                    maximum_stake_cents=1_000_000_00,
+                    open_seconds=86400,
+                    resolves_at_unixtime=now.timestamp() + 2*86400,
+                ))
+                prediction_ids.append(prediction_id)
+
+        stop = threading.Event()
+        read_latencies: List[List[float]] = [[] for _ in range(args.readers)]
+        write_counts = [0] * args.writers
+
+        def read(i: int) -> None:
+            while not stop.is_set():
+                prediction_id = prediction_ids[len(read_latencies[i]) % len(prediction_ids)]
+                start = time.perf_counter()
+                servicer.GetPageContext(
+                    creator,
+                    lambda: servicer.GetPrediction(creator, mvp_pb2.GetPredictionRequest(prediction_id=prediction_id)),
+                    lambda _: [creator],
+                )
+                read_latencies[i].append(time.perf_counter() - start)
+
+        def write(i: int) -> None:
+            while not stop.is_set():
+                servicer.Stake(bettors[i], mvp_pb2.StakeRequest(
+                    prediction_id=prediction_ids[write_counts[i] % len(prediction_ids)],
+                    bettor_is_a_skeptic=True,
+                    bettor_stake_cents=10,
+                ))
+                write_counts[i] += 1
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=args.readers + args.writers) as executor:
+            futures = [executor.submit(read, i) for i in range(args.readers)] + [executor.submit(write, i) for i in range(args.writers)]
+            time.sleep(args.seconds)
+            stop.set()
+            for future in futures:
+                future.result()
+
+    latencies = [x for xs in read_latencies for x in xs]
+    print(
+        f'{profile:>12}:'
+        f'  reads/s={len(latencies)/args.seconds:8.1f}'
+        f'  writes/s={sum(write_counts)/args.seconds:7.1f}'
+        f'  read p50={1000*statistics.median(latencies):6.2f}ms'
+        f'  p99={1000*_percentile(latencies, 0.99):6.2f}ms'
+    )
+
+
+def main(args: argparse.Namespace) -> None:
+    # Every stake logs at info level; printing all that would dominate the timings.
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+    for profile in args.profiles.split(','):
+        if profile not in PROFILES:
+            raise ValueError(f'unknown profile {profile!r}; choose from {PROFILES}')
+        run_profile(profile, args)
+
+
+if __name__ == '__main__':
+    main(parser.parse_args())
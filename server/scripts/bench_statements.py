@@ -0,0 +1,157 @@
+"""Benchmark: per-call cost of SqlConn's hot queries, built per call vs prebuilt.
+
+For each of the ten most frequent queries on the request path, times executing
+it many times against a small in-memory database two ways:
+
+  per-call  building the expression tree on every call, as SqlConn used to
+  prebuilt  executing the module-level statement with bound parameters
+
+Both go through the engine's compiled-SQL cache; the difference is the cost of
+constructing the statement and computing its cache key.
+
+Usage: python -m server.scripts.bench_statements [--calls=5000]
+"""
+
+import argparse
+import datetime
+import time
+from typing import Any, Callable, Mapping, Sequence, Tuple
+
+import sqlalchemy
+
+from ..core import PredictionId, Username
+from ..protobuf import mvp_pb2
+from ..sql_servicer import SqlConn
+from .. import sql_schema as schema
+from .. import sql_servicer
+
+parser = argparse.ArgumentParser()
+parser.add_argument('--calls', type=int, default=5000)
+
+ALICE = Username('alice')
+BOB = Username('bob')
+PREDIDS = [PredictionId(str(i)) for i in range(5)]
+
+# name -> (build the statement the old way, the prebuilt statement, its parameters)
+QUERIES: Mapping[str, Tuple[Callable[[], Any], Any, Mapping[str, Any]]] = {
+    'user_exists': (
+        lambda: sqlalchemy.select([schema.users.c.username]).where(schema.users.c.username == ALICE),
+        sql_servicer._SELECT_USERNAME, {'username': ALICE},
+    ),
+    'get_username_password_info': (
+        lambda: sqlalchemy.select([schema.passwords.c.salt, schema.passwords.c.scrypt]).where(sqlalchemy.and_(
+            schema.users.c.username == ALICE,
+            schema.users.c.login_password_id == schema.passwords.c.password_id,
+        )),
+        sql_servicer._SELECT_PASSWORD_INFO, {'username': ALICE},
+    ),
+    'get_prediction_info': (
+        lambda: sqlalchemy.select(schema.predictions.c).where(schema.predictions.c.prediction_id == PREDIDS[0]),
+        sql_servicer._SELECT_PREDICTION, {'prediction_id': PREDIDS[0]},
+    ),
+    'view_predictions: predictions': (
+        lambda: sqlalchemy.select(schema.predictions.c).where(schema.predictions.c.prediction_id.in_(PREDIDS)),
+        sql_servicer._SELECT_PREDICTIONS, {'prediction_ids': PREDIDS},
+    ),
+    'view_predictions: exposures': (
+        lambda: sqlalchemy.select(schema.prediction_exposure.c).where(schema.prediction_exposure.c.prediction_id.in_(PREDIDS)),
+        sql_servicer._SELECT_EXPOSURES, {'prediction_ids': PREDIDS},
+    ),
+    'view_predictions: trades': (
+        lambda: (
+            sqlalchemy.select(schema.trades.c)
+            .select_from(schema.trades.join(schema.predictions))
+            .where(sqlalchemy.and_(
+                schema.trades.c.prediction_id.in_(PREDIDS),
+                sqlalchemy.or_(schema.predictions.c.creator == BOB, schema.trades.c.bettor == BOB),
+            ))
+            .order_by(schema.trades.c.transacted_at_unixtime)
+        ),
+        sql_servicer._SELECT_VIEWER_TRADES, {'prediction_ids': PREDIDS, 'viewer': BOB},
+    ),
+    'get_creator_exposure_cents': (
+        lambda: (
+            sqlalchemy.select([schema.prediction_exposure.c.creator_exposure_cents])
+            .where(sqlalchemy.and_(
+                schema.prediction_exposure.c.prediction_id == PREDIDS[0],
+                schema.prediction_exposure.c.against_skeptics == True,
+            ))
+            .with_for_update()
+        ),
+        sql_servicer._SELECT_CREATOR_EXPOSURE_FOR_UPDATE, {'prediction_id': PREDIDS[0], 'against_skeptics': True},
+    ),
+    'get_bettor_exposure_cents': (
+        lambda: (
+            sqlalchemy.select([sqlalchemy.sql.func.sum(schema.trades.c.bettor_stake_cents).label('exposure')])
+            .select_from(schema.predictions.join(schema.trades))
+            .where(sqlalchemy.and_(
+                schema.trades.c.bettor == BOB,
+                schema.predictions.c.prediction_id == PREDIDS[0],
+                schema.trades.c.bettor_is_a_skeptic,
+                schema.trades.c.state == mvp_pb2.TradeState.Name(mvp_pb2.TRADE_STATE_ACTIVE),
+            ))
+        ),
+        sql_servicer._SELECT_BETTOR_EXPOSURE, {'prediction_id': PREDIDS[0], 'bettor': BOB, 'bettor_is_a_skeptic': True},
+    ),
+    'get_settings: user': (
+        lambda: sqlalchemy.select(schema.users.c).where(schema.users.c.username == ALICE),
+        sql_servicer._SELECT_USER, {'username': ALICE},
+    ),
+    'get_settings: trusting users': (
+        lambda: (
+            sqlalchemy.select(schema.relationships.c)
+            .where(sqlalchemy.and_(
+                schema.relationships.c.subject_username.in_([BOB]),
+                schema.relationships.c.object_username == ALICE,
+                schema.relationships.c.trusted,
+            ))
+        ),
+        sql_servicer._SELECT_TRUSTING_SUBJECTS, {'subjects': [BOB], 'username': ALICE},
+    ),
+}
+
+
+def _time_per_call(calls: int, f: Callable[[], Any]) -> float:
+    f()  # warm the compiled-SQL cache
+    start = time.perf_counter()
+    for _ in range(calls):
+        f()
+    return (time.perf_counter() - start) / calls
+
+
+def _populate(conn: SqlConn) -> None:
+    now = datetime.datetime.now() - datetime.timedelta(minutes=1)
+    with conn.transaction():
+        for user in [ALICE, BOB]:
+            conn.register_username(user, password='secret', password_id=f'{user}pwid', email_address=f'{user}@example.com')
+        conn.set_trusted(ALICE, BOB, True, now=now)
+        conn.set_trusted(BOB, ALICE, True, now=now)
+        for predid in PREDIDS:
+            conn.create_prediction(now, predid, ALICE, mvp_pb2.CreatePredictionRequest(
+                prediction='a thing will happen',
+                certainty=mvp_pb2.CertaintyRange(low=0.4, high=0.6),
+                maximum_stake_cents=100_00,
+                open_seconds=86400,
+                resolves_at_unixtime=now.timestamp() + 2*86400,
+            ))
+            conn.stake(predid, BOB, bettor_is_a_skeptic=True, bettor_stake_cents=30, creator_stake_cents=20, state=mvp_pb2.TRADE_STATE_ACTIVE, now=now)
+
+
+def main(args: argparse.Namespace) -> None:
+    engine = sqlalchemy.create_engine('sqlite+pysqlite:///:memory:')
+    schema.metadata.create_all(engine)
+    with engine.connect() as db:
+        _populate(SqlConn(db))
+        print(f'{"query":>32}  {"per-call":>9}  {"prebuilt":>9}  speedup')
+        totals = [0.0, 0.0]
+        for name, (build, prebuilt, params) in QUERIES.items():
+            before = _time_per_call(args.calls, lambda: db.execute(build()).fetchall())
+            after = _time_per_call(args.calls, lambda: db.execute(prebuilt, params).fetchall())
+            totals[0] += before
+            totals[1] += after
+            print(f'{name:>32}  {1e6*before:7.1f}us  {1e6*after:7.1f}us  {before/after:6.2f}x')
+        print(f'{"all ten":>32}  {1e6*totals[0]:7.1f}us  {1e6*totals[1]:7.1f}us  {totals[0]/totals[1]:6.2f}x')
+
+
+if __name__ == '__main__':
+    main(parser.parse_args())
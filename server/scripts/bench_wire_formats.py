@@ -0,0 +1,108 @@
+"""Benchmark: per-request CPU cost of the API's two wire formats, protobuf vs JSON.
+
+For UserPredictionViews and PredictionsByIds of a few realistic sizes, times
+(in process CPU time, not wall time):
+
+  pb enc / pb dec      SerializeToString / FromString on the mvp_pb2 message
+  json enc / json dec  model_dump_json / model_validate_json on the api_types model
+  pb->model            api_json.to_model, which the JSON endpoints pay on top of
+                       `json enc` for as long as the servicer speaks protobuf
+
+and reports each body's size, uncompressed and gzipped. Protobuf's speed
+depends heavily on which implementation is installed (pure Python, or the
+C++/upb extension), so that's reported too.
+
+Usage: python -m server.scripts.bench_wire_formats [--seconds=0.3]
+"""
+
+import argparse
+import gzip
+import time
+from typing import Callable, Sequence, Tuple, Type
+
+from google.protobuf.internal import api_implementation
+from google.protobuf.message import Message
+from pydantic import BaseModel
+
+from .. import api_types
+from ..api_json import to_model
+from ..protobuf import mvp_pb2
+
+parser = argparse.ArgumentParser()
+parser.add_argument('--seconds', type=float, default=0.3, help='CPU time to spend timing each operation')
+
+
+def _view(i: int, n_trades: int) -> mvp_pb2.UserPredictionView:
+    return mvp_pb2.UserPredictionView(
+        prediction=f'Will the thing numbered {i} happen by the end of next year, as reported by a reputable news outlet?',
+        certainty=mvp_pb2.CertaintyRange(low=0.6, high=0.8),
+        maximum_stake_cents=100_00,
+        remaining_stake_cents_vs_believers=100_00 - 1_00 * (n_trades // 2),
+        remaining_stake_cents_vs_skeptics=100_00 - 1_00 * ((n_trades + 1) // 2),
+        created_unixtime=1_600_000_000.0 + i,
+        closes_unixtime=1_600_086_400.0 + i,
+        special_rules='If the outlets disagree, the first to report it wins.',
+        creator='somebody',
+        resolution=mvp_pb2.ResolutionEvent(
+            unixtime=1_610_000_000.0, resolution=mvp_pb2.RESOLUTION_YES, notes='',
+            prior_revision=mvp_pb2.ResolutionEvent(unixtime=1_609_000_000.0, resolution=mvp_pb2.RESOLUTION_NO, notes='misread the article'),
+        ) if i % 3 == 0 else None,
+        your_trades=[
+            mvp_pb2.Trade(
+                bettor=f'bettor{j}', bettor_is_a_skeptic=(j % 2 == 1), bettor_stake_cents=1_00, creator_stake_cents=1_00,
+                transacted_unixtime=1_600_000_100.0 + j, updated_unixtime=1_600_000_100.0 + j, notes='',
+                state=mvp_pb2.TRADE_STATE_ACTIVE,
+            )
+            for j in range(n_trades)
+        ],
+        resolves_at_unixtime=1_630_000_000.0 + i,
+        your_following_status=mvp_pb2.PREDICTION_FOLLOWING_MANDATORY_BECAUSE_STAKED,
+    )
+
+def _listing(n_predictions: int, n_trades: int) -> mvp_pb2.PredictionsById:
+    return mvp_pb2.PredictionsById(
+        predictions={f'prediction{i:05d}': _view(i, n_trades) for i in range(n_predictions)},
+        next_cursor='1600000000.0:prediction00000',
+    )
+
+PAYLOADS: Sequence[Tuple[str, Message, Type[BaseModel]]] = [
+    ('view, no trades', _view(0, 0), api_types.UserPredictionView),
+    ('view, 10 trades', _view(0, 10), api_types.UserPredictionView),
+    ('view, 100 trades', _view(0, 100), api_types.UserPredictionView),
+    ('listing, 20 predictions', _listing(20, 2), api_types.PredictionsById),
+    ('listing, 200 predictions', _listing(200, 2), api_types.PredictionsById),
+]
+
+
+def _cpu_per_call(seconds: float, f: Callable[[], object]) -> float:
+    f()  # warm up (e.g. api_json's per-type plans)
+    calls = 0
+    start = time.process_time()
+    while True:
+        f()
+        calls += 1
+        elapsed = time.process_time() - start
+        if elapsed >= seconds:
+            return elapsed / calls
+
+
+def main(args: argparse.Namespace) -> None:
+    print(f'protobuf implementation: {api_implementation.Type()}')
+    print(f'{"payload":>24}  {"pb size":>15}  {"json size":>15}  {"pb enc":>8}  {"pb dec":>8}  {"json enc":>8}  {"json dec":>8}  {"pb->model":>9}')
+    for name, message, model_cls in PAYLOADS:
+        pb_bytes = message.SerializeToString()
+        model = to_model(message, model_cls)
+        json_bytes = model.model_dump_json().encode('utf-8')
+        times = [
+            _cpu_per_call(args.seconds, message.SerializeToString),
+            _cpu_per_call(args.seconds, lambda: type(message).FromString(pb_bytes)),
+            _cpu_per_call(args.seconds, model.model_dump_json),
+            _cpu_per_call(args.seconds, lambda: model_cls.model_validate_json(json_bytes)),
+            _cpu_per_call(args.seconds, lambda: to_model(message, model_cls)),
+        ]
+        sizes = [f'{len(b):>6} ({len(gzip.compress(b)):>5}gz)' for b in (pb_bytes, json_bytes)]
+        print(f'{name:>24}  {sizes[0]:>15}  {sizes[1]:>15}  ' + '  '.join(f'{1e6*t:6.1f}us' for t in times[:4]) + f'  {1e6*times[4]:7.1f}us')
+
+
+if __name__ == '__main__':
+    main(parser.parse_args())
@@ -3,6 +3,8 @@ from server.config import DatabaseInfo, SqliteDatabase
 from sqlalchemy import event
 from sqlalchemy import MetaData, Table, Column, Integer, String, BOOLEAN, ForeignKey, BINARY, Index, REAL, CheckConstraint, VARBINARY, BLOB, TEXT
 import sqlalchemy
+import sqlalchemy.pool
+from typing import Any, Callable, Optional, Sequence
 
 metadata = MetaData()
 
@@ -51,7 +53,17 @@ predictions = Table(
   Column('creator', ForeignKey('users.username'), nullable=False),
   Column('resolution_reminder_sent', BOOLEAN(), nullable=False, server_default=sqlalchemy.text('FALSE')),
   Column('view_privacy', String(96), CheckConstraint("view_privacy in ('PREDICTION_VIEW_PRIVACY_ANYBODY', 'PREDICTION_VIEW_PRIVACY_ANYBODY_WITH_THE_LINK')"), nullable=False, server_default='PREDICTION_VIEW_PRIVACY_ANYBODY'),
+  # Copy of the prediction's latest `resolutions` row (all NULL if it has never
+  # been resolved), kept in sync by SqlConn.resolve, so that viewing a
+  # prediction's current state doesn't need the resolutions table.
+  Column('resolution', String(64), CheckConstraint("resolution IN ('RESOLUTION_INVALID', 'RESOLUTION_NO', 'RESOLUTION_NONE_YET', 'RESOLUTION_YES')"), nullable=True),
+  Column('resolved_at_unixtime', REAL(), nullable=True),
+  Column('resolution_notes', TEXT(), nullable=True),
 )
+# For paging through someone's predictions in each PredictionOrder (see SqlConn._page_of_predictions).
+Index('predictions_by_creator_and_created', predictions.c.creator, predictions.c.created_at_unixtime, predictions.c.prediction_id)
+Index('predictions_by_creator_and_closes', predictions.c.creator, predictions.c.closes_at_unixtime, predictions.c.prediction_id)
+Index('predictions_by_creator_and_resolves', predictions.c.creator, predictions.c.resolves_at_unixtime, predictions.c.prediction_id)
 
 prediction_follows = Table(
   'prediction_follows',
@@ -74,7 +86,38 @@ trades = Table(
   Column('notes', TEXT(), nullable=False, server_default=sqlalchemy.text("''")),
 )
 Index('trades_by_prediction_id', trades.c.prediction_id)
-Index('trades_by_bettor', trades.c.bettor)
+# Covers "which predictions has this user bet on?" (see SqlConn.page_of_stakes) without touching the table.
+Index('trades_by_bettor_and_prediction_id', trades.c.bettor, trades.c.prediction_id)
+
+# Running total of creator_stake_cents over each prediction's ACTIVE trades,
+# split by which side the bettors took. Maintained alongside `trades` (see
+# SqlConn.stake) so that checking a creator's exposure is a point lookup;
+# find_invariant_violations checks it against the trades themselves.
+prediction_exposure = Table(
+  'prediction_exposure',
+  metadata,
+  Column('prediction_id', ForeignKey('predictions.prediction_id'), primary_key=True, nullable=False),
+  Column('against_skeptics', BOOLEAN(), primary_key=True, nullable=False),
+  Column('creator_exposure_cents', Integer(), CheckConstraint('creator_exposure_cents >= 0'), nullable=False, server_default=sqlalchemy.text('0')),
+)
+
+# One row per prediction each user created or has bet on, with the prediction's
+# sort keys copied in, so that paging through someone's stakes is one range scan
+# of a `stakes_by_user_and_*` index (see SqlConn.page_of_stakes). Maintained by
+# SqlConn.create_prediction and SqlConn.stake; find_invariant_violations checks
+# it against predictions and trades.
+stakes = Table(
+  'stakes',
+  metadata,
+  Column('username', ForeignKey('users.username'), primary_key=True, nullable=False),
+  Column('prediction_id', ForeignKey('predictions.prediction_id'), primary_key=True, nullable=False),
+  Column('created_at_unixtime', REAL(), nullable=False),
+  Column('closes_at_unixtime', REAL(), nullable=False),
+  Column('resolves_at_unixtime', REAL(), nullable=False),
+)
+Index('stakes_by_user_and_created', stakes.c.username, stakes.c.created_at_unixtime, stakes.c.prediction_id)
+Index('stakes_by_user_and_closes', stakes.c.username, stakes.c.closes_at_unixtime, stakes.c.prediction_id)
+Index('stakes_by_user_and_resolves', stakes.c.username, stakes.c.resolves_at_unixtime, stakes.c.prediction_id)
 
 resolutions = Table(
   'resolutions',
@@ -105,12 +148,66 @@ def set_sqlite_pragma(dbapi_connection, connection_record):
   cursor.close()
 
 
-def create_engine(dbinfo: DatabaseInfo) -> sqlalchemy.engine.Engine:
-  engine = sqlalchemy.create_engine(get_db_url(dbinfo))
+# MySQL drops connections that sit idle longer than its wait_timeout (8h by
+# default); recycle well before that, and ping on checkout to catch the rest.
+POOL_RECYCLE_SECONDS = 3600
+
+# Applied to every connection under the "performance" SQLite profile. WAL lets
+# readers proceed while a write is in progress; synchronous=NORMAL is durable
+# across application crashes (just not power loss) in WAL mode.
+SQLITE_PERFORMANCE_PRAGMAS = (
+  "PRAGMA foreign_keys=ON",
+  "PRAGMA journal_mode=WAL",
+  "PRAGMA synchronous=NORMAL",
+  "PRAGMA busy_timeout=5000",
+  "PRAGMA cache_size=-65536",  # KiB, i.e. 64MiB
+  "PRAGMA mmap_size=268435456",  # 256MiB
+  "PRAGMA temp_store=MEMORY",
+)
+
+def _sqlite_pragma_setter(pragmas: Sequence[str]) -> Callable[[Any, Any], None]:
+  def set_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    for pragma in pragmas:
+      cursor.execute(pragma)
+    cursor.close()
+  return set_pragmas
+
+def _create_pooled_sqlite_engine(dbinfo: SqliteDatabase, pool_size: int, pragmas: Sequence[str]) -> sqlalchemy.engine.Engine:
+  engine = sqlalchemy.create_engine(
+    get_db_url(dbinfo),
+    poolclass=sqlalchemy.pool.QueuePool,
+    pool_size=pool_size,
+    max_overflow=0,
+    connect_args={'check_same_thread': False},  # pooled connections hop between servicer threads
+  )
+  event.listen(engine, "connect", _sqlite_pragma_setter(pragmas))
+  return engine
+
+def create_engine(dbinfo: DatabaseInfo, pool_size: int = 5) -> sqlalchemy.engine.Engine:
+  """The engine that transactions run on (all of them, unless create_read_engine gives a separate one for reads)."""
   if isinstance(dbinfo, SqliteDatabase):
+    if dbinfo.profile == 'performance':
+      # SQLite allows one writer at a time anyway; queueing writers on a single
+      # connection beats having them bounce off each other's locks.
+      return _create_pooled_sqlite_engine(dbinfo, pool_size=1, pragmas=SQLITE_PERFORMANCE_PRAGMAS)
+    engine = sqlalchemy.create_engine(get_db_url(dbinfo), pool_pre_ping=True)
     event.listen(engine, "connect", set_sqlite_pragma)
+  else:
+    engine = sqlalchemy.create_engine(
+      get_db_url(dbinfo),
+      pool_size=pool_size,
+      pool_pre_ping=True,
+      pool_recycle=POOL_RECYCLE_SECONDS,
+    )
   return engine
 
+def create_read_engine(dbinfo: DatabaseInfo, pool_size: int = 5) -> Optional[sqlalchemy.engine.Engine]:
+  """A pool of read-only connections for read-only transactions, or None if reads should share create_engine's."""
+  if isinstance(dbinfo, SqliteDatabase) and dbinfo.profile == 'performance':
+    return _create_pooled_sqlite_engine(dbinfo, pool_size=pool_size, pragmas=SQLITE_PERFORMANCE_PRAGMAS + ("PRAGMA query_only=ON",))
+  return None
+
 
 def get_db_url(dbinfo: DatabaseInfo) -> str:
   if isinstance(dbinfo, SqliteDatabase):
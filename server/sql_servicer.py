@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import asyncio
+import collections
 import contextlib
 import datetime
 import functools
@@ -10,8 +11,10 @@ import json
 from pathlib import Path
 import random
 import secrets
+import sys
+import threading
 import time
-from typing import Any, Awaitable, Iterator, Mapping, Optional, MutableMapping, MutableSequence, NoReturn, Callable, NoReturn, Iterable, Sequence, MutableSequence
+from typing import Any, Awaitable, Iterator, Mapping, Optional, MutableMapping, MutableSequence, NoReturn, Callable, NoReturn, Iterable, Sequence, MutableSequence, Set, Tuple, TypeVar, Union
 from typing_extensions import TypedDict
 import logging
 import os
@@ -31,21 +34,464 @@ from . import sql_schema as schema
 import structlog
 logger = structlog.get_logger()
 
+_T = TypeVar('_T')
+
+
+
+class TrustGraph:
+  """In-memory copy of who trusts whom: the `trusted` rows of `relationships`.
+
+  Lookups take no lock; SqlConn serializes writes and rebuilds.
+  """
+  def __init__(self, trusted_by_subject: Optional[MutableMapping[str, Set[str]]] = None) -> None:
+    self._trusted_by_subject: MutableMapping[str, Set[str]] = trusted_by_subject if (trusted_by_subject is not None) else {}
+
+  @staticmethod
+  def load(conn: sqlalchemy.engine.base.Connection) -> TrustGraph:
+    trusted_by_subject: MutableMapping[str, Set[str]] = {}
+    for row in conn.execute(
+      sqlalchemy.select([schema.relationships.c.subject_username, schema.relationships.c.object_username])
+      .where(schema.relationships.c.trusted)
+    ):
+      trusted_by_subject.setdefault(row['subject_username'], set()).add(row['object_username'])
+    return TrustGraph(trusted_by_subject)
+
+  def trusts(self, a: Username, b: Username) -> bool:
+    return b in self._trusted_by_subject.get(a, ())
+
+  def set_trusted(self, subject_username: Username, object_username: Username, trusted: bool) -> None:
+    if trusted:
+      self._trusted_by_subject.setdefault(subject_username, set()).add(object_username)
+    else:
+      trusted_objects = self._trusted_by_subject.get(subject_username)
+      if trusted_objects is not None:
+        trusted_objects.discard(object_username)
+        if not trusted_objects:
+          del self._trusted_by_subject[subject_username]
+
+  def edge_count(self) -> int:
+    return sum(len(objects) for objects in list(self._trusted_by_subject.values()))
+
+  def memory_bytes(self) -> int:
+    """Approximate size of the index: the dict, its sets, and their strings.
+
+    Safe to call while SqlConn applies writes: it iterates over copies (which
+    `list` takes atomically), not the live sets.
+    """
+    return sys.getsizeof(self._trusted_by_subject) + sum(
+      sys.getsizeof(subject) + sys.getsizeof(objects) + sum(sys.getsizeof(o) for o in list(objects))
+      for subject, objects in list(self._trusted_by_subject.items())
+    )
+
+
+class KnownUsers:
+  """Bounded LRU set of usernames known to exist, with hit/miss counts.
+
+  Only ever holds positive results, which is safe because users are never
+  deleted. Whatever deletes a user must `discard` it (or `clear()` the lot).
+  """
+  def __init__(self, maxsize: int = 10_000) -> None:
+    self.maxsize = maxsize
+    self._users: 'collections.OrderedDict[str, None]' = collections.OrderedDict()
+    self._lock = threading.Lock()
+    self.hits = 0
+    self.misses = 0
+
+  def __contains__(self, user: str) -> bool:
+    with self._lock:
+      if user in self._users:
+        self._users.move_to_end(user)
+        self.hits += 1
+        return True
+      self.misses += 1
+      return False
+
+  def add(self, user: str) -> None:
+    with self._lock:
+      self._users[user] = None
+      self._users.move_to_end(user)
+      while len(self._users) > self.maxsize:
+        self._users.popitem(last=False)
+
+  def discard(self, user: str) -> None:
+    with self._lock:
+      self._users.pop(user, None)
+
+  def clear(self) -> None:
+    with self._lock:
+      self._users.clear()
+
+  def stats(self) -> Mapping[str, Any]:
+    with self._lock:
+      lookups = self.hits + self.misses
+      return {
+        'size': len(self._users),
+        'maxsize': self.maxsize,
+        'hits': self.hits,
+        'misses': self.misses,
+        'hit_rate': (self.hits / lookups) if lookups else None,
+      }
+
+
+class PredictionVersions:
+  """Per-prediction counters, bumped whenever something about a prediction changes.
+
+  Cheap to read (no database access), so callers can cache anything derived
+  from a prediction under its version. In-memory, so they start over at 0 when
+  the server restarts: nothing keyed on them may outlive the process.
+
+  Listeners are called with the prediction's ID after each bump, on whichever
+  thread bumped it.
+  """
+  def __init__(self) -> None:
+    self._versions: MutableMapping[str, int] = {}
+    self._lock = threading.Lock()
+    self._listeners: MutableSequence[Callable[[str], None]] = []
+
+  def add_listener(self, f: Callable[[str], None]) -> None:
+    self._listeners.append(f)
+
+  def get(self, prediction_id: str) -> int:
+    return self._versions.get(prediction_id, 0)
+
+  def bump(self, prediction_id: str) -> None:
+    with self._lock:
+      self._versions[prediction_id] = self._versions.get(prediction_id, 0) + 1
+    for f in self._listeners:
+      f(prediction_id)
+
+
+# The column each PredictionOrder sorts by (in `predictions` and `stakes` alike),
+# and whether it's descending (latest first) or ascending (soonest first); ties
+# go by prediction_id, the same way.
+_ORDER_COLUMNS = {
+  mvp_pb2.PREDICTION_ORDER_CREATED: ('created_at_unixtime', True),
+  mvp_pb2.PREDICTION_ORDER_CLOSES: ('closes_at_unixtime', True),
+  mvp_pb2.PREDICTION_ORDER_RESOLVES: ('resolves_at_unixtime', True),
+  mvp_pb2.PREDICTION_ORDER_CLOSES_SOONEST: ('closes_at_unixtime', False),
+  mvp_pb2.PREDICTION_ORDER_RESOLVES_SOONEST: ('resolves_at_unixtime', False),
+}
+
+def _encode_cursor(key: Tuple[float, PredictionId]) -> str:
+  unixtime, prediction_id = key
+  return f'{unixtime!r}:{prediction_id}'
+
+def _decode_cursor(cursor: str) -> Tuple[float, PredictionId]:
+  unixtime, _, prediction_id = cursor.partition(':')
+  try:
+    return (float(unixtime), PredictionId(prediction_id))
+  except ValueError:
+    raise InvalidRequestError('malformed cursor')
+
+
+# The request path's hottest queries, built once with bound parameters rather
+# than on every call. SQLAlchemy memoizes a statement object's cache key, so
+# reusing the object skips both building the expression tree and working out
+# which entry of the engine's compiled-SQL cache it maps to.
+# (scripts/bench_statements measures the difference.)
+_bp = sqlalchemy.bindparam
+_SELECT_USERNAME = (
+  sqlalchemy.select([schema.users.c.username])
+  .where(schema.users.c.username == _bp('username'))
+)
+_SELECT_EMAIL_IS_REGISTERED = (
+  sqlalchemy.select([schema.users.c.username])
+  .where(schema.users.c.email_address == _bp('email_address'))
+)
+_SELECT_PASSWORD_INFO = (
+  sqlalchemy.select([schema.passwords.c.salt, schema.passwords.c.scrypt])
+  .where(sqlalchemy.and_(
+    schema.users.c.username == _bp('username'),
+    schema.users.c.login_password_id == schema.passwords.c.password_id,
+  ))
+)
+_SELECT_PREDICTION = (
+  sqlalchemy.select(schema.predictions.c)
+  .where(schema.predictions.c.prediction_id == _bp('prediction_id'))
+)
+_SELECT_PREDICTIONS = (
+  sqlalchemy.select(schema.predictions.c)
+  .where(schema.predictions.c.prediction_id.in_(_bp('prediction_ids', expanding=True)))
+)
+_SELECT_EXPOSURES = (
+  sqlalchemy.select(schema.prediction_exposure.c)
+  .where(schema.prediction_exposure.c.prediction_id.in_(_bp('prediction_ids', expanding=True)))
+)
+_exposure_vs_believers = schema.prediction_exposure.alias('exposure_vs_believers')
+_exposure_vs_skeptics = schema.prediction_exposure.alias('exposure_vs_skeptics')
+_SELECT_PREDICTION_SUMMARIES = (
+  sqlalchemy.select([
+    schema.predictions.c.prediction_id,
+    schema.predictions.c.prediction,
+    schema.predictions.c.certainty_low_p,
+    schema.predictions.c.certainty_high_p,
+    schema.predictions.c.maximum_stake_cents,
+    schema.predictions.c.created_at_unixtime,
+    schema.predictions.c.closes_at_unixtime,
+    schema.predictions.c.resolves_at_unixtime,
+    schema.predictions.c.creator,
+    schema.predictions.c.resolution,
+    _exposure_vs_believers.c.creator_exposure_cents.label('exposure_vs_believers'),
+    _exposure_vs_skeptics.c.creator_exposure_cents.label('exposure_vs_skeptics'),
+  ])
+  .select_from(
+    schema.predictions
+    .outerjoin(_exposure_vs_believers, sqlalchemy.and_(
+      _exposure_vs_believers.c.prediction_id == schema.predictions.c.prediction_id,
+      _exposure_vs_believers.c.against_skeptics == sqlalchemy.false(),
+    ))
+    .outerjoin(_exposure_vs_skeptics, sqlalchemy.and_(
+      _exposure_vs_skeptics.c.prediction_id == schema.predictions.c.prediction_id,
+      _exposure_vs_skeptics.c.against_skeptics == sqlalchemy.true(),
+    ))
+  )
+  .where(schema.predictions.c.prediction_id.in_(_bp('prediction_ids', expanding=True)))
+)
+_SELECT_PREDICTION_UPDATE = (
+  sqlalchemy.select([
+    schema.predictions.c.maximum_stake_cents,
+    schema.predictions.c.resolution,
+    _exposure_vs_believers.c.creator_exposure_cents.label('exposure_vs_believers'),
+    _exposure_vs_skeptics.c.creator_exposure_cents.label('exposure_vs_skeptics'),
+    sqlalchemy.select([sqlalchemy.func.count()])
+    .where(sqlalchemy.and_(
+      schema.trades.c.prediction_id == schema.predictions.c.prediction_id,
+      schema.trades.c.state == mvp_pb2.TradeState.Name(mvp_pb2.TRADE_STATE_ACTIVE),
+    ))
+    .label('num_active_trades'),
+  ])
+  .select_from(
+    schema.predictions
+    .outerjoin(_exposure_vs_believers, sqlalchemy.and_(
+      _exposure_vs_believers.c.prediction_id == schema.predictions.c.prediction_id,
+      _exposure_vs_believers.c.against_skeptics == sqlalchemy.false(),
+    ))
+    .outerjoin(_exposure_vs_skeptics, sqlalchemy.and_(
+      _exposure_vs_skeptics.c.prediction_id == schema.predictions.c.prediction_id,
+      _exposure_vs_skeptics.c.against_skeptics == sqlalchemy.true(),
+    ))
+  )
+  .where(schema.predictions.c.prediction_id == _bp('prediction_id'))
+)
+_SELECT_VIEWER_TRADES = (
+  sqlalchemy.select(schema.trades.c)
+  .select_from(schema.trades.join(schema.predictions))
+  .where(sqlalchemy.and_(
+    schema.trades.c.prediction_id.in_(_bp('prediction_ids', expanding=True)),
+    sqlalchemy.or_(
+      schema.predictions.c.creator == _bp('viewer'),
+      schema.trades.c.bettor == _bp('viewer'),
+    ),
+  ))
+  .order_by(schema.trades.c.transacted_at_unixtime)
+)
+_SELECT_VIEWER_FOLLOWS = (
+  sqlalchemy.select([schema.prediction_follows.c.prediction_id])
+  .where(sqlalchemy.and_(
+    schema.prediction_follows.c.prediction_id.in_(_bp('prediction_ids', expanding=True)),
+    schema.prediction_follows.c.follower == _bp('viewer'),
+  ))
+)
+_SELECT_CURRENT_RESOLUTION = (
+  sqlalchemy.select([
+    schema.predictions.c.resolution,
+    schema.predictions.c.resolved_at_unixtime,
+    schema.predictions.c.resolution_notes,
+  ])
+  .where(schema.predictions.c.prediction_id == _bp('prediction_id'))
+)
+_SELECT_CREATOR_EXPOSURE_FOR_UPDATE = (
+  sqlalchemy.select([schema.prediction_exposure.c.creator_exposure_cents])
+  .where(sqlalchemy.and_(
+    schema.prediction_exposure.c.prediction_id == _bp('prediction_id'),
+    schema.prediction_exposure.c.against_skeptics == _bp('against_skeptics'),
+  ))
+  .with_for_update()
+)
+_UPDATE_CREATOR_EXPOSURE = (
+  sqlalchemy.update(schema.prediction_exposure)
+  .where(sqlalchemy.and_(
+    # (UPDATE reserves the bare column names for its SET clause.)
+    schema.prediction_exposure.c.prediction_id == _bp('where_prediction_id'),
+    schema.prediction_exposure.c.against_skeptics == _bp('where_against_skeptics'),
+  ))
+  .values(creator_exposure_cents=schema.prediction_exposure.c.creator_exposure_cents + _bp('delta_cents'))
+)
+_SELECT_STAKE = (
+  sqlalchemy.select([schema.stakes.c.prediction_id])
+  .where(sqlalchemy.and_(
+    schema.stakes.c.username == _bp('username'),
+    schema.stakes.c.prediction_id == _bp('prediction_id'),
+  ))
+)
+_INSERT_STAKE_FROM_PREDICTION = (
+  sqlalchemy.insert(schema.stakes)
+  .from_select(
+    ['username', 'prediction_id', 'created_at_unixtime', 'closes_at_unixtime', 'resolves_at_unixtime'],
+    sqlalchemy.select([
+      _bp('username', type_=sqlalchemy.String),
+      schema.predictions.c.prediction_id,
+      schema.predictions.c.created_at_unixtime,
+      schema.predictions.c.closes_at_unixtime,
+      schema.predictions.c.resolves_at_unixtime,
+    ])
+    .where(schema.predictions.c.prediction_id == _bp('prediction_id'))
+  )
+)
+_SELECT_BETTOR_EXPOSURE = (
+  sqlalchemy.select([
+    sqlalchemy.sql.func.sum(schema.trades.c.bettor_stake_cents).label('exposure'),
+  ])
+  .select_from(schema.predictions.join(schema.trades))
+  .where(sqlalchemy.and_(
+    schema.trades.c.bettor == _bp('bettor'),
+    schema.predictions.c.prediction_id == _bp('prediction_id'),
+    schema.trades.c.bettor_is_a_skeptic == _bp('bettor_is_a_skeptic'),
+    schema.trades.c.state == mvp_pb2.TradeState.Name(mvp_pb2.TRADE_STATE_ACTIVE),
+  ))
+)
+_SELECT_USER = (
+  sqlalchemy.select(schema.users.c)
+  .where(schema.users.c.username == _bp('username'))
+)
+_SELECT_OUTGOING_RELATIONSHIPS = (
+  sqlalchemy.select(schema.relationships.c)
+  .where(schema.relationships.c.subject_username == _bp('username'))
+)
+_SELECT_TRUSTING_SUBJECTS = (
+  sqlalchemy.select([schema.relationships.c.subject_username])
+  .where(sqlalchemy.and_(
+    schema.relationships.c.subject_username.in_(_bp('subjects', expanding=True)),
+    schema.relationships.c.object_username == _bp('username'),
+    schema.relationships.c.trusted,
+  ))
+)
+_SELECT_INVITATION_RECIPIENTS = (
+  sqlalchemy.select([schema.email_invitations.c.recipient])
+  .where(schema.email_invitations.c.inviter == _bp('username'))
+)
+_SELECT_INVITATION_IS_OUTSTANDING = (
+  sqlalchemy.select([1])
+  .where(sqlalchemy.and_(
+    schema.email_invitations.c.inviter == _bp('inviter'),
+    schema.email_invitations.c.recipient == _bp('recipient'),
+  ))
+)
+del _bp
 
 
 class SqlConn:
-  def  __init__(self, conn: sqlalchemy.engine.base.Connection):
-    self._conn = conn
+  """Runs the app's queries.
+
+  Given an Engine, each outermost `transaction()` checks a connection out of the
+  engine's pool for its duration (so it's safe to use from several threads at
+  once); nested `transaction()`s join the enclosing one. If also given a
+  `read_engine`, `transaction(read_only=True)` checks out of that instead. Given
+  a single Connection, everything runs on that connection, as in tests.
+
+  `trusts` is answered from a TrustGraph, loaded on first use, and
+  `user_exists` consults a KnownUsers cache first. Both learn about changes
+  only when the transaction that made them commits, as do
+  `prediction_versions`.
+  """
+  def  __init__(self, conn: Union[sqlalchemy.engine.Engine, sqlalchemy.engine.base.Connection], password_hasher: Optional[PasswordHasher] = None, known_users: Optional[KnownUsers] = None, read_engine: Optional[sqlalchemy.engine.Engine] = None):
+    self._password_hasher = password_hasher if (password_hasher is not None) else PasswordHasher()
+    if isinstance(conn, sqlalchemy.engine.Engine):
+      self._engine: Optional[sqlalchemy.engine.Engine] = conn
+      self._read_engine: Optional[sqlalchemy.engine.Engine] = read_engine if (read_engine is not None) else conn
+      self._fixed_conn: Optional[sqlalchemy.engine.base.Connection] = None
+    else:
+      self._engine = None
+      self._read_engine = None
+      self._fixed_conn = conn
+    self._local = threading.local()
+    self._trust_graph: Optional[TrustGraph] = None
+    self._trust_graph_lock = threading.Lock()
+    self.known_users = known_users if (known_users is not None) else KnownUsers()
+    self.prediction_versions = PredictionVersions()
+
+  @property
+  def _conn(self) -> sqlalchemy.engine.base.Connection:
+    if self._fixed_conn is not None:
+      return self._fixed_conn
+    conn = getattr(self._local, 'conn', None)
+    if conn is None:
+      raise RuntimeError('SqlConn used outside of a transaction')
+    return conn
 
   @contextlib.contextmanager
-  def transaction(self) -> Iterator[None]:
-    with self._conn.begin():
+  def transaction(self, read_only: bool = False) -> Iterator[None]:
+    if getattr(self._local, 'on_commit', None) is not None:
       yield
+      return
+
+    self._local.on_commit = []
+    try:
+      if self._engine is None:
+        with self._conn.begin():
+          yield
+      else:
+        engine = self._read_engine if read_only else self._engine
+        assert engine is not None
+        with engine.begin() as conn:
+          self._local.conn = conn
+          try:
+            yield
+          finally:
+            self._local.conn = None
+      on_commit = self._local.on_commit
+    finally:
+      self._local.on_commit = None
+      self._local.uncommitted_trust = None
+    for f in on_commit:
+      f()
 
-  def register_username(self, username: Username, password: str, password_id: str, email_address: str) -> None:
+  @contextlib.contextmanager
+  def savepoint(self) -> Iterator[None]:
+    """Within a transaction: if the block raises, undoes what it did, and leaves the rest of the transaction be.
+
+    That's its writes (rolled back to a SAVEPOINT) and its `after_commit`
+    callbacks (dropped, along with its changes to the trust graph).
+    """
+    on_commit = getattr(self._local, 'on_commit', None)
+    if on_commit is None:
+      raise RuntimeError('SqlConn.savepoint used outside of a transaction')
+    conn = self._conn
+    if conn.dialect.name == 'sqlite' and not conn.connection.in_transaction:
+      # pysqlite only BEGINs just before the first write; a SAVEPOINT outside a
+      # transaction would start one of its own, which its RELEASE would commit.
+      conn.execute(sqlalchemy.text('BEGIN'))
+    n_callbacks = len(on_commit)
+    uncommitted_trust = getattr(self._local, 'uncommitted_trust', None)
+    trust_before = dict(uncommitted_trust) if (uncommitted_trust is not None) else None
+    try:
+      with conn.begin_nested():
+        yield
+    except BaseException:
+      del on_commit[n_callbacks:]
+      if uncommitted_trust is None:
+        self._local.uncommitted_trust = None
+      else:
+        uncommitted_trust.clear()
+        uncommitted_trust.update(trust_before or {})
+      raise
+
+  def after_commit(self, f: Callable[[], None]) -> None:
+    """Runs `f` once the current transaction commits (right away if there is none)."""
+    on_commit = getattr(self._local, 'on_commit', None)
+    if on_commit is None:
+      f()
+    else:
+      on_commit.append(f)
+
+  def _prediction_changed(self, prediction_id: str) -> None:
+    self.after_commit(functools.partial(self.prediction_versions.bump, prediction_id))
+
+  def register_username(self, username: Username, password: Union[str, mvp_pb2.HashedPassword], password_id: str, email_address: str) -> None:
+      """`password` may come already hashed, so that callers can hash it outside the transaction."""
       if self.user_exists(username):
         raise UsernameAlreadyRegisteredError(username)
-      hashed_password = new_hashed_password(password)
+      hashed_password = password if isinstance(password, mvp_pb2.HashedPassword) else self._password_hasher.new_hashed_password(password)
       self._conn.execute(sqlalchemy.insert(schema.passwords).values(
         password_id=password_id,
         salt=hashed_password.salt,
@@ -56,15 +502,10 @@ class SqlConn:
         email_address=email_address,
         login_password_id=password_id,
       ))
+      self.after_commit(functools.partial(self.known_users.add, username))
 
   def get_username_password_info(self, username: Username) -> Optional[mvp_pb2.HashedPassword]:
-    row = self._conn.execute(
-      sqlalchemy.select([schema.passwords.c.salt, schema.passwords.c.scrypt])
-      .where(sqlalchemy.and_(
-        schema.users.c.username == username,
-        schema.users.c.login_password_id == schema.passwords.c.password_id,
-      ))
-    ).first()
+    row = self._conn.execute(_SELECT_PASSWORD_INFO, {'username': username}).first()
     if row is None:
       return None
     return mvp_pb2.HashedPassword(salt=row['salt'], scrypt=row['scrypt'])
@@ -90,128 +531,245 @@ class SqlConn:
       special_rules=request.special_rules,
       creator=creator,
     ))
+    self._conn.execute(sqlalchemy.insert(schema.prediction_exposure), [
+      dict(prediction_id=prediction_id, against_skeptics=against_skeptics, creator_exposure_cents=0)
+      for against_skeptics in (False, True)
+    ])
+    self._conn.execute(sqlalchemy.insert(schema.stakes).values(
+      username=creator,
+      prediction_id=prediction_id,
+      created_at_unixtime=now_unixtime,
+      closes_at_unixtime=now_unixtime + request.open_seconds,
+      resolves_at_unixtime=request.resolves_at_unixtime,
+    ))
 
   def user_exists(self, user: Username) -> bool:
-    return self._conn.execute(sqlalchemy.select(schema.users.c).where(schema.users.c.username == user)).first() is not None
+    if user in self.known_users:
+      return True
+    exists = self._conn.execute(_SELECT_USERNAME, {'username': user}).first() is not None
+    if exists:
+      # The row might be this transaction's own uncommitted insert.
+      self.after_commit(functools.partial(self.known_users.add, user))
+    return exists
 
   def email_is_registered(self, email_address: str) -> bool:
-    return self._conn.execute(sqlalchemy.select(schema.users.c).where(schema.users.c.email_address == email_address)).first() is not None
+    return self._conn.execute(_SELECT_EMAIL_IS_REGISTERED, {'email_address': email_address}).first() is not None
 
   def trusts(self, a: Username, b: Username) -> bool:
     if a == b:
       return True
+    uncommitted = getattr(self._local, 'uncommitted_trust', None)
+    if uncommitted and (a, b) in uncommitted:
+      return uncommitted[(a, b)]
+    return self.trust_graph.trusts(a, b)
+
+  @property
+  def trust_graph(self) -> TrustGraph:
+    graph = self._trust_graph
+    if graph is None:
+      graph = self.rebuild_trust_graph()
+    return graph
+
+  def rebuild_trust_graph(self) -> TrustGraph:
+    """Reloads the trust graph from the relationships table."""
+    # Hold the lock while reading, so that a transaction committing meanwhile
+    # applies its changes to the new graph rather than the discarded one.
+    with self._trust_graph_lock:
+      if self._read_engine is None:
+        graph = TrustGraph.load(self._conn)
+      else:
+        with self._read_engine.connect() as conn:
+          graph = TrustGraph.load(conn)
+      self._trust_graph = graph
+    logger.info('loaded trust graph', edges=graph.edge_count(), memory_bytes=graph.memory_bytes())
+    return graph
+
+  def _apply_trust_changes(self, changes: Mapping[Tuple[Username, Username], bool]) -> None:
+    if not changes:
+      return
+    with self._trust_graph_lock:
+      if self._trust_graph is None:
+        return  # it'll see the changes in the database whenever it's loaded
+      for (subject_username, object_username), trusted in changes.items():
+        self._trust_graph.set_trusted(subject_username, object_username, trusted)
+
+  def view_prediction(self, viewer: Optional[Username], prediction_id: PredictionId, include_resolution_history: bool = False) -> Optional[mvp_pb2.UserPredictionView]:
+    return self.view_predictions(viewer, [prediction_id], include_resolution_history=include_resolution_history).get(prediction_id)
+
+  def view_predictions(self, viewer: Optional[Username], prediction_ids: Iterable[PredictionId], include_resolution_history: bool = False) -> Mapping[str, mvp_pb2.UserPredictionView]:
+    """Builds the views for many predictions at once.
+
+    Issues a fixed number of queries (one per table, filtered by an IN-list)
+    however many predictions are asked for, so listing a user's stakes doesn't
+    cost a handful of round trips per prediction. Nonexistent IDs are omitted.
+
+    Each view's `resolution` is the current one, read off the predictions
+    table; its `prior_revision` chain is only filled in (from the resolutions
+    table) if `include_resolution_history` is set.
+    """
+    prediction_ids = set(prediction_ids)
+    if not prediction_ids:
+      return {}
+
+    rows = self._conn.execute(_SELECT_PREDICTIONS, {'prediction_ids': list(prediction_ids)}).fetchall()
+    if not rows:
+      return {}
+
+    resolution_rows_by_predid: MutableMapping[str, MutableSequence[Any]] = {}
+    resolved_predids = {row['prediction_id'] for row in rows if row['resolution'] is not None}
+    if include_resolution_history and resolved_predids:
+      for r in self._conn.execute(
+        sqlalchemy.select(schema.resolutions.c)
+        .where(schema.resolutions.c.prediction_id.in_(resolved_predids))
+        .order_by(schema.resolutions.c.resolved_at_unixtime)
+      ):
+        resolution_rows_by_predid.setdefault(r['prediction_id'], []).append(r)
+
+    exposures: MutableMapping[Tuple[str, bool], int] = {}
+    for r in self._conn.execute(_SELECT_EXPOSURES, {'prediction_ids': list(prediction_ids)}):
+      exposures[(r['prediction_id'], bool(r['against_skeptics']))] = r['creator_exposure_cents']
+
+    trade_rows_by_predid: MutableMapping[str, MutableSequence[Any]] = {}
+    followed_predids: Set[str] = set()
+    if viewer is not None:
+      for t in self._conn.execute(_SELECT_VIEWER_TRADES, {'prediction_ids': list(prediction_ids), 'viewer': viewer}):
+        trade_rows_by_predid.setdefault(t['prediction_id'], []).append(t)
+
+      followed_predids = {
+        r['prediction_id']
+        for r in self._conn.execute(_SELECT_VIEWER_FOLLOWS, {'prediction_ids': list(prediction_ids), 'viewer': viewer})
+      }
 
-    result: Optional[bool] = self._conn.execute(
-      sqlalchemy.select([schema.relationships.c.trusted])
-      .where(sqlalchemy.and_(
-        schema.relationships.c.subject_username == a,
-        schema.relationships.c.object_username == b,
-        schema.relationships.c.trusted,
-      ))
-    ).scalar()
-
-    return bool(result)
+    result: MutableMapping[str, mvp_pb2.UserPredictionView] = {}
+    for row in rows:
+      predid = PredictionId(row['prediction_id'])
+      creator_is_viewer = (viewer == row['creator'])
+      trade_rows = trade_rows_by_predid.get(predid, [])
+      result[predid] = mvp_pb2.UserPredictionView(
+        prediction=row['prediction'],
+        certainty=mvp_pb2.CertaintyRange(low=row['certainty_low_p'], high=row['certainty_high_p']),
+        maximum_stake_cents=row['maximum_stake_cents'],
+        remaining_stake_cents_vs_believers=int(row['maximum_stake_cents'] - exposures.get((predid, False), 0)),
+        remaining_stake_cents_vs_skeptics=int(row['maximum_stake_cents'] - exposures.get((predid, True), 0)),
+        created_unixtime=row['created_at_unixtime'],
+        closes_unixtime=row['closes_at_unixtime'],
+        resolves_at_unixtime=row['resolves_at_unixtime'],
+        special_rules=row['special_rules'],
+        creator=row['creator'],
+        resolution=(
+          SqlConn._resolution_rows_to_pb(resolution_rows_by_predid.get(predid, [])) if include_resolution_history else
+          SqlConn._current_resolution_to_pb(row)
+        ),
+        your_trades=[SqlConn._trade_row_to_pb(t) for t in trade_rows],
+        your_following_status=(
+          mvp_pb2.PREDICTION_FOLLOWING_MANDATORY_BECAUSE_STAKED if (creator_is_viewer or trade_rows) else
+          mvp_pb2.PREDICTION_FOLLOWING_FOLLOWING if predid in followed_predids else
+          mvp_pb2.PREDICTION_FOLLOWING_NOT_FOLLOWING
+        ),
+      )
+    return result
+
+  def summarize_predictions(self, prediction_ids: Iterable[PredictionId]) -> Mapping[str, mvp_pb2.PredictionSummary]:
+    """Like `view_predictions`, but builds PredictionSummaries, from a single query.
+
+    A summary doesn't depend on who's looking, so there are no trades or
+    follows to look up; and it only has the current resolution, so there's no
+    history to look up either.
+    """
+    prediction_ids = list(prediction_ids)
+    if not prediction_ids:
+      return {}
+    return {
+      row['prediction_id']: mvp_pb2.PredictionSummary(
+        prediction=row['prediction'],
+        certainty=mvp_pb2.CertaintyRange(low=row['certainty_low_p'], high=row['certainty_high_p']),
+        maximum_stake_cents=row['maximum_stake_cents'],
+        remaining_stake_cents_vs_believers=int(row['maximum_stake_cents'] - (row['exposure_vs_believers'] or 0)),
+        remaining_stake_cents_vs_skeptics=int(row['maximum_stake_cents'] - (row['exposure_vs_skeptics'] or 0)),
+        created_unixtime=row['created_at_unixtime'],
+        closes_unixtime=row['closes_at_unixtime'],
+        resolves_at_unixtime=row['resolves_at_unixtime'],
+        creator=row['creator'],
+        resolution=mvp_pb2.RESOLUTION_NONE_YET if (row['resolution'] is None) else mvp_pb2.Resolution.Value(row['resolution']),
+      )
+      for row in self._conn.execute(_SELECT_PREDICTION_SUMMARIES, {'prediction_ids': prediction_ids})
+    }
 
-  def view_prediction(self, viewer: Optional[Username], prediction_id: PredictionId) -> Optional[mvp_pb2.UserPredictionView]:
-    row = self._conn.execute(sqlalchemy.select(schema.predictions.c).where(schema.predictions.c.prediction_id == prediction_id)).first()
+  def get_prediction_update(self, prediction_id: PredictionId) -> Optional[mvp_pb2.PredictionUpdate]:
+    """The parts of a prediction that stakes and resolutions change, from a single query; None if there's no such prediction."""
+    row = self._conn.execute(_SELECT_PREDICTION_UPDATE, {'prediction_id': prediction_id}).fetchone()
     if row is None:
       return None
+    return mvp_pb2.PredictionUpdate(
+      remaining_stake_cents_vs_believers=int(row['maximum_stake_cents'] - (row['exposure_vs_believers'] or 0)),
+      remaining_stake_cents_vs_skeptics=int(row['maximum_stake_cents'] - (row['exposure_vs_skeptics'] or 0)),
+      resolution=mvp_pb2.RESOLUTION_NONE_YET if (row['resolution'] is None) else mvp_pb2.Resolution.Value(row['resolution']),
+      num_active_trades=row['num_active_trades'],
+    )
 
-    creator_is_viewer = (viewer == row['creator'])
-
-    creator_settings_row = self._conn.execute(
-      sqlalchemy.select(schema.users.c)
-      .where(schema.users.c.username == row['creator'])
-    ).fetchone()
-    assert creator_settings_row is not None  # else the "prediction.creator -> user.username" integrity constraint is broken
-
-    resolution = self.get_resolution(prediction_id)
-
-    trade_rows = self._conn.execute(
-      sqlalchemy.select(schema.trades.c)
-      .where(sqlalchemy.and_(
-        schema.trades.c.prediction_id == prediction_id,
-        True if creator_is_viewer else (schema.trades.c.bettor == viewer)
-      ))
-      .order_by(schema.trades.c.transacted_at_unixtime)
-    ).fetchall()
+  def page_of_stakes(self, user: Username, order: mvp_pb2.PredictionOrder.V, limit: int, cursor: str) -> Tuple[Sequence[PredictionId], str]:
+    """One page of the predictions `user` created or has bet on; see `_page_of_predictions`.
 
-    remaining_stake_cents_vs_believers = int(
-      row['maximum_stake_cents'] - self.get_creator_exposure_cents(prediction_id, against_skeptics=False)
-    )
-    remaining_stake_cents_vs_skeptics = int(
-      row['maximum_stake_cents'] - self.get_creator_exposure_cents(prediction_id, against_skeptics=True)
+    Reads the `stakes` table, so created and bet-on predictions alike come
+    straight off a `stakes_by_user_and_*` index.
+    """
+    return self._page_of_predictions(
+      schema.stakes,
+      schema.stakes.c.username == user,
+      order=order, limit=limit, cursor=cursor,
     )
 
-    follow_row = self._conn.execute(
-      sqlalchemy.select(schema.prediction_follows.c)
-      .where(sqlalchemy.and_(
-        schema.prediction_follows.c.prediction_id == prediction_id,
-        schema.prediction_follows.c.follower == viewer,
-      ))
-    ).fetchone()
-
-    return mvp_pb2.UserPredictionView(
-      prediction=row['prediction'],
-      certainty=mvp_pb2.CertaintyRange(low=row['certainty_low_p'], high=row['certainty_high_p']),
-      maximum_stake_cents=row['maximum_stake_cents'],
-      remaining_stake_cents_vs_believers=remaining_stake_cents_vs_believers,
-      remaining_stake_cents_vs_skeptics=remaining_stake_cents_vs_skeptics,
-      created_unixtime=row['created_at_unixtime'],
-      closes_unixtime=row['closes_at_unixtime'],
-      resolves_at_unixtime=row['resolves_at_unixtime'],
-      special_rules=row['special_rules'],
-      creator=row['creator'],
-      resolution=resolution,
-      your_trades=[
-        mvp_pb2.Trade(
-          bettor=t['bettor'],
-          bettor_is_a_skeptic=t['bettor_is_a_skeptic'],
-          creator_stake_cents=t['creator_stake_cents'],
-          bettor_stake_cents=t['bettor_stake_cents'],
-          transacted_unixtime=t['transacted_at_unixtime'],
-          updated_unixtime=t['updated_at_unixtime'],
-          state=mvp_pb2.TradeState.Value(t['state']),
-          notes=t['notes'],
-        )
-        for t in trade_rows
-      ],
-      your_following_status=(
-        mvp_pb2.PREDICTION_FOLLOWING_MANDATORY_BECAUSE_STAKED if (creator_is_viewer or trade_rows) else
-        mvp_pb2.PREDICTION_FOLLOWING_FOLLOWING if follow_row is not None else
-        mvp_pb2.PREDICTION_FOLLOWING_NOT_FOLLOWING
+  def page_of_predictions_created(self, creator: Username, privacies: Iterable[mvp_pb2.PredictionViewPrivacy.V], order: mvp_pb2.PredictionOrder.V, limit: int, cursor: str) -> Tuple[Sequence[PredictionId], str]:
+    """One page of the predictions `creator` created with any of `privacies`; see `_page_of_predictions`."""
+    privacy_names = {mvp_pb2.PredictionViewPrivacy.Name(p) for p in privacies}
+    return self._page_of_predictions(
+      schema.predictions,
+      sqlalchemy.and_(
+        schema.predictions.c.creator == creator,
+        schema.predictions.c.view_privacy.in_(privacy_names),
       ),
+      order=order, limit=limit, cursor=cursor,
     )
 
-  def list_stakes(self, user: Username) -> Iterable[PredictionId]:
-    return {
-      *[PredictionId(row['prediction_id'])
-        for row in self._conn.execute(
-          sqlalchemy.select([schema.predictions.c.prediction_id])
-          .where(schema.predictions.c.creator == user)
-        ).fetchall()],
-      *[PredictionId(row['prediction_id'])
-        for row in self._conn.execute(
-          sqlalchemy.select([schema.trades.c.prediction_id.distinct()])
-          .where(sqlalchemy.and_(
-            schema.trades.c.bettor == user,
-            # schema.trades.c.state == mvp_pb2.TradeState.Name(mvp_pb2.TRADE_STATE_ACTIVE),
-          ))
-        ).fetchall()],
-    }
-
-  def list_predictions_created(self, creator: Username, privacies: Iterable[mvp_pb2.PredictionViewPrivacy.V]) -> Iterable[PredictionId]:
-    privacy_names = {mvp_pb2.PredictionViewPrivacy.Name(p) for p in privacies}
-    return {
-      PredictionId(row['prediction_id'])
-      for row in self._conn.execute(
-        sqlalchemy.select([schema.predictions.c.prediction_id, schema.predictions.c.view_privacy])
-        .where(sqlalchemy.and_(
-          schema.predictions.c.creator == creator,
-          schema.predictions.c.view_privacy.in_(privacy_names),
+  def _page_of_predictions(self, table: sqlalchemy.Table, where: sqlalchemy.sql.ColumnElement, order: mvp_pb2.PredictionOrder.V, limit: int, cursor: str) -> Tuple[Sequence[PredictionId], str]:
+    """Picks one page of the predictions in the rows of `table` matching `where`, sorted by `order`'s column.
+
+    The page is the first `limit` of them (all, if `limit` is 0) after
+    `cursor`, which is empty or a previous page's next-cursor. Returns the
+    page and the cursor for the one after it ('' if there's no more).
+
+    The cursor is the last row's (sort key, prediction_id), so the next page
+    starts where the index says it should, rather than after skipping
+    everything before it; with the `predictions_by_creator_and_*` and
+    `stakes_by_user_and_*` indexes, a page costs the same however many come
+    before it.
+    """
+    if order not in _ORDER_COLUMNS:
+      raise InvalidRequestError('unrecognized order')
+    key_name, descending = _ORDER_COLUMNS[order]
+    key = table.c[key_name]
+    pid = table.c.prediction_id
+    query = sqlalchemy.select([pid, key]).where(where)
+    if cursor:
+      after_key, after_pid = _decode_cursor(cursor)
+      if descending:
+        query = query.where(sqlalchemy.and_(
+          key <= after_key,  # redundant, but it's what lets the index seek straight to the cursor
+          sqlalchemy.or_(key < after_key, pid < after_pid),
         ))
-      ).fetchall()
-    }
+      else:
+        query = query.where(sqlalchemy.and_(
+          key >= after_key,
+          sqlalchemy.or_(key > after_key, pid > after_pid),
+        ))
+    query = query.order_by(key.desc(), pid.desc()) if descending else query.order_by(key.asc(), pid.asc())
+    if limit:
+      query = query.limit(limit + 1)
+    rows = self._conn.execute(query).fetchall()
+    if limit and len(rows) > limit:
+      last = rows[limit-1]
+      return [PredictionId(row[pid]) for row in rows[:limit]], _encode_cursor((last[key], PredictionId(last[pid])))
+    return [PredictionId(row[pid]) for row in rows], ''
 
   PredictionInfo = TypedDict('PredictionInfo',
                  {'creator': Username,
@@ -226,10 +784,7 @@ class SqlConn:
     self,
     prediction_id: PredictionId,
   ) -> Optional[PredictionInfo]:
-    row = self._conn.execute(
-      sqlalchemy.select(schema.predictions.c)
-      .where(schema.predictions.c.prediction_id == prediction_id)
-    ).fetchone()
+    row = self._conn.execute(_SELECT_PREDICTION, {'prediction_id': prediction_id}).fetchone()
     if row is None:
       return None
     return {
@@ -268,12 +823,32 @@ class SqlConn:
   def get_resolution(
     self,
     prediction_id: PredictionId,
+    include_history: bool = False,
   ) -> Optional[mvp_pb2.ResolutionEvent]:
+    if not include_history:
+      row = self._conn.execute(_SELECT_CURRENT_RESOLUTION, {'prediction_id': prediction_id}).fetchone()
+      return None if row is None else SqlConn._current_resolution_to_pb(row)
     rows = self._conn.execute(
       sqlalchemy.select(schema.resolutions.c)
       .where(schema.resolutions.c.prediction_id == prediction_id)
       .order_by(schema.resolutions.c.resolved_at_unixtime)
     ).fetchall()
+    return SqlConn._resolution_rows_to_pb(rows)
+
+  @staticmethod
+  def _current_resolution_to_pb(prediction_row: Any) -> Optional[mvp_pb2.ResolutionEvent]:
+    """Reads the denormalized current resolution off a predictions row."""
+    if prediction_row['resolution'] is None:
+      return None
+    return mvp_pb2.ResolutionEvent(
+      unixtime=float(prediction_row['resolved_at_unixtime']),
+      resolution=mvp_pb2.Resolution.Value(prediction_row['resolution']),
+      notes=str(prediction_row['resolution_notes']),
+    )
+
+  @staticmethod
+  def _resolution_rows_to_pb(rows: Iterable[Any]) -> Optional[mvp_pb2.ResolutionEvent]:
+    """Folds resolution rows (oldest first) into a prior_revision chain."""
     last_event = None
     for row in rows:
       last_event = mvp_pb2.ResolutionEvent(
@@ -289,17 +864,34 @@ class SqlConn:
     prediction_id: PredictionId,
     against_skeptics: bool,
   ) -> int:
-    return int(self._conn.execute(
-      sqlalchemy.select([
-        sqlalchemy.sql.func.sum(schema.trades.c.creator_stake_cents).label('exposure'),
-      ])
-      .select_from(schema.predictions.join(schema.trades))
-      .where(sqlalchemy.and_(
-        schema.predictions.c.prediction_id == prediction_id,
-        schema.trades.c.bettor_is_a_skeptic if against_skeptics else sqlalchemy.not_(schema.trades.c.bettor_is_a_skeptic),
-        schema.trades.c.state == mvp_pb2.TradeState.Name(mvp_pb2.TRADE_STATE_ACTIVE),
+    """Reads the creator's exposure from the prediction_exposure counters.
+
+    Locks the counter row (where the database supports it) until the
+    transaction ends, so a concurrent stake can't slip in between checking the
+    exposure against the cap and adding to it.
+    """
+    return int(self._conn.execute(_SELECT_CREATOR_EXPOSURE_FOR_UPDATE, {
+      'prediction_id': prediction_id,
+      'against_skeptics': against_skeptics,
+    }).scalar() or 0)
+
+  def _add_creator_exposure_cents(
+    self,
+    prediction_id: PredictionId,
+    against_skeptics: bool,
+    delta_cents: int,
+  ) -> None:
+    updated = self._conn.execute(_UPDATE_CREATOR_EXPOSURE, {
+      'where_prediction_id': prediction_id,
+      'where_against_skeptics': against_skeptics,
+      'delta_cents': delta_cents,
+    }).rowcount
+    if updated == 0:
+      self._conn.execute(sqlalchemy.insert(schema.prediction_exposure).values(
+        prediction_id=prediction_id,
+        against_skeptics=against_skeptics,
+        creator_exposure_cents=delta_cents,
       ))
-    ).scalar() or 0)
 
   def get_bettor_exposure_cents(
     self,
@@ -307,18 +899,11 @@ class SqlConn:
     bettor: Username,
     bettor_is_a_skeptic: bool
   ) -> int:
-    return int(self._conn.execute(
-      sqlalchemy.select([
-        sqlalchemy.sql.func.sum(schema.trades.c.bettor_stake_cents).label('exposure'),
-      ])
-      .select_from(schema.predictions.join(schema.trades))
-      .where(sqlalchemy.and_(
-        schema.trades.c.bettor == bettor,
-        schema.predictions.c.prediction_id == prediction_id,
-        schema.trades.c.bettor_is_a_skeptic if bettor_is_a_skeptic else sqlalchemy.not_(schema.trades.c.bettor_is_a_skeptic),
-        schema.trades.c.state == mvp_pb2.TradeState.Name(mvp_pb2.TRADE_STATE_ACTIVE),
-      ))
-    ).scalar() or 0)
+    return int(self._conn.execute(_SELECT_BETTOR_EXPOSURE, {
+      'prediction_id': prediction_id,
+      'bettor': bettor,
+      'bettor_is_a_skeptic': bettor_is_a_skeptic,
+    }).scalar() or 0)
 
   def stake(
     self,
@@ -340,6 +925,11 @@ class SqlConn:
       transacted_at_unixtime=now.timestamp(),
       updated_at_unixtime=now.timestamp(),
     ))
+    if self._conn.execute(_SELECT_STAKE, {'username': bettor, 'prediction_id': prediction_id}).first() is None:
+      self._conn.execute(_INSERT_STAKE_FROM_PREDICTION, {'username': bettor, 'prediction_id': prediction_id})
+    if state == mvp_pb2.TRADE_STATE_ACTIVE:
+      self._add_creator_exposure_cents(prediction_id, against_skeptics=bettor_is_a_skeptic, delta_cents=creator_stake_cents)
+    self._prediction_changed(prediction_id)
 
   def set_following(
     self,
@@ -363,18 +953,31 @@ class SqlConn:
           schema.prediction_follows.c.follower == follower,
         ))
       )
+    self._prediction_changed(prediction_id)
 
   def resolve(
     self,
     request: mvp_pb2.ResolveRequest,
     now: datetime.datetime,
   ) -> None:
+    resolution = mvp_pb2.Resolution.Name(request.resolution)
+    resolved_at_unixtime = round(now.timestamp())
     self._conn.execute(sqlalchemy.insert(schema.resolutions).values(
       prediction_id=request.prediction_id,
-      resolution=mvp_pb2.Resolution.Name(request.resolution),
-      resolved_at_unixtime=round(now.timestamp()),
+      resolution=resolution,
+      resolved_at_unixtime=resolved_at_unixtime,
       notes=request.notes,
     ))
+    self._conn.execute(
+      sqlalchemy.update(schema.predictions)
+      .where(schema.predictions.c.prediction_id == request.prediction_id)
+      .values(
+        resolution=resolution,
+        resolved_at_unixtime=resolved_at_unixtime,
+        resolution_notes=request.notes,
+      )
+    )
+    self._prediction_changed(request.prediction_id)
 
   def set_trusted(self, subject_username: Username, object_username: Username, trusted: bool, now: datetime.datetime) -> None:
     if self._conn.execute(
@@ -401,6 +1004,14 @@ class SqlConn:
           schema.relationships.c.object_username == object_username,
         ))
       )
+    if getattr(self._local, 'on_commit', None) is None:
+      self._apply_trust_changes({(subject_username, object_username): trusted})
+    else:
+      uncommitted = getattr(self._local, 'uncommitted_trust', None)
+      if uncommitted is None:
+        uncommitted = self._local.uncommitted_trust = {}
+        self.after_commit(functools.partial(self._apply_trust_changes, uncommitted))
+      uncommitted[(subject_username, object_username)] = trusted
 
     if self.trusts(subject_username, object_username) and self.trusts(object_username, subject_username):
       self._dequeue_trades(bettor=subject_username, creator=object_username, now=now)
@@ -457,15 +1068,17 @@ class SqlConn:
           **values
         )
       )
+      if values['state'] == mvp_pb2.TradeState.Name(mvp_pb2.TRADE_STATE_ACTIVE):
+        self._add_creator_exposure_cents(PredictionId(qt['prediction_id']), against_skeptics=qt['bettor_is_a_skeptic'], delta_cents=creator_stake_cents)
+      self._prediction_changed(qt['prediction_id'])
 
-  def change_password(self, user: Username, new_password: str) -> None:
+  def change_password(self, user: Username, new: mvp_pb2.HashedPassword) -> None:
     pwid = self._conn.execute(
       sqlalchemy.select([schema.users.c.login_password_id])
       .where(schema.users.c.username == user)
     ).scalar()
     if pwid is None:
       raise ValueError('no such user', user)
-    new = new_hashed_password(new_password)
     self._conn.execute(
       sqlalchemy.update(schema.passwords)
       .values(salt=new.salt, scrypt=new.scrypt)
@@ -496,26 +1109,16 @@ class SqlConn:
     return {row['email_address'] for row in self._conn.execute(q_bettors.union(q_followers))}
 
   def get_settings(self, user: AuthorizingUsername, include_relationships_with_users: Iterable[Username] = ()) -> Optional[mvp_pb2.GenericUserInfo]:
-    row = self._conn.execute(
-      sqlalchemy.select(schema.users.c)
-      .where(schema.users.c.username == user)
-    ).first()
+    row = self._conn.execute(_SELECT_USER, {'username': user}).first()
     if row is None:
       return None
-    outgoing_relationships = self._conn.execute(
-      sqlalchemy.select(schema.relationships.c)
-      .where(schema.relationships.c.subject_username == user)
-    ).fetchall()
+    outgoing_relationships = self._conn.execute(_SELECT_OUTGOING_RELATIONSHIPS, {'username': user}).fetchall()
     include_relationships_with_users = set(include_relationships_with_users) | {row['object_username'] for row in outgoing_relationships}
     outgoing_relationships_by_name = {row['object_username']: row for row in outgoing_relationships}
-    trusting_users = {row['subject_username'] for row in self._conn.execute(
-      sqlalchemy.select(schema.relationships.c)
-      .where(sqlalchemy.and_(
-        schema.relationships.c.subject_username.in_(include_relationships_with_users),
-        schema.relationships.c.object_username == user,
-        schema.relationships.c.trusted,
-      ))
-    )}
+    trusting_users = {row['subject_username'] for row in self._conn.execute(_SELECT_TRUSTING_SUBJECTS, {
+      'subjects': list(include_relationships_with_users),
+      'username': user,
+    })}
     return mvp_pb2.GenericUserInfo(
       email_address=str(row['email_address']),
       relationships={
@@ -527,10 +1130,7 @@ class SqlConn:
       },
       invitations={
         row['recipient']: mvp_pb2.GenericUserInfo.Invitation()
-        for row in self._conn.execute(
-          sqlalchemy.select([schema.email_invitations.c.recipient])
-          .where(schema.email_invitations.c.inviter == user)
-        )
+        for row in self._conn.execute(_SELECT_INVITATION_RECIPIENTS, {'username': user})
       },
     )
 
@@ -577,38 +1177,12 @@ class SqlConn:
     )
 
   def is_invitation_outstanding(self, inviter: Username, recipient: Username) -> bool:
-    return self._conn.execute(
-      sqlalchemy.select([1])
-      .where(sqlalchemy.and_(
-        schema.email_invitations.c.inviter == inviter,
-        schema.email_invitations.c.recipient == recipient,
-      ))
-    ).fetchone() is not None
+    return self._conn.execute(_SELECT_INVITATION_IS_OUTSTANDING, {'inviter': inviter, 'recipient': recipient}).fetchone() is not None
 
   ResolutionReminderInfo = TypedDict('ResolutionReminderInfo', {'prediction_id': PredictionId,
                                                                 'prediction_text': str,
                                                                 'email_address': str})
   def get_predictions_needing_resolution_reminders(self, now: datetime.datetime) -> Iterable[ResolutionReminderInfo]:
-    latest_time_per_prediction_q = sqlalchemy.select([
-      schema.resolutions.c.prediction_id,
-      sqlalchemy.sql.func.max(schema.resolutions.c.resolved_at_unixtime).label('resolved_at_unixtime'),
-    ]).group_by(
-      schema.resolutions.c.prediction_id,
-    )
-    latest_time_per_prediction_q = latest_time_per_prediction_q.subquery()  # type: ignore # https://github.com/dropbox/sqlalchemy-stubs/pull/218
-
-    resolved_prediction_ids_q = sqlalchemy.select([
-      schema.resolutions.c.prediction_id,
-    ]).select_from(schema.resolutions.join(
-      latest_time_per_prediction_q,
-      onclause=sqlalchemy.and_(
-        latest_time_per_prediction_q.c.prediction_id == schema.resolutions.c.prediction_id,
-        latest_time_per_prediction_q.c.resolved_at_unixtime == schema.resolutions.c.resolved_at_unixtime,
-        schema.resolutions.c.resolution != 'RESOLUTION_NONE_YET'
-      ),
-    ))
-    resolved_prediction_ids_q = resolved_prediction_ids_q.subquery()  # type: ignore # https://github.com/dropbox/sqlalchemy-stubs/pull/218
-
     rows = self._conn.execute(
       sqlalchemy.select([
         schema.predictions.c.prediction_id,
@@ -619,7 +1193,10 @@ class SqlConn:
         schema.predictions.c.resolves_at_unixtime < now.timestamp(),
         sqlalchemy.not_(schema.predictions.c.resolution_reminder_sent),
         schema.predictions.c.creator == schema.users.c.username,
-        sqlalchemy.not_(schema.predictions.c.prediction_id.in_(sqlalchemy.select(resolved_prediction_ids_q.c)))
+        sqlalchemy.or_(
+          schema.predictions.c.resolution == None,
+          schema.predictions.c.resolution == mvp_pb2.Resolution.Name(mvp_pb2.RESOLUTION_NONE_YET),
+        ),
       ))
     ).fetchall()
 
@@ -644,6 +1221,12 @@ def transactional(f):
     with self._conn.transaction():
       return f(self, *args, **kwargs)
   return wrapped
+def read_only_transactional(f):
+  @functools.wraps(f)
+  def wrapped(self: 'SqlServicer', *args, **kwargs):
+    with self._conn.transaction(read_only=True):
+      return f(self, *args, **kwargs)
+  return wrapped
 def log_actor(f):
   @functools.wraps(f)
   def wrapped(self: 'SqlServicer', actor: Optional[AuthorizingUsername], *args, **kwargs):
@@ -672,21 +1255,26 @@ def log_action(f):
 
 
 class SqlServicer(Servicer):
-    def __init__(self, conn: SqlConn, token_mint: TokenMint, emailer: Emailer, random_seed: Optional[int] = None, clock: Callable[[], datetime.datetime] = datetime.datetime.now) -> None:
+    def __init__(self, conn: SqlConn, token_mint: TokenMint, emailer: Emailer, random_seed: Optional[int] = None, clock: Callable[[], datetime.datetime] = datetime.datetime.now, password_hasher: Optional[PasswordHasher] = None) -> None:
         self._conn = conn
+        self._password_hasher = password_hasher if (password_hasher is not None) else PasswordHasher()
         self._token_mint = token_mint
         self._emailer = emailer
         self._rng = random.Random(random_seed)
         self._clock = clock
 
-    @transactional
+    def _send_after_commit(self, send: Callable[[], Awaitable[Any]]) -> None:
+        """Sends an email (the coroutine `send()`) once the current transaction commits; never, if it rolls back."""
+        self._conn.after_commit(lambda: fire_and_forget(send()))
+
+    @read_only_transactional
     @ensure_actor_exists
     @log_actor
     @log_action
     def Whoami(self, actor: Optional[AuthorizingUsername], request: mvp_pb2.WhoamiRequest) -> mvp_pb2.WhoamiResponse:
         return mvp_pb2.WhoamiResponse(username=actor if (actor is not None) else '')
 
-    @transactional
+    @read_only_transactional
     @ensure_actor_exists
     @log_actor
     @log_action
@@ -696,7 +1284,7 @@ class SqlServicer(Servicer):
             pass # TODO(P3): figure out how token-revoking should work; is it enough for the browser to just forget the cookie?
         return mvp_pb2.SignOutResponse()
 
-    @transactional
+    @read_only_transactional
     @log_actor
     @log_action
     def SendVerificationEmail(self, actor: Optional[AuthorizingUsername], request: mvp_pb2.SendVerificationEmailRequest) -> mvp_pb2.Empty:
@@ -710,19 +1298,41 @@ class SqlServicer(Servicer):
         raise AlreadyRegisteredError('email is already registered')
 
       logger.info('sending verification email', email_address=request.email_address)
-      asyncio.create_task(self._emailer.send_email_verification(
+      self._send_after_commit(functools.partial(self._emailer.send_email_verification,
         to=request.email_address,
         proof_token=self._token_mint.sign_proof_of_email(email_address=request.email_address),
       ))
 
       return mvp_pb2.Empty()
 
-    @transactional
-    @ensure_actor_exists
+    # RegisterUsername, LogInUsername and ChangePassword each scrypt a password
+    # or two. That's slow, so they do it between transactions, not in one:
+    # waiting on a hash mustn't hold a pooled connection (or, with SQLite, the
+    # write lock). Transports usually precompute the hashes anyway; see
+    # PasswordHasher.precompute.
+
     @log_actor
     @log_action
     def RegisterUsername(self, actor: Optional[AuthorizingUsername], request: mvp_pb2.RegisterUsernameRequest) -> mvp_pb2.AuthSuccess:
       logger.debug('API call', username=request.username)
+      email_address = self._check_registration(actor, request)
+      hashed_password = self._password_hasher.new_hashed_password(request.password)
+      logger.info('registering username', username=request.username)
+      self._register_username(Username(request.username), email_address, hashed_password)
+
+      # Catch LogInUsername's ApiError rather than letting it propagate: failing
+      # to log in as the user we just created is our bug, not the caller's, and
+      # shouldn't surface as (say) a 401.
+      try:
+        return self.LogInUsername(None, mvp_pb2.LogInUsernameRequest(username=request.username, password=request.password))
+      except ApiError as e:
+        logger.error('unable to log in as freshly-created user', username=request.username, error=e.catchall)
+        raise InternalError('somehow failed to log you into your fresh account')
+
+    @read_only_transactional
+    @ensure_actor_exists
+    def _check_registration(self, actor: Optional[AuthorizingUsername], request: mvp_pb2.RegisterUsernameRequest) -> str:
+      """The email address the registration proves; raises if it mustn't happen."""
       if actor is not None:
         logger.warn('logged-in user trying to register a username', new_username=request.username)
         raise AlreadyLoggedInError('already authenticated; first, log out')
@@ -743,29 +1353,36 @@ class SqlServicer(Servicer):
       if email_address is None:
         logger.warn('invalid HMAC for proof-of-email', request=request)
         raise InvalidRequestError('invalid signature')
-      logger.info('registering username', username=request.username)
+      return email_address
+
+    @transactional
+    def _register_username(self, username: Username, email_address: str, hashed_password: mvp_pb2.HashedPassword) -> None:
+      if self._conn.user_exists(username):
+        # Someone else took it while we were hashing.
+        logger.info('username taken', username=username)
+        raise AlreadyRegisteredError('username taken')
       password_id = ''.join(self._rng.choices('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ01234567879_', k=16))
       self._conn.register_username(
-        username=Username(request.username),
+        username=username,
         email_address=email_address,
-        password=request.password,
+        password=hashed_password,
         password_id=password_id,
       )
 
-      # Catch LogInUsername's ApiError rather than letting it propagate: failing
-      # to log in as the user we just created is our bug, not the caller's, and
-      # shouldn't surface as (say) a 401.
-      try:
-        return self.LogInUsername(None, mvp_pb2.LogInUsernameRequest(username=request.username, password=request.password))
-      except ApiError as e:
-        logger.error('unable to log in as freshly-created user', username=request.username, error=e.catchall)
-        raise InternalError('somehow failed to log you into your fresh account')
-
-    @transactional
-    @ensure_actor_exists
     @log_actor
     @log_action
     def LogInUsername(self, actor: Optional[AuthorizingUsername], request: mvp_pb2.LogInUsernameRequest) -> mvp_pb2.AuthSuccess:
+        hashed_password = self._login_password_info(actor, request)
+        if not self._password_hasher.check_password(request.password, hashed_password):
+            logger.info('login attempt has bad password', possible_malice=True)
+            raise BadCredentialsError('bad password')
+
+        logger.debug('username logged in', username=request.username)
+        return self._auth_success(Username(request.username))
+
+    @read_only_transactional
+    @ensure_actor_exists
+    def _login_password_info(self, actor: Optional[AuthorizingUsername], request: mvp_pb2.LogInUsernameRequest) -> mvp_pb2.HashedPassword:
         if actor is not None:
             logger.warn('logged-in user trying to log in again', new_username=request.username)
             # Not an auth failure -- the caller is authenticated, just confused.
@@ -778,17 +1395,16 @@ class SqlServicer(Servicer):
             # refactor. Preserved verbatim to keep the change behavior-preserving;
             # worth closing separately.
             raise BadCredentialsError('no such user; maybe you want to sign up?')
-        if not check_password(request.password, hashed_password):
-            logger.info('login attempt has bad password', possible_malice=True)
-            raise BadCredentialsError('bad password')
+        return hashed_password
 
-        logger.debug('username logged in', username=request.username)
+    @read_only_transactional
+    def _auth_success(self, username: Username) -> mvp_pb2.AuthSuccess:
         # The AuthSuccess carries the username so the client knows who it's now
         # logged in as; the actual signed session cookie is minted by the
         # transport (api_server), which owns cookies.
         return mvp_pb2.AuthSuccess(
-          token=mvp_pb2.AuthToken(owner=Username(request.username)),
-          user_info=self._conn.get_settings(AuthorizingUsername(Username(request.username))),
+          token=mvp_pb2.AuthToken(owner=username),
+          user_info=self._conn.get_settings(AuthorizingUsername(username)),
         )
 
     @transactional
@@ -817,19 +1433,19 @@ class SqlServicer(Servicer):
       )
       return mvp_pb2.CreatePredictionResponse(new_prediction_id=prediction_id)
 
-    @transactional
+    @read_only_transactional
     @ensure_actor_exists
     @log_actor
     @log_action
     def GetPrediction(self, actor: Optional[AuthorizingUsername], request: mvp_pb2.GetPredictionRequest) -> mvp_pb2.UserPredictionView:
-      view = self._conn.view_prediction(actor, PredictionId(request.prediction_id))
+      view = self._conn.view_prediction(actor, PredictionId(request.prediction_id), include_resolution_history=True)
       if view is None:
         logger.info('trying to get nonexistent prediction', prediction_id=request.prediction_id)
         raise NoSuchPredictionError('no such prediction')
       return view
 
 
-    @transactional
+    @read_only_transactional
     @ensure_actor_exists
     @log_actor
     @log_action
@@ -838,33 +1454,37 @@ class SqlServicer(Servicer):
         logger.info('logged-out user trying to list their predictions')
         return mvp_pb2.PredictionsById(predictions={})
 
-      prediction_ids = self._conn.list_stakes(actor)
+      return self._predictions_by_id(actor, self._list_my_stakes_page(actor, request), request.projection)
 
-      predictions_by_id: MutableMapping[str, mvp_pb2.UserPredictionView] = {}
-      for prediction_id in prediction_ids:
-        view = self._conn.view_prediction(actor, prediction_id)
-        assert view is not None
-        predictions_by_id[prediction_id] = view
-      return mvp_pb2.PredictionsById(predictions=predictions_by_id)
+    def _list_my_stakes_page(self, actor: Optional[AuthorizingUsername], request: mvp_pb2.ListMyStakesRequest) -> PredictionsPage:
+      if actor is None:
+        return PredictionsPage(prediction_ids=[], next_cursor='')
+      prediction_ids, next_cursor = self._conn.page_of_stakes(actor, order=request.order, limit=request.limit, cursor=request.cursor)
+      return PredictionsPage(prediction_ids=prediction_ids, next_cursor=next_cursor)
 
-    @transactional
+    @read_only_transactional
     @ensure_actor_exists
     @log_actor
     @log_action
     def ListPredictions(self, actor: Optional[AuthorizingUsername], request: mvp_pb2.ListPredictionsRequest) -> mvp_pb2.PredictionsById:
-      creator = Username(request.creator)
-
-      prediction_ids = self._conn.list_predictions_created(
-        creator=creator,
+      return self._predictions_by_id(actor, self._list_predictions_page(actor, request), request.projection)
+
+    def _predictions_by_id(self, actor: Optional[AuthorizingUsername], page: PredictionsPage, projection: mvp_pb2.PredictionProjection.V) -> mvp_pb2.PredictionsById:
+      if projection == mvp_pb2.PREDICTION_PROJECTION_FULL:
+        return mvp_pb2.PredictionsById(predictions=self._conn.view_predictions(actor, page.prediction_ids), next_cursor=page.next_cursor)
+      if projection == mvp_pb2.PREDICTION_PROJECTION_SUMMARY:
+        return mvp_pb2.PredictionsById(summaries=self._conn.summarize_predictions(page.prediction_ids), next_cursor=page.next_cursor)
+      raise InvalidRequestError('unrecognized projection')
+
+    def _list_predictions_page(self, actor: Optional[AuthorizingUsername], request: mvp_pb2.ListPredictionsRequest) -> PredictionsPage:
+      prediction_ids, next_cursor = self._conn.page_of_predictions_created(
+        creator=Username(request.creator),
         privacies=mvp_pb2.PredictionViewPrivacy.values() if actor == request.creator else {mvp_pb2.PREDICTION_VIEW_PRIVACY_ANYBODY},
+        order=request.order,
+        limit=request.limit,
+        cursor=request.cursor,
       )
-
-      predictions_by_id: MutableMapping[str, mvp_pb2.UserPredictionView] = {}
-      for prediction_id in prediction_ids:
-        view = self._conn.view_prediction(actor, prediction_id)
-        assert view is not None
-        predictions_by_id[prediction_id] = view
-      return mvp_pb2.PredictionsById(predictions=predictions_by_id)
+      return PredictionsPage(prediction_ids=prediction_ids, next_cursor=next_cursor)
 
     @transactional
     @ensure_actor_exists
@@ -934,7 +1554,7 @@ class SqlServicer(Servicer):
         now=now,
       )
       logger.info('trade executed', prediction_id=request.prediction_id, request=request)
-      view = self._conn.view_prediction(actor, PredictionId(request.prediction_id))
+      view = self._conn.view_prediction(actor, PredictionId(request.prediction_id), include_resolution_history=True)
       assert view is not None  # else the prediction we just wrote to vanished
       return view
 
@@ -959,7 +1579,7 @@ class SqlServicer(Servicer):
         follow=request.follow,
       )
       logger.info('trade executed', prediction_id=request.prediction_id, request=request)
-      view = self._conn.view_prediction(actor, PredictionId(request.prediction_id))
+      view = self._conn.view_prediction(actor, PredictionId(request.prediction_id), include_resolution_history=True)
       assert view is not None  # else the prediction we just wrote to vanished
       return view
 
@@ -992,13 +1612,13 @@ class SqlServicer(Servicer):
       email_addrs = set(self._conn.get_resolution_notification_addrs(predid))
       if email_addrs:
         logger.info('sending resolution emails', prediction_id=request.prediction_id, email_addrs=email_addrs)
-        asyncio.create_task(self._emailer.send_resolution_notifications(
+        self._send_after_commit(functools.partial(self._emailer.send_resolution_notifications,
             bccs=email_addrs,
             prediction_id=predid,
             prediction_text=predinfo['prediction'],
             resolution=request.resolution,
         ))
-      view = self._conn.view_prediction(actor, predid)
+      view = self._conn.view_prediction(actor, predid, include_resolution_history=True)
       assert view is not None  # else the prediction we just resolved vanished
       return view
 
@@ -1028,7 +1648,7 @@ class SqlServicer(Servicer):
       assert info is not None  # actor is authenticated, so they have settings
       return info
 
-    @transactional
+    @read_only_transactional
     @ensure_actor_exists
     @log_actor
     @log_action
@@ -1042,12 +1662,24 @@ class SqlServicer(Servicer):
         trusts_you=self._conn.trusts(Username(request.who), actor) if (actor is not None) else False,
       )
 
-    @transactional
-    @ensure_actor_exists
     @log_actor
     @log_action
     def ChangePassword(self, actor: Optional[AuthorizingUsername], request: mvp_pb2.ChangePasswordRequest) -> mvp_pb2.Empty:
       logger.debug('API call')
+      old_hashed_password = self._password_to_change(actor, request)
+      if not self._password_hasher.check_password(request.old_password, old_hashed_password):
+        logger.warn('password-change request has wrong password', possible_malice=True)
+        raise BadCredentialsError('wrong old password')
+      new_hashed_password = self._password_hasher.new_hashed_password(request.new_password)
+
+      logger.info('changing password', who=actor)
+      assert actor is not None  # else _password_to_change would have raised
+      self._replace_password(actor, old_hashed_password, new_hashed_password)
+      return mvp_pb2.Empty()
+
+    @read_only_transactional
+    @ensure_actor_exists
+    def _password_to_change(self, actor: Optional[AuthorizingUsername], request: mvp_pb2.ChangePasswordRequest) -> mvp_pb2.HashedPassword:
       if actor is None:
         logger.warn('not logged in')
         raise NotLoggedInError('must log in to change your password')
@@ -1060,17 +1692,17 @@ class SqlServicer(Servicer):
       if old_hashed_password is None:
         logger.warn('password-change request for non-password user', possible_malice=True)
         raise InvalidRequestError("you don't use a password to log in")
+      return old_hashed_password
 
-      if not check_password(request.old_password, old_hashed_password):
-        logger.warn('password-change request has wrong password', possible_malice=True)
+    @transactional
+    def _replace_password(self, actor: AuthorizingUsername, old: mvp_pb2.HashedPassword, new: mvp_pb2.HashedPassword) -> None:
+      if self._conn.get_username_password_info(actor) != old:
+        # Changed by some other request while we were hashing: the old password we checked is stale.
+        logger.warn('password changed during password-change request', possible_malice=True)
         raise BadCredentialsError('wrong old password')
+      self._conn.change_password(actor, new)
 
-      logger.info('changing password', who=actor)
-      self._conn.change_password(actor, request.new_password)
-
-      return mvp_pb2.Empty()
-
-    @transactional
+    @read_only_transactional
     @ensure_actor_exists
     @log_actor
     @log_action
@@ -1116,7 +1748,7 @@ class SqlServicer(Servicer):
         inviter=actor,
         recipient=recipient,
       )
-      asyncio.create_task(self._emailer.send_invitation(
+      self._send_after_commit(functools.partial(self._emailer.send_invitation,
         inviter_username=actor,
         inviter_email=inviter_email,
         recipient_username=recipient,
@@ -1127,7 +1759,7 @@ class SqlServicer(Servicer):
       assert info is not None  # actor is authenticated, so they have settings
       return info
 
-    @transactional
+    @read_only_transactional
     @ensure_actor_exists
     @log_actor
     @log_action
@@ -1155,7 +1787,7 @@ class SqlServicer(Servicer):
         raise NoSuchInvitationError('no such invitation')
       inviter_email = self._conn.get_email(Username(result.inviter))
       assert inviter_email is not None  # inviter must have existed in order to issue the invitation
-      asyncio.create_task(self._emailer.send_invitation_acceptance_notification(
+      self._send_after_commit(functools.partial(self._emailer.send_invitation_acceptance_notification,
         inviter_email=inviter_email,
         recipient_username=Username(result.recipient),
       ))
@@ -1165,6 +1797,65 @@ class SqlServicer(Servicer):
       assert info is not None  # actor is authenticated, so they have settings
       return info
 
+    @read_only_transactional
+    @ensure_actor_exists
+    def ListMyStakesPage(self, actor: Optional[AuthorizingUsername], request: mvp_pb2.ListMyStakesRequest) -> PredictionsPage:
+      return self._list_my_stakes_page(actor, request)
+
+    @read_only_transactional
+    @ensure_actor_exists
+    def ListPredictionsPage(self, actor: Optional[AuthorizingUsername], request: mvp_pb2.ListPredictionsRequest) -> PredictionsPage:
+      return self._list_predictions_page(actor, request)
+
+    def GetPredictionVersion(self, prediction_id: PredictionId) -> int:
+      return self._conn.prediction_versions.get(prediction_id)
+
+    @read_only_transactional
+    def GetPasswordSalt(self, username: Username) -> Optional[bytes]:
+      hashed_password = self._conn.get_username_password_info(username)
+      return None if (hashed_password is None) else hashed_password.salt
+
+    @read_only_transactional
+    def GetPredictionUpdate(self, prediction_id: PredictionId) -> mvp_pb2.PredictionUpdate:
+      update = self._conn.get_prediction_update(prediction_id)
+      if update is None:
+        raise NoSuchPredictionError('no such prediction')
+      return update
+
+    def WatchPredictions(self, callback: Callable[[PredictionId], None]) -> None:
+      self._conn.prediction_versions.add_listener(lambda prediction_id: callback(PredictionId(prediction_id)))
+
+    @transactional
+    @ensure_actor_exists
+    @log_actor
+    @log_action
+    def RunBatch(self, actor: Optional[AuthorizingUsername], calls: Sequence[Callable[[], _T]]) -> Sequence[Union[_T, ApiError]]:
+      results: MutableSequence[Union[_T, ApiError]] = []
+      for call in calls:
+        try:
+          with self._conn.savepoint():
+            result = call()
+          results.append(result)
+        except ApiError as e:
+          logger.info('batched call failed', status=e.http_status, catchall=e.catchall)
+          results.append(e)
+      return results
+
+    @read_only_transactional
+    @ensure_actor_exists
+    @log_actor
+    @log_action
+    def GetPageContext(self, actor: Optional[AuthorizingUsername], load_payload: Callable[[], _T], relationships_with: Callable[[_T], Iterable[str]] = lambda _: ()) -> PageContext[_T]:
+      payload = load_payload()
+      if actor is None:
+        return PageContext(user_info=None, payload=payload)
+      try:
+        user_info: Optional[mvp_pb2.GenericUserInfo] = self.GetSettings(actor, mvp_pb2.GetSettingsRequest(include_relationships_with_users=relationships_with(payload)))
+      except ApiError as e:
+        logger.error('failed to get settings for valid-looking user', data_loss=True, error=e.catchall)
+        user_info = None
+      return PageContext(user_info=user_info, payload=payload)
+
 
 
 def find_invariant_violations(conn: sqlalchemy.engine.base.Connection) -> Sequence[Mapping[str, Any]]:
@@ -1198,9 +1889,156 @@ def find_invariant_violations(conn: sqlalchemy.engine.base.Connection) -> Sequen
         'maximum_stake_cents': row['maximum_stake_cents'],
         'actual_exposure': row['exposure'],
       })
+
+  counted_exposures = {
+    (row['prediction_id'], bool(row['against_skeptics'])): row['creator_exposure_cents']
+    for row in conn.execute(sqlalchemy.select(schema.prediction_exposure.c))
+  }
+  actual_exposures = _sum_active_creator_exposures(conn)
+  for (prediction_id, against_skeptics) in sorted(set(counted_exposures) | set(actual_exposures)):
+    counted = counted_exposures.get((prediction_id, against_skeptics), 0)
+    actual = actual_exposures.get((prediction_id, against_skeptics), 0)
+    if counted != actual:
+      violations.append({
+        'type': 'exposure counter out of sync',
+        'prediction_id': prediction_id,
+        'against_skeptics': against_skeptics,
+        'counted_exposure': counted,
+        'actual_exposure': actual,
+      })
+
+  latest_resolutions = _latest_resolutions(conn)
+  for row in conn.execute(sqlalchemy.select([
+    schema.predictions.c.prediction_id,
+    schema.predictions.c.resolution,
+    schema.predictions.c.resolved_at_unixtime,
+    schema.predictions.c.resolution_notes,
+  ]).order_by(schema.predictions.c.prediction_id)):
+    denormalized = (row['resolution'], row['resolved_at_unixtime'], row['resolution_notes'])
+    latest = latest_resolutions.get(row['prediction_id'], (None, None, None))
+    if denormalized != latest:
+      violations.append({
+        'type': 'current resolution out of sync',
+        'prediction_id': row['prediction_id'],
+        'denormalized_resolution': denormalized,
+        'latest_resolution': latest,
+      })
+
+  recorded_stakes = {
+    (row['username'], row['prediction_id']): (row['created_at_unixtime'], row['closes_at_unixtime'], row['resolves_at_unixtime'])
+    for row in conn.execute(sqlalchemy.select(schema.stakes.c))
+  }
+  actual_stakes = _actual_stakes(conn)
+  for (username, prediction_id) in sorted(set(recorded_stakes) | set(actual_stakes)):
+    recorded_keys = recorded_stakes.get((username, prediction_id))
+    actual_keys = actual_stakes.get((username, prediction_id))
+    if recorded_keys != actual_keys:
+      violations.append({
+        'type': 'stake out of sync',
+        'username': username,
+        'prediction_id': prediction_id,
+        'recorded_sort_keys': recorded_keys,
+        'actual_sort_keys': actual_keys,
+      })
   return violations
 
 
+def _latest_resolutions(conn: sqlalchemy.engine.base.Connection) -> Mapping[str, Tuple[str, float, str]]:
+  latest: MutableMapping[str, Tuple[str, float, str]] = {}
+  for row in conn.execute(sqlalchemy.select(schema.resolutions.c).order_by(schema.resolutions.c.resolved_at_unixtime)):
+    latest[row['prediction_id']] = (row['resolution'], row['resolved_at_unixtime'], row['notes'])
+  return latest
+
+
+def _sum_active_creator_exposures(conn: sqlalchemy.engine.base.Connection) -> Mapping[Tuple[str, bool], int]:
+  return {
+    (row['prediction_id'], bool(row['bettor_is_a_skeptic'])): int(row['exposure'])
+    for row in conn.execute(
+      sqlalchemy.select([
+        schema.trades.c.prediction_id,
+        schema.trades.c.bettor_is_a_skeptic,
+        sqlalchemy.sql.func.sum(schema.trades.c.creator_stake_cents).label('exposure'),
+      ])
+      .where(schema.trades.c.state == mvp_pb2.TradeState.Name(mvp_pb2.TRADE_STATE_ACTIVE))
+      .group_by(schema.trades.c.prediction_id, schema.trades.c.bettor_is_a_skeptic)
+    )
+  }
+
+
+def _actual_stakes(conn: sqlalchemy.engine.base.Connection) -> Mapping[Tuple[str, str], Tuple[float, float, float]]:
+  """What the `stakes` table should hold: each user's created and bet-on predictions, with their sort keys."""
+  sort_keys = [
+    schema.predictions.c.prediction_id,
+    schema.predictions.c.created_at_unixtime,
+    schema.predictions.c.closes_at_unixtime,
+    schema.predictions.c.resolves_at_unixtime,
+  ]
+  rows = conn.execute(
+    sqlalchemy.union(
+      sqlalchemy.select([schema.predictions.c.creator.label('username'), *sort_keys]),
+      sqlalchemy.select([schema.trades.c.bettor.label('username'), *sort_keys])
+      .select_from(schema.predictions.join(schema.trades)),
+    )
+  )
+  return {
+    (row['username'], row['prediction_id']): (row['created_at_unixtime'], row['closes_at_unixtime'], row['resolves_at_unixtime'])
+    for row in rows
+  }
+
+
+def rebuild_prediction_exposure(conn: sqlalchemy.engine.base.Connection) -> None:
+  """Recomputes every prediction_exposure counter from the trades table.
+
+  For populating the table in a database that predates it, or repairing it
+  after find_invariant_violations reports it out of sync.
+  """
+  with conn.begin():
+    actual_exposures = _sum_active_creator_exposures(conn)
+    counters = [
+      dict(prediction_id=row['prediction_id'], against_skeptics=against_skeptics, creator_exposure_cents=actual_exposures.get((row['prediction_id'], against_skeptics), 0))
+      for row in conn.execute(sqlalchemy.select([schema.predictions.c.prediction_id]))
+      for against_skeptics in (False, True)
+    ]
+    conn.execute(sqlalchemy.delete(schema.prediction_exposure))
+    if counters:
+      conn.execute(sqlalchemy.insert(schema.prediction_exposure), counters)
+
+
+def rebuild_stakes(conn: sqlalchemy.engine.base.Connection) -> None:
+  """Recomputes the `stakes` table from predictions and trades.
+
+  For populating the table in a database that predates it, or repairing it
+  after find_invariant_violations reports it out of sync.
+  """
+  with conn.begin():
+    stakes = [
+      dict(username=username, prediction_id=prediction_id, created_at_unixtime=created, closes_at_unixtime=closes, resolves_at_unixtime=resolves)
+      for (username, prediction_id), (created, closes, resolves) in _actual_stakes(conn).items()
+    ]
+    conn.execute(sqlalchemy.delete(schema.stakes))
+    if stakes:
+      conn.execute(sqlalchemy.insert(schema.stakes), stakes)
+
+
+def rebuild_current_resolutions(conn: sqlalchemy.engine.base.Connection) -> None:
+  """Recopies each prediction's latest resolution onto its predictions row.
+
+  For populating the columns in a database that predates them, or repairing
+  them after find_invariant_violations reports them out of sync.
+  """
+  with conn.begin():
+    conn.execute(
+      sqlalchemy.update(schema.predictions)
+      .values(resolution=None, resolved_at_unixtime=None, resolution_notes=None)
+    )
+    for prediction_id, (resolution, resolved_at_unixtime, notes) in _latest_resolutions(conn).items():
+      conn.execute(
+        sqlalchemy.update(schema.predictions)
+        .where(schema.predictions.c.prediction_id == prediction_id)
+        .values(resolution=resolution, resolved_at_unixtime=resolved_at_unixtime, resolution_notes=notes)
+      )
+
+
 ###################################################################################
 ## Below this line are email-related very-nice-to-haves (TODO(P1)) that are hard to port from the Protobuf world.
 
@@ -1237,7 +2075,11 @@ async def forever(
   while True:
     cycle_start_time = time.time()
 
-    await f(datetime.datetime.now())
+    try:
+      await f(datetime.datetime.now())
+    except Exception:
+      # Don't let one bad cycle end the task: it'd never run again.
+      logger.exception('periodic task failed', task=getattr(f, '__name__', repr(f)))
 
     next_cycle_time = cycle_start_time + interval_secs
     time_to_next_cycle = next_cycle_time - time.time()
@@ -1251,13 +2093,16 @@ async def email_resolution_reminders(
   now: datetime.datetime,
 ):
   logger.info('sending email resolution reminders')
-  for info in conn.get_predictions_needing_resolution_reminders(now):
+  with conn.transaction():
+    infos = list(conn.get_predictions_needing_resolution_reminders(now))
+  for info in infos:
     await emailer.send_resolution_reminder(
         to=info['email_address'],
         prediction_id=info['prediction_id'],
         prediction_text=info['prediction_text'],
     )
-    conn.mark_resolution_reminder_sent(info['prediction_id'])
+    with conn.transaction():
+      conn.mark_resolution_reminder_sent(info['prediction_id'])
 
 async def email_invariant_violations(
   conn: sqlalchemy.engine.Connection,
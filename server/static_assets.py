@@ -0,0 +1,210 @@
+import dataclasses
+import gzip
+import hashlib
+import mimetypes
+from pathlib import Path
+import re
+import threading
+from typing import Dict, Iterable, Mapping, Optional, Tuple
+
+from aiohttp import web
+import structlog
+
+try:
+    import brotli  # type: ignore
+except ImportError:  # optional: without it we just don't offer `br`
+    brotli = None
+
+logger = structlog.get_logger()
+
+# Fingerprinted URLs' content never changes, so browsers needn't ever recheck them.
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+_FINGERPRINTED_NAME_RE = re.compile(r'^(?P<stem>.+)\.(?P<fingerprint>[0-9a-f]{16})(?P<suffix>\.[^./]+)?$')
+
+_COMPRESSIBLE_CONTENT_TYPES = {'text/css', 'text/html', 'text/javascript', 'text/plain', 'application/json', 'image/svg+xml'}
+
+
+def _content_type(path: Path) -> str:
+    if path.suffix == '.js':
+        return 'text/javascript'
+    return mimetypes.guess_type(path.name)[0] or 'application/octet-stream'
+
+
+@dataclasses.dataclass(frozen=True)
+class StaticAsset:
+    """A file's bytes, plus whichever compressed variants are worth serving."""
+    content_type: str
+    etag_base: str
+    identity: bytes
+    gzip: Optional[bytes] = None
+    br: Optional[bytes] = None
+
+    @staticmethod
+    def from_bytes(body: bytes, content_type: str) -> 'StaticAsset':
+        gz = br = None
+        if content_type in _COMPRESSIBLE_CONTENT_TYPES:
+            gz = gzip.compress(body, compresslevel=9, mtime=0)
+            if brotli is not None:
+                br = brotli.compress(body)
+        return StaticAsset(
+            content_type=content_type,
+            etag_base=hashlib.sha256(body).hexdigest()[:32],
+            identity=body,
+            gzip=gz if (gz is not None and len(gz) < len(body)) else None,
+            br=br if (br is not None and len(br) < len(body)) else None,
+        )
+
+    @property
+    def fingerprint(self) -> str:
+        return self.etag_base[:16]
+
+    def encodings(self) -> Iterable[Tuple[str, bytes]]:
+        """The available (Content-Encoding, body) pairs, most preferred first."""
+        if self.br is not None:
+            yield 'br', self.br
+        if self.gzip is not None:
+            yield 'gzip', self.gzip
+        yield 'identity', self.identity
+
+
+def accepted_encodings(accept_encoding: str) -> Dict[str, float]:
+    """Parses an Accept-Encoding header into {coding: q-value}."""
+    result: Dict[str, float] = {}
+    for part in accept_encoding.split(','):
+        coding, *params = [s.strip() for s in part.split(';')]
+        if not coding:
+            continue
+        q = 1.0
+        for param in params:
+            if param.startswith('q='):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        result[coding.lower()] = q
+    return result
+
+
+def _choose_encoding(asset: StaticAsset, accept_encoding: str) -> Tuple[str, bytes]:
+    accepted = accepted_encodings(accept_encoding)
+    for coding, body in asset.encodings():
+        q = accepted.get(coding, accepted.get('*', 1.0 if coding == 'identity' else 0.0))
+        if q > 0:
+            return coding, body
+    return 'identity', asset.identity
+
+
+def _etag(asset: StaticAsset, coding: str) -> str:
+    # Strong ETags must differ between representations, so tag each encoding.
+    return f'"{asset.etag_base}"' if coding == 'identity' else f'"{asset.etag_base}-{coding}"'
+
+
+def if_none_match_hits(if_none_match: str, etag_base: str) -> bool:
+    """Whether an If-None-Match header names any representation (`"<etag_base>"` or `"<etag_base>-<coding>"`) of the content."""
+    for tag in if_none_match.split(','):
+        tag = tag.strip()
+        if tag == '*':
+            return True
+        if tag.startswith('W/'):
+            tag = tag[2:]
+        if tag.strip('"').split('-')[0] == etag_base:
+            return True
+    return False
+
+
+def asset_response(req: web.Request, asset: StaticAsset, cache_control: str) -> web.Response:
+    """Serves `asset`, compressed as the client accepts, or a 304 if the client's copy is current."""
+    coding, body = _choose_encoding(asset, req.headers.get('Accept-Encoding', ''))
+    headers = {
+        'ETag': _etag(asset, coding),
+        'Cache-Control': cache_control,
+        'Vary': 'Accept-Encoding',
+    }
+    if_none_match = req.headers.get('If-None-Match')
+    if if_none_match is not None and if_none_match_hits(if_none_match, asset.etag_base):
+        return web.Response(status=304, headers=headers)
+    if coding != 'identity':
+        headers['Content-Encoding'] = coding
+    return web.Response(status=200, body=body, content_type=asset.content_type, headers=headers)
+
+
+class StaticAssetCache:
+    """Serves the files under a directory from memory.
+
+    Each file is read (and compressed) the first time it's requested (or on
+    `preload`), and again only if its size or mtime changes, so a rebuilt Elm
+    module is picked up without a restart.
+
+    Each file can also be fetched by a fingerprinted name: `Login.js` as
+    `Login.<fingerprint>.js`, where the fingerprint is a hash of its content.
+    Those responses are marked immutable, since a change in content means a
+    change in name; `fingerprinted_name` says what the current name is.
+    """
+    def __init__(self, root: Path, cache_control: str) -> None:
+        self._root = root
+        self.cache_control = cache_control
+        self._assets: Dict[Path, Tuple[Tuple[int, int], StaticAsset]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, relpath: str) -> Optional[StaticAsset]:
+        """The asset at `relpath` under the root, or None if there's no such file (or it's outside the root)."""
+        root = self._root.resolve()
+        path = (root / relpath).resolve()
+        if root not in path.parents:
+            return None
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        if not path.is_file():
+            return None
+        version = (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            cached = self._assets.get(path)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        asset = StaticAsset.from_bytes(path.read_bytes(), _content_type(path))
+        logger.info('loaded static asset', path=str(path), bytes=len(asset.identity), gzip_bytes=asset.gzip and len(asset.gzip), br_bytes=asset.br and len(asset.br))
+        with self._lock:
+            self._assets[path] = (version, asset)
+        return asset
+
+    def preload(self) -> Mapping[str, str]:
+        """Loads every file under the root; returns the manifest of their fingerprinted names."""
+        root = self._root.resolve()
+        manifest = {}
+        for path in sorted(root.rglob('*')) if root.is_dir() else []:
+            relpath = str(path.relative_to(root))
+            fingerprinted = self.fingerprinted_name(relpath)
+            if fingerprinted is not None:
+                manifest[relpath] = fingerprinted
+        logger.info('preloaded static assets', root=str(root), manifest=manifest)
+        return manifest
+
+    def fingerprinted_name(self, relpath: str) -> Optional[str]:
+        asset = self.get(relpath)
+        if asset is None:
+            return None
+        parent, _, name = relpath.rpartition('/')
+        stem, dot, suffix = name.rpartition('.')
+        fingerprinted = f'{stem}.{asset.fingerprint}.{suffix}' if dot else f'{name}.{asset.fingerprint}'
+        return f'{parent}/{fingerprinted}' if parent else fingerprinted
+
+    def respond(self, req: web.Request, relpath: str) -> web.Response:
+        asset = self.get(relpath)
+        if asset is not None:
+            return asset_response(req, asset, self.cache_control)
+
+        parent, _, name = relpath.rpartition('/')
+        m = _FINGERPRINTED_NAME_RE.match(name)
+        if m is None:
+            return web.Response(status=404)
+        plain_name = m.group('stem') + (m.group('suffix') or '')
+        asset = self.get(f'{parent}/{plain_name}' if parent else plain_name)
+        if asset is None:
+            return web.Response(status=404)
+        if asset.fingerprint == m.group('fingerprint'):
+            return asset_response(req, asset, IMMUTABLE_CACHE_CONTROL)
+        # A page from before the file changed; give it the current version, but don't let that stick.
+        return asset_response(req, asset, self.cache_control)
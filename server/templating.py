@@ -0,0 +1,37 @@
+from pathlib import Path
+from typing import Optional, Sequence
+
+import jinja2
+
+
+def make_environment(searchpath: Path, *, production: bool = False, bytecode_cache_dir: Optional[Path] = None) -> jinja2.Environment:
+    """A Jinja environment for the templates under `searchpath`.
+
+    In development, templates are recompiled whenever their files change. In
+    production, they're compiled once (see `compile_all`) and never looked at
+    on disk again; and, if `bytecode_cache_dir` is given, compiled templates
+    are kept there, so restarts needn't recompile them either.
+    """
+    bytecode_cache = None
+    if bytecode_cache_dir is not None:
+        bytecode_cache_dir.mkdir(parents=True, exist_ok=True)
+        bytecode_cache = jinja2.FileSystemBytecodeCache(str(bytecode_cache_dir))
+    env = jinja2.Environment( # adapted from https://jinja.palletsprojects.com/en/2.11.x/api/#basics
+        loader=jinja2.FileSystemLoader(searchpath=[searchpath], encoding='utf-8'),
+        autoescape=jinja2.select_autoescape(['html', 'xml']),
+        auto_reload=not production,
+        # The default cache holds 400 templates; with auto_reload off, a template
+        # evicted from it would be recompiled from disk, so keep them all.
+        cache_size=-1 if production else 400,
+        bytecode_cache=bytecode_cache,
+    )
+    env.undefined = jinja2.StrictUndefined  # raise exception if a template uses an undefined variable; adapted from https://stackoverflow.com/a/39127941/8877656
+    return env
+
+
+def compile_all(env: jinja2.Environment) -> Sequence[str]:
+    """Loads every template the environment can find, so no request pays to compile one. Returns their names."""
+    names = env.list_templates(extensions=['html'])
+    for name in names:
+        env.get_template(name)
+    return names
@@ -0,0 +1,75 @@
+import pytest
+
+from . import api_types as T
+from .api_json import JSON_CONTENT_TYPE, PROTOBUF_CONTENT_TYPE, from_model, response_content_type, to_model
+from .protobuf import mvp_pb2
+
+
+def some_view() -> mvp_pb2.UserPredictionView:
+  return mvp_pb2.UserPredictionView(
+    prediction='a thing',
+    certainty=mvp_pb2.CertaintyRange(low=0.6, high=0.8),
+    maximum_stake_cents=100_00,
+    remaining_stake_cents_vs_believers=90_00,
+    remaining_stake_cents_vs_skeptics=100_00,
+    created_unixtime=1.5,
+    closes_unixtime=2.5,
+    special_rules='rules',
+    creator='alice',
+    resolution=mvp_pb2.ResolutionEvent(
+      unixtime=3, resolution=mvp_pb2.RESOLUTION_YES, notes='fixed',
+      prior_revision=mvp_pb2.ResolutionEvent(unixtime=2, resolution=mvp_pb2.RESOLUTION_NO, notes='oops'),
+    ),
+    your_trades=[mvp_pb2.Trade(bettor='bob', bettor_is_a_skeptic=True, bettor_stake_cents=10_00, creator_stake_cents=10_00, state=mvp_pb2.TRADE_STATE_QUEUED)],
+    resolves_at_unixtime=4.5,
+    your_following_status=mvp_pb2.PREDICTION_FOLLOWING_MANDATORY_BECAUSE_STAKED,
+  )
+
+
+@pytest.mark.parametrize('message,model_cls', [
+  (some_view(), T.UserPredictionView),
+  (mvp_pb2.PredictionsById(
+    predictions={'p1': some_view()},
+    summaries={'p2': mvp_pb2.PredictionSummary(prediction='b', certainty=mvp_pb2.CertaintyRange(low=0.5, high=1), resolution=mvp_pb2.RESOLUTION_INVALID)},
+    next_cursor='1.0:p1',
+  ), T.PredictionsById),
+  (mvp_pb2.GetSettingsRequest(include_relationships_with_users=['a', 'b']), T.GetSettingsRequest),
+  (mvp_pb2.GenericUserInfo(email_address='a@example.com', invitations={'x@example.com': mvp_pb2.GenericUserInfo.Invitation()}, relationships={'bob': mvp_pb2.Relationship(trusts_you=True)}), T.GenericUserInfo),
+])
+def test_round_trips_through_json(message, model_cls):
+  json = to_model(message, model_cls).model_dump_json()
+  assert from_model(model_cls.model_validate_json(json), type(message)) == message
+
+def test_unset_messages_are_defaults_unless_optional():
+  model = to_model(mvp_pb2.UserPredictionView(), T.UserPredictionView)
+  assert model.resolution == T.ResolutionEvent(unixtime=0, resolution=T.Resolution.NONE_YET, notes='', prior_revision=None)
+  assert model.certainty == T.CertaintyRange(low=0, high=0)
+
+def test_float32s_are_as_written():
+  assert to_model(mvp_pb2.CertaintyRange(low=0.6, high=0.99), T.CertaintyRange).model_dump() == {'low': 0.6, 'high': 0.99}
+
+def test_auth_success_carries_only_the_owner():
+  message = mvp_pb2.AuthSuccess(token=mvp_pb2.AuthToken(owner='alice', hmac_of_rest=b'secret'), user_info=mvp_pb2.GenericUserInfo(email_address='a@example.com'))
+  assert 'secret' not in to_model(message, T.AuthSuccess).model_dump_json()
+  assert to_model(message, T.AuthSuccess).owner == 'alice'
+
+def test_omits_fields_the_model_lacks():
+  message = mvp_pb2.GenericUserInfo(login_password=mvp_pb2.HashedPassword(salt=b'salt', scrypt=b'scrypt'))
+  assert 'loginPassword' not in to_model(message, T.GenericUserInfo).model_dump(by_alias=True)
+
+def test_rejects_values_that_dont_fit():
+  with pytest.raises(ValueError):
+    from_model(T.StakeRequest(prediction_id='p', bettor_is_a_skeptic=True, bettor_stake_cents=-1), mvp_pb2.StakeRequest)
+
+
+@pytest.mark.parametrize('accept,request_content_type,expected', [
+  ('', PROTOBUF_CONTENT_TYPE, PROTOBUF_CONTENT_TYPE),
+  ('', JSON_CONTENT_TYPE, JSON_CONTENT_TYPE),
+  ('*/*', JSON_CONTENT_TYPE, JSON_CONTENT_TYPE),
+  ('application/json', PROTOBUF_CONTENT_TYPE, JSON_CONTENT_TYPE),
+  ('application/octet-stream', JSON_CONTENT_TYPE, PROTOBUF_CONTENT_TYPE),
+  ('application/json;q=0.5, application/octet-stream', JSON_CONTENT_TYPE, PROTOBUF_CONTENT_TYPE),
+  ('application/json, */*;q=0.1', PROTOBUF_CONTENT_TYPE, JSON_CONTENT_TYPE),
+])
+def test_response_content_type(accept: str, request_content_type: str, expected: str):
+  assert response_content_type(accept, request_content_type) == expected
@@ -1,18 +1,28 @@
+import asyncio
+import concurrent.futures
+import json
 from pathlib import Path
+import threading
 
 import aiohttp
 from server.core import ForgottenTokenError
-from typing import AnyStr, TypeVar, Type, Tuple
+from typing import Any, AnyStr, Dict, TypeVar, Type, Tuple
 from unittest.mock import Mock, patch
 
 from aiohttp import web
 import pytest
+import sqlalchemy
 from google.protobuf.message import Message as PbMessage
 
 from .api_server import _Req, _Resp
 from .protobuf import mvp_pb2
 from .api_server import ApiServer
+from . import api_types
+from . import core
+from .config import SqliteDatabase
 from .http_glue import HttpTokenGlue
+from .sql_servicer import SqlConn, SqlServicer
+from . import sql_schema
 from .test_utils import *
 
 SECRET_KEY = b'secret for testing'
@@ -126,6 +136,8 @@ async def test_forgotten_token_recovery(aiohttp_client, app, any_servicer: Servi
   ('/api/LogInUsername', mvp_pb2.LogInUsernameRequest(), mvp_pb2.AuthSuccess),
   ('/api/CreatePrediction', mvp_pb2.CreatePredictionRequest(), mvp_pb2.CreatePredictionResponse),
   ('/api/GetPrediction', mvp_pb2.GetPredictionRequest(), mvp_pb2.UserPredictionView),
+  ('/api/ListMyStakes', mvp_pb2.ListMyStakesRequest(), mvp_pb2.PredictionsById),
+  ('/api/ListPredictions', mvp_pb2.ListPredictionsRequest(), mvp_pb2.PredictionsById),
   ('/api/Stake', mvp_pb2.StakeRequest(), mvp_pb2.UserPredictionView),
   ('/api/Follow', mvp_pb2.FollowRequest(), mvp_pb2.UserPredictionView),
   ('/api/Resolve', mvp_pb2.ResolveRequest(), mvp_pb2.UserPredictionView),
@@ -167,6 +179,268 @@ async def test_smoke(aiohttp_client, app, any_servicer: Servicer, logged_in: boo
     assert err.catchall, f'{endpoint} returned {http_resp.status} with no explanation'
 
 
+async def test_ListPredictions_pages(aiohttp_client, app, any_servicer: Servicer, clock: MockClock):
+  create_user(any_servicer, u('alice'))
+  prediction_ids = []
+  for _ in range(3):
+    prediction_ids.append(any_servicer.CreatePrediction(au('alice'), some_create_prediction_request()).new_prediction_id)
+    clock.tick()
+  cli = await aiohttp_client(app)
+
+  (_, first) = await post_proto(cli, '/api/ListPredictions', mvp_pb2.ListPredictionsRequest(creator='alice', limit=2), mvp_pb2.PredictionsById)
+  assert set(first.predictions) == set(prediction_ids[1:])
+  (_, second) = await post_proto(cli, '/api/ListPredictions', mvp_pb2.ListPredictionsRequest(creator='alice', limit=2, cursor=first.next_cursor), mvp_pb2.PredictionsById)
+  assert set(second.predictions) == set(prediction_ids[:1])
+  assert second.next_cursor == ''
+
+
+async def test_GetPrediction_304s_until_prediction_changes(aiohttp_client, app, any_servicer: Servicer):
+  register_friend_pair(any_servicer, au('alice'), au('bob'))
+  prediction_id = any_servicer.CreatePrediction(au('alice'), some_create_prediction_request()).new_prediction_id
+  cli = await aiohttp_client(app)
+  req = mvp_pb2.GetPredictionRequest(prediction_id=prediction_id)
+
+  (http_resp, _) = await post_proto(cli, '/api/GetPrediction', req, mvp_pb2.UserPredictionView)
+  etag = http_resp.headers['ETag']
+  http_resp = await cli.post('/api/GetPrediction', data=req.SerializeToString(), headers={'If-None-Match': etag})
+  assert http_resp.status == 304
+  assert await http_resp.read() == b''
+
+  any_servicer.Stake(au('bob'), mvp_pb2.StakeRequest(prediction_id=prediction_id, bettor_is_a_skeptic=True, bettor_stake_cents=10))
+  http_resp = await cli.post('/api/GetPrediction', data=req.SerializeToString(), headers={'If-None-Match': etag})
+  assert http_resp.status == 200
+  assert http_resp.headers['ETag'] != etag
+  await http_resp.read()
+
+async def test_GetPrediction_etag_depends_on_viewer(aiohttp_client, app, any_servicer: Servicer):
+  create_user(any_servicer, u('alice'), password='pw')
+  prediction_id = any_servicer.CreatePrediction(au('alice'), some_create_prediction_request()).new_prediction_id
+  cli = await aiohttp_client(app)
+  req = mvp_pb2.GetPredictionRequest(prediction_id=prediction_id)
+
+  (http_resp, _) = await post_proto(cli, '/api/GetPrediction', req, mvp_pb2.UserPredictionView)
+  anonymous_etag = http_resp.headers['ETag']
+  await post_proto(cli, '/api/LogInUsername', mvp_pb2.LogInUsernameRequest(username='alice', password='pw'), mvp_pb2.AuthSuccess)
+  http_resp = await cli.post('/api/GetPrediction', data=req.SerializeToString(), headers={'If-None-Match': anonymous_etag})
+  assert http_resp.status == 200
+  await http_resp.read()
+
+async def test_ListMyStakes_304s_without_building_views(aiohttp_client, app, any_servicer: Servicer, monkeypatch):
+  create_user(any_servicer, u('alice'), password='pw')
+  any_servicer.CreatePrediction(au('alice'), some_create_prediction_request())
+  cli = await aiohttp_client(app)
+  await post_proto(cli, '/api/LogInUsername', mvp_pb2.LogInUsernameRequest(username='alice', password='pw'), mvp_pb2.AuthSuccess)
+  req = mvp_pb2.ListMyStakesRequest(limit=10)
+
+  (http_resp, _) = await post_proto(cli, '/api/ListMyStakes', req, mvp_pb2.PredictionsById)
+  etag = http_resp.headers['ETag']
+  with monkeypatch.context() as m:
+    m.setattr(any_servicer, 'ListMyStakes', Mock(side_effect=AssertionError('should not build views')))
+    http_resp = await cli.post('/api/ListMyStakes', data=req.SerializeToString(), headers={'If-None-Match': etag})
+    assert http_resp.status == 304
+    await http_resp.read()
+
+  any_servicer.CreatePrediction(au('alice'), some_create_prediction_request())
+  (http_resp, pb_resp) = await post_proto(cli, '/api/ListMyStakes', req, mvp_pb2.PredictionsById)
+  assert http_resp.headers['ETag'] != etag
+  assert len(pb_resp.predictions) == 2
+
+
+async def test_Batch_runs_calls_in_order_in_one_transaction(aiohttp_client, app, any_servicer: Servicer):
+  create_user(any_servicer, u('creator'))
+  create_user(any_servicer, u('bettor'), password='pw')
+  any_servicer.SetTrusted(au('creator'), mvp_pb2.SetTrustedRequest(who='bettor', trusted=True))
+  any_servicer.SetTrusted(au('bettor'), mvp_pb2.SetTrustedRequest(who='creator', trusted=True))
+  prediction_id = any_servicer.CreatePrediction(au('creator'), some_create_prediction_request()).new_prediction_id
+  cli = await aiohttp_client(app)
+  await post_proto(cli, '/api/LogInUsername', mvp_pb2.LogInUsernameRequest(username='bettor', password='pw'), mvp_pb2.AuthSuccess)
+
+  begins = []
+  raw_conn = any_servicer._conn._conn  # type: ignore
+  listener = lambda conn: begins.append(conn)
+  sqlalchemy.event.listen(raw_conn, 'begin', listener)
+  try:
+    (_, pb_resp) = await post_proto(cli, '/api/Batch', mvp_pb2.BatchRequest(calls=[
+      mvp_pb2.BatchRequest.Call(method='Stake', request=mvp_pb2.StakeRequest(prediction_id=prediction_id, bettor_is_a_skeptic=True, bettor_stake_cents=10).SerializeToString()),
+      mvp_pb2.BatchRequest.Call(method='ListMyStakes', request=mvp_pb2.ListMyStakesRequest().SerializeToString()),
+    ]), mvp_pb2.BatchResponse)
+  finally:
+    sqlalchemy.event.remove(raw_conn, 'begin', listener)
+  assert len(begins) == 1
+
+  assert [r.http_status for r in pb_resp.results] == [200, 200]
+  my_stakes = mvp_pb2.PredictionsById()
+  my_stakes.ParseFromString(pb_resp.results[1].ok)
+  assert len(my_stakes.predictions[prediction_id].your_trades) == 1
+
+async def test_Batch_reports_errors_per_call(aiohttp_client, app, any_servicer: Servicer):
+  create_user(any_servicer, u('rando'), password='pw')
+  cli = await aiohttp_client(app)
+  await post_proto(cli, '/api/LogInUsername', mvp_pb2.LogInUsernameRequest(username='rando', password='pw'), mvp_pb2.AuthSuccess)
+
+  (_, pb_resp) = await post_proto(cli, '/api/Batch', mvp_pb2.BatchRequest(calls=[
+    mvp_pb2.BatchRequest.Call(method='GetPrediction', request=mvp_pb2.GetPredictionRequest(prediction_id='nonexistent').SerializeToString()),
+    mvp_pb2.BatchRequest.Call(method='Whoami', request=mvp_pb2.WhoamiRequest().SerializeToString()),
+  ]), mvp_pb2.BatchResponse)
+
+  [missing, whoami] = pb_resp.results
+  assert missing.http_status == 404
+  assert missing.WhichOneof('outcome') == 'error'
+  assert missing.error.catchall
+  assert whoami.http_status == 200
+  assert mvp_pb2.WhoamiResponse.FromString(whoami.ok).username == 'rando'
+
+@pytest.mark.parametrize('method,request_', [
+  ('LogInUsername', mvp_pb2.LogInUsernameRequest(username='rando', password='pw')),
+  ('ChangePassword', mvp_pb2.ChangePasswordRequest(old_password='pw', new_password='new pw')),
+])
+async def test_Batch_rejects_unbatchable_methods(aiohttp_client, app, any_servicer: Servicer, method: str, request_: PbMessage):
+  create_user(any_servicer, u('rando'), password='pw')
+  cli = await aiohttp_client(app)
+  (_, err) = await post_proto(cli, '/api/Batch', mvp_pb2.BatchRequest(calls=[
+    mvp_pb2.BatchRequest.Call(method=method, request=request_.SerializeToString()),
+  ]), mvp_pb2.ErrorResponse, expected_status=400)
+  assert method in err.catchall
+
+
+async def read_event(http_resp: aiohttp.ClientResponse) -> Tuple[str, Any]:
+  """Reads one server-sent event, skipping comments; returns its type and its data, parsed as JSON."""
+  fields: Dict[str, str] = {}
+  while True:
+    line = (await asyncio.wait_for(http_resp.content.readline(), timeout=5)).decode('utf-8').rstrip('\n')
+    if not line:
+      if fields:
+        return (fields['event'], json.loads(fields['data']))
+      continue
+    if not line.startswith(':'):
+      key, _, value = line.partition(': ')
+      fields[key] = value
+
+async def test_StreamPrediction_pushes_stakes_resolutions_and_dequeues(aiohttp_client, app, any_servicer: Servicer, api_server: ApiServer):
+  register_friend_pair(any_servicer, au('creator'), au('friend'))
+  create_user(any_servicer, u('stranger'))
+  SetTrustedOk(any_servicer, au('stranger'), u('creator'), True)
+  prediction_id = CreatePredictionOk(any_servicer, au('creator'), dict(maximum_stake_cents=100_00, certainty=mvp_pb2.CertaintyRange(low=0.5, high=1.0)))
+  cli = await aiohttp_client(app)
+
+  http_resp = await cli.get(f'/api/stream/prediction/{prediction_id}')
+  assert http_resp.status == 200
+  assert http_resp.headers['Content-Type'] == 'text/event-stream'
+  (event, data) = await read_event(http_resp)
+  assert event == 'update'
+  assert api_types.PredictionUpdate.model_validate(data) == api_types.PredictionUpdate(
+    remaining_stake_cents_vs_believers=100_00,
+    remaining_stake_cents_vs_skeptics=100_00,
+    resolution=api_types.Resolution.NONE_YET,
+    num_active_trades=0,
+  )
+
+  any_servicer.Stake(au('friend'), mvp_pb2.StakeRequest(prediction_id=prediction_id, bettor_is_a_skeptic=True, bettor_stake_cents=10_00))
+  (_, data) = await read_event(http_resp)
+  assert (data['remainingStakeCentsVsSkeptics'], data['numActiveTrades']) == (90_00, 1)
+
+  # The stranger's stake is queued, and changes nothing a watcher sees; until the creator trusts them.
+  any_servicer.Stake(au('stranger'), mvp_pb2.StakeRequest(prediction_id=prediction_id, bettor_is_a_skeptic=True, bettor_stake_cents=20_00))
+  SetTrustedOk(any_servicer, au('creator'), u('stranger'), True)
+  (_, data) = await read_event(http_resp)
+  assert (data['remainingStakeCentsVsSkeptics'], data['numActiveTrades']) == (70_00, 2)
+
+  ResolveOk(any_servicer, au('creator'), prediction_id, mvp_pb2.RESOLUTION_YES)
+  (_, data) = await read_event(http_resp)
+  assert data['resolution'] == 'RESOLUTION_YES'
+
+  api_server.prediction_updates.close()
+  assert await asyncio.wait_for(http_resp.content.read(), timeout=5) == b''
+
+async def test_StreamPrediction_fetches_each_update_once_for_all_watchers(aiohttp_client, app, any_servicer: Servicer):
+  register_friend_pair(any_servicer, au('creator'), au('friend'))
+  prediction_id = CreatePredictionOk(any_servicer, au('creator'), {})
+  cli = await aiohttp_client(app)
+  streams = [await cli.get(f'/api/stream/prediction/{prediction_id}') for _ in range(3)]
+  for http_resp in streams:
+    await read_event(http_resp)
+
+  with patch.object(any_servicer, 'GetPredictionUpdate', wraps=any_servicer.GetPredictionUpdate) as get_update:
+    any_servicer.Stake(au('friend'), mvp_pb2.StakeRequest(prediction_id=prediction_id, bettor_is_a_skeptic=True, bettor_stake_cents=10))
+    for http_resp in streams:
+      (_, data) = await read_event(http_resp)
+      assert data['numActiveTrades'] == 1
+  assert get_update.call_count == 1
+
+async def post_json(client, url: str, body: Any, expected_status: int = 200, **kwargs) -> Tuple[aiohttp.ClientResponse, Any]:
+  http_resp = await client.post(url, json=body, **kwargs)
+  assert http_resp.status == expected_status
+  assert http_resp.headers['Content-Type'] == 'application/json'
+  return (http_resp, await http_resp.json())
+
+async def test_JSON_endpoints_speak_api_types(aiohttp_client, app, token_mint: TokenMint):
+  cli = await aiohttp_client(app)
+  (_, auth) = await post_json(cli, '/api/RegisterUsername', {'username': 'potato', 'password': 'secret', 'proofOfEmailToken': token_mint.sign_proof_of_email('potato@example.com')})
+  assert api_types.AuthSuccess.model_validate(auth).owner == 'potato'
+  (_, whoami) = await post_json(cli, '/api/Whoami', {})
+  assert whoami == {'username': 'potato'}
+
+  (_, created) = await post_json(cli, '/api/CreatePrediction', api_types.CreatePredictionRequest(
+    prediction='a thing', view_privacy=api_types.PredictionViewPrivacy.ANYBODY_WITH_THE_LINK,
+    certainty=api_types.CertaintyRange(low=0.6, high=0.8), maximum_stake_cents=100_00,
+    open_seconds=86400, special_rules='', resolves_at_unixtime=2e9,
+  ).model_dump(mode='json'))
+  (_, view) = await post_json(cli, '/api/GetPrediction', {'predictionId': created['newPredictionId']})
+  view = api_types.UserPredictionView.model_validate(view)
+  assert (view.prediction, view.certainty) == ('a thing', api_types.CertaintyRange(low=0.6, high=0.8))
+  assert view.resolution.resolution == api_types.Resolution.NONE_YET
+  assert view.resolution.prior_revision is None
+
+async def test_Accept_chooses_the_response_format(aiohttp_client, app):
+  cli = await aiohttp_client(app)
+  http_resp = await cli.post('/api/Whoami', data=mvp_pb2.WhoamiRequest().SerializeToString(), headers={'Content-Type': 'application/octet-stream', 'Accept': 'application/json'})
+  assert await http_resp.json() == {'username': ''}
+  http_resp = await cli.post('/api/Whoami', json={}, headers={'Accept': 'application/octet-stream'})
+  assert http_resp.headers['Content-Type'] == 'application/octet-stream'
+  assert mvp_pb2.WhoamiResponse.FromString(await http_resp.read()) == mvp_pb2.WhoamiResponse()
+
+async def test_JSON_errors_are_JSON(aiohttp_client, app):
+  cli = await aiohttp_client(app)
+  (_, err) = await post_json(cli, '/api/GetPrediction', {'predictionId': 'nonexistent'}, expected_status=404)
+  assert err['catchall']
+  (_, err) = await post_json(cli, '/api/GetPrediction', {'prediction_id': 7}, expected_status=400)
+  assert 'GetPredictionRequest' in err['catchall']
+  (_, err) = await post_json(cli, '/api/Stake', {'predictionId': 'p', 'bettorIsASkeptic': True, 'bettorStakeCents': -1}, expected_status=400)
+  assert 'StakeRequest' in err['catchall']
+
+async def test_JSON_GetPrediction_etag_differs_from_protobuf(aiohttp_client, app, any_servicer: Servicer):
+  create_user(any_servicer, u('creator'))
+  prediction_id = CreatePredictionOk(any_servicer, au('creator'), {})
+  cli = await aiohttp_client(app)
+  (json_resp, _) = await post_json(cli, '/api/GetPrediction', {'predictionId': prediction_id})
+  (proto_resp, _) = await post_proto(cli, '/api/GetPrediction', mvp_pb2.GetPredictionRequest(prediction_id=prediction_id), mvp_pb2.UserPredictionView)
+  assert json_resp.headers['ETag'] != proto_resp.headers['ETag']
+  http_resp = await cli.post('/api/GetPrediction', json={'predictionId': prediction_id}, headers={'If-None-Match': json_resp.headers['ETag']})
+  assert http_resp.status == 304
+
+async def test_JSON_Batch(aiohttp_client, app, any_servicer: Servicer):
+  create_user(any_servicer, u('rando'), password='pw')
+  cli = await aiohttp_client(app)
+  await post_json(cli, '/api/LogInUsername', {'username': 'rando', 'password': 'pw'})
+  (_, batch) = await post_json(cli, '/api/Batch', {'calls': [
+    {'method': 'GetPrediction', 'request': {'predictionId': 'nonexistent'}},
+    {'method': 'Whoami', 'request': {}},
+  ]})
+  [missing, whoami] = api_types.BatchResponse.model_validate(batch).results
+  assert missing.http_status == 404 and missing.error is not None and missing.ok is None
+  assert whoami.http_status == 200 and whoami.ok == {'username': 'rando'}
+
+def test_routes_every_endpoint(app):
+  paths = {r.get_info().get('path') for r in app.router.routes()}
+  assert {f'/api/{name}' for (name, _, _) in api_types.ENDPOINTS} <= paths
+
+async def test_StreamPrediction_nonexistent_is_404(aiohttp_client, app):
+  cli = await aiohttp_client(app)
+  http_resp = await cli.get('/api/stream/prediction/nonexistent')
+  assert http_resp.status == 404
+  assert mvp_pb2.ErrorResponse.FromString(await http_resp.read()).catchall
+
+
 # --- HTTP-status error propagation -------------------------------------------
 # These pin the behaviour this refactor is validating: failures leave via an
 # exception, arrive as a non-2xx status, and carry an ErrorResponse body the
@@ -287,3 +561,48 @@ async def test_InvalidRequestError_is_400(aiohttp_client, app, any_servicer: Ser
   (_, err) = await post_proto(cli, '/api/SetTrusted', mvp_pb2.SetTrustedRequest(who='rando', trusted=True),
                               mvp_pb2.ErrorResponse, expected_status=400)
   assert err.catchall == 'cannot set trust for self', err
+
+
+async def test_serves_concurrent_requests_from_an_executor(aiohttp_client, loop, tmp_path: Path, clock: MockClock, token_mint: TokenMint, emailer):
+  engine = sql_schema.create_engine(SqliteDatabase(path=str(tmp_path / 'db.sqlite')))
+  sql_schema.metadata.create_all(engine)
+  servicer = SqlServicer(conn=SqlConn(engine), token_mint=token_mint, emailer=emailer, random_seed=0, clock=clock.now)
+  with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+    app = web.Application(loop=loop)
+    ApiServer(token_glue=HttpTokenGlue(token_mint), servicer=servicer, executor=executor).add_to_app(app)
+    cli = await aiohttp_client(app)
+
+    await post_proto(cli, '/api/SendVerificationEmail', mvp_pb2.SendVerificationEmailRequest(email_address='potato@example.com'), mvp_pb2.Empty)
+    proof_of_email_token = get_call_kwarg(emailer.send_email_verification, 'proof_token')
+    await post_proto(cli, '/api/RegisterUsername', mvp_pb2.RegisterUsernameRequest(username='potato', password='secret', proof_of_email_token=proof_of_email_token), mvp_pb2.AuthSuccess)
+
+    results = await asyncio.gather(*[
+      post_proto(cli, '/api/Whoami', mvp_pb2.WhoamiRequest(), mvp_pb2.WhoamiResponse)
+      for _ in range(16)
+    ])
+    assert all(pb_resp.username == 'potato' for (_, pb_resp) in results)
+
+async def test_servicer_threads_dont_wait_on_password_hashes(aiohttp_client, loop, tmp_path: Path, clock: MockClock, token_mint: TokenMint, emailer, monkeypatch):
+  engine = sql_schema.create_engine(SqliteDatabase(path=str(tmp_path / 'db.sqlite')))
+  sql_schema.metadata.create_all(engine)
+  servicer = SqlServicer(conn=SqlConn(engine), token_mint=token_mint, emailer=emailer, random_seed=0, clock=clock.now)
+  hashed_on = []
+  real_scrypt = core.scrypt
+  def scrypt(password: str, salt: bytes) -> bytes:
+    hashed_on.append(threading.current_thread().name)
+    return real_scrypt(password, salt)
+  monkeypatch.setattr('server.core.scrypt', scrypt)
+  with concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix='servicer') as executor:
+    app = web.Application(loop=loop)
+    ApiServer(token_glue=HttpTokenGlue(token_mint), servicer=servicer, executor=executor, password_hasher=core.PasswordHasher()).add_to_app(app)
+    cli = await aiohttp_client(app)
+
+    await post_proto(cli, '/api/SendVerificationEmail', mvp_pb2.SendVerificationEmailRequest(email_address='potato@example.com'), mvp_pb2.Empty)
+    proof_of_email_token = get_call_kwarg(emailer.send_email_verification, 'proof_token')
+    await post_proto(cli, '/api/RegisterUsername', mvp_pb2.RegisterUsernameRequest(username='potato', password='secret', proof_of_email_token=proof_of_email_token), mvp_pb2.AuthSuccess)
+    await post_proto(cli, '/api/ChangePassword', mvp_pb2.ChangePasswordRequest(old_password='secret', new_password='new secret'), mvp_pb2.Empty)
+    await post_proto(cli, '/api/SignOut', mvp_pb2.SignOutRequest(), mvp_pb2.SignOutResponse)
+    await post_proto(cli, '/api/LogInUsername', mvp_pb2.LogInUsernameRequest(username='potato', password='new secret'), mvp_pb2.AuthSuccess)
+
+  assert len(hashed_on) == 4  # new password; old and new passwords; password
+  assert not any(name.startswith('servicer') for name in hashed_on), hashed_on
@@ -50,7 +50,7 @@ def test_maps_and_nested_models_round_trip():
         your_trades=[], resolves_at_unixtime=3.0,
         your_following_status=T.PredictionFollowingStatus.NOT_FOLLOWING,
     )
-    preds = T.PredictionsById(predictions={"pred1": view})
+    preds = T.PredictionsById(predictions={"pred1": view}, summaries={}, next_cursor="")
     assert T.PredictionsById.model_validate_json(preds.model_dump_json()) == preds
 
 
@@ -0,0 +1,104 @@
+import gzip
+
+from aiohttp import web
+import pytest
+
+from .compression import CompressionMiddleware
+
+BIG_HTML = '<p>hello</p>' * 1000
+BIG_PROTO = b'\x0a\x05hello' * 1000
+
+
+@pytest.fixture
+def compression() -> CompressionMiddleware:
+  return CompressionMiddleware(min_bytes=100, executor_min_bytes=5000)
+
+@pytest.fixture
+def app(loop, compression: CompressionMiddleware):
+  app = web.Application(loop=loop)
+  compression.add_to_app(app)
+  async def big_html(req: web.Request) -> web.StreamResponse:
+    return web.Response(text=BIG_HTML, content_type='text/html')
+  async def big_html_str_body(req: web.Request) -> web.StreamResponse:
+    return web.Response(body=BIG_HTML, content_type='text/html')
+  async def small_html(req: web.Request) -> web.StreamResponse:
+    return web.Response(text='<p>hi</p>', content_type='text/html')
+  async def big_proto(req: web.Request) -> web.StreamResponse:
+    return web.Response(body=BIG_PROTO, headers={'Content-Type': 'application/octet-stream'})
+  async def big_png(req: web.Request) -> web.StreamResponse:
+    return web.Response(body=BIG_PROTO, content_type='image/png')
+  async def pre_encoded(req: web.Request) -> web.StreamResponse:
+    return web.Response(body=gzip.compress(BIG_PROTO), content_type='text/plain', headers={'Content-Encoding': 'gzip'})
+  async def big_html_etagged(req: web.Request) -> web.StreamResponse:
+    return web.Response(text=BIG_HTML, content_type='text/html', headers={'ETag': req.query['etag']})
+  app.router.add_get('/big_html', big_html)
+  app.router.add_get('/big_html_etagged', big_html_etagged)
+  app.router.add_get('/big_html_str_body', big_html_str_body)
+  app.router.add_get('/small_html', small_html)
+  app.router.add_get('/big_proto/{x}', big_proto)
+  app.router.add_get('/big_png', big_png)
+  app.router.add_get('/pre_encoded', pre_encoded)
+  return app
+
+
+@pytest.mark.parametrize('path,expected', [('/big_html', BIG_HTML.encode()), ('/big_proto/1', BIG_PROTO)], ids=['html', 'proto'])
+async def test_compresses_big_bodies(aiohttp_client, app, path: str, expected: bytes):
+  cli = await aiohttp_client(app, auto_decompress=False)
+  resp = await cli.get(path, headers={'Accept-Encoding': 'gzip, deflate'})
+  assert resp.status == 200
+  assert resp.headers['Content-Encoding'] == 'gzip'
+  assert 'Accept-Encoding' in resp.headers['Vary']
+  assert gzip.decompress(await resp.read()) == expected
+
+async def test_leaves_small_bodies_alone(aiohttp_client, app):
+  cli = await aiohttp_client(app, auto_decompress=False)
+  resp = await cli.get('/small_html', headers={'Accept-Encoding': 'gzip'})
+  assert 'Content-Encoding' not in resp.headers
+  assert await resp.text() == '<p>hi</p>'
+
+async def test_leaves_incompressible_types_alone(aiohttp_client, app):
+  cli = await aiohttp_client(app, auto_decompress=False)
+  resp = await cli.get('/big_png', headers={'Accept-Encoding': 'gzip'})
+  assert 'Content-Encoding' not in resp.headers
+  assert await resp.read() == BIG_PROTO
+
+async def test_leaves_payload_bodies_alone(aiohttp_client, app):
+  cli = await aiohttp_client(app, auto_decompress=False)
+  resp = await cli.get('/big_html_str_body', headers={'Accept-Encoding': 'gzip'})
+  assert 'Content-Encoding' not in resp.headers
+  assert await resp.text() == BIG_HTML
+
+async def test_leaves_already_encoded_bodies_alone(aiohttp_client, app):
+  cli = await aiohttp_client(app, auto_decompress=False)
+  resp = await cli.get('/pre_encoded', headers={'Accept-Encoding': 'gzip'})
+  assert gzip.decompress(await resp.read()) == BIG_PROTO
+
+@pytest.mark.parametrize('accept_encoding', ['', 'identity', 'gzip;q=0', 'br'])
+async def test_respects_accept_encoding(aiohttp_client, app, accept_encoding: str):
+  cli = await aiohttp_client(app, auto_decompress=False)
+  resp = await cli.get('/big_html', headers={'Accept-Encoding': accept_encoding})
+  assert 'Content-Encoding' not in resp.headers
+  assert await resp.text() == BIG_HTML
+
+@pytest.mark.parametrize('accept_encoding,etag,expected', [
+  ('gzip', '"abc"', '"abc-gzip"'),
+  ('identity', '"abc"', '"abc"'),
+  ('gzip', 'W/"abc"', 'W/"abc"'),
+])
+async def test_tags_strong_etags_with_the_encoding(aiohttp_client, app, accept_encoding: str, etag: str, expected: str):
+  cli = await aiohttp_client(app, auto_decompress=False)
+  resp = await cli.get('/big_html_etagged', params={'etag': etag}, headers={'Accept-Encoding': accept_encoding})
+  assert resp.headers['ETag'] == expected
+
+async def test_reports_bytes_saved_per_route(aiohttp_client, app, compression: CompressionMiddleware):
+  cli = await aiohttp_client(app)
+  for path in ['/big_proto/1', '/big_proto/2', '/small_html']:
+    await (await cli.get(path, headers={'Accept-Encoding': 'gzip'})).read()
+
+  stats = compression.stats()
+  assert list(stats) == ['/big_proto/{x}', '/small_html']
+  assert stats['/big_proto/{x}']['responses'] == 2
+  assert stats['/big_proto/{x}']['compressed'] == 2
+  assert stats['/big_proto/{x}']['bytes_in'] == 2 * len(BIG_PROTO)
+  assert 0 < stats['/big_proto/{x}']['bytes_saved'] < 2 * len(BIG_PROTO)
+  assert stats['/small_html']['bytes_saved'] == 0
@@ -0,0 +1,41 @@
+from unittest.mock import Mock
+
+import pytest
+
+from . import core
+from .core import PasswordHasher
+
+
+@pytest.fixture(params=['inline', 'process_pool'])
+def password_hasher(request):
+    hasher = PasswordHasher() if request.param == 'inline' else PasswordHasher.process_pool(max_workers=2)
+    yield hasher
+    hasher.shutdown()
+
+
+def test_password_hasher_accepts_right_password(password_hasher: PasswordHasher):
+    hashed = password_hasher.new_hashed_password('secret')
+    assert password_hasher.check_password('secret', hashed)
+
+
+def test_password_hasher_rejects_wrong_password(password_hasher: PasswordHasher):
+    hashed = password_hasher.new_hashed_password('secret')
+    assert not password_hasher.check_password('wrong', hashed)
+
+
+def test_password_hashers_agree(password_hasher: PasswordHasher):
+    # Passwords hashed before switching executors must still check out after.
+    hashed = PasswordHasher().new_hashed_password('secret')
+    assert password_hasher.check_password('secret', hashed)
+
+
+async def test_password_hasher_uses_precomputed_hashes(loop, password_hasher: PasswordHasher, monkeypatch):
+    stored = PasswordHasher().new_hashed_password('old')
+    hashes = await password_hasher.precompute(checks=[('old', stored.salt)], new_passwords=['new'])
+    monkeypatch.setattr(core, 'scrypt', Mock(side_effect=AssertionError('should have been precomputed')))
+    with PasswordHasher.using(hashes):
+        assert password_hasher.check_password('old', stored)
+        new = password_hasher.new_hashed_password('new')
+        assert password_hasher.check_password('new', new)
+    monkeypatch.undo()
+    assert password_hasher.check_password('new', new)
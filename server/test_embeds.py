@@ -0,0 +1,99 @@
+import concurrent.futures
+import datetime
+from pathlib import Path
+import xml.etree.ElementTree as ET
+
+from .embeds import EmbedRenderer, Style, embed_text, render_svg, render_text
+from .protobuf import mvp_pb2
+
+T0 = datetime.datetime(2020, 1, 1)
+
+def some_prediction(**kwargs) -> mvp_pb2.UserPredictionView:
+  return mvp_pb2.UserPredictionView(**{
+    'certainty': mvp_pb2.CertaintyRange(low=0.6, high=0.7),
+    'maximum_stake_cents': 50_00,
+    'remaining_stake_cents_vs_believers': 50_00,
+    'remaining_stake_cents_vs_skeptics': 50_00,
+    'closes_unixtime': T0.timestamp() + 86400,
+    **kwargs,
+  })
+
+
+class TestStyle:
+  def test_canonical_ignores_spelling(self):
+    assert Style.parse('').canonical() == Style.parse('-darkgreen-12pt').canonical() == Style.parse('12pt-darkgreen').canonical()
+
+  def test_canonical_distinguishes_styles(self):
+    assert len({Style.parse(s).canonical() for s in ['', '-red', '-14pt', '-lesswrong']}) == 4
+
+
+class TestEmbedText:
+  def test_open(self):
+    assert embed_text(some_prediction(), now=T0) == '[bet: $50 at 60-70%]'
+
+  def test_partially_taken(self):
+    assert embed_text(some_prediction(remaining_stake_cents_vs_skeptics=20_00), now=T0) == '[bet: $50 at 60-70% ($20 remain)]'
+
+  def test_closed(self):
+    assert embed_text(some_prediction(), now=T0 + datetime.timedelta(days=2)) == '[bet: $50 at 60-70% (closed)]'
+
+  def test_resolved(self):
+    prediction = some_prediction(resolution=mvp_pb2.ResolutionEvent(resolution=mvp_pb2.RESOLUTION_YES))
+    assert embed_text(prediction, now=T0) == '[bet: $50 at 60-70% (resolved: correct)]'
+
+
+def test_render_text_is_thread_safe():
+  style = Style.parse('')
+  expected = render_text('[bet: $50 at 60-70%]', style)
+  assert expected.startswith(b'\x89PNG')
+  with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+    assert set(executor.map(lambda _: render_text('[bet: $50 at 60-70%]', style), range(20))) == {expected}
+
+
+class TestRenderSvg:
+  def test_is_well_formed(self):
+    svg = ET.fromstring(render_svg('[bet: $50 at 60-70%] <&>', Style.parse('-red-14pt')))
+    [text] = svg
+    assert text.text == '[bet: $50 at 60-70%] <&>'
+    assert text.attrib['fill'] == '#ff0000'
+    assert text.attrib['font-size'] == '14px'
+    assert text.attrib['text-decoration'] == 'underline'
+
+  def test_lesswrong_style(self):
+    [text] = ET.fromstring(render_svg('[bet]', Style.parse('-lesswrong')))
+    assert 'Warnock Pro' in text.attrib['font-family']
+    assert 'text-decoration' not in text.attrib
+
+
+class TestEmbedRenderer:
+  async def test_renders_once(self, loop):
+    renderer = EmbedRenderer()
+    first = await renderer.render('[bet]', Style.parse(''))
+    assert first == render_text('[bet]', Style.parse(''))
+    assert await renderer.render('[bet]', Style.parse('-darkgreen')) == first
+    assert renderer.stats()['renders'] == 1
+    assert renderer.stats()['memory_hits'] == 1
+
+  async def test_memory_cache_is_bounded(self, loop):
+    renderer = EmbedRenderer(memory_cache_size=2)
+    for text in ['a', 'b', 'c']:
+      await renderer.render(text, Style.parse(''))
+    assert renderer.stats()['memory_size'] == 2
+    await renderer.render('a', Style.parse(''))
+    assert renderer.stats()['renders'] == 4
+
+  async def test_disk_cache_survives_restarts(self, loop, tmp_path: Path):
+    first = await EmbedRenderer(cache_dir=tmp_path).render('[bet]', Style.parse(''))
+    renderer = EmbedRenderer(cache_dir=tmp_path)
+    assert await renderer.render('[bet]', Style.parse('')) == first
+    assert renderer.stats()['disk_hits'] == 1
+    assert renderer.stats()['renders'] == 0
+
+  def test_cache_key_depends_on_text_style_and_format(self):
+    keys = {
+      EmbedRenderer.cache_key('a', Style.parse(''), 'png'),
+      EmbedRenderer.cache_key('b', Style.parse(''), 'png'),
+      EmbedRenderer.cache_key('a', Style.parse('-red'), 'png'),
+      EmbedRenderer.cache_key('a', Style.parse(''), 'gif'),
+    }
+    assert len(keys) == 4
@@ -0,0 +1,80 @@
+import json
+import threading
+
+from .core import PredictionId
+from .live_updates import PredictionUpdateHub, format_event
+from .protobuf import mvp_pb2
+
+PREDICTION_ID = PredictionId('my_prediction_id')
+
+
+def some_update(**kwargs) -> mvp_pb2.PredictionUpdate:
+  return mvp_pb2.PredictionUpdate(**{
+    'remaining_stake_cents_vs_believers': 50_00,
+    'remaining_stake_cents_vs_skeptics': 50_00,
+    **kwargs,
+  })
+
+
+class TestPredictionUpdateHub:
+  async def test_slow_reader_skips_to_latest(self, loop):
+    hub = PredictionUpdateHub()
+    with hub.subscribe(PREDICTION_ID) as subscription:
+      for n in range(1, 4):
+        hub.publish(PREDICTION_ID, n, some_update(num_active_trades=n))
+      assert await subscription.next(timeout=1) == some_update(num_active_trades=3)
+      assert await subscription.next(timeout=0.01) is None
+
+  async def test_drops_updates_older_than_the_last_delivered(self, loop):
+    hub = PredictionUpdateHub()
+    with hub.subscribe(PREDICTION_ID) as subscription:
+      hub.publish(PREDICTION_ID, 2, some_update(num_active_trades=2))
+      assert await subscription.next(timeout=1) == some_update(num_active_trades=2)
+      hub.publish(PREDICTION_ID, 1, some_update(num_active_trades=1))
+      hub.publish(PREDICTION_ID, 2, some_update(num_active_trades=2))
+      assert await subscription.next(timeout=0.01) is None
+      hub.publish(PREDICTION_ID, 3, some_update(num_active_trades=3))
+      assert await subscription.next(timeout=1) == some_update(num_active_trades=3)
+
+  async def test_only_delivers_to_that_predictions_watchers(self, loop):
+    hub = PredictionUpdateHub()
+    with hub.subscribe(PREDICTION_ID) as subscription, hub.subscribe(PredictionId('other')) as other:
+      hub.publish(PREDICTION_ID, 1, some_update())
+      assert await subscription.next(timeout=1) == some_update()
+      assert await other.next(timeout=0.01) is None
+
+  async def test_publishes_from_other_threads(self, loop):
+    hub = PredictionUpdateHub()
+    with hub.subscribe(PREDICTION_ID) as subscription:
+      thread = threading.Thread(target=hub.publish, args=(PREDICTION_ID, 1, some_update()))
+      thread.start()
+      thread.join()
+      assert await subscription.next(timeout=1) == some_update()
+
+  async def test_watched_until_last_unsubscribe(self, loop):
+    hub = PredictionUpdateHub()
+    assert not hub.watched(PREDICTION_ID)
+    with hub.subscribe(PREDICTION_ID):
+      with hub.subscribe(PREDICTION_ID):
+        assert hub.stats() == {'predictions_watched': 1, 'subscriptions': 2}
+      assert hub.watched(PREDICTION_ID)
+    assert not hub.watched(PREDICTION_ID)
+
+  async def test_close_ends_subscriptions(self, loop):
+    hub = PredictionUpdateHub()
+    with hub.subscribe(PREDICTION_ID) as subscription:
+      hub.close()
+      assert await subscription.next(timeout=1) is None
+      assert subscription.closed
+
+
+def test_format_event():
+  event = format_event(some_update(resolution=mvp_pb2.RESOLUTION_YES))
+  [event_line, data_line, blank, end] = event.decode('utf-8').split('\n')
+  assert (event_line, blank, end) == ('event: update', '', '')
+  assert json.loads(data_line[len('data: '):]) == {
+    'remainingStakeCentsVsBelievers': 50_00,
+    'remainingStakeCentsVsSkeptics': 50_00,
+    'resolution': 'RESOLUTION_YES',
+    'numActiveTrades': 0,
+  }
@@ -1,11 +1,11 @@
 from __future__ import annotations
 import copy
-from typing import Sequence
+from typing import List, Sequence
 
 from unittest.mock import ANY
 
 from .protobuf import mvp_pb2
-from .core import Servicer
+from .core import ForbiddenError, InvalidRequestError, NoSuchPredictionError, PageContext, Servicer
 from .emailer import Emailer
 from .test_utils import *
 
@@ -266,6 +266,46 @@ class TestListMyStakes:
     StakeOk(any_servicer, ALICE, mvp_pb2.StakeRequest(prediction_id=prediction_id, bettor_stake_cents=1_00))
     assert set(ListMyStakesOk(any_servicer, ALICE).predictions.keys()) == {prediction_id}
 
+  async def test_pages_newest_first(self, any_servicer: Servicer, clock: MockClock):
+    register_friend_pair(any_servicer, ALICE, BOB)
+    prediction_ids = []
+    for i in range(5):
+      prediction_ids.append(CreatePredictionOk(any_servicer, ALICE if i%2 else BOB, {}))
+      if i%2 == 0:
+        StakeOk(any_servicer, ALICE, mvp_pb2.StakeRequest(prediction_id=prediction_ids[-1], bettor_is_a_skeptic=True, bettor_stake_cents=10))
+      clock.tick()
+
+    first = any_servicer.ListMyStakes(ALICE, mvp_pb2.ListMyStakesRequest(limit=2))
+    second = any_servicer.ListMyStakes(ALICE, mvp_pb2.ListMyStakesRequest(limit=2, cursor=first.next_cursor))
+    third = any_servicer.ListMyStakes(ALICE, mvp_pb2.ListMyStakesRequest(limit=2, cursor=second.next_cursor))
+    assert [set(page.predictions) for page in [first, second, third]] == [set(prediction_ids[3:5]), set(prediction_ids[1:3]), set(prediction_ids[0:1])]
+    assert first.next_cursor and second.next_cursor
+    assert third.next_cursor == ''
+
+  async def test_no_cursor_when_everything_fits(self, any_servicer: Servicer):
+    create_user(any_servicer, ALICE)
+    prediction_id = CreatePredictionOk(any_servicer, ALICE, {})
+    resp = any_servicer.ListMyStakes(ALICE, mvp_pb2.ListMyStakesRequest(limit=1))
+    assert set(resp.predictions) == {prediction_id}
+    assert resp.next_cursor == ''
+
+  async def test_rejects_malformed_cursor(self, any_servicer: Servicer):
+    create_user(any_servicer, ALICE)
+    CreatePredictionOk(any_servicer, ALICE, {})
+    with pytest.raises(InvalidRequestError):
+      any_servicer.ListMyStakes(ALICE, mvp_pb2.ListMyStakesRequest(limit=1, cursor='garbage'))
+
+  async def test_page_agrees_with_full_listing(self, any_servicer: Servicer, clock: MockClock):
+    create_user(any_servicer, ALICE)
+    for _ in range(3):
+      CreatePredictionOk(any_servicer, ALICE, {})
+      clock.tick()
+    request = mvp_pb2.ListMyStakesRequest(limit=2)
+    page = any_servicer.ListMyStakesPage(ALICE, request)
+    listing = any_servicer.ListMyStakes(ALICE, request)
+    assert set(page.prediction_ids) == set(listing.predictions)
+    assert page.next_cursor == listing.next_cursor
+
 
 class TestListPredictions:
 
@@ -295,6 +335,79 @@ class TestListPredictions:
 
     assert prediction_id not in ListPredictionsOk(any_servicer, ALICE, ALICE).predictions.keys()
 
+  async def test_pages_newest_first(self, any_servicer: Servicer, clock: MockClock):
+    create_user(any_servicer, ALICE)
+    prediction_ids = []
+    for _ in range(3):
+      prediction_ids.append(CreatePredictionOk(any_servicer, ALICE, {}))
+      clock.tick()
+
+    seen: List[str] = []
+    cursor = ''
+    while True:
+      page = any_servicer.ListPredictions(None, mvp_pb2.ListPredictionsRequest(creator=ALICE, limit=1, cursor=cursor))
+      seen.extend(page.predictions)
+      cursor = page.next_cursor
+      if not cursor:
+        break
+    assert seen == prediction_ids[::-1]
+
+  @pytest.mark.parametrize('order,field,offsets_in_order', [
+    (mvp_pb2.PREDICTION_ORDER_CLOSES, 'open_seconds', [300, 200, 100]),
+    (mvp_pb2.PREDICTION_ORDER_RESOLVES, 'resolves_at_unixtime', [300, 200, 100]),
+    (mvp_pb2.PREDICTION_ORDER_CLOSES_SOONEST, 'open_seconds', [100, 200, 300]),
+    (mvp_pb2.PREDICTION_ORDER_RESOLVES_SOONEST, 'resolves_at_unixtime', [100, 200, 300]),
+  ])
+  async def test_pages_in_requested_order(self, any_servicer: Servicer, order: mvp_pb2.PredictionOrder.V, field: str, offsets_in_order: List[int]):
+    create_user(any_servicer, ALICE)
+    base = getattr(some_create_prediction_request(), field)
+    prediction_ids_by_offset = {offset: CreatePredictionOk(any_servicer, ALICE, {field: base + offset}) for offset in [200, 100, 300]}
+
+    first = any_servicer.ListPredictions(None, mvp_pb2.ListPredictionsRequest(creator=ALICE, limit=2, order=order))
+    second = any_servicer.ListPredictions(None, mvp_pb2.ListPredictionsRequest(creator=ALICE, limit=2, order=order, cursor=first.next_cursor))
+    assert set(first.predictions) == {prediction_ids_by_offset[o] for o in offsets_in_order[:2]}
+    assert set(second.predictions) == {prediction_ids_by_offset[o] for o in offsets_in_order[2:]}
+    assert second.next_cursor == ''
+
+  async def test_soonest_first_breaks_ties_by_id(self, any_servicer: Servicer):
+    create_user(any_servicer, ALICE)
+    prediction_ids = sorted(CreatePredictionOk(any_servicer, ALICE, {}) for _ in range(3))
+
+    seen: List[str] = []
+    cursor = ''
+    while True:
+      page = any_servicer.ListPredictions(None, mvp_pb2.ListPredictionsRequest(creator=ALICE, limit=1, cursor=cursor, order=mvp_pb2.PREDICTION_ORDER_RESOLVES_SOONEST))
+      seen.extend(page.predictions)
+      cursor = page.next_cursor
+      if not cursor:
+        break
+    assert seen == prediction_ids
+
+  async def test_stakes_page_in_requested_order(self, any_servicer: Servicer):
+    register_friend_pair(any_servicer, ALICE, BOB)
+    bobs = CreatePredictionOk(any_servicer, BOB, {'open_seconds': 300})
+    StakeOk(any_servicer, ALICE, mvp_pb2.StakeRequest(prediction_id=bobs, bettor_is_a_skeptic=True, bettor_stake_cents=10))
+    alices = CreatePredictionOk(any_servicer, ALICE, {'open_seconds': 100})
+    CreatePredictionOk(any_servicer, BOB, {'open_seconds': 200})
+
+    first = any_servicer.ListMyStakes(ALICE, mvp_pb2.ListMyStakesRequest(limit=1, order=mvp_pb2.PREDICTION_ORDER_CLOSES))
+    second = any_servicer.ListMyStakes(ALICE, mvp_pb2.ListMyStakesRequest(limit=1, order=mvp_pb2.PREDICTION_ORDER_CLOSES, cursor=first.next_cursor))
+    assert [set(first.predictions), set(second.predictions)] == [{bobs}, {alices}]
+    assert second.next_cursor == ''
+
+  async def test_summary_projection(self, any_servicer: Servicer):
+    create_user(any_servicer, ALICE)
+    prediction_id = CreatePredictionOk(any_servicer, ALICE, {'prediction': 'a thing will happen'})
+    resp = any_servicer.ListPredictions(ALICE, mvp_pb2.ListPredictionsRequest(creator=ALICE, projection=mvp_pb2.PREDICTION_PROJECTION_SUMMARY))
+    assert not resp.predictions
+    assert resp.summaries[prediction_id].prediction == 'a thing will happen'
+    assert resp.summaries[prediction_id].resolution == mvp_pb2.RESOLUTION_NONE_YET
+
+  async def test_rejects_unrecognized_order(self, any_servicer: Servicer):
+    create_user(any_servicer, ALICE)
+    with pytest.raises(InvalidRequestError):
+      any_servicer.ListPredictions(None, mvp_pb2.ListPredictionsRequest(creator=ALICE, order=99))  # type: ignore
+
 
 def some_stake_request(prediction_id: PredictionId, **kwargs) -> mvp_pb2.StakeRequest:
   kwargs['prediction_id'] = prediction_id
@@ -807,6 +920,63 @@ class TestGetSettings:
 
 
 
+class TestGetPageContext:
+
+  async def test_logged_out(self, any_servicer: Servicer):
+    assert any_servicer.GetPageContext(None, lambda: 'payload') == PageContext(user_info=None, payload='payload')
+
+  async def test_includes_settings_with_requested_relationships(self, any_servicer: Servicer):
+    charlie = au('charlie')
+    register_friend_pair(any_servicer, ALICE, BOB)
+    create_user(any_servicer, charlie)
+    ctx = any_servicer.GetPageContext(ALICE, lambda: charlie, relationships_with=lambda who: [who])
+    assert ctx.payload == charlie
+    assert ctx.user_info == any_servicer.GetSettings(ALICE, mvp_pb2.GetSettingsRequest(include_relationships_with_users=[charlie]))
+    assert ctx.user_info is not None and set(ctx.user_info.relationships) == {BOB, charlie}
+
+  async def test_propagates_payload_errors(self, any_servicer: Servicer):
+    create_user(any_servicer, ALICE)
+    with pytest.raises(NoSuchPredictionError):
+      any_servicer.GetPageContext(ALICE, lambda: any_servicer.GetPrediction(ALICE, mvp_pb2.GetPredictionRequest(prediction_id='nonexistent')))
+
+
+class TestRunBatch:
+
+  async def test_failed_call_leaves_nothing_behind(self, any_servicer: Servicer, emailer: Emailer):
+    create_user(any_servicer, ALICE)
+    create_user(any_servicer, BOB)
+    def write_then_fail() -> None:
+      CreatePredictionOk(any_servicer, ALICE, {})
+      SendInvitationOk(any_servicer, ALICE, BOB)
+      raise ForbiddenError('changed my mind')
+
+    [failed, stakes] = any_servicer.RunBatch(ALICE, [write_then_fail, lambda: ListMyStakesOk(any_servicer, ALICE)])
+    assert isinstance(failed, ForbiddenError)
+    assert stakes == mvp_pb2.PredictionsById()
+    assert ListMyStakesOk(any_servicer, ALICE) == mvp_pb2.PredictionsById()
+    emailer.send_invitation.assert_not_called()  # type: ignore
+    SendInvitationOk(any_servicer, ALICE, BOB)  # not "already sent"
+
+  async def test_keeps_the_other_calls_writes(self, any_servicer: Servicer, emailer: Emailer):
+    create_user(any_servicer, ALICE)
+    create_user(any_servicer, BOB)
+    [prediction_id, failed] = any_servicer.RunBatch(ALICE, [
+      lambda: CreatePredictionOk(any_servicer, ALICE, {}),
+      lambda: SendInvitationOk(any_servicer, ALICE, 'nobody'),
+    ])
+    assert isinstance(failed, ApiError)
+    assert list(ListMyStakesOk(any_servicer, ALICE).predictions) == [prediction_id]
+
+  async def test_sends_no_emails_if_the_batch_aborts(self, any_servicer: Servicer, emailer: Emailer):
+    create_user(any_servicer, ALICE)
+    create_user(any_servicer, BOB)
+    def crash() -> None:
+      raise RuntimeError('bug')
+    with pytest.raises(RuntimeError):
+      any_servicer.RunBatch(ALICE, [lambda: SendInvitationOk(any_servicer, ALICE, BOB), crash])
+    emailer.send_invitation.assert_not_called()  # type: ignore
+
+
 class TestSendInvitation:
 
   async def test_error_if_logged_out(self, any_servicer: Servicer):
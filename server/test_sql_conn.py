@@ -1,11 +1,16 @@
+import concurrent.futures
 import datetime
-from typing import Iterable, Optional, TypeVar
+from pathlib import Path
+import threading
+from typing import Callable, Iterable, List, Optional, Sequence, TypeVar
 
 import pytest
 import sqlalchemy
 
 from .core import UsernameAlreadyRegisteredError, Username, PredictionId
-from .sql_servicer import SqlConn
+from .config import SqliteDatabase
+from .sql_servicer import KnownUsers, SqlConn, TrustGraph
+from . import sql_schema
 from .protobuf import mvp_pb2
 from .test_utils import au, some_create_prediction_request, sqlite_engine
 
@@ -42,6 +47,58 @@ class TestRegisterUsername:
       conn.register_username(username=ALICE, password='password', password_id='alicepwid', email_address='ALICE@example.com')
 
 
+class TestKnownUsers:
+  def test_evicts_least_recently_used(self):
+    known = KnownUsers(maxsize=2)
+    known.add('a')
+    known.add('b')
+    assert 'a' in known
+    known.add('c')
+    assert 'a' in known
+    assert 'b' not in known
+    assert 'c' in known
+
+  def test_counts_hits_and_misses(self):
+    known = KnownUsers()
+    known.add('a')
+    assert 'a' in known
+    assert 'b' not in known
+    assert known.stats() == {'size': 1, 'maxsize': 10_000, 'hits': 1, 'misses': 1, 'hit_rate': 0.5}
+
+  def test_clear(self):
+    known = KnownUsers()
+    known.add('a')
+    known.clear()
+    assert 'a' not in known
+
+  def test_user_exists_is_cached_after_first_sight(self, conn: SqlConn):
+    conn.register_username(username=ALICE, password='password', password_id='alicepwid', email_address='ALICE@example.com')
+    conn.known_users.clear()
+    assert conn.user_exists(ALICE)
+    statements: List[str] = []
+    listener = lambda _conn, _cursor, statement, *_args: statements.append(statement)
+    sqlalchemy.event.listen(conn._conn, 'before_cursor_execute', listener)
+    try:
+      assert conn.user_exists(ALICE)
+    finally:
+      sqlalchemy.event.remove(conn._conn, 'before_cursor_execute', listener)
+    assert statements == []
+
+  def test_does_not_cache_negative_results(self, conn: SqlConn):
+    assert not conn.user_exists(ALICE)
+    conn.register_username(username=ALICE, password='password', password_id='alicepwid', email_address='ALICE@example.com')
+    assert conn.user_exists(ALICE)
+
+  def test_ignores_rolled_back_registrations(self, conn: SqlConn):
+    with pytest.raises(ZeroDivisionError):
+      with conn.transaction():
+        conn.register_username(username=ALICE, password='password', password_id='alicepwid', email_address='ALICE@example.com')
+        assert conn.user_exists(ALICE)
+        1/0
+    assert ALICE not in conn.known_users
+    assert not conn.user_exists(ALICE)
+
+
 class TestTrust:
   def test_initially_no_trust_until_set_trust(self, conn: SqlConn):
     conn.register_username(username=ALICE, password='password', password_id='alicepwid', email_address='ALICE@example.com')
@@ -79,6 +136,49 @@ class TestTrust:
     conn.register_username(username=ALICE, password='password', password_id='alicepwid', email_address='ALICE@example.com')
     assert conn.trusts(ALICE, ALICE)
 
+  def test_answers_from_memory_once_loaded(self, conn: SqlConn):
+    conn.register_username(username=ALICE, password='password', password_id='alicepwid', email_address='ALICE@example.com')
+    conn.register_username(username=BOB, password='password', password_id='bobpwid', email_address='BOB@example.com')
+    conn.set_trusted(ALICE, BOB, True, now=T0)
+    conn.trust_graph
+    statements: List[str] = []
+    listener = lambda _conn, _cursor, statement, *_args: statements.append(statement)
+    sqlalchemy.event.listen(conn._conn, 'before_cursor_execute', listener)
+    try:
+      assert conn.trusts(ALICE, BOB)
+      assert not conn.trusts(BOB, ALICE)
+    finally:
+      sqlalchemy.event.remove(conn._conn, 'before_cursor_execute', listener)
+    assert statements == []
+
+  def test_rebuild_picks_up_outside_changes(self, conn: SqlConn):
+    conn.register_username(username=ALICE, password='password', password_id='alicepwid', email_address='ALICE@example.com')
+    conn.register_username(username=BOB, password='password', password_id='bobpwid', email_address='BOB@example.com')
+    assert conn.trust_graph.edge_count() == 0
+    conn._conn.execute(sqlalchemy.insert(sql_schema.relationships).values(subject_username=ALICE, object_username=BOB, trusted=True))
+    assert not conn.trusts(ALICE, BOB)
+    graph = conn.rebuild_trust_graph()
+    assert conn.trusts(ALICE, BOB)
+    assert graph.edge_count() == 1
+    assert graph.memory_bytes() > 0
+
+  def test_memory_bytes_tolerates_concurrent_writes(self):
+    graph = TrustGraph({ALICE: {f'user{i}' for i in range(20_000)}})
+    stop = threading.Event()
+    def churn() -> None:
+      i = 0
+      while not stop.is_set():
+        graph.set_trusted(ALICE, Username(f'churn{i % 50}'), trusted=(i // 50) % 2 == 0)
+        i += 1
+    thread = threading.Thread(target=churn)
+    thread.start()
+    try:
+      for _ in range(50):
+        assert graph.memory_bytes() > 0
+    finally:
+      stop.set()
+      thread.join()
+
 
 _T = TypeVar('_T')
 def must(x: Optional[_T]) -> _T:
@@ -187,6 +287,153 @@ class TestPredictions:
         now=T0,
       )
 
+class TestCreatorExposure:
+  def test_counts_only_active_trades(self, conn: SqlConn):
+    conn.register_username(username=ALICE, password='password', password_id='alicepwid', email_address='ALICE@example.com')
+    conn.register_username(username=BOB, password='password', password_id='bobpwid', email_address='BOB@example.com')
+    conn.create_prediction(now=T0, prediction_id=PRED_ID, creator=ALICE, request=some_create_prediction_request())
+    assert conn.get_creator_exposure_cents(PRED_ID, against_skeptics=True) == 0
+
+    conn.stake(prediction_id=PRED_ID, bettor=BOB, bettor_is_a_skeptic=True, bettor_stake_cents=10, creator_stake_cents=40, state=mvp_pb2.TRADE_STATE_ACTIVE, now=T0)
+    conn.stake(prediction_id=PRED_ID, bettor=BOB, bettor_is_a_skeptic=True, bettor_stake_cents=5, creator_stake_cents=20, state=mvp_pb2.TRADE_STATE_ACTIVE, now=T1)
+    conn.stake(prediction_id=PRED_ID, bettor=BOB, bettor_is_a_skeptic=True, bettor_stake_cents=1, creator_stake_cents=4, state=mvp_pb2.TRADE_STATE_QUEUED, now=T2)
+    assert conn.get_creator_exposure_cents(PRED_ID, against_skeptics=True) == 60
+    assert conn.get_creator_exposure_cents(PRED_ID, against_skeptics=False) == 0
+
+  def test_includes_dequeued_trades(self, conn: SqlConn):
+    conn.register_username(username=ALICE, password='password', password_id='alicepwid', email_address='ALICE@example.com')
+    conn.register_username(username=BOB, password='password', password_id='bobpwid', email_address='BOB@example.com')
+    conn.create_prediction(now=T0, prediction_id=PRED_ID, creator=ALICE, request=some_create_prediction_request())
+    conn.stake(prediction_id=PRED_ID, bettor=BOB, bettor_is_a_skeptic=False, bettor_stake_cents=90, creator_stake_cents=10, state=mvp_pb2.TRADE_STATE_QUEUED, now=T0)
+    assert conn.get_creator_exposure_cents(PRED_ID, against_skeptics=False) == 0
+
+    conn.set_trusted(ALICE, BOB, True, now=T1)
+    conn.set_trusted(BOB, ALICE, True, now=T1)
+    assert conn.get_creator_exposure_cents(PRED_ID, against_skeptics=False) == 10
+
+
+class TestPredictionVersions:
+  @pytest.fixture
+  def setup(self, conn: SqlConn) -> None:
+    conn.register_username(username=ALICE, password='password', password_id='alicepwid', email_address='ALICE@example.com')
+    conn.register_username(username=BOB, password='password', password_id='bobpwid', email_address='BOB@example.com')
+    conn.create_prediction(now=T0, prediction_id=PRED_ID, creator=ALICE, request=some_create_prediction_request())
+
+  @pytest.mark.parametrize('change', [
+    lambda conn: conn.stake(prediction_id=PRED_ID, bettor=BOB, bettor_is_a_skeptic=True, bettor_stake_cents=10, creator_stake_cents=40, state=mvp_pb2.TRADE_STATE_ACTIVE, now=T0),
+    lambda conn: conn.resolve(now=T1, request=mvp_pb2.ResolveRequest(prediction_id=PRED_ID, resolution=mvp_pb2.RESOLUTION_YES)),
+    lambda conn: conn.set_following(PRED_ID, BOB, True),
+  ])
+  def test_bumped_by_changes(self, conn: SqlConn, setup: None, change: Callable[[SqlConn], None]):
+    v0 = conn.prediction_versions.get(PRED_ID)
+    change(conn)
+    assert conn.prediction_versions.get(PRED_ID) != v0
+
+  def test_bumped_by_dequeueing(self, conn: SqlConn, setup: None):
+    conn.stake(prediction_id=PRED_ID, bettor=BOB, bettor_is_a_skeptic=False, bettor_stake_cents=90, creator_stake_cents=10, state=mvp_pb2.TRADE_STATE_QUEUED, now=T0)
+    v0 = conn.prediction_versions.get(PRED_ID)
+    conn.set_trusted(ALICE, BOB, True, now=T1)
+    conn.set_trusted(BOB, ALICE, True, now=T1)
+    assert conn.prediction_versions.get(PRED_ID) != v0
+
+  def test_bumped_only_on_commit(self, conn: SqlConn, setup: None):
+    v0 = conn.prediction_versions.get(PRED_ID)
+    with pytest.raises(ZeroDivisionError):
+      with conn.transaction():
+        conn.set_following(PRED_ID, BOB, True)
+        assert conn.prediction_versions.get(PRED_ID) == v0
+        1/0
+    assert conn.prediction_versions.get(PRED_ID) == v0
+
+    with conn.transaction():
+      conn.set_following(PRED_ID, BOB, True)
+    assert conn.prediction_versions.get(PRED_ID) != v0
+
+
+class TestViewPredictions:
+  def setup_predictions(self, conn: SqlConn, n: int) -> Sequence[PredictionId]:
+    conn.register_username(username=ALICE, password='password', password_id='alicepwid', email_address='ALICE@example.com')
+    conn.register_username(username=BOB, password='password', password_id='bobpwid', email_address='BOB@example.com')
+    predids = [PredictionId(f'pred{i}') for i in range(n)]
+    for i, predid in enumerate(predids):
+      conn.create_prediction(now=T0, prediction_id=predid, creator=ALICE, request=some_create_prediction_request())
+      conn.stake(prediction_id=predid, bettor=BOB, bettor_is_a_skeptic=True, bettor_stake_cents=10, creator_stake_cents=40, state=mvp_pb2.TRADE_STATE_ACTIVE, now=T0)
+      conn.stake(prediction_id=predid, bettor=BOB, bettor_is_a_skeptic=False, bettor_stake_cents=90, creator_stake_cents=10, state=mvp_pb2.TRADE_STATE_QUEUED, now=T1)
+      if i % 2:
+        conn.resolve(now=T1, request=mvp_pb2.ResolveRequest(prediction_id=predid, resolution=mvp_pb2.RESOLUTION_YES))
+        conn.resolve(now=T2, request=mvp_pb2.ResolveRequest(prediction_id=predid, resolution=mvp_pb2.RESOLUTION_NO, notes='oops'))
+    return predids
+
+  @pytest.mark.parametrize('viewer', [ALICE, BOB, CHARLIE, None])
+  def test_matches_view_prediction(self, conn: SqlConn, viewer: Optional[Username]):
+    predids = self.setup_predictions(conn, 4)
+    conn.register_username(username=CHARLIE, password='password', password_id='charliepwid', email_address='CHARLIE@example.com')
+    conn.set_following(predids[1], CHARLIE, True)
+    assert conn.view_predictions(viewer, predids) == {predid: conn.view_prediction(viewer, predid) for predid in predids}
+
+  def test_omits_nonexistent_predictions(self, conn: SqlConn):
+    predids = self.setup_predictions(conn, 1)
+    assert set(conn.view_predictions(ALICE, [*predids, PredictionId('nonexistent')])) == set(predids)
+    assert conn.view_predictions(ALICE, []) == {}
+
+  def statements_run(self, conn: SqlConn, f: Callable[[], object]) -> Sequence[str]:
+    statements: List[str] = []
+    listener = lambda _conn, _cursor, statement, *_args: statements.append(statement)
+    sqlalchemy.event.listen(conn._conn, 'before_cursor_execute', listener)
+    try:
+      f()
+    finally:
+      sqlalchemy.event.remove(conn._conn, 'before_cursor_execute', listener)
+    return statements
+
+  def test_query_count_is_independent_of_prediction_count(self, conn: SqlConn):
+    predids = self.setup_predictions(conn, 20)
+    assert len(self.statements_run(conn, lambda: conn.view_predictions(BOB, predids[:1]))) == len(self.statements_run(conn, lambda: conn.view_predictions(BOB, predids)))
+
+  def test_resolution_history_only_on_request(self, conn: SqlConn):
+    [_, predid] = self.setup_predictions(conn, 2)
+    current = mvp_pb2.ResolutionEvent(unixtime=T2.timestamp(), resolution=mvp_pb2.RESOLUTION_NO, notes='oops')
+
+    view = conn.view_prediction(ALICE, predid)
+    assert view is not None
+    assert view.resolution == current
+    assert not any('resolutions' in stmt for stmt in self.statements_run(conn, lambda: conn.view_predictions(ALICE, [predid])))
+
+    view = conn.view_prediction(ALICE, predid, include_resolution_history=True)
+    assert view is not None
+    assert view.resolution == mvp_pb2.ResolutionEvent(
+      unixtime=T2.timestamp(), resolution=mvp_pb2.RESOLUTION_NO, notes='oops',
+      prior_revision=mvp_pb2.ResolutionEvent(unixtime=T1.timestamp(), resolution=mvp_pb2.RESOLUTION_YES),
+    )
+    assert conn.get_resolution(predid) == current
+    assert conn.get_resolution(predid, include_history=True) == view.resolution
+
+  def test_summaries_agree_with_views(self, conn: SqlConn):
+    predids = self.setup_predictions(conn, 4)
+    summaries = conn.summarize_predictions([*predids, PredictionId('nonexistent')])
+    assert set(summaries) == set(predids)
+    for predid in predids:
+      view = conn.view_prediction(BOB, predid)
+      assert view is not None
+      assert summaries[predid] == mvp_pb2.PredictionSummary(
+        prediction=view.prediction,
+        certainty=view.certainty,
+        maximum_stake_cents=view.maximum_stake_cents,
+        remaining_stake_cents_vs_believers=view.remaining_stake_cents_vs_believers,
+        remaining_stake_cents_vs_skeptics=view.remaining_stake_cents_vs_skeptics,
+        created_unixtime=view.created_unixtime,
+        closes_unixtime=view.closes_unixtime,
+        resolves_at_unixtime=view.resolves_at_unixtime,
+        creator=view.creator,
+        resolution=view.resolution.resolution,
+      )
+
+  def test_summaries_take_one_query(self, conn: SqlConn):
+    predids = self.setup_predictions(conn, 20)
+    [statement] = self.statements_run(conn, lambda: conn.summarize_predictions(predids))
+    assert 'trades' not in statement and 'prediction_follows' not in statement and 'resolutions' not in statement
+
+
 class TestResolutionNotifications:
   def test_emails_bettors(self, conn: SqlConn):
     conn.register_username(username=ALICE, password='password', password_id='alicepwid', email_address='ALICE@example.com')
@@ -246,8 +493,152 @@ class TestResolutionReminders:
     conn.resolve(now=T3, request=mvp_pb2.ResolveRequest(prediction_id=PRED_ID, resolution=mvp_pb2.RESOLUTION_YES))
     assert [r['prediction_id'] for r in conn.get_predictions_needing_resolution_reminders(now=T4)] == []
 
+  def test_does_not_read_resolutions_table(self, conn: SqlConn):
+    statements: List[str] = []
+    listener = lambda _conn, _cursor, statement, *_args: statements.append(statement)
+    sqlalchemy.event.listen(conn._conn, 'before_cursor_execute', listener)
+    try:
+      list(conn.get_predictions_needing_resolution_reminders(now=T0))
+    finally:
+      sqlalchemy.event.remove(conn._conn, 'before_cursor_execute', listener)
+    assert statements and not any('resolutions' in stmt for stmt in statements)
+
   def test_skips_previously_reminded(self, conn: SqlConn):
     conn.register_username(ALICE, password='password', password_id=f'{ALICE} pwid', email_address=f'{ALICE}@example.com')
     conn.create_prediction(now=T0, prediction_id=PRED_ID, creator=ALICE, request=some_create_prediction_request(resolves_at_unixtime=T1.timestamp()))
     conn.mark_resolution_reminder_sent(prediction_id=PRED_ID)
     assert [r['prediction_id'] for r in conn.get_predictions_needing_resolution_reminders(now=T2)] == []
+
+
+class TestPooledConnections:
+  @pytest.fixture
+  def pooled_conn(self, tmp_path: Path) -> SqlConn:
+    engine = sql_schema.create_engine(SqliteDatabase(path=str(tmp_path / 'db.sqlite')))
+    sql_schema.metadata.create_all(engine)
+    return SqlConn(engine)
+
+  def test_requires_transaction(self, pooled_conn: SqlConn):
+    with pytest.raises(RuntimeError):
+      pooled_conn.user_exists(ALICE)
+
+  def test_commits_on_success(self, pooled_conn: SqlConn):
+    with pooled_conn.transaction():
+      pooled_conn.register_username(username=ALICE, password='password', password_id='alicepwid', email_address='ALICE@example.com')
+    with pooled_conn.transaction():
+      assert pooled_conn.user_exists(ALICE)
+
+  def test_rolls_back_on_error(self, pooled_conn: SqlConn):
+    with pytest.raises(ZeroDivisionError):
+      with pooled_conn.transaction():
+        pooled_conn.register_username(username=ALICE, password='password', password_id='alicepwid', email_address='ALICE@example.com')
+        1/0
+    with pooled_conn.transaction():
+      assert not pooled_conn.user_exists(ALICE)
+
+  def test_nested_transactions_join_the_outer_one(self, pooled_conn: SqlConn):
+    with pytest.raises(ZeroDivisionError):
+      with pooled_conn.transaction():
+        with pooled_conn.transaction():
+          pooled_conn.register_username(username=ALICE, password='password', password_id='alicepwid', email_address='ALICE@example.com')
+        assert pooled_conn.user_exists(ALICE)
+        1/0
+    with pooled_conn.transaction():
+      assert not pooled_conn.user_exists(ALICE)
+
+  def test_savepoint_undoes_only_its_block(self, pooled_conn: SqlConn):
+    with pooled_conn.transaction():
+      with pooled_conn.savepoint():
+        pooled_conn.register_username(username=ALICE, password='password', password_id='alicepwid', email_address='ALICE@example.com')
+      with pytest.raises(ZeroDivisionError):
+        with pooled_conn.savepoint():
+          pooled_conn.register_username(username=BOB, password='password', password_id='bobpwid', email_address='BOB@example.com')
+          pooled_conn.set_trusted(ALICE, BOB, True, now=T0)
+          1/0
+      assert not pooled_conn.trusts(ALICE, BOB)
+    with pooled_conn.transaction():
+      assert pooled_conn.user_exists(ALICE)
+      assert not pooled_conn.user_exists(BOB)
+    assert not pooled_conn.trust_graph.trusts(ALICE, BOB)
+
+  def test_savepoint_commits_only_with_the_transaction(self, pooled_conn: SqlConn):
+    with pytest.raises(ZeroDivisionError):
+      with pooled_conn.transaction():
+        with pooled_conn.savepoint():
+          pooled_conn.register_username(username=ALICE, password='password', password_id='alicepwid', email_address='ALICE@example.com')
+        1/0
+    with pooled_conn.transaction():
+      assert not pooled_conn.user_exists(ALICE)
+
+  def test_trust_changes_reach_the_graph_only_on_commit(self, pooled_conn: SqlConn):
+    with pooled_conn.transaction():
+      pooled_conn.register_username(username=ALICE, password='password', password_id='alicepwid', email_address='ALICE@example.com')
+      pooled_conn.register_username(username=BOB, password='password', password_id='bobpwid', email_address='BOB@example.com')
+    assert not pooled_conn.trust_graph.trusts(ALICE, BOB)
+
+    with pytest.raises(ZeroDivisionError):
+      with pooled_conn.transaction():
+        pooled_conn.set_trusted(ALICE, BOB, True, now=T0)
+        assert pooled_conn.trusts(ALICE, BOB)
+        assert not pooled_conn.trust_graph.trusts(ALICE, BOB)
+        1/0
+    assert not pooled_conn.trust_graph.trusts(ALICE, BOB)
+
+    with pooled_conn.transaction():
+      pooled_conn.set_trusted(ALICE, BOB, True, now=T0)
+    assert pooled_conn.trust_graph.trusts(ALICE, BOB)
+
+  def test_usable_from_many_threads(self, pooled_conn: SqlConn):
+    users = [Username(f'user{i}') for i in range(8)]
+    def register(user: Username) -> None:
+      with pooled_conn.transaction():
+        pooled_conn.register_username(username=user, password='password', password_id=f'{user}pwid', email_address=f'{user}@example.com')
+    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+      list(executor.map(register, users))
+    with pooled_conn.transaction():
+      assert all(pooled_conn.user_exists(user) for user in users)
+
+
+class TestPerformanceProfile:
+  @pytest.fixture
+  def perf_conn(self, tmp_path: Path) -> SqlConn:
+    db = SqliteDatabase(path=str(tmp_path / 'db.sqlite'), profile='performance')
+    engine = sql_schema.create_engine(db)
+    sql_schema.metadata.create_all(engine)
+    return SqlConn(engine, read_engine=sql_schema.create_read_engine(db))
+
+  def test_uses_wal(self, perf_conn: SqlConn):
+    for read_only in [False, True]:
+      with perf_conn.transaction(read_only=read_only):
+        assert perf_conn._conn.execute(sqlalchemy.text('PRAGMA journal_mode')).scalar() == 'wal'
+
+  def test_reads_see_committed_writes(self, perf_conn: SqlConn):
+    with perf_conn.transaction():
+      perf_conn.register_username(username=ALICE, password='password', password_id='alicepwid', email_address='ALICE@example.com')
+    perf_conn.known_users.clear()
+    with perf_conn.transaction(read_only=True):
+      assert perf_conn.user_exists(ALICE)
+
+  def test_read_only_transactions_cannot_write(self, perf_conn: SqlConn):
+    with pytest.raises(sqlalchemy.exc.OperationalError):
+      with perf_conn.transaction(read_only=True):
+        perf_conn.register_username(username=ALICE, password='password', password_id='alicepwid', email_address='ALICE@example.com')
+    with perf_conn.transaction():
+      assert not perf_conn.user_exists(ALICE)
+
+  def test_nested_read_only_transaction_joins_the_writer(self, perf_conn: SqlConn):
+    with perf_conn.transaction():
+      perf_conn.register_username(username=ALICE, password='password', password_id='alicepwid', email_address='ALICE@example.com')
+      with perf_conn.transaction(read_only=True):
+        perf_conn.register_username(username=BOB, password='password', password_id='bobpwid', email_address='BOB@example.com')
+    with perf_conn.transaction(read_only=True):
+      assert perf_conn.user_exists(BOB)
+
+  def test_reads_and_writes_from_many_threads(self, perf_conn: SqlConn):
+    users = [Username(f'user{i}') for i in range(8)]
+    def register_then_read(user: Username) -> bool:
+      with perf_conn.transaction():
+        perf_conn.register_username(username=user, password='password', password_id=f'{user}pwid', email_address=f'{user}@example.com')
+      with perf_conn.transaction(read_only=True):
+        return perf_conn.user_exists(user)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+      assert all(executor.map(register_then_read, users))
@@ -1,3 +1,4 @@
+import asyncio
 import datetime
 import json
 
@@ -11,9 +12,10 @@ from unittest.mock import Mock
 import sqlalchemy
 
 from .emailer import Emailer
-from .sql_servicer import SqlConn, find_invariant_violations, _backup_text, SqlServicer, TokenMint, email_resolution_reminders
+from .sql_servicer import SqlConn, find_invariant_violations, forever, rebuild_current_resolutions, rebuild_prediction_exposure, rebuild_stakes, _backup_text, SqlServicer, TokenMint, email_resolution_reminders
 from . import sql_schema as schema
-from .test_utils import emailer, some_create_prediction_request, sqlite_engine
+from . import core
+from .test_utils import au, create_user, emailer, some_create_prediction_request, sqlite_engine, token_mint, clock
 
 class TestFindInvariantViolations:
   def test_initially_empty(self, sqlite_engine: sqlalchemy.engine.Engine):
@@ -41,6 +43,76 @@ class TestFindInvariantViolations:
         'actual_exposure': 150,
       }]
 
+  def test_detects_and_rebuilds_out_of_sync_exposure_counters(self, sqlite_engine: sqlalchemy.engine.Engine):
+    with sqlite_engine.connect() as raw_conn:
+      now = datetime.datetime(2020, 1, 1, 0, 0, 0)
+      conn = SqlConn(raw_conn)
+      conn.register_username(username=ALICE, password='secret', password_id='alice_pwid', email_address=f'{ALICE}@example.com')
+      conn.register_username(username=BOB, password='secret', password_id='bob_pwid', email_address=f'{BOB}@example.com')
+      predid = PredictionId('my_pred')
+      conn.create_prediction(now, predid, ALICE, some_create_prediction_request(maximum_stake_cents=100))
+      conn.stake(predid, BOB, True, 20, creator_stake_cents=20, state=mvp_pb2.TRADE_STATE_ACTIVE, now=now)
+      raw_conn.execute(sqlalchemy.delete(schema.prediction_exposure))
+
+      assert find_invariant_violations(raw_conn) == [{
+        'type': 'exposure counter out of sync',
+        'prediction_id': predid,
+        'against_skeptics': True,
+        'counted_exposure': 0,
+        'actual_exposure': 20,
+      }]
+
+      rebuild_prediction_exposure(raw_conn)
+      assert find_invariant_violations(raw_conn) == []
+      assert conn.get_creator_exposure_cents(predid, against_skeptics=True) == 20
+      assert conn.get_creator_exposure_cents(predid, against_skeptics=False) == 0
+
+  def test_detects_and_rebuilds_out_of_sync_current_resolution(self, sqlite_engine: sqlalchemy.engine.Engine):
+    with sqlite_engine.connect() as raw_conn:
+      now = datetime.datetime(2020, 1, 1, 0, 0, 0)
+      conn = SqlConn(raw_conn)
+      conn.register_username(username=ALICE, password='secret', password_id='alice_pwid', email_address=f'{ALICE}@example.com')
+      predid = PredictionId('my_pred')
+      conn.create_prediction(now, predid, ALICE, some_create_prediction_request())
+      conn.resolve(mvp_pb2.ResolveRequest(prediction_id=predid, resolution=mvp_pb2.RESOLUTION_YES, notes='yay'), now=now)
+      raw_conn.execute(sqlalchemy.update(schema.predictions).values(resolution=None, resolved_at_unixtime=None, resolution_notes=None))
+
+      assert find_invariant_violations(raw_conn) == [{
+        'type': 'current resolution out of sync',
+        'prediction_id': predid,
+        'denormalized_resolution': (None, None, None),
+        'latest_resolution': ('RESOLUTION_YES', now.timestamp(), 'yay'),
+      }]
+
+      rebuild_current_resolutions(raw_conn)
+      assert find_invariant_violations(raw_conn) == []
+      assert conn.get_resolution(predid) == mvp_pb2.ResolutionEvent(unixtime=now.timestamp(), resolution=mvp_pb2.RESOLUTION_YES, notes='yay')
+
+  def test_detects_and_rebuilds_out_of_sync_stakes(self, sqlite_engine: sqlalchemy.engine.Engine):
+    with sqlite_engine.connect() as raw_conn:
+      now = datetime.datetime(2020, 1, 1, 0, 0, 0)
+      conn = SqlConn(raw_conn)
+      conn.register_username(username=ALICE, password='secret', password_id='alice_pwid', email_address=f'{ALICE}@example.com')
+      conn.register_username(username=BOB, password='secret', password_id='bob_pwid', email_address=f'{BOB}@example.com')
+      predid = PredictionId('my_pred')
+      conn.create_prediction(now, predid, ALICE, some_create_prediction_request(open_seconds=100, resolves_at_unixtime=now.timestamp() + 200))
+      conn.stake(predid, BOB, True, 20, creator_stake_cents=20, state=mvp_pb2.TRADE_STATE_QUEUED, now=now)
+      conn.stake(predid, BOB, True, 20, creator_stake_cents=20, state=mvp_pb2.TRADE_STATE_ACTIVE, now=now+datetime.timedelta(seconds=1))
+      assert find_invariant_violations(raw_conn) == []
+      raw_conn.execute(sqlalchemy.delete(schema.stakes).where(schema.stakes.c.username == BOB))
+
+      assert find_invariant_violations(raw_conn) == [{
+        'type': 'stake out of sync',
+        'username': BOB,
+        'prediction_id': predid,
+        'recorded_sort_keys': None,
+        'actual_sort_keys': (now.timestamp(), now.timestamp() + 100, now.timestamp() + 200),
+      }]
+
+      rebuild_stakes(raw_conn)
+      assert find_invariant_violations(raw_conn) == []
+      assert conn.page_of_stakes(BOB, mvp_pb2.PREDICTION_ORDER_CREATED, limit=0, cursor='') == ([predid], '')
+
 def test_backup_text(sqlite_engine: sqlalchemy.engine.Engine):
   with sqlite_engine.connect() as conn:
     j = json.loads(_backup_text(conn))
@@ -58,7 +130,7 @@ def test_backup_text(sqlite_engine: sqlalchemy.engine.Engine):
     )
 
 async def test_email_resolution_reminders_sends_all_emails(emailer: Emailer):
-  conn = mock.Mock()
+  conn = mock.MagicMock()
   conn.get_predictions_needing_resolution_reminders.return_value = [
     {'prediction_id': 12, 'prediction_text': 'prediction 12', 'email_address': 'pred12@example.com'},
     {'prediction_id': 34, 'prediction_text': 'prediction 34', 'email_address': 'pred34@example.com'},
@@ -68,3 +140,37 @@ async def test_email_resolution_reminders_sends_all_emails(emailer: Emailer):
     mock.call(prediction_id=12, prediction_text='prediction 12', to='pred12@example.com'),
     mock.call(prediction_id=34, prediction_text='prediction 34', to='pred34@example.com'),
   ])
+
+
+async def test_hashes_passwords_outside_transactions(loop, sqlite_engine: sqlalchemy.engine.Engine, emailer: Emailer, token_mint: TokenMint, monkeypatch):
+  with sqlite_engine.connect() as raw_conn:
+    conn = SqlConn(raw_conn)
+    servicer = SqlServicer(conn=conn, token_mint=token_mint, emailer=emailer)
+    in_transaction = []
+    real_scrypt = core.scrypt
+    def scrypt(password: str, salt: bytes) -> bytes:
+      in_transaction.append(getattr(conn._local, 'on_commit', None) is not None)
+      return real_scrypt(password, salt)
+    monkeypatch.setattr('server.core.scrypt', scrypt)
+
+    create_user(servicer, au('alice'), password='secret')
+    servicer.ChangePassword(au('alice'), mvp_pb2.ChangePasswordRequest(old_password='secret', new_password='new secret'))
+    servicer.LogInUsername(None, mvp_pb2.LogInUsernameRequest(username='alice', password='new secret'))
+
+    assert in_transaction and not any(in_transaction)
+
+
+async def test_forever_survives_failed_cycles(loop):
+  calls = []
+  second_call = asyncio.Event()
+  async def f(now: datetime.datetime) -> None:
+    calls.append(now)
+    if len(calls) == 1:
+      raise RuntimeError('oops')
+    second_call.set()
+  task = asyncio.ensure_future(forever(datetime.timedelta(milliseconds=1), f))
+  try:
+    await asyncio.wait_for(second_call.wait(), timeout=5)
+  finally:
+    task.cancel()
+  assert len(calls) >= 2
@@ -0,0 +1,143 @@
+import gzip
+import os
+from pathlib import Path
+
+from aiohttp import web
+import pytest
+
+from .static_assets import IMMUTABLE_CACHE_CONTROL, StaticAsset, StaticAssetCache
+
+CSS = b'body { color: red; }\n' * 100
+
+
+@pytest.fixture
+def asset_dir(tmp_path: Path) -> Path:
+  (tmp_path / 'assets').mkdir()
+  (tmp_path / 'assets' / 'style.css').write_bytes(CSS)
+  (tmp_path / 'secret.txt').write_bytes(b'secret')
+  return tmp_path / 'assets'
+
+@pytest.fixture
+def cache(asset_dir: Path) -> StaticAssetCache:
+  return StaticAssetCache(asset_dir, cache_control='public, max-age=60')
+
+@pytest.fixture
+def app(loop, cache: StaticAssetCache):
+  app = web.Application(loop=loop)
+  async def handler(req: web.Request) -> web.StreamResponse:
+    return cache.respond(req, req.match_info['path'])
+  app.router.add_get('/{path:.*}', handler)
+  return app
+
+
+class TestStaticAsset:
+  def test_compresses_compressible_types(self):
+    asset = StaticAsset.from_bytes(CSS, 'text/css')
+    assert asset.gzip is not None
+    assert gzip.decompress(asset.gzip) == CSS
+
+  def test_skips_compressing_binary_types(self):
+    asset = StaticAsset.from_bytes(CSS, 'image/png')
+    assert asset.gzip is None
+    assert asset.br is None
+
+  def test_etag_depends_on_content(self):
+    assert StaticAsset.from_bytes(b'a', 'text/css').etag_base != StaticAsset.from_bytes(b'b', 'text/css').etag_base
+
+
+class TestStaticAssetCache:
+  def test_reads_file_once(self, cache: StaticAssetCache, asset_dir: Path):
+    asset = cache.get('style.css')
+    assert asset is not None
+    assert cache.get('style.css') is asset
+
+  def test_rereads_changed_file(self, cache: StaticAssetCache, asset_dir: Path):
+    asset = cache.get('style.css')
+    (asset_dir / 'style.css').write_bytes(b'body {}')
+    os.utime(asset_dir / 'style.css', ns=(0, 0))
+    new_asset = cache.get('style.css')
+    assert new_asset is not None
+    assert new_asset.identity == b'body {}'
+
+  @pytest.mark.parametrize('relpath', ['nonexistent.css', '../secret.txt', '.', ''])
+  def test_returns_none_for_non_files(self, cache: StaticAssetCache, relpath: str):
+    assert cache.get(relpath) is None
+
+  def test_fingerprinted_name_goes_before_the_extension(self, cache: StaticAssetCache):
+    asset = cache.get('style.css')
+    assert asset is not None
+    assert cache.fingerprinted_name('style.css') == f'style.{asset.fingerprint}.css'
+
+  def test_fingerprinted_name_changes_with_content(self, cache: StaticAssetCache, asset_dir: Path):
+    old_name = cache.fingerprinted_name('style.css')
+    (asset_dir / 'style.css').write_bytes(b'body {}')
+    assert cache.fingerprinted_name('style.css') != old_name
+
+  def test_preload_returns_manifest(self, cache: StaticAssetCache, asset_dir: Path):
+    (asset_dir / 'sub').mkdir()
+    (asset_dir / 'sub' / 'x.js').write_bytes(b'1')
+    assert cache.preload() == {
+      'style.css': cache.fingerprinted_name('style.css'),
+      'sub/x.js': cache.fingerprinted_name('sub/x.js'),
+    }
+
+
+async def test_serves_with_validators_and_cache_control(aiohttp_client, app):
+  cli = await aiohttp_client(app)
+  resp = await cli.get('/style.css', headers={'Accept-Encoding': 'identity'})
+  assert resp.status == 200
+  assert resp.content_type == 'text/css'
+  assert resp.headers['Cache-Control'] == 'public, max-age=60'
+  assert resp.headers['ETag'].startswith('"')
+  assert 'Content-Encoding' not in resp.headers
+  assert await resp.read() == CSS
+
+async def test_serves_gzip_when_accepted(aiohttp_client, app):
+  cli = await aiohttp_client(app, auto_decompress=False)
+  resp = await cli.get('/style.css', headers={'Accept-Encoding': 'gzip'})
+  assert resp.status == 200
+  assert resp.headers['Content-Encoding'] == 'gzip'
+  assert resp.headers['Vary'] == 'Accept-Encoding'
+  assert gzip.decompress(await resp.read()) == CSS
+
+async def test_ignores_refused_encodings(aiohttp_client, app):
+  cli = await aiohttp_client(app, auto_decompress=False)
+  resp = await cli.get('/style.css', headers={'Accept-Encoding': 'gzip;q=0, br;q=0'})
+  assert 'Content-Encoding' not in resp.headers
+  assert await resp.read() == CSS
+
+@pytest.mark.parametrize('encoding', ['identity', 'gzip'])
+async def test_304s_when_client_is_current(aiohttp_client, app, encoding: str):
+  cli = await aiohttp_client(app)
+  etag = (await cli.get('/style.css', headers={'Accept-Encoding': encoding})).headers['ETag']
+  resp = await cli.get('/style.css', headers={'If-None-Match': etag})
+  assert resp.status == 304
+  assert await resp.read() == b''
+
+async def test_200s_when_client_is_stale(aiohttp_client, app):
+  cli = await aiohttp_client(app)
+  resp = await cli.get('/style.css', headers={'If-None-Match': '"0123"'})
+  assert resp.status == 200
+
+async def test_404s_outside_root(aiohttp_client, app):
+  cli = await aiohttp_client(app)
+  assert (await cli.get('/nonexistent.css')).status == 404
+  assert (await cli.get('/%2E%2E/secret.txt')).status == 404
+
+async def test_serves_fingerprinted_names_as_immutable(aiohttp_client, app, cache: StaticAssetCache):
+  cli = await aiohttp_client(app)
+  resp = await cli.get(f'/{cache.fingerprinted_name("style.css")}')
+  assert resp.status == 200
+  assert resp.headers['Cache-Control'] == IMMUTABLE_CACHE_CONTROL
+  assert await resp.read() == CSS
+
+async def test_serves_stale_fingerprints_without_immutable(aiohttp_client, app):
+  cli = await aiohttp_client(app)
+  resp = await cli.get('/style.0123456789abcdef.css')
+  assert resp.status == 200
+  assert resp.headers['Cache-Control'] == 'public, max-age=60'
+  assert await resp.read() == CSS
+
+async def test_404s_fingerprinted_names_of_nonexistent_files(aiohttp_client, app):
+  cli = await aiohttp_client(app)
+  assert (await cli.get('/nonexistent.0123456789abcdef.css')).status == 404
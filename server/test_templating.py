@@ -0,0 +1,56 @@
+import os
+from pathlib import Path
+
+import jinja2
+import pytest
+
+from .templating import compile_all, make_environment
+
+
+@pytest.fixture
+def template_dir(tmp_path: Path) -> Path:
+  (tmp_path / 'templates').mkdir()
+  (tmp_path / 'templates' / 'Page.html').write_text('v1 {{ x }}')
+  (tmp_path / 'templates' / 'emails').mkdir()
+  (tmp_path / 'templates' / 'emails' / 'Email.html').write_text('email')
+  return tmp_path / 'templates'
+
+def edit(path: Path, text: str) -> None:
+  path.write_text(text)
+  st = path.stat()
+  os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+
+def test_dev_mode_reloads_changed_templates(template_dir: Path):
+  env = make_environment(template_dir)
+  assert env.get_template('Page.html').render(x=1) == 'v1 1'
+  edit(template_dir / 'Page.html', 'v2 {{ x }}')
+  assert env.get_template('Page.html').render(x=1) == 'v2 1'
+
+def test_production_mode_never_reloads(template_dir: Path):
+  env = make_environment(template_dir, production=True)
+  assert env.get_template('Page.html').render(x=1) == 'v1 1'
+  edit(template_dir / 'Page.html', 'v2 {{ x }}')
+  assert env.get_template('Page.html').render(x=1) == 'v1 1'
+
+def test_compile_all_loads_every_template(template_dir: Path):
+  env = make_environment(template_dir, production=True)
+  assert sorted(compile_all(env)) == ['Page.html', 'emails/Email.html']
+  (template_dir / 'Page.html').unlink()
+  assert env.get_template('Page.html').render(x=1) == 'v1 1'
+
+def test_bytecode_cache_is_written_and_used(template_dir: Path, tmp_path: Path):
+  cache_dir = tmp_path / 'bytecode'
+  compile_all(make_environment(template_dir, production=True, bytecode_cache_dir=cache_dir))
+  assert len(list(cache_dir.iterdir())) == 2
+
+  env = make_environment(template_dir, production=True, bytecode_cache_dir=cache_dir)
+  compiled = []
+  original_compile = env.compile
+  env.compile = lambda *args, **kwargs: compiled.append(args) or original_compile(*args, **kwargs)  # type: ignore
+  compile_all(env)
+  assert compiled == []
+
+def test_undefined_variables_are_errors(template_dir: Path):
+  with pytest.raises(jinja2.UndefinedError):
+    make_environment(template_dir).get_template('Page.html').render()
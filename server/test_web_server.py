@@ -1,8 +1,14 @@
+import base64
+import gzip
 from pathlib import Path
+import re
 from server.core import token_owner
 from aiohttp import web
 import pytest
+import sqlalchemy
+from unittest.mock import patch
 
+from .compression import CompressionMiddleware
 from .protobuf import mvp_pb2
 from .web_server import WebServer
 from .http_glue import HttpTokenGlue
@@ -48,6 +54,7 @@ async def test_smoke(aiohttp_client, app, api_server, any_servicer, path: str, l
 @pytest.mark.parametrize('path', [
   '/p/{prediction_id}',
   '/p/{prediction_id}/embed-darkgreen-14pt.png',
+  '/p/{prediction_id}/embed-darkgreen-14pt.svg',
 ])
 async def test_smoke_for_prediction_paths(aiohttp_client, app, api_server, any_servicer: Servicer, path: str, logged_in: bool):
   create_user(any_servicer, u('rando'))
@@ -100,3 +107,184 @@ async def test_smoke_for_invitation_paths(aiohttp_client, app, api_server, any_s
 
   resp = await cli.get(path.format(nonce=nonce))
   assert resp.status == 200
+
+
+async def test_prediction_page_loads_in_one_transaction(aiohttp_client, app, api_server, any_servicer: Servicer):
+  create_user(any_servicer, u('rando'))
+  api_server.add_to_app(app)
+  prediction_id = any_servicer.CreatePrediction(au('rando'), some_create_prediction_request()).new_prediction_id
+
+  cli = await aiohttp_client(app)
+  create_user(any_servicer, u('alice'), password='alice')
+  await post_proto(cli, '/api/LogInUsername', mvp_pb2.LogInUsernameRequest(username='alice', password='alice'), mvp_pb2.AuthSuccess)
+
+  begins = []
+  raw_conn = any_servicer._conn._conn  # type: ignore
+  listener = lambda conn: begins.append(conn)
+  sqlalchemy.event.listen(raw_conn, 'begin', listener)
+  try:
+    resp = await cli.get(f'/p/{prediction_id}')
+  finally:
+    sqlalchemy.event.remove(raw_conn, 'begin', listener)
+  assert resp.status == 200
+  assert len(begins) == 1
+
+async def test_static_files_are_cacheable(aiohttp_client, app):
+  cli = await aiohttp_client(app)
+  resp = await cli.get('/static/bootstrap.min.css')
+  assert resp.status == 200
+  assert resp.content_type == 'text/css'
+  assert 'max-age' in resp.headers['Cache-Control']
+  await resp.read()
+
+  resp = await cli.get('/static/bootstrap.min.css', headers={'If-None-Match': resp.headers['ETag']})
+  assert resp.status == 304
+
+  assert (await cli.get('/static/nonexistent.css')).status == 404
+
+async def test_pages_link_to_fingerprinted_assets(aiohttp_client, app):
+  cli = await aiohttp_client(app)
+  html = await (await cli.get('/welcome')).text()
+  [css_url] = re.findall(r'href="(/static/bootstrap\.min\.[0-9a-f]{16}\.css)"', html)
+
+  resp = await cli.get(css_url)
+  assert resp.status == 200
+  assert 'immutable' in resp.headers['Cache-Control']
+  await resp.read()
+
+async def test_anonymous_prediction_page_is_rendered_once_per_version(aiohttp_client, app, api_server, any_servicer: Servicer):
+  create_user(any_servicer, u('creator'))
+  create_user(any_servicer, u('bettor'))
+  any_servicer.SetTrusted(au('creator'), mvp_pb2.SetTrustedRequest(who='bettor', trusted=True))
+  any_servicer.SetTrusted(au('bettor'), mvp_pb2.SetTrustedRequest(who='creator', trusted=True))
+  prediction_id = any_servicer.CreatePrediction(au('creator'), some_create_prediction_request()).new_prediction_id
+  cli = await aiohttp_client(app)
+
+  begins = []
+  raw_conn = any_servicer._conn._conn  # type: ignore
+  listener = lambda conn: begins.append(conn)
+  sqlalchemy.event.listen(raw_conn, 'begin', listener)
+  try:
+    first = await (await cli.get(f'/p/{prediction_id}')).text()
+    assert len(begins) == 1
+    assert await (await cli.get(f'/p/{prediction_id}')).text() == first
+    assert len(begins) == 1
+
+    any_servicer.Stake(au('bettor'), mvp_pb2.StakeRequest(prediction_id=prediction_id, bettor_is_a_skeptic=True, bettor_stake_cents=10))
+    begins.clear()
+    assert await (await cli.get(f'/p/{prediction_id}')).text() != first
+    assert len(begins) == 1
+  finally:
+    sqlalchemy.event.remove(raw_conn, 'begin', listener)
+
+async def test_embed_is_cacheable(aiohttp_client, app, any_servicer: Servicer):
+  create_user(any_servicer, u('rando'))
+  prediction_id = any_servicer.CreatePrediction(au('rando'), some_create_prediction_request()).new_prediction_id
+  cli = await aiohttp_client(app)
+
+  resp = await cli.get(f'/p/{prediction_id}/embed-darkgreen-14pt.png')
+  assert resp.status == 200
+  assert resp.content_type == 'image/png'
+  assert 'max-age' in resp.headers['Cache-Control']
+  await resp.read()
+
+  resp = await cli.get(f'/p/{prediction_id}/embed-darkgreen-14pt.png', headers={'If-None-Match': resp.headers['ETag']})
+  assert resp.status == 304
+
+async def test_cleanup_shuts_down_embed_renderer(aiohttp_client, app, web_server: WebServer):
+  cli = await aiohttp_client(app)
+  with patch.object(web_server.embeds, 'shutdown', wraps=web_server.embeds.shutdown) as shutdown:
+    await cli.close()
+  shutdown.assert_called_once_with()
+
+async def test_svg_embed(aiohttp_client, app, any_servicer: Servicer):
+  create_user(any_servicer, u('rando'))
+  prediction_id = any_servicer.CreatePrediction(au('rando'), some_create_prediction_request()).new_prediction_id
+  cli = await aiohttp_client(app)
+
+  resp = await cli.get(f'/p/{prediction_id}/embed-red.svg')
+  assert resp.status == 200
+  assert resp.content_type == 'image/svg+xml'
+  svg = await resp.text()
+  assert svg.startswith('<svg ')
+  assert 'fill="#ff0000"' in svg
+
+  png_resp = await cli.get(f'/p/{prediction_id}/embed-red.png')
+  assert png_resp.headers['ETag'] != resp.headers['ETag']
+  await png_resp.read()
+
+@pytest.mark.parametrize('path', ['/', '/welcome', '/new', '/login', '/signup'])
+async def test_production_templates(aiohttp_client, loop, any_servicer: Servicer, token_mint, path: str):
+  web_server = WebServer(servicer=any_servicer, token_glue=HttpTokenGlue(token_mint), token_mint=token_mint, elm_dist=Path(__file__)/"elm"/"dist", production_templates=True)
+  app = web.Application(loop=loop)
+  web_server.add_to_app(app)
+  cli = await aiohttp_client(app)
+  resp = await cli.get(path)
+  assert resp.status == 200
+  await resp.read()
+
+@pytest.mark.parametrize('path', ['/welcome', '/new', '/login', '/signup', '/fast'])
+async def test_anonymous_pages_are_prerendered(aiohttp_client, loop, any_servicer: Servicer, token_mint, path: str):
+  web_server = WebServer(servicer=any_servicer, token_glue=HttpTokenGlue(token_mint), token_mint=token_mint, elm_dist=Path(__file__)/"elm"/"dist", production_templates=True)
+  web_server.preload_assets()
+  app = web.Application(loop=loop)
+  web_server.add_to_app(app)
+  cli = await aiohttp_client(app, auto_decompress=False)
+
+  render_calls = []
+  real_get_template = web_server._jinja.get_template
+  web_server._jinja.get_template = lambda name: render_calls.append(name) or real_get_template(name)  # type: ignore
+  resp = await cli.get(path, headers={'Accept-Encoding': 'gzip'})
+  assert resp.status == 200
+  assert resp.headers['Content-Encoding'] == 'gzip'
+  assert b'<html' in gzip.decompress(await resp.read()).lower()
+  assert render_calls == []
+
+  resp = await cli.get(path, headers={'Accept-Encoding': 'gzip', 'If-None-Match': resp.headers['ETag']})
+  assert resp.status == 304
+  await resp.read()
+
+async def test_logged_in_pages_are_not_prerendered(aiohttp_client, app, api_server, any_servicer: Servicer):
+  create_user(any_servicer, u('alice'), password='alice')
+  api_server.add_to_app(app)
+  cli = await aiohttp_client(app)
+  anonymous = await (await cli.get('/welcome')).text()
+  await post_proto(cli, '/api/LogInUsername', mvp_pb2.LogInUsernameRequest(username='alice', password='alice'), mvp_pb2.AuthSuccess)
+  logged_in = await (await cli.get('/welcome')).text()
+  assert re.search(r'authSuccessPbB64: +null', anonymous)
+  m = re.search(r'authSuccessPbB64: +"([^"]*)"', logged_in)
+  assert m
+  auth_success = mvp_pb2.AuthSuccess()
+  auth_success.ParseFromString(base64.b64decode(m.group(1)))
+  assert auth_success.token.owner == 'alice'
+
+async def test_my_stakes_ships_first_page_and_cursor(aiohttp_client, app, api_server, any_servicer: Servicer, monkeypatch):
+  monkeypatch.setattr('server.web_server.PREDICTIONS_PAGE_SIZE', 2)
+  create_user(any_servicer, u('alice'), password='alice')
+  for _ in range(3):
+    any_servicer.CreatePrediction(au('alice'), some_create_prediction_request())
+  api_server.add_to_app(app)
+  cli = await aiohttp_client(app)
+  await post_proto(cli, '/api/LogInUsername', mvp_pb2.LogInUsernameRequest(username='alice', password='alice'), mvp_pb2.AuthSuccess)
+
+  page = await (await cli.get('/my_stakes')).text()
+  m = re.search(r'var predictionsPbB64 = "([^"]*)"', page)
+  assert m
+  predictions = mvp_pb2.PredictionsById()
+  predictions.ParseFromString(base64.b64decode(m.group(1)))
+  assert len(predictions.predictions) == 2
+  assert re.search(r'var nextCursor = "[^"]+"', page)
+
+async def test_pages_are_compressed(aiohttp_client, app, api_server, any_servicer: Servicer):
+  CompressionMiddleware().add_to_app(app)
+  create_user(any_servicer, u('alice'), password='alice')
+  for _ in range(20):
+    any_servicer.CreatePrediction(au('alice'), some_create_prediction_request())
+  api_server.add_to_app(app)
+  cli = await aiohttp_client(app, auto_decompress=False)
+  await post_proto(cli, '/api/LogInUsername', mvp_pb2.LogInUsernameRequest(username='alice', password='alice'), mvp_pb2.AuthSuccess)
+
+  resp = await cli.get('/my_stakes', headers={'Accept-Encoding': 'gzip'})
+  assert resp.status == 200
+  assert resp.headers['Content-Encoding'] == 'gzip'
+  assert 'var predictionsPbB64 = "' in gzip.decompress(await resp.read()).decode(resp.charset or 'utf-8')
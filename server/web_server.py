@@ -1,285 +1,352 @@
 import base64
+import collections
+import concurrent.futures
 import datetime
-import functools
-import io
 from pathlib import Path
-import re
-from typing import AbstractSet, Callable, Optional, Tuple
+from typing import AbstractSet, Any, Callable, Dict, Generic, Iterable, Mapping, Optional, Tuple, TypeVar
 
 from aiohttp import web
-from attr import dataclass
 from google.protobuf.message import Message
-import jinja2
-from PIL import Image, ImageDraw, ImageFont  # type: ignore
 import structlog
 
-from .core import ApiError, AuthorizingUsername, Servicer, TokenMint, Username, token_owner
+from .core import ApiError, AuthorizingUsername, PredictionId, Servicer, TokenMint, Username, call_in_executor, token_owner
+from .embeds import EMBED_CACHE_CONTROL, EmbedRenderer, Style, embed_text, render_svg
 from .tokens import AuthToken
 from .http_glue import HttpTokenGlue
 from .protobuf import mvp_pb2
+from .static_assets import StaticAsset, StaticAssetCache, asset_response, if_none_match_hits
+from .templating import compile_all, make_environment
 
 logger = structlog.get_logger()
 
+_T = TypeVar('_T')
+
+_PARSED_AUTH_KEY = 'biatob_parsed_auth'
+
 _HERE = Path(__file__).parent
 
-ARIAL_PATH = _HERE / 'arial.ttf'
-WARNOCK_PRO_PATH = _HERE / 'warnock-pro.otf'
+# How many predictions MyStakes and user pages ship with; the Elm app fetches
+# more, the same number at a time (its `pageSize`), as the user scrolls.
+PREDICTIONS_PAGE_SIZE = 50
 
+# The pages that, for logged-out visitors, depend on nothing but their template.
+ANONYMOUS_PAGE_TEMPLATES = ['Welcome.html', 'LoginPage.html', 'SignupPage.html', 'CreatePredictionPage.html', 'FastBetPage.html']
 
-@dataclass(frozen=True)
-class Style:
-    color: Tuple[int, int, int]
-    fontpath: Path
-    fontsize: int
-    underline: bool
+# Prerendered pages link to the assets current when they were rendered, so
+# browsers must recheck them; the ETag makes that cheap. They're only served
+# to requests without an auth cookie, so caches must tell those apart.
+ANONYMOUS_PAGE_CACHE_CONTROL = 'no-cache'
 
-    @staticmethod
-    def parse(s: str) -> 'Style':
-        s = s.lstrip('-')
-        m = re.search(r'(?:-|^)([0-9]{1,2})pt\b', s)
-        if m:
-            fontsize = min(30, int(m.group(1)))
-            s = s.replace(m.group(), '', 1)
-        else:
-            fontsize = 12
 
-        if s == 'lesswrong':
-            return Style(color=(0x5f, 0x9b, 0x65), fontpath=WARNOCK_PRO_PATH, fontsize=fontsize, underline=False)
+class VersionedRenderCache(Generic[_T]):
+    """Bounded LRU map from key to (version, rendered value), with hit/miss counts.
 
-        m = re.search('(?:-|^)(' + '|'.join(COLOR_NAME_TO_COLOR.keys()) + r')\b', s)
-        if m:
-            color = COLOR_NAME_TO_COLOR[m.group(1)]
-            s = s.replace(m.group(), '', 1)
-        else:
-            color = COLOR_NAME_TO_COLOR['darkgreen']
-
-        return Style(color=color, fontpath=ARIAL_PATH, fontsize=fontsize, underline=True)
-
-COLOR_NAME_TO_COLOR = {
-    'red'      : (255, 0  , 0  ),
-    'darkgreen': (0  , 128, 0  ),
-    'darkblue' : (0  , 0  , 128),
-    'black'    : (0  , 0  , 0  ),
-    'white'    : (255, 255, 255),
-    'plainlink' : (0x0a, 0x58, 0xca),
-    'lwlinkgreen': (0x5f, 0x9b, 0x65),
-}
-
-@functools.lru_cache(maxsize=256)
-def render_text(text: str, style: Style, file_format: str = 'png') -> bytes:
-    font = ImageFont.truetype(str(style.fontpath.resolve()), style.fontsize)
-    _,_,w, h = font.getbbox(text)
-    if style.underline:
-        h += 2
-    img = Image.new('RGBA', (w, h), color=(255,255,255,0))
-    draw = ImageDraw.Draw(img)
-    draw.text((0,0), text, fill=style.color, font=font)
-    if style.underline:
-        draw.line([(0, h-1), (w, h-1)], fill=style.color)
-    buf = io.BytesIO()
-    img.save(buf, format=file_format)
-    return buf.getvalue()
-
-
-def stupid_file_response(path: Path) -> web.Response:
-    '''For some reason, web.FileResponse sometimes results in a 404 even when the file exists. Dodge that.'''
-    if path.is_file():
-        return web.Response(status=200, body=path.read_bytes(), content_type='text/html' if path.name.endswith('.html') else 'text/css' if path.name.endswith('.css') else 'text/javascript' if path.name.endswith('.js') else 'application/octet-stream')
-    return web.Response(status=404)
+    A lookup only hits if the caller's current version matches the one the
+    value was rendered at. Only touched from the event loop, so takes no lock.
+    """
+    def __init__(self, maxsize: int = 1000) -> None:
+        self.maxsize = maxsize
+        self._pages: 'collections.OrderedDict[str, Tuple[int, _T]]' = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str, version: int) -> Optional[_T]:
+        entry = self._pages.get(key)
+        if entry is None or entry[0] != version:
+            self.misses += 1
+            return None
+        self._pages.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key: str, version: int, page: _T) -> None:
+        self._pages[key] = (version, page)
+        self._pages.move_to_end(key)
+        while len(self._pages) > self.maxsize:
+            self._pages.popitem(last=False)
+
+    def stats(self) -> Mapping[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._pages),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': (self.hits / lookups) if lookups else None,
+        }
 
 
 class WebServer:
-    def __init__(self, servicer: Servicer, elm_dist: Path, token_glue: HttpTokenGlue, token_mint: TokenMint, clock: Callable[[], datetime.datetime] = datetime.datetime.now) -> None:
+    def __init__(self, servicer: Servicer, elm_dist: Path, token_glue: HttpTokenGlue, token_mint: TokenMint, clock: Callable[[], datetime.datetime] = datetime.datetime.now, executor: Optional[concurrent.futures.Executor] = None, embed_cache_dir: Optional[Path] = None, production_templates: bool = False, template_bytecode_cache_dir: Optional[Path] = None) -> None:
         self._servicer = servicer
+        self._executor = executor
         self._elm_dist = elm_dist
         self._token_glue = token_glue
         self._token_mint = token_mint
         self._clock = clock
 
-        self._jinja = jinja2.Environment( # adapted from https://jinja.palletsprojects.com/en/2.11.x/api/#basics
-            loader=jinja2.FileSystemLoader(searchpath=[_HERE/'templates'], encoding='utf-8'),
-            autoescape=jinja2.select_autoescape(['html', 'xml']),
-        )
-        self._jinja.undefined = jinja2.StrictUndefined  # raise exception if a template uses an undefined variable; adapted from https://stackoverflow.com/a/39127941/8877656
-
-    def _get_auth_success(self, auth: Optional[AuthToken], req: mvp_pb2.GetSettingsRequest = mvp_pb2.GetSettingsRequest()) -> Optional[mvp_pb2.AuthSuccess]:
+        # Pages link to these by fingerprinted URL (see `_asset_url`), which are
+        # cached forever; these Cache-Controls are just for the plain URLs. The
+        # Elm modules change with every deploy, so those are only cached briefly,
+        # after which the ETag makes rechecking them cheap.
+        self._static_assets = StaticAssetCache(_HERE / 'static', cache_control='public, max-age=604800')
+        self._elm_assets = StaticAssetCache(_HERE.parent / 'elm' / 'dist', cache_control='public, max-age=300')
+        self._wellknown_assets = StaticAssetCache(Path('/home/public/.well-known'), cache_control='public, max-age=3600')
+        self._fingerprinted_asset_caches = {'/static/': self._static_assets, '/elm/': self._elm_assets}
+
+        # Logged-out visitors all see the same page for a given prediction, so
+        # render it once per version of the prediction.
+        self.anonymous_prediction_pages: VersionedRenderCache[str] = VersionedRenderCache()
+        # Embeds look the same to everyone, so they're made from the anonymous view.
+        self.embed_predictions: VersionedRenderCache[mvp_pb2.UserPredictionView] = VersionedRenderCache(maxsize=10_000)
+        self.embeds = EmbedRenderer(cache_dir=embed_cache_dir)
+
+        self._jinja = make_environment(_HERE/'templates', production=production_templates, bytecode_cache_dir=template_bytecode_cache_dir)
+        self._jinja.globals['asset_url'] = self._asset_url
+        if production_templates:
+            compile_all(self._jinja)
+
+        # Template name -> the page as a logged-out visitor sees it, compressed.
+        # Only kept with production templates: in development, the templates
+        # might change under us.
+        self._prerender_anonymous_pages = production_templates
+        self._anonymous_pages: Dict[str, StaticAsset] = {}
+
+    def preload_assets(self) -> None:
+        """Reads, compresses and fingerprints every static file and Elm module, rather than waiting for the first request for each.
+
+        With production templates, also prerenders the pages logged-out visitors see.
+        """
+        for cache in self._fingerprinted_asset_caches.values():
+            cache.preload()
+        if self._prerender_anonymous_pages:
+            for template_name in ANONYMOUS_PAGE_TEMPLATES:
+                self._anonymous_pages[template_name] = self._render_anonymous_page(template_name)
+            logger.info('prerendered anonymous pages', bytes={name: len(page.identity) for name, page in self._anonymous_pages.items()})
+
+    def _render_anonymous_page(self, template_name: str) -> StaticAsset:
+        kwargs = {} if template_name == 'FastBetPage.html' else {'auth_success_pb_b64': None}
+        return StaticAsset.from_bytes(self._jinja.get_template(template_name).render(**kwargs).encode('utf-8'), 'text/html')
+
+    def _anonymous_page_response(self, req: web.Request, template_name: str) -> web.Response:
+        page = self._anonymous_pages.get(template_name)
+        if page is None:
+            page = self._render_anonymous_page(template_name)
+            if self._prerender_anonymous_pages:
+                self._anonymous_pages[template_name] = page
+        resp = asset_response(req, page, ANONYMOUS_PAGE_CACHE_CONTROL)
+        resp.headers['Vary'] = 'Accept-Encoding, Cookie'
+        return resp
+
+    def _asset_url(self, url: str) -> str:
+        """The fingerprinted URL for e.g. `/elm/Login.js`; or the URL itself, if there's no such file."""
+        for prefix, cache in self._fingerprinted_asset_caches.items():
+            if url.startswith(prefix):
+                fingerprinted = cache.fingerprinted_name(url[len(prefix):])
+                return url if fingerprinted is None else prefix + fingerprinted
+        return url
+
+    async def _call(self, method: Callable[..., _T], *args: Any) -> _T:
+        return await call_in_executor(self._executor, method, *args)
+
+    def _parse_auth(self, req: web.Request) -> Optional[AuthToken]:
+        """Parses the auth cookie once per request, even if several handlers look (get_index hands its request to get_my_stakes)."""
+        if _PARSED_AUTH_KEY not in req:
+            req[_PARSED_AUTH_KEY] = self._token_glue.parse_cookie(req)
+        return req[_PARSED_AUTH_KEY]
+
+    async def _get_page_context(self, auth: Optional[AuthToken], load_payload: Callable[[], _T], relationships_with: Callable[[_T], Iterable[str]] = lambda _: ()) -> Tuple[Optional[mvp_pb2.AuthSuccess], _T]:
+        """Loads a page's data and the viewer's AuthSuccess in one servicer transaction; see Servicer.GetPageContext."""
+        ctx = await self._call(self._servicer.GetPageContext, token_owner(auth), load_payload, relationships_with)
+        if auth is None or ctx.user_info is None:
+            return None, ctx.payload
+        return mvp_pb2.AuthSuccess(token=mvp_pb2.AuthToken(owner=auth.owner), user_info=ctx.user_info), ctx.payload
+
+    async def _get_auth_success(self, auth: Optional[AuthToken]) -> Optional[mvp_pb2.AuthSuccess]:
         if auth is None:
             return None
-        try:
-            user_info = self._servicer.GetSettings(token_owner(auth), req)
-        except ApiError as e:
-            logger.error('failed to get settings for valid-looking user', data_loss=True, auth=auth, error=e.catchall)
-            return None
-        return mvp_pb2.AuthSuccess(token=mvp_pb2.AuthToken(owner=auth.owner), user_info=user_info)
+        auth_success, _ = await self._get_page_context(auth, lambda: None)
+        return auth_success
 
     async def get_static(self, req: web.Request) -> web.StreamResponse:
-        filename = req.match_info['filename']
-        static_dir = _HERE / 'static'
-        return stupid_file_response(static_dir / (static_dir/filename).relative_to(static_dir))
+        return self._static_assets.respond(req, req.match_info['filename'])
 
     async def get_wellknown(self, req: web.Request) -> web.StreamResponse:
-        path = Path(req.match_info['path'])
-        root = Path('/home/public/.well-known')
-        try:
-            return stupid_file_response(root / ((root/path).absolute().relative_to(root)))
-        except Exception:
-            raise web.HTTPBadRequest()
+        return self._wellknown_assets.respond(req, req.match_info['path'])
 
     async def get_elm_module(self, req: web.Request) -> web.StreamResponse:
-        module = req.match_info['module']
-        elmdist = _HERE.parent/'elm'/'dist'
-        return stupid_file_response(elmdist / (elmdist/f'{module}.js').relative_to(elmdist))
+        return self._elm_assets.respond(req, f'{req.match_info["module"]}.js')
 
     async def get_index(self, req: web.Request) -> web.StreamResponse:
-        auth = self._token_glue.parse_cookie(req)
+        auth = self._parse_auth(req)
         if auth is None:
             return web.HTTPTemporaryRedirect('/welcome')
         else:
             return await self.get_my_stakes(req)
 
     async def get_fast_bet(self, req: web.Request) -> web.Response:
-        return web.Response(
-            content_type='text/html',
-            body=self._jinja.get_template('FastBetPage.html').render()
-        )
+        # Everyone sees the same page here, logged in or not.
+        return self._anonymous_page_response(req, 'FastBetPage.html')
 
     async def get_welcome(self, req: web.Request) -> web.Response:
-        auth = self._token_glue.parse_cookie(req)
-        auth_success = self._get_auth_success(auth)
+        auth = self._parse_auth(req)
+        if auth is None:
+            return self._anonymous_page_response(req, 'Welcome.html')
+        auth_success = await self._get_auth_success(auth)
         return web.Response(
             content_type='text/html',
-            body=self._jinja.get_template('Welcome.html').render(
+            text=self._jinja.get_template('Welcome.html').render(
                 auth_success_pb_b64=pb_b64(auth_success),
             ))
 
     async def get_create_prediction_page(self, req: web.Request) -> web.Response:
-        auth = self._token_glue.parse_cookie(req)
-        auth_success = self._get_auth_success(auth)
+        auth = self._parse_auth(req)
+        if auth is None:
+            return self._anonymous_page_response(req, 'CreatePredictionPage.html')
+        auth_success = await self._get_auth_success(auth)
         return web.Response(
             content_type='text/html',
-            body=self._jinja.get_template('CreatePredictionPage.html').render(
+            text=self._jinja.get_template('CreatePredictionPage.html').render(
                 auth_success_pb_b64=pb_b64(auth_success),
             ))
 
     async def get_view_prediction_page(self, req: web.Request) -> web.Response:
-        auth = self._token_glue.parse_cookie(req)
+        auth = self._parse_auth(req)
         prediction_id = str(req.match_info['prediction_id'])
+        if auth is None:
+            # Read the version before loading, so that a change racing with the
+            # load can only make us cache an already-stale version, never keep
+            # serving stale content under the current one.
+            version = self._servicer.GetPredictionVersion(PredictionId(prediction_id))
+            page = self.anonymous_prediction_pages.get(prediction_id, version)
+            if page is not None:
+                return web.Response(content_type='text/html', text=page)
+
         try:
-            prediction = self._servicer.GetPrediction(token_owner(auth), mvp_pb2.GetPredictionRequest(prediction_id=prediction_id))
+            auth_success, prediction = await self._get_page_context(
+                auth,
+                lambda: self._servicer.GetPrediction(token_owner(auth), mvp_pb2.GetPredictionRequest(prediction_id=prediction_id)),
+                relationships_with=lambda prediction: [prediction.creator],
+            )
         except ApiError as e:
-            return web.Response(status=e.http_status, body=e.catchall)
-
-        auth_success = self._get_auth_success(auth, mvp_pb2.GetSettingsRequest(include_relationships_with_users=[prediction.creator]))
-        return web.Response(
-            content_type='text/html',
-            body=self._jinja.get_template('ViewPredictionPage.html').render(
-                title=f'Prediction: by {datetime.datetime.fromtimestamp(prediction.resolves_at_unixtime).strftime("%Y-%m-%d")}, {prediction.prediction}',
-                auth_success_pb_b64=pb_b64(auth_success),
-                predictions_pb_b64=pb_b64(mvp_pb2.PredictionsById(predictions={prediction_id: prediction})),
-                prediction_id=prediction_id,
-            ))
+            return web.Response(status=e.http_status, text=e.catchall)
 
-    async def get_prediction_img_embed(self, req: web.Request) -> web.Response:
-        auth = self._token_glue.parse_cookie(req)
-        prediction_id = str(req.match_info['prediction_id'])
+        page = self._jinja.get_template('ViewPredictionPage.html').render(
+            title=f'Prediction: by {datetime.datetime.fromtimestamp(prediction.resolves_at_unixtime).strftime("%Y-%m-%d")}, {prediction.prediction}',
+            auth_success_pb_b64=pb_b64(auth_success),
+            predictions_pb_b64=pb_b64(mvp_pb2.PredictionsById(predictions={prediction_id: prediction})),
+            prediction_id=prediction_id,
+        )
+        if auth is None:
+            self.anonymous_prediction_pages.put(prediction_id, version, page)
+        return web.Response(content_type='text/html', text=page)
+
+    async def _get_embed_prediction(self, prediction_id: PredictionId) -> mvp_pb2.UserPredictionView:
+        version = self._servicer.GetPredictionVersion(prediction_id)
+        prediction = self.embed_predictions.get(prediction_id, version)
+        if prediction is None:
+            prediction = await self._call(self._servicer.GetPrediction, None, mvp_pb2.GetPredictionRequest(prediction_id=prediction_id))
+            self.embed_predictions.put(prediction_id, version, prediction)
+        return prediction
+
+    async def _embed_response(self, req: web.Request, file_format: str) -> web.Response:
+        prediction_id = PredictionId(req.match_info['prediction_id'])
         try:
-            prediction = self._servicer.GetPrediction(token_owner(auth), mvp_pb2.GetPredictionRequest(prediction_id=prediction_id))
+            prediction = await self._get_embed_prediction(prediction_id)
         except ApiError as e:
-            return web.Response(status=e.http_status, body=e.catchall)
-
-        def format_stake_concisely(n_cents: int) -> str:
-            return f'${n_cents//100}'
-        stake_text = format_stake_concisely(prediction.maximum_stake_cents)
+            return web.Response(status=e.http_status, text=e.catchall)
 
-        if prediction.certainty.high == 1:
-            confidence_text = f'{round(prediction.certainty.low*100)}%+'
-        else:
-            confidence_text = f'{round(prediction.certainty.low*100)}-{round(prediction.certainty.high*100)}%'
-
-        if prediction.resolution and prediction.resolution.resolution != mvp_pb2.RESOLUTION_NONE_YET:
-            res = prediction.resolution.resolution
-            res_text = "correct" if res == mvp_pb2.RESOLUTION_YES else "incorrect" if res == mvp_pb2.RESOLUTION_NO  else "n/a" if res == mvp_pb2.RESOLUTION_INVALID else "???"
-            remaining_text = f" (resolved: {res_text})"
-        elif prediction.closes_unixtime < self._clock().timestamp():
-            remaining_text = " (closed)"
-        elif not (prediction.remaining_stake_cents_vs_skeptics == prediction.remaining_stake_cents_vs_believers == prediction.maximum_stake_cents):
-            remaining_text = (
-                " ("
-                + format_stake_concisely(prediction.remaining_stake_cents_vs_skeptics)
-                + ("/" + format_stake_concisely(prediction.remaining_stake_cents_vs_believers) if prediction.remaining_stake_cents_vs_believers < prediction.maximum_stake_cents else "")
-                + " remain)"
-            )
-        else:
-            remaining_text = ""
-
-        text = f'[bet: {stake_text} at {confidence_text}{remaining_text}]'
+        text = embed_text(prediction, now=self._clock())
         style = Style.parse(req.match_info['style'])
+        key = EmbedRenderer.cache_key(text, style, file_format)
+        headers = {'ETag': f'"{key}"', 'Cache-Control': EMBED_CACHE_CONTROL}
+        if_none_match = req.headers.get('If-None-Match')
+        if if_none_match is not None and if_none_match_hits(if_none_match, key):
+            return web.Response(status=304, headers=headers)
+        if file_format == 'svg':
+            return web.Response(content_type='image/svg+xml', headers=headers, body=render_svg(text, style))
+        return web.Response(content_type=f'image/{file_format}', headers=headers, body=await self.embeds.render(text, style, file_format))
 
-        return web.Response(content_type='image/png', body=render_text(text=text, style=style, file_format='png'))
+    async def get_prediction_img_embed(self, req: web.Request) -> web.Response:
+        return await self._embed_response(req, 'png')
+
+    async def get_prediction_svg_embed(self, req: web.Request) -> web.Response:
+        return await self._embed_response(req, 'svg')
 
     async def get_my_stakes(self, req: web.Request) -> web.Response:
-        auth = self._token_glue.parse_cookie(req)
-        auth_success = self._get_auth_success(auth)
+        auth = self._parse_auth(req)
         if auth is None:
             return web.HTTPTemporaryRedirect('/login?dest=/my_stakes')
         try:
-            predictions = self._servicer.ListMyStakes(token_owner(auth), mvp_pb2.ListMyStakesRequest())
+            auth_success, predictions = await self._get_page_context(
+                auth,
+                lambda: self._servicer.ListMyStakes(token_owner(auth), mvp_pb2.ListMyStakesRequest(limit=PREDICTIONS_PAGE_SIZE)),
+            )
         except ApiError as e:
-            return web.Response(status=e.http_status, body=e.catchall)
+            return web.Response(status=e.http_status, text=e.catchall)
         return web.Response(
             content_type='text/html',
-            body=self._jinja.get_template('MyStakesPage.html').render(
+            text=self._jinja.get_template('MyStakesPage.html').render(
                 auth_success_pb_b64=pb_b64(auth_success),
                 predictions_pb_b64=pb_b64(predictions),
+                next_cursor=predictions.next_cursor,
             ))
 
     async def get_username(self, req: web.Request) -> web.Response:
-        auth = self._token_glue.parse_cookie(req)
+        auth = self._parse_auth(req)
         username = Username(str(req.match_info['username']))
-        auth_success = self._get_auth_success(auth, req=mvp_pb2.GetSettingsRequest(include_relationships_with_users=[username]))
         try:
-            predictions = self._servicer.ListPredictions(token_owner(auth), mvp_pb2.ListPredictionsRequest(creator=username))
+            auth_success, predictions = await self._get_page_context(
+                auth,
+                lambda: self._servicer.ListPredictions(token_owner(auth), mvp_pb2.ListPredictionsRequest(creator=username, limit=PREDICTIONS_PAGE_SIZE)),
+                relationships_with=lambda _: [username],
+            )
         except ApiError as e:
-            return web.Response(status=e.http_status, body=e.catchall)
+            return web.Response(status=e.http_status, text=e.catchall)
         return web.Response(
             content_type='text/html',
-            body=self._jinja.get_template('ViewUserPage.html').render(
+            text=self._jinja.get_template('ViewUserPage.html').render(
                 auth_success_pb_b64=pb_b64(auth_success),
                 who=username,
                 predictions_pb_b64=pb_b64(predictions),
+                next_cursor=predictions.next_cursor,
             ))
 
     async def get_settings(self, req: web.Request) -> web.Response:
-        auth = self._token_glue.parse_cookie(req)
-        auth_success = self._get_auth_success(auth)
+        auth = self._parse_auth(req)
         if auth is None:
             return web.HTTPTemporaryRedirect('/login?dest=/settings')
+        auth_success = await self._get_auth_success(auth)
         return web.Response(
             content_type='text/html',
-            body=self._jinja.get_template('SettingsPage.html').render(
+            text=self._jinja.get_template('SettingsPage.html').render(
                 auth_success_pb_b64=pb_b64(auth_success),
             ))
 
     async def get_login(self, req: web.Request) -> web.Response:
-        auth = self._token_glue.parse_cookie(req)
-        auth_success = self._get_auth_success(auth)
+        auth = self._parse_auth(req)
+        if auth is None:
+            return self._anonymous_page_response(req, 'LoginPage.html')
+        auth_success = await self._get_auth_success(auth)
         return web.Response(
             content_type='text/html',
-            body=self._jinja.get_template('LoginPage.html').render(
+            text=self._jinja.get_template('LoginPage.html').render(
                 auth_success_pb_b64=pb_b64(auth_success),
             ))
 
     async def accept_invitation(self, req: web.Request) -> web.Response:
-        auth = self._token_glue.parse_cookie(req)
-        auth_success = self._get_auth_success(auth)
+        auth = self._parse_auth(req)
         nonce = str(req.match_info['nonce'])
         try:
-            invitation = self._servicer.CheckInvitation(token_owner(auth), mvp_pb2.CheckInvitationRequest(nonce=nonce))
+            auth_success, invitation = await self._get_page_context(
+                auth,
+                lambda: self._servicer.CheckInvitation(token_owner(auth), mvp_pb2.CheckInvitationRequest(nonce=nonce)),
+            )
         except ApiError as e:
-            return web.Response(status=e.http_status, body=e.catchall)
+            return web.Response(status=e.http_status, text=e.catchall)
         return web.Response(
             content_type='text/html',
-            body=self._jinja.get_template('AcceptInvitationPage.html').render(
+            text=self._jinja.get_template('AcceptInvitationPage.html').render(
                 auth_success_pb_b64=pb_b64(auth_success),
                 recipient=invitation.recipient,
                 inviter=invitation.inviter,
@@ -287,24 +354,26 @@ class WebServer:
             ))
 
     async def signup(self, req: web.Request) -> web.Response:
-        auth = self._token_glue.parse_cookie(req)
-        auth_success = self._get_auth_success(auth)
+        auth = self._parse_auth(req)
+        if auth is None:
+            return self._anonymous_page_response(req, 'SignupPage.html')
+        auth_success = await self._get_auth_success(auth)
         return web.Response(
             content_type='text/html',
-            body=self._jinja.get_template('SignupPage.html').render(
+            text=self._jinja.get_template('SignupPage.html').render(
                 auth_success_pb_b64=pb_b64(auth_success),
             ))
 
     async def init_user(self, req: web.Request) -> web.Response:
-        auth = self._token_glue.parse_cookie(req)
-        auth_success = self._get_auth_success(auth)
+        auth = self._parse_auth(req)
+        auth_success = await self._get_auth_success(auth)
         proof_token = str(req.match_info['code'])
         email = self._token_mint.check_proof_of_email(proof_token)
         if email is None:
-            return web.Response(status=400, body='This email-verification link is invalid or has expired.')
+            return web.Response(status=400, text='This email-verification link is invalid or has expired.')
         return web.Response(
             content_type='text/html',
-            body=self._jinja.get_template('InitUserPage.html').render(
+            text=self._jinja.get_template('InitUserPage.html').render(
                 auth_success_pb_b64=pb_b64(auth_success),
                 email=email,
                 proof_of_email_token=proof_token,
@@ -323,6 +392,7 @@ class WebServer:
         app.router.add_get('/new', self.get_create_prediction_page)
         app.router.add_get('/p/{prediction_id:[0-9]+}', self.get_view_prediction_page)
         app.router.add_get('/p/{prediction_id:[0-9]+}/embed{style}.png', self.get_prediction_img_embed)
+        app.router.add_get('/p/{prediction_id:[0-9]+}/embed{style}.svg', self.get_prediction_svg_embed)
         app.router.add_get('/my_stakes', self.get_my_stakes)
         app.router.add_get('/settings', self.get_settings)
         app.router.add_get('/login', self.get_login)
@@ -332,6 +402,10 @@ class WebServer:
         app.router.add_get('/username/{username:[a-zA-Z0-9_-]+}', self.get_username)
         app.router.add_get('/u/{username:[a-zA-Z0-9_-]+}', self.get_username)
         app.router.add_get('/{username:[a-zA-Z0-9_-]+}', self.get_username)
+        app.on_cleanup.append(self._shut_down_embeds)
+
+    async def _shut_down_embeds(self, app: web.Application) -> None:
+        self.embeds.shutdown()
 
 def _reserved_toplevel_path_segments() -> AbstractSet[str]:
     server = WebServer(servicer=None, elm_dist=None, token_glue=HttpTokenGlue(token_mint=TokenMint(secret_key=b'')), token_mint=TokenMint(secret_key=b''))  # type: ignore